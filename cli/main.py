@@ -36,7 +36,6 @@ from cli.utils import (
     select_shallow_thinking_agent,
 )
 from tradingagents.default_config import DEFAULT_CONFIG
-from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.utils.logging_manager import get_logger
 
 # 加载环境变量
@@ -1074,6 +1073,9 @@ def run_analysis():
     # Initialize the graph
     ui.show_progress("正在初始化分析系统...")
     try:
+        # 按需导入分析图（会加载LangChain和各数据源），其他子命令无需承担这部分启动开销
+        from tradingagents.graph.trading_graph import TradingAgentsGraph
+
         graph = TradingAgentsGraph(
             [analyst.value for analyst in selections["analysts"]], config=config, debug=True
         )
@@ -1951,6 +1953,82 @@ def test():
         logger.info(f"python tests/integration/test_dashscope_integration.py")
 
 
+@app.command(
+    name="profile",
+    help="运行耗时剖析 | Run profile report"
+)
+def profile(
+    profile_file: Optional[str] = typer.Argument(None, help="剖析JSON文件，默认取最新 | Profile JSON file, latest by default"),
+    top: int = typer.Option(10, "--top", "-n", help="显示最慢的N个span | Show top-N slow spans"),
+    category: Optional[str] = typer.Option(None, "--category", "-c", help="按类别过滤: node/llm/tool/data_source | Filter by category"),
+):
+    """
+    显示运行剖析的关键路径和最慢span（需设置 TRADINGAGENTS_PROFILE=true 运行分析）
+    Show critical path and slowest spans of a profiled run
+    """
+    from tradingagents.utils.run_profiler import load_profile
+
+    if profile_file is None:
+        profile_dir = Path(DEFAULT_CONFIG["results_dir"]) / "profiles"
+        candidates = sorted(
+            (p for p in profile_dir.glob("*.json") if not p.name.endswith(".trace.json")),
+            key=lambda p: p.stat().st_mtime,
+        ) if profile_dir.exists() else []
+        if not candidates:
+            logger.error(f"[red]❌ 未找到剖析文件: {profile_dir}[/red]")
+            logger.info(f"[yellow]💡 设置 TRADINGAGENTS_PROFILE=true 后运行分析即可生成[/yellow]")
+            raise typer.Exit(1)
+        profile_file = str(candidates[-1])
+
+    try:
+        profiler = load_profile(profile_file)
+    except Exception as e:
+        logger.error(f"[red]❌ 读取剖析文件失败: {e}[/red]")
+        raise typer.Exit(1)
+
+    total = profiler.root.duration or 1e-9
+    metadata = ", ".join(f"{k}={v}" for k, v in profiler.metadata.items())
+    logger.info(f"\n[bold blue]⏱️ 运行剖析 | Run Profile[/bold blue] {profile_file}")
+    logger.info(f"[green]总耗时 | Total:[/green] {profiler.root.duration:.2f}s  {metadata}")
+
+    def metrics_text(span):
+        return ", ".join(f"{k}={v}" for k, v in span.metrics.items())
+
+    path_table = Table(title="关键路径 | Critical Path", show_header=True, header_style="bold magenta")
+    path_table.add_column("Span", style="cyan")
+    path_table.add_column("类别 | Category", style="green")
+    path_table.add_column("耗时 | Duration", justify="right")
+    path_table.add_column("占比 | Share", justify="right")
+    path_table.add_column("指标 | Metrics")
+    for depth, span in enumerate(profiler.critical_path()):
+        path_table.add_row(
+            "  " * depth + span.name, span.category, f"{span.duration:.2f}s",
+            f"{span.duration / total:.0%}", metrics_text(span)
+        )
+    console.print(path_table)
+
+    top_table = Table(title=f"最慢的{top}个Span | Top {top} Slow Spans", show_header=True, header_style="bold magenta")
+    top_table.add_column("Span", style="cyan")
+    top_table.add_column("类别 | Category", style="green")
+    top_table.add_column("耗时 | Duration", justify="right")
+    top_table.add_column("自身 | Self", justify="right")
+    top_table.add_column("指标 | Metrics")
+    for span in profiler.top_spans(top, category):
+        name = f"{span.name} [red](错误)[/red]" if span.error else span.name
+        top_table.add_row(name, span.category, f"{span.duration:.2f}s", f"{span.self_time:.2f}s", metrics_text(span))
+    console.print(top_table)
+
+    summary_table = Table(title="类别汇总 | Summary", show_header=True, header_style="bold magenta")
+    for column in ["类别 | Category", "次数 | Count", "总耗时 | Total", "tokens_in", "tokens_out", "cache_hits", "cache_misses", "bytes"]:
+        summary_table.add_column(column)
+    for name, entry in profiler.summary().items():
+        summary_table.add_row(
+            name, str(entry['count']), f"{entry['total_time']:.2f}s",
+            *[str(entry.get(key, 0)) for key in ["tokens_in", "tokens_out", "cache_hits", "cache_misses", "bytes"]]
+        )
+    console.print(summary_table)
+
+
 @app.command(
     name="help",
     help="中文帮助 | Chinese help"
@@ -1995,6 +2073,11 @@ def help_chinese():
         "运行测试 | Run Tests",
         "执行系统集成测试，验证功能正常"
     )
+    commands_table.add_row(
+        "profile",
+        "运行剖析 | Profile",
+        "查看分析运行的关键路径和最慢环节"
+    )
     commands_table.add_row(
         "version",
         "版本信息 | Version",
@@ -2030,7 +2113,7 @@ def main():
             # 只在退出码为2（typer的未知命令错误）时提供智能建议
             if e.code == 2 and len(sys.argv) > 1:
                 unknown_command = sys.argv[1]
-                available_commands = ['analyze', 'config', 'version', 'data-config', 'examples', 'test', 'help']
+                available_commands = ['analyze', 'config', 'version', 'data-config', 'examples', 'test', 'profile', 'help']
                 
                 # 使用difflib找到最相似的命令
                 suggestions = get_close_matches(unknown_command, available_commands, n=3, cutoff=0.6)
@@ -30,6 +30,8 @@ sys.path.insert(0, str(project_root))
 try:
     from tradingagents.utils.logging_manager import get_logger
     from tradingagents.config.config_manager import config_manager
+    from tradingagents.dataflows.http_session import get_http_session
+    from tradingagents.dataflows.finnhub_store import get_finnhub_store
     logger = get_logger('finnhub_downloader')
 except ImportError as e:
     print(f"❌ 导入模块失败: {e}")
@@ -67,7 +69,7 @@ class FinnhubDataDownloader:
             logger.info(f"🔍 数据目录来源: {'环境变量' if env_data_dir else '项目根目录'}")
         
         self.base_url = "https://finnhub.io/api/v1"
-        self.session = requests.Session()
+        self.session = get_http_session()
         
         logger.info(f"📁 数据目录: {self.data_dir}")
         logger.info(f"🔑 API密钥: {self.api_key[:8]}...")
@@ -102,6 +104,13 @@ class FinnhubDataDownloader:
             logger.error(f"❌ API请求失败: {e}")
             return {}
     
+    def _index(self, symbol: str, data_type: str):
+        """把刚保存的JSON转换进按日期索引的本地库，分析时的区间查询不再解析整个文件"""
+        try:
+            get_finnhub_store(self.data_dir).import_json(symbol, data_type)
+        except Exception as e:
+            logger.warning(f"⚠️ {symbol} {data_type} 建立日期索引失败: {e}")
+
     def download_news_data(self, symbols: List[str], days: int = 7, force_refresh: bool = False):
         """
         下载新闻数据
@@ -175,6 +184,7 @@ class FinnhubDataDownloader:
                     if file_path.exists():
                         file_size = file_path.stat().st_size
                         logger.info(f"✅ {symbol} 新闻数据已保存: {len(formatted_data)} 条, 文件大小: {file_size} 字节")
+                        self._index(symbol, 'news_data')
                     else:
                         logger.error(f"❌ {symbol} 文件保存失败，文件不存在")
 
@@ -222,6 +232,7 @@ class FinnhubDataDownloader:
                     json.dump(sentiment_data, f, ensure_ascii=False, indent=2)
                 
                 logger.info(f"✅ {symbol} 内部人情绪数据已保存")
+                self._index(symbol, 'insider_senti')
             else:
                 logger.warning(f"⚠️ {symbol} 内部人情绪数据下载失败")
             
@@ -261,6 +272,7 @@ class FinnhubDataDownloader:
                     json.dump(trans_data, f, ensure_ascii=False, indent=2)
                 
                 logger.info(f"✅ {symbol} 内部人交易数据已保存")
+                self._index(symbol, 'insider_trans')
             else:
                 logger.warning(f"⚠️ {symbol} 内部人交易数据下载失败")
             
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A股全市场日线入库脚本
+
+每个交易日通过 Tushare daily/adj_factor/daily_basic 按交易日期拉取全市场数据，
+写入按日期分区的本地日线库，DataSourceManager.get_stock_data 会优先读取该库。
+建议每个交易日收盘后(18:00以后)定时运行一次。
+
+使用方法:
+    python scripts/ingest_a_share_eod.py                       # 增量更新到今天
+    python scripts/ingest_a_share_eod.py --start 20240101      # 回填指定区间
+    python scripts/ingest_a_share_eod.py --start 20250102 --end 20250102 --force
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    from tradingagents.utils.logging_manager import get_logger
+    from tradingagents.dataflows.eod_store import EODIngestor, EODStore, get_eod_ingestor
+    logger = get_logger('eod_ingest')
+except ImportError as e:
+    print(f"❌ 导入模块失败: {e}")
+    print("请确保在项目根目录运行此脚本")
+    sys.exit(1)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='A股全市场日线入库脚本')
+    parser.add_argument('--start', help='回填开始日期 YYYYMMDD（默认从最后入库日期继续）')
+    parser.add_argument('--end', help='回填结束日期 YYYYMMDD（默认今天）')
+    parser.add_argument('--lookback-days', type=int, default=365, help='日线库为空时的回填天数')
+    parser.add_argument('--force', action='store_true', help='重新拉取已入库的日期')
+    parser.add_argument('--store-dir', help='日线库目录（默认 TRADINGAGENTS_EOD_STORE_DIR）')
+    parser.add_argument('--min-interval', type=float, default=0.35, help='Tushare请求最小间隔(秒)')
+    args = parser.parse_args()
+
+    try:
+        ingestor = get_eod_ingestor(min_interval=args.min_interval)
+    except RuntimeError as e:
+        logger.error(f"❌ {e}")
+        return 1
+    if args.store_dir:
+        ingestor = EODIngestor(ingestor.api, EODStore(args.store_dir), min_interval=args.min_interval)
+
+    if args.start:
+        summary = ingestor.backfill(args.start, args.end, force=args.force)
+    else:
+        summary = ingestor.update(lookback_days=args.lookback_days)
+
+    logger.info(f"✅ 入库完成: 交易日 {summary['trading_days']} 个, 新入库 {summary['ingested']} 个, "
+                f"跳过 {summary['skipped']} 个, 共 {summary['rows']} 行")
+    if summary['failed']:
+        logger.error(f"❌ 入库失败的日期: {', '.join(summary['failed'])}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
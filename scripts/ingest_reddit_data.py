@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reddit离线数据索引脚本
+
+把 reddit_data/<分类>/*.jsonl 原始转储转换为按日期分区、带股票代码倒排索引的本地库
+（位于 reddit_data/.store），get_reddit_company_news / get_reddit_global_news 会优先读取该库。
+原始转储更新后重新运行即可，未变化的分类自动跳过。
+
+使用方法:
+    python scripts/ingest_reddit_data.py                          # 转换全部分类
+    python scripts/ingest_reddit_data.py --category company_news  # 只转换指定分类
+    python scripts/ingest_reddit_data.py --source /path/to/reddit_data --force
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    from tradingagents.utils.logging_manager import get_logger
+    from tradingagents.dataflows.config import get_config
+    from tradingagents.dataflows.reddit_store import get_reddit_store
+    logger = get_logger('reddit_ingest')
+except ImportError as e:
+    print(f"❌ 导入模块失败: {e}")
+    print("请确保在项目根目录运行此脚本")
+    sys.exit(1)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='Reddit离线数据索引脚本')
+    parser.add_argument('--source', help='原始转储目录（默认 <data_dir>/reddit_data）')
+    parser.add_argument('--category', action='append', help='要转换的分类，可重复指定，默认全部')
+    parser.add_argument('--force', action='store_true', help='原始文件未变化时也重新转换')
+    args = parser.parse_args()
+    args.source = args.source or os.path.join(get_config()["data_dir"], "reddit_data")
+
+    if not os.path.isdir(args.source):
+        logger.error(f"❌ 原始数据目录不存在: {args.source}")
+        return 1
+
+    for summary in get_reddit_store(args.source).ingest(args.source, args.category, force=args.force):
+        if summary['skipped']:
+            logger.info(f"⏭️ {summary['category']}: 原始转储未变化，跳过")
+        else:
+            logger.info(f"✅ {summary['category']}: {summary['days']}天, {summary['posts']}条帖子")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
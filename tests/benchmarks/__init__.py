@@ -0,0 +1,7 @@
+"""
+离线端到端基准测试
+使用脚本化的假LLM和录制的数据源响应（Tushare/AKShare/yfinance/新闻）运行数据流和完整的
+TradingAgentsGraph，统计各阶段耗时、内存峰值、CSV/JSON解析次数和缓存命中率，并与基线对比
+
+运行方式：python -m tests.benchmarks.run_benchmarks --help
+"""
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+缓存编码基准
+用合成的多年日线行情比较旧版JSON缓存路径与各缓存帧编码器的存储字节数、编码/解码耗时，
+并检查解码后的dtype是否与原始DataFrame一致
+
+旧版路径与 DatabaseCacheManager 之前写入Redis的内容一致：
+json.dumps({"data": df.to_json(orient='records', date_format='iso'), ...})，读取时 json.loads + pd.read_json
+
+运行方式：python -m tests.benchmarks.cache_codec [--years 1 5 10] [--repeat 5] [--output PATH]
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from tradingagents.dataflows.cache_codec import ARROW_AVAILABLE, ZSTD_AVAILABLE, ColumnarCodec, decode_frame, encode_frame
+
+TRADING_DAYS_PER_YEAR = 243
+
+
+def synthetic_daily_bars(years: int, seed: int = 7) -> pd.DataFrame:
+    """与AKShare日线列结构一致的随机游走行情"""
+    rng = np.random.RandomState(seed)
+    rows = years * TRADING_DAYS_PER_YEAR
+    dates = pd.bdate_range("2015-01-05", periods=rows)
+    close = np.round(10 * np.exp(np.cumsum(rng.normal(0, 0.02, rows))), 2)
+    open_ = np.round(close * (1 + rng.normal(0, 0.01, rows)), 2)
+    high = np.round(np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, rows))), 2)
+    low = np.round(np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, rows))), 2)
+    volume = rng.randint(100_000, 5_000_000, rows).astype("int64")
+    previous = np.concatenate([[close[0]], close[:-1]])
+    return pd.DataFrame({
+        "日期": dates,
+        "股票代码": "600036",
+        "开盘": open_,
+        "收盘": close,
+        "最高": high,
+        "最低": low,
+        "成交量": volume,
+        "成交额": np.round(volume * close, 2),
+        "振幅": np.round((high - low) / previous * 100, 2),
+        "涨跌幅": np.round((close - previous) / previous * 100, 2),
+        "涨跌额": np.round(close - previous, 2),
+        "换手率": np.round(rng.uniform(0.1, 5, rows), 2),
+    })
+
+
+def _legacy_encode(df: pd.DataFrame) -> bytes:
+    return json.dumps({"data": df.to_json(orient='records', date_format='iso'), "data_format": "dataframe_json",
+                       "symbol": "600036", "data_source": "akshare", "created_at": "2025-01-01T00:00:00"},
+                      ensure_ascii=False).encode('utf-8')
+
+
+def _legacy_decode(payload: bytes) -> pd.DataFrame:
+    return pd.read_json(io.StringIO(json.loads(payload)["data"]), orient='records')
+
+
+def available_codecs() -> Dict[str, Tuple[Callable, Callable]]:
+    codecs = {
+        "json(旧版)": (_legacy_encode, _legacy_decode),
+        "columnar+zlib": (lambda df: encode_frame(df, ColumnarCodec("zlib")), decode_frame),
+    }
+    if ZSTD_AVAILABLE:
+        codecs["columnar+zstd"] = (lambda df: encode_frame(df, ColumnarCodec("zstd")), decode_frame)
+    if ARROW_AVAILABLE:
+        codecs["arrow+zstd"] = (lambda df: encode_frame(df, "arrow"), decode_frame)
+    return codecs
+
+
+@dataclass
+class CodecResult:
+    codec: str
+    years: int
+    rows: int
+    bytes: int
+    encode_ms: float
+    decode_ms: float
+    dtypes_preserved: bool
+
+
+def _best_ms(func, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def run(years_list: List[int], repeat: int = 5) -> List[CodecResult]:
+    results = []
+    for years in years_list:
+        df = synthetic_daily_bars(years)
+        for name, (encode, decode) in available_codecs().items():
+            encode_ms, payload = _best_ms(lambda: encode(df), repeat)
+            decode_ms, decoded = _best_ms(lambda: decode(payload), repeat)
+            results.append(CodecResult(name, years, len(df), len(payload), round(encode_ms, 3),
+                                       round(decode_ms, 3), bool(decoded.dtypes.equals(df.dtypes))))
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="缓存编码存储大小与编解码耗时")
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 5, 10], help="合成行情的年数")
+    parser.add_argument("--repeat", type=int, default=5, help="每项取最好成绩的重复次数")
+    parser.add_argument("--output", default=None, help="结果JSON输出路径")
+    args = parser.parse_args(argv)
+
+    results = run(args.years, args.repeat)
+    print(f"{'编码器':<16}{'年数':>5}{'行数':>7}{'字节':>11}{'压缩比':>8}{'编码(ms)':>10}{'解码(ms)':>10}  dtype")
+    baselines = {result.years: result for result in results if result.codec == "json(旧版)"}
+    for result in results:
+        ratio = baselines[result.years].bytes / result.bytes
+        print(f"{result.codec:<16}{result.years:>5}{result.rows:>7}{result.bytes:>11}{ratio:>7.1f}x"
+              f"{result.encode_ms:>10.2f}{result.decode_ms:>10.2f}  {'✅' if result.dtypes_preserved else '❌'}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps([asdict(result) for result in results], ensure_ascii=False, indent=2),
+                                     encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+脚本化的假聊天模型
+按固定脚本响应：绑定工具且尚未收到工具结果时发起一次工具调用，之后返回固定格式的中文报告；
+信号处理等要求JSON的提示返回结构化决策。可选的固定延迟用于模拟模型耗时。
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+# 按参数名填充工具调用参数
+_TICKER_ARGS = {'ticker', 'symbol', 'stock_code', 'company', 'company_name', 'query'}
+_DATE_ARGS = {'curr_date', 'trade_date', 'end_date', 'date', 'end_day'}
+
+
+class ScriptedChatModel(BaseChatModel):
+    """离线基准测试使用的确定性聊天模型"""
+
+    model_name: str = "scripted-chat"
+    ticker: str = "000001"
+    trade_date: str = "2025-06-30"
+    decision: str = "买入"
+    target_price: float = 12.5
+    latency: float = 0.0
+    bound_tools: List[Any] = Field(default_factory=list)
+    # 复制出的绑定工具实例共享同一个统计字典
+    stats: Dict[str, int] = Field(default_factory=lambda: {'calls': 0, 'tool_calls': 0})
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {'model_name': self.model_name}
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={'bound_tools': list(tools)})
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> ChatResult:
+        self.stats['calls'] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        prompt_text = "\n".join(str(getattr(m, 'content', '')) for m in messages)
+        has_tool_result = any(isinstance(m, ToolMessage) for m in messages)
+
+        if self.bound_tools and not has_tool_result:
+            self.stats['tool_calls'] += 1
+            tool = self._pick_tool()
+            message = AIMessage(content="", tool_calls=[{
+                'name': tool.name,
+                'args': self._tool_args(tool),
+                'id': f"call_{self.stats['tool_calls']}",
+            }])
+        elif "JSON" in prompt_text or "json" in prompt_text:
+            message = AIMessage(content=json.dumps({
+                'action': self.decision,
+                'target_price': self.target_price,
+                'confidence': 0.7,
+                'risk_score': 0.4,
+                'reasoning': '基准测试脚本化决策',
+            }, ensure_ascii=False))
+        else:
+            message = AIMessage(content=self._report())
+
+        tokens_in = max(len(prompt_text) // 4, 1)
+        tokens_out = max(len(str(message.content)) // 4, 1)
+        message.usage_metadata = {'input_tokens': tokens_in, 'output_tokens': tokens_out,
+                                  'total_tokens': tokens_in + tokens_out}
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={'token_usage': {'prompt_tokens': tokens_in, 'completion_tokens': tokens_out}},
+        )
+
+    def _pick_tool(self):
+        """优先选择统一工具"""
+        for tool in self.bound_tools:
+            if getattr(tool, 'name', '').endswith('_unified'):
+                return tool
+        return self.bound_tools[0]
+
+    def _tool_args(self, tool) -> Dict[str, Any]:
+        schema = getattr(tool, 'args', {}) or {}
+        trade_date = datetime.strptime(self.trade_date, "%Y-%m-%d")
+        args = {}
+        for name, spec in schema.items():
+            if name in _TICKER_ARGS:
+                args[name] = self.ticker
+            elif name in _DATE_ARGS:
+                args[name] = self.trade_date
+            elif name == 'start_date':
+                args[name] = (trade_date - timedelta(days=30)).strftime("%Y-%m-%d")
+            elif spec.get('type') == 'integer':
+                args[name] = 30 if 'day' in name else 10
+            elif spec.get('type') == 'boolean':
+                args[name] = False
+            elif 'default' not in spec:
+                args[name] = ""
+        return args
+
+    def _report(self) -> str:
+        sections = "\n".join(
+            f"## {title}\n" + f"{self.ticker} 在 {self.trade_date} 前后的{title}保持稳定，相关指标处于合理区间。" * 3
+            for title in ("技术指标分析", "基本面分析", "情绪与新闻", "风险评估")
+        )
+        return (
+            f"# {self.ticker} 分析报告\n{sections}\n\n"
+            f"目标价位: ¥{self.target_price}\n置信度: 0.7\n风险评分: 0.4\n"
+            f"最终交易建议: **{self.decision}**"
+        )
+
+
+def scripted_model_factory(latency: float = 0.0, ticker: str = "000001", trade_date: str = "2025-06-30"):
+    """返回可替代ChatOpenAI构造函数的工厂，图中所有模型共享调用统计"""
+    stats = {'calls': 0, 'tool_calls': 0}
+
+    def factory(*args, model: str = "scripted-chat", **kwargs):
+        return ScriptedChatModel(model_name=model, latency=latency, ticker=ticker,
+                                 trade_date=trade_date, stats=stats)
+
+    factory.stats = stats
+    return factory
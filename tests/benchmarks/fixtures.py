@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+基准测试数据夹具
+- FixtureStore: 按 数据源/接口/参数 保存和读取录制的响应
+- ReplayClient / ReplayYFinance: 以录制数据替代 Tushare pro_api、akshare 模块和 yfinance
+- block_network: 禁止非本机网络连接，保证基准测试完全离线
+- synthesize_fixtures: 生成确定性的示例夹具（没有真实录制时使用）
+"""
+
+import hashlib
+import json
+import os
+import socket
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# 保留原始解析函数，避免夹具读写被计入被测代码的解析次数
+_json_loads = json.loads
+_json_dumps = json.dumps
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# 通配夹具按调用参数过滤行时使用的列
+FILTER_COLUMNS = {'ts_code': ['ts_code'], 'symbol': ['symbol', '代码', '关键词']}
+
+# 默认基准股票
+CHINA_SYMBOLS = {"000001": ("000001.SZ", "平安银行", "银行"), "600036": ("600036.SH", "招商银行", "银行")}
+US_SYMBOLS = {"AAPL": "Apple Inc.", "MSFT": "Microsoft Corporation"}
+
+
+class FixtureMissingError(LookupError):
+    """回放模式下找不到对应的录制数据"""
+
+
+class OfflineNetworkError(ConnectionError):
+    """基准测试期间尝试访问外部网络"""
+
+
+class FixtureStore:
+    """录制数据存储：<root>/<provider>/<call>/<参数哈希>.json，default.json 作为通配响应"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root) if root else FIXTURES_DIR
+        self.loads = 0
+        self.misses = 0
+
+    @staticmethod
+    def params_key(params: Dict[str, Any]) -> str:
+        raw = _json_dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.md5(raw.encode('utf-8')).hexdigest()[:12]
+
+    def _path(self, provider: str, call: str, key: str) -> Path:
+        return self.root / provider / call / f"{key}.json"
+
+    def load(self, provider: str, call: str, params: Dict[str, Any]):
+        """读取录制数据，精确参数未录制时回退到default.json"""
+        for key in (self.params_key(params), "default"):
+            path = self._path(provider, call, key)
+            if path.exists():
+                self.loads += 1
+                payload = _json_loads(path.read_text(encoding='utf-8'))
+                return self._decode(payload, params)
+        self.misses += 1
+        raise FixtureMissingError(f"没有录制数据: {provider}.{call}({params})")
+
+    def save(self, provider: str, call: str, params: Dict[str, Any], data, default: bool = False) -> Path:
+        path = self._path(provider, call, "default" if default else self.params_key(params))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'provider': provider, 'call': call, 'params': params, **self._encode(data)}
+        path.write_text(_json_dumps(payload, ensure_ascii=False, default=str), encoding='utf-8')
+        return path
+
+    @staticmethod
+    def _encode(data) -> Dict[str, Any]:
+        if isinstance(data, pd.DataFrame):
+            frame = data.reset_index() if data.index.name else data
+            return {'format': 'dataframe', 'index': data.index.name,
+                    'data': _json_loads(frame.to_json(orient='records', date_format='iso', force_ascii=False))}
+        if isinstance(data, (dict, list)):
+            return {'format': 'json', 'data': data}
+        return {'format': 'text', 'data': str(data)}
+
+    @staticmethod
+    def _decode(payload: Dict[str, Any], params: Dict[str, Any]):
+        if payload.get('format') != 'dataframe':
+            return payload.get('data')
+
+        frame = pd.DataFrame(payload['data'])
+        # 通配夹具包含多只股票时按代码过滤
+        for param, columns in FILTER_COLUMNS.items():
+            if param not in params:
+                continue
+            for column in columns:
+                if column in frame.columns:
+                    frame = frame[frame[column] == params[param]].reset_index(drop=True)
+                    break
+        if payload.get('index') and payload['index'] in frame.columns:
+            frame[payload['index']] = pd.to_datetime(frame[payload['index']])
+            frame = frame.set_index(payload['index'])
+        return frame
+
+
+class ReplayClient:
+    """
+    以属性调用方式回放录制数据，可替代 Tushare pro_api 对象或 akshare 模块
+
+    传入recorder(真实客户端)时转为录制模式：调用真实接口并保存响应。
+    """
+
+    def __init__(self, store: FixtureStore, provider: str, recorder=None):
+        self._store = store
+        self._provider = provider
+        self._recorder = recorder
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            params = dict(kwargs)
+            if args:
+                params['args'] = list(args)
+            if self._recorder is not None:
+                data = getattr(self._recorder, name)(*args, **kwargs)
+                self._store.save(self._provider, name, params, data)
+                return data
+            return self._store.load(self._provider, name, params)
+
+        return call
+
+
+class _ReplayTicker:
+    def __init__(self, store: FixtureStore, symbol: str):
+        self._store = store
+        self.ticker = symbol
+
+    def history(self, **kwargs):
+        data = self._store.load("yfinance", "history", {'symbol': self.ticker, **kwargs})
+        return data.drop(columns=['symbol'], errors='ignore')
+
+    @property
+    def info(self):
+        return self._store.load("yfinance", "info", {'symbol': self.ticker})
+
+
+class ReplayYFinance:
+    """yfinance模块的回放替身（Ticker.history / Ticker.info / download）"""
+
+    def __init__(self, store: FixtureStore):
+        self._store = store
+
+    def Ticker(self, symbol: str):
+        return _ReplayTicker(self._store, symbol)
+
+    def download(self, tickers, **kwargs):
+        return self._store.load("yfinance", "history", {'symbol': tickers, **kwargs})
+
+
+@contextmanager
+def block_network(stats: Optional[Dict[str, int]] = None):
+    """禁止连接非本机地址；被拦截的连接计入 stats['network_blocked']"""
+    original_connect = socket.socket.connect
+    original_create_connection = socket.create_connection
+
+    def is_local(address) -> bool:
+        host = address[0] if isinstance(address, tuple) else address
+        return host in ('localhost', '127.0.0.1', '::1') or isinstance(host, str) and host.startswith('/')
+
+    def refuse(address):
+        if stats is not None:
+            stats['network_blocked'] = stats.get('network_blocked', 0) + 1
+        raise OfflineNetworkError(f"基准测试禁止访问网络: {address}")
+
+    def guarded_connect(sock, address):
+        if sock.family == getattr(socket, 'AF_UNIX', None) or is_local(address):
+            return original_connect(sock, address)
+        refuse(address)
+
+    def guarded_create_connection(address, *args, **kwargs):
+        if is_local(address):
+            return original_create_connection(address, *args, **kwargs)
+        refuse(address)
+
+    socket.socket.connect = guarded_connect
+    socket.create_connection = guarded_create_connection
+    try:
+        yield
+    finally:
+        socket.socket.connect = original_connect
+        socket.create_connection = original_create_connection
+
+
+# ---------------------------------------------------------------- 示例夹具生成
+
+def _trading_days(end: datetime, count: int):
+    days = pd.bdate_range(end=end, periods=count)
+    return list(days)
+
+
+def _random_walk(seed: int, count: int, start_price: float) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.015, count)
+    return start_price * np.cumprod(1 + returns)
+
+
+def synthesize_fixtures(store: FixtureStore, days: int = 120, end_date: str = "2025-06-30") -> int:
+    """
+    生成确定性的示例夹具（固定随机种子的价格序列），写入default.json
+
+    真实录制请使用 run_benchmarks --record（需要网络和相应的API密钥）。
+    返回写入的文件数。
+    """
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    dates = _trading_days(end, days)
+    written = 0
+
+    # Tushare: daily / stock_basic / daily_basic
+    daily_rows, basic_rows, daily_basic_rows = [], [], []
+    for seed, (code, (ts_code, name, industry)) in enumerate(CHINA_SYMBOLS.items(), start=1):
+        closes = _random_walk(seed, days, 12.0 + seed * 20)
+        prev = np.concatenate([[closes[0]], closes[:-1]])
+        for i, day in enumerate(dates):
+            close = round(float(closes[i]), 2)
+            pre_close = round(float(prev[i]), 2)
+            daily_rows.append({
+                'ts_code': ts_code, 'trade_date': day.strftime('%Y%m%d'),
+                'open': round(pre_close * 1.001, 2), 'high': round(max(close, pre_close) * 1.01, 2),
+                'low': round(min(close, pre_close) * 0.99, 2), 'close': close, 'pre_close': pre_close,
+                'change': round(close - pre_close, 2), 'pct_chg': round((close / pre_close - 1) * 100, 4),
+                'vol': float(800000 + (i * 7919 + seed * 104729) % 400000), 'amount': round(close * 900000, 2),
+            })
+            daily_basic_rows.append({
+                'ts_code': ts_code, 'trade_date': day.strftime('%Y%m%d'), 'close': close,
+                'turnover_rate': 0.5, 'pe': 5.2 + seed, 'pb': 0.6 + seed / 10, 'total_mv': close * 1.9e6,
+            })
+        basic_rows.append({'ts_code': ts_code, 'symbol': code, 'name': name, 'area': '深圳',
+                           'industry': industry, 'market': '主板', 'list_date': '19910403'})
+
+    store.save("tushare", "daily", {}, pd.DataFrame(daily_rows), default=True)
+    store.save("tushare", "stock_basic", {}, pd.DataFrame(basic_rows), default=True)
+    store.save("tushare", "daily_basic", {}, pd.DataFrame(daily_basic_rows), default=True)
+    written += 3
+
+    # AKShare: stock_zh_a_hist / stock_info_a_code_name / stock_news_em
+    hist_rows, news_rows = [], []
+    for row in daily_rows:
+        hist_rows.append({
+            '代码': row['ts_code'][:6], '日期': f"{row['trade_date'][:4]}-{row['trade_date'][4:6]}-{row['trade_date'][6:]}",
+            '开盘': row['open'], '收盘': row['close'], '最高': row['high'], '最低': row['low'],
+            '成交量': row['vol'], '成交额': row['amount'], '振幅': 2.0, '涨跌幅': row['pct_chg'],
+            '涨跌额': row['change'], '换手率': 0.5,
+        })
+    for code, (_, name, _) in CHINA_SYMBOLS.items():
+        for i in range(10):
+            published = (end - timedelta(hours=6 * i)).strftime('%Y-%m-%d %H:%M:%S')
+            news_rows.append({
+                '关键词': code, '新闻标题': f"{name}发布经营数据 第{i + 1}条",
+                '新闻内容': f"{name}({code})披露最新经营情况，净利润同比增长{5 + i}%，资产质量保持稳定。",
+                '发布时间': published, '文章来源': '示例财经', '新闻链接': f"https://example.com/news/{code}/{i}",
+            })
+    store.save("akshare", "stock_zh_a_hist", {}, pd.DataFrame(hist_rows), default=True)
+    store.save("akshare", "stock_info_a_code_name", {},
+               pd.DataFrame([{'code': code, 'name': name} for code, (_, name, _) in CHINA_SYMBOLS.items()]),
+               default=True)
+    store.save("akshare", "stock_news_em", {}, pd.DataFrame(news_rows), default=True)
+    written += 3
+
+    # yfinance: history / info
+    history_rows = []
+    for seed, (symbol, name) in enumerate(US_SYMBOLS.items(), start=11):
+        closes = _random_walk(seed, days, 150.0 + seed * 10)
+        for i, day in enumerate(dates):
+            close = round(float(closes[i]), 2)
+            history_rows.append({'symbol': symbol, 'Date': day.strftime('%Y-%m-%d'),
+                                 'Open': round(close * 0.995, 2), 'High': round(close * 1.01, 2),
+                                 'Low': round(close * 0.99, 2), 'Close': close,
+                                 'Volume': 50000000 + (i * 7919) % 1000000})
+    history = pd.DataFrame(history_rows).set_index('Date')
+    store.save("yfinance", "history", {}, history, default=True)
+    store.save("yfinance", "info", {}, {'longName': 'Example Corp', 'currency': 'USD', 'sector': 'Technology'},
+               default=True)
+    written += 2
+
+    return written
+
+
+def ensure_fixtures(store: FixtureStore) -> bool:
+    """夹具目录为空时生成示例夹具，返回是否新生成"""
+    if store.root.exists() and any(store.root.rglob("*.json")):
+        return False
+    synthesize_fixtures(store)
+    return True
+
+
+def record_clients(store: FixtureStore) -> Dict[str, Any]:
+    """创建录制模式客户端（调用真实接口并保存响应），需要网络和TUSHARE_TOKEN"""
+    clients = {}
+    try:
+        import tushare as ts
+        ts.set_token(os.getenv('TUSHARE_TOKEN', ''))
+        clients['tushare'] = ReplayClient(store, "tushare", recorder=ts.pro_api())
+    except ImportError:
+        pass
+    try:
+        import akshare as ak
+        clients['akshare'] = ReplayClient(store, "akshare", recorder=ak)
+    except ImportError:
+        pass
+    return clients
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+基准测试执行与度量
+每个阶段在离线环境（录制数据回放 + 禁止外网 + 临时缓存目录）中运行若干次，
+记录总耗时、内存峰值、CSV/JSON解析次数、缓存命中率和按span汇总的耗时，并与基线对比
+"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+import pandas as pd
+
+from tests.benchmarks.fixtures import (
+    CHINA_SYMBOLS,
+    US_SYMBOLS,
+    FixtureStore,
+    ReplayClient,
+    ReplayYFinance,
+    block_network,
+)
+from tradingagents.utils.run_profiler import (
+    CATEGORY_DATA_SOURCE,
+    CATEGORY_LLM,
+    CATEGORY_NODE,
+    CATEGORY_TOOL,
+    profile_run,
+    profile_span,
+)
+
+BASELINE_FILE = Path(__file__).parent / "baselines.json"
+
+# 对比基线时的默认容差
+DEFAULT_TIME_TOLERANCE = 0.25
+MIN_TIME_DELTA = 0.05       # 秒，小于该差值的耗时波动不视为回退
+MIN_MEMORY_DELTA = 1.0      # MB
+
+
+@dataclass
+class BenchmarkContext:
+    """阶段运行参数"""
+    store: FixtureStore
+    trade_date: str = "2025-06-30"
+    lookback_days: int = 60
+    llm_latency: float = 0.0
+    record: bool = False
+    clients: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def start_date(self) -> str:
+        end = datetime.strptime(self.trade_date, "%Y-%m-%d")
+        return (end - timedelta(days=self.lookback_days)).strftime("%Y-%m-%d")
+
+
+@dataclass
+class StageResult:
+    """单个阶段的度量结果"""
+    name: str
+    status: str = "ok"
+    reason: str = ""
+    iterations: int = 0
+    wall_time: float = 0.0
+    peak_memory_mb: float = 0.0
+    parse_counts: Dict[str, int] = field(default_factory=dict)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    tokens: int = 0
+    network_blocked: int = 0
+    fixture_loads: int = 0
+    spans: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def cache_hit_rate(self) -> Optional[float]:
+        total = self.cache_hits + self.cache_misses
+        return round(self.cache_hits / total, 4) if total else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['cache_hit_rate'] = self.cache_hit_rate
+        return data
+
+
+class ParseCounter:
+    """统计期间的 pandas.read_csv/read_json 和 json.load/loads 调用次数"""
+
+    def __init__(self):
+        self.counts = {'csv': 0, 'json': 0}
+        self._stack = ExitStack()
+
+    def __enter__(self):
+        original_read_csv = pd.read_csv
+        original_read_json = pd.read_json
+        original_loads = json.loads
+
+        def counted(kind, func):
+            def wrapper(*args, **kwargs):
+                self.counts[kind] += 1
+                return func(*args, **kwargs)
+            return wrapper
+
+        def counted_load(fp, *args, **kwargs):
+            # json.load内部会调用json.loads，这里直接解析以免重复计数
+            self.counts['json'] += 1
+            return original_loads(fp.read(), *args, **kwargs)
+
+        self._stack.enter_context(mock.patch.object(pd, 'read_csv', counted('csv', original_read_csv)))
+        self._stack.enter_context(mock.patch.object(pd, 'read_json', counted('json', original_read_json)))
+        self._stack.enter_context(mock.patch.object(json, 'loads', counted('json', original_loads)))
+        self._stack.enter_context(mock.patch.object(json, 'load', counted_load))
+        return self
+
+    def __exit__(self, *exc):
+        self._stack.close()
+        return False
+
+
+@contextmanager
+def offline_runtime(context: BenchmarkContext):
+    """
+    离线运行环境：关闭数据库缓存、使用临时文件缓存，
+    并把Tushare/AKShare/yfinance的客户端替换为录制数据回放
+    """
+    from tradingagents.dataflows import akshare_utils, cache_manager, tushare_adapter, tushare_utils
+    from tradingagents.dataflows import data_source_manager
+
+    with ExitStack() as stack, tempfile.TemporaryDirectory(prefix="ta_bench_") as cache_dir:
+        stack.enter_context(mock.patch.dict(os.environ, {
+            'MONGODB_ENABLED': 'false',
+            'REDIS_ENABLED': 'false',
+            'TUSHARE_TOKEN': os.getenv('TUSHARE_TOKEN', 'fixture-replay'),
+            'OPENAI_API_KEY': os.getenv('OPENAI_API_KEY', 'fixture-replay'),
+            'TRADINGAGENTS_RESULTS_DIR': cache_dir,
+        }))
+        stack.enter_context(mock.patch.object(
+            cache_manager, '_cache_instance', cache_manager.StockDataCache(cache_dir)))
+
+        tushare_client = context.clients.get('tushare') or ReplayClient(context.store, "tushare")
+        akshare_client = context.clients.get('akshare') or ReplayClient(context.store, "akshare")
+
+        provider = tushare_utils.TushareProvider(token="fixture-replay")
+        provider.api = tushare_client
+        provider.connected = True
+        stack.enter_context(mock.patch.object(tushare_utils, '_tushare_provider', provider))
+
+        adapter = tushare_adapter.TushareDataAdapter()
+        adapter.provider = provider
+        stack.enter_context(mock.patch.object(tushare_adapter, '_tushare_adapter', adapter))
+
+        def replay_akshare_provider():
+            ak_provider = akshare_utils.AKShareProvider.__new__(akshare_utils.AKShareProvider)
+            ak_provider.ak = akshare_client
+            ak_provider.connected = True
+            return ak_provider
+
+        stack.enter_context(mock.patch.object(akshare_utils, 'get_akshare_provider', replay_akshare_provider))
+        stack.enter_context(mock.patch.object(data_source_manager, '_data_source_manager', None))
+
+        try:
+            from tradingagents.dataflows import optimized_us_data
+        except ImportError:
+            optimized_us_data = None
+        if optimized_us_data is not None:
+            stack.enter_context(mock.patch.object(optimized_us_data, 'yf', ReplayYFinance(context.store)))
+            us_provider = optimized_us_data.OptimizedUSDataProvider()
+            us_provider.min_api_interval = 0  # 回放数据无需限速
+            stack.enter_context(mock.patch.object(optimized_us_data, '_us_data_provider', us_provider))
+
+        yield cache_dir
+
+
+def measure_stage(name: str, func: Callable[[BenchmarkContext], Any], context: BenchmarkContext,
+                  iterations: int = 2) -> StageResult:
+    """在离线环境中运行阶段iterations次并收集度量"""
+    result = StageResult(name=name, iterations=iterations)
+    network_stats: Dict[str, int] = {}
+    loads_before = context.store.loads
+
+    try:
+        with ExitStack() as stack:
+            stack.enter_context(offline_runtime(context))
+            if not context.record:
+                stack.enter_context(block_network(network_stats))
+            parses = stack.enter_context(ParseCounter())
+            profiler = stack.enter_context(profile_run(name, stage=name))
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            try:
+                for i in range(iterations):
+                    with profile_span(f"iteration_{i + 1}", "iteration"):
+                        func(context)
+            finally:
+                result.wall_time = round(time.perf_counter() - started, 4)
+                result.peak_memory_mb = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+                tracemalloc.stop()
+    except ImportError as e:
+        result.status, result.reason = "skipped", f"缺少依赖: {e}"
+        return result
+    except Exception as e:
+        result.status, result.reason = "error", f"{type(e).__name__}: {e}"
+        return result
+
+    result.parse_counts = dict(parses.counts)
+    result.network_blocked = network_stats.get('network_blocked', 0)
+    result.fixture_loads = context.store.loads - loads_before
+
+    for span in profiler.iter_spans():
+        result.cache_hits += span.metrics.get('cache_hits', 0)
+        result.cache_misses += span.metrics.get('cache_misses', 0)
+        result.tokens += span.metrics.get('tokens_in', 0) + span.metrics.get('tokens_out', 0)
+        if span.category in (CATEGORY_NODE, CATEGORY_LLM, CATEGORY_TOOL, CATEGORY_DATA_SOURCE):
+            key = f"{span.category}:{span.name}"
+            result.spans[key] = round(result.spans.get(key, 0.0) + span.duration, 4)
+    return result
+
+
+# ---------------------------------------------------------------- 阶段定义
+
+def stage_tushare(context: BenchmarkContext):
+    from tradingagents.dataflows.data_source_manager import ChinaDataSource, DataSourceManager
+
+    manager = DataSourceManager()
+    manager.available_sources = [ChinaDataSource.TUSHARE]
+    manager.current_source = ChinaDataSource.TUSHARE
+    for symbol in CHINA_SYMBOLS:
+        manager.get_stock_data(symbol, context.start_date, context.trade_date)
+
+
+def stage_akshare(context: BenchmarkContext):
+    from tradingagents.dataflows.data_source_manager import ChinaDataSource, DataSourceManager
+
+    manager = DataSourceManager()
+    manager.available_sources = [ChinaDataSource.AKSHARE]
+    manager.current_source = ChinaDataSource.AKSHARE
+    for symbol in CHINA_SYMBOLS:
+        manager.get_stock_data(symbol, context.start_date, context.trade_date)
+
+
+def stage_yfinance(context: BenchmarkContext):
+    from tradingagents.dataflows.optimized_us_data import get_optimized_us_data_provider
+
+    provider = get_optimized_us_data_provider()
+    for symbol in US_SYMBOLS:
+        provider.get_stock_data(symbol, context.start_date, context.trade_date)
+
+
+def stage_news(context: BenchmarkContext):
+    from tradingagents.dataflows.akshare_utils import get_stock_news_em
+
+    for symbol in CHINA_SYMBOLS:
+        get_stock_news_em(symbol)
+
+
+def stage_graph(context: BenchmarkContext):
+    from tradingagents.default_config import DEFAULT_CONFIG
+    from tradingagents.graph import trading_graph
+    from tests.benchmarks.fake_llm import scripted_model_factory
+
+    symbol = next(iter(CHINA_SYMBOLS))
+    config = DEFAULT_CONFIG.copy()
+    config.update({
+        'llm_provider': 'openai',
+        'memory_enabled': False,
+        'online_tools': False,
+        'profiling_enabled': False,  # 由基准测试自身的剖析记录span
+        'results_dir': os.environ.get('TRADINGAGENTS_RESULTS_DIR', DEFAULT_CONFIG['results_dir']),
+    })
+    factory = scripted_model_factory(context.llm_latency, ticker=symbol, trade_date=context.trade_date)
+    with mock.patch.object(trading_graph, 'ChatOpenAI', factory):
+        graph = trading_graph.TradingAgentsGraph(["market", "fundamentals"], config=config)
+        graph.propagate(symbol, context.trade_date)
+
+
+STAGES: Dict[str, Callable[[BenchmarkContext], Any]] = {
+    'dataflow_tushare': stage_tushare,
+    'dataflow_akshare': stage_akshare,
+    'dataflow_yfinance': stage_yfinance,
+    'news_akshare': stage_news,
+    'graph_full': stage_graph,
+}
+
+
+# ---------------------------------------------------------------- 基线对比
+
+def is_ci_environment() -> bool:
+    """CI环境（CI=true/1）下缺少基线视为失败，避免回退检查静默失效"""
+    return os.getenv("CI", "").strip().lower() in ("1", "true", "yes")
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> Dict[str, Dict[str, Any]]:
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results: List[StageResult], path: Path = BASELINE_FILE):
+    """用成功的阶段结果更新基线（保留未运行阶段的原基线）"""
+    baseline = load_baseline(path)
+    for result in results:
+        if result.status == "ok":
+            baseline[result.name] = result.to_dict()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def compare_with_baseline(result: StageResult, baseline: Optional[Dict[str, Any]],
+                          tolerance: float = DEFAULT_TIME_TOLERANCE) -> List[str]:
+    """
+    返回回退描述列表：耗时/内存超过容差、解析次数增加、缓存命中率下降、出现外网访问。
+    解析次数和命中率是确定性的，不设容差。
+    """
+    if result.status != "ok" or not baseline:
+        return []
+
+    regressions = []
+    base_time = baseline.get('wall_time', 0.0)
+    if result.wall_time > base_time * (1 + tolerance) and result.wall_time - base_time > MIN_TIME_DELTA:
+        regressions.append(f"耗时 {base_time:.3f}s -> {result.wall_time:.3f}s")
+
+    base_memory = baseline.get('peak_memory_mb', 0.0)
+    if (result.peak_memory_mb > base_memory * (1 + tolerance)
+            and result.peak_memory_mb - base_memory > MIN_MEMORY_DELTA):
+        regressions.append(f"内存峰值 {base_memory:.1f}MB -> {result.peak_memory_mb:.1f}MB")
+
+    for kind, count in result.parse_counts.items():
+        base_count = baseline.get('parse_counts', {}).get(kind)
+        if base_count is not None and count > base_count:
+            regressions.append(f"{kind}解析次数 {base_count} -> {count}")
+
+    base_rate = baseline.get('cache_hit_rate')
+    if base_rate is not None and result.cache_hit_rate is not None and result.cache_hit_rate < base_rate - 0.01:
+        regressions.append(f"缓存命中率 {base_rate:.0%} -> {result.cache_hit_rate:.0%}")
+
+    if result.network_blocked > baseline.get('network_blocked', 0):
+        regressions.append(f"外网访问尝试 {baseline.get('network_blocked', 0)} -> {result.network_blocked}")
+
+    return regressions
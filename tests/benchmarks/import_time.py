@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+启动导入耗时基准
+在子进程中以 python -X importtime 导入 cli/main.py 和 web/app.py 的顶层依赖，
+统计总导入耗时、模块数量、最慢模块以及是否提前加载了重量级依赖
+
+运行方式：python -m tests.benchmarks.import_time [--update-baseline] [--ci]
+    --update-baseline  用本次结果更新 tests/benchmarks/baselines.json 中的 startup_* 条目
+    --ci               CI模式：导入成功但缺少基线时视为失败，缺少依赖的目标跳过（设置了CI环境变量时默认开启）
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tests.benchmarks.harness import is_ci_environment
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+BASELINE_FILE = Path(__file__).parent / "baselines.json"
+
+# 启动时不应加载的重量级依赖（应在实际使用时才导入）
+HEAVY_MODULES = (
+    "langchain_openai", "langgraph", "chromadb", "yfinance", "akshare", "tushare", "baostock",
+    "stockstats", "torch", "transformers", "sentence_transformers", "bs4", "praw", "finnhub",
+)
+
+MIN_TIME_DELTA_MS = 50.0
+
+
+@dataclass
+class ImportTimeResult:
+    target: str
+    status: str = "ok"
+    reason: str = ""
+    total_ms: float = 0.0
+    module_count: int = 0
+    heavy_modules: List[str] = field(default_factory=list)
+    slowest: List[List] = field(default_factory=list)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def _web_app_imports() -> str:
+    """提取 web/app.py 的顶层导入语句（不执行页面代码）"""
+    tree = ast.parse((PROJECT_ROOT / "web" / "app.py").read_text(encoding="utf-8"))
+    statements = []
+
+    def collect(nodes):
+        for node in nodes:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                statements.append(ast.unparse(node))
+            elif isinstance(node, ast.Try):
+                collect(node.body)
+
+    collect(tree.body)
+    return "\n".join(statements)
+
+
+def target_code(target: str) -> str:
+    paths = [str(PROJECT_ROOT)]
+    if target == "web":
+        paths.insert(0, str(PROJECT_ROOT / "web"))
+        body = _web_app_imports()
+    elif target == "cli":
+        body = "import cli.main"
+    else:
+        raise ValueError(f"未知目标: {target}")
+    return f"import sys\nsys.path[:0] = {paths!r}\n{body}\n"
+
+
+def parse_importtime(output: str, top: int = 10) -> Dict:
+    """解析 -X importtime 输出：'import time: self | cumulative | package'"""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+
+    top_level = {name.split(".")[0] for name, _, _ in modules}
+    return {
+        'total_ms': round(sum(self_us for _, self_us, _ in modules) / 1000, 1),
+        'module_count': len(modules),
+        'heavy_modules': sorted(module for module in HEAVY_MODULES if module in top_level),
+        'slowest': [[name, round(cumulative / 1000, 1)]
+                    for name, _, cumulative in sorted(modules, key=lambda m: m[2], reverse=True)[:top]],
+    }
+
+
+def measure_import_time(target: str, top: int = 10) -> ImportTimeResult:
+    result = ImportTimeResult(target=target)
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", target_code(target)],
+        cwd=str(PROJECT_ROOT), env=env, capture_output=True, text=True, timeout=300,
+    )
+    if completed.returncode != 0:
+        last_line = (completed.stderr.strip().splitlines() or ["未知错误"])[-1]
+        if last_line.startswith("ModuleNotFoundError"):
+            result.status, result.reason = "skipped", f"缺少依赖: {last_line.split(':', 1)[-1].strip()}"
+        else:
+            result.status, result.reason = "error", last_line
+        return result
+
+    for key, value in parse_importtime(completed.stderr, top).items():
+        setattr(result, key, value)
+    return result
+
+
+def compare_with_baseline(result: ImportTimeResult, baseline: Optional[Dict], tolerance: float = 0.25) -> List[str]:
+    if result.status != "ok" or not baseline:
+        return []
+    regressions = []
+    base_ms = baseline.get('total_ms', 0.0)
+    if result.total_ms > base_ms * (1 + tolerance) and result.total_ms - base_ms > MIN_TIME_DELTA_MS:
+        regressions.append(f"导入耗时 {base_ms:.0f}ms -> {result.total_ms:.0f}ms")
+    new_heavy = sorted(set(result.heavy_modules) - set(baseline.get('heavy_modules', [])))
+    if new_heavy:
+        regressions.append(f"启动时新加载重量级依赖: {', '.join(new_heavy)}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="启动导入耗时基准")
+    parser.add_argument("-t", "--target", action="append", choices=["cli", "web"], help="默认全部")
+    parser.add_argument("--top", type=int, default=10, help="显示最慢的N个模块")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baseline", default=str(BASELINE_FILE))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--ci", action="store_true", default=is_ci_environment(),
+                        help="CI模式：导入成功但缺少基线时视为失败，缺少依赖的目标跳过")
+    args = parser.parse_args(argv)
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+
+    regressions = 0
+    results = []
+    for target in args.target or ["cli", "web"]:
+        result = measure_import_time(target, args.top)
+        results.append(result)
+        print(f"🚀 startup_{target}: {result.status} 耗时 {result.total_ms:.0f}ms, 模块 {result.module_count}")
+        if result.reason:
+            print(f"    ↳ {result.reason}")
+        if result.heavy_modules:
+            print(f"    ↳ 启动时加载的重量级依赖: {', '.join(result.heavy_modules)}")
+        for name, cumulative_ms in result.slowest:
+            print(f"      {name:<50}{cumulative_ms:>10.1f}ms")
+        target_baseline = baseline.get(f"startup_{target}")
+        if result.status == "ok" and not target_baseline and args.ci and not args.update_baseline:
+            regressions += 1
+            print("    ❌ 无基线（CI模式），请运行 --update-baseline 生成并提交 baselines.json")
+        for regression in compare_with_baseline(result, target_baseline, args.tolerance):
+            regressions += 1
+            print(f"    ❌ 回退: {regression}")
+
+    if args.update_baseline:
+        for result in results:
+            if result.status == "ok":
+                baseline[f"startup_{result.target}"] = result.to_dict()
+        baseline_path.write_text(json.dumps(baseline, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"📌 基线已更新: {baseline_path}")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+日志开销基准
+分别以同步写入、队列日志、队列日志+采样三种配置运行同一负载，统计调用线程在 Logger.handle 中花费的时间
+（同步模式包含格式化和控制台/文件写入，队列模式只包含入队），以及队列模式下后台线程写完剩余日志的时间
+
+负载:
+    graph      离线完整 propagate（录制数据回放 + 脚本化假LLM，与 run_benchmarks 的 graph_full 阶段一致）
+    synthetic  模拟数据获取热路径：工具/数据源日志装饰器 + DataSourceManager风格的日志调用
+graph 负载缺少依赖（如langchain）时自动改用 synthetic
+
+运行方式：python -m tests.benchmarks.logging_overhead [--workload graph|synthetic] [--level INFO|DEBUG] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from tradingagents.utils.logging_manager import get_logger, setup_logging
+
+# 与 config/logging.toml 中的默认采样规则一致
+DEFAULT_SAMPLING = {
+    'agents': {'max_level': 'DEBUG', 'max_per_second': 200},
+    'tools': {'max_level': 'DEBUG', 'max_per_second': 100},
+}
+MODES = ("sync", "queue", "queue+sampling")
+
+
+def logging_config(log_dir: str, mode: str, level: str) -> Dict[str, Any]:
+    """生产环境形态的日志配置：控制台 + 轮转文件 + 结构化JSON文件"""
+    file_format = '%(asctime)s | %(name)-20s | %(levelname)-8s | %(module)s:%(funcName)s:%(lineno)d | %(message)s'
+    return {
+        'level': level,
+        'format': {
+            'console': '%(asctime)s | %(name)-20s | %(levelname)-8s | %(message)s',
+            'file': file_format,
+            'structured': 'json',
+        },
+        'handlers': {
+            'console': {'enabled': True, 'colored': False, 'level': level},
+            'file': {'enabled': True, 'level': 'DEBUG', 'max_size': '100MB', 'backup_count': 1, 'directory': log_dir},
+            'structured': {'enabled': True, 'level': level, 'directory': log_dir},
+        },
+        'queue': {'enabled': mode != "sync"},
+        'sampling': DEFAULT_SAMPLING if mode == "queue+sampling" else {},
+        'loggers': {name: {'level': level} for name in ('agents', 'tools', 'dataflows', 'tradingagents')},
+        'docker': {'enabled': False, 'stdout_only': False},
+    }
+
+
+class CallerLoggingTimer:
+    """统计调用线程在 Logger.handle 中的累计耗时和记录数（只统计通过日志器级别检查的记录）"""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.records = 0
+        self._lock = threading.Lock()
+        self._original = None
+
+    def __enter__(self):
+        self._original = original = logging.Logger.handle
+
+        def timed_handle(logger_self, record):
+            started = time.perf_counter()
+            try:
+                return original(logger_self, record)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.seconds += elapsed
+                    self.records += 1
+
+        logging.Logger.handle = timed_handle
+        return self
+
+    def __exit__(self, *exc):
+        logging.Logger.handle = self._original
+        return False
+
+
+def synthetic_workload(iterations: int = 300):
+    """数据获取热路径的日志形态：装饰器日志 + 带extra的f-string日志 + 调试追踪日志"""
+    from tradingagents.utils.tool_logging import log_data_source_call, log_tool_call
+
+    logger = get_logger('agents')
+    frame = pd.DataFrame(np.random.RandomState(7).normal(size=(250, 8)), columns=list("ABCDEFGH"))
+    report = "\n".join(f"2025-06-{day:02d},600036,{40 + day * 0.1:.2f}" for day in range(1, 30))
+
+    @log_tool_call(tool_name="get_stock_market_data_unified", log_args=True)
+    def tool(ticker, data):
+        return report
+
+    @log_data_source_call("tushare")
+    def fetch(symbol):
+        return report
+
+    for i in range(iterations):
+        symbol = f"{600000 + i % 50:06d}"
+        logger.info(f"📊 [数据获取] 开始获取股票数据",
+                    extra={'symbol': symbol, 'data_source': 'tushare', 'event_type': 'data_fetch_start'})
+        logger.debug("🔍 [股票代码追踪] DataSourceManager.get_stock_data 接收到的股票代码: %r (类型: %s)",
+                     symbol, type(symbol).__name__)
+        fetch(symbol)
+        tool(symbol, frame)
+        logger.info(f"✅ [数据获取] 成功获取股票数据",
+                    extra={'symbol': symbol, 'result_length': len(report), 'event_type': 'data_fetch_success'})
+
+
+def graph_workload():
+    """离线完整 propagate"""
+    from tests.benchmarks.fixtures import FixtureStore, ensure_fixtures
+    from tests.benchmarks.harness import BenchmarkContext, offline_runtime, stage_graph
+
+    store = FixtureStore()
+    ensure_fixtures(store)
+    context = BenchmarkContext(store=store)
+    with offline_runtime(context):
+        stage_graph(context)
+
+
+WORKLOADS: Dict[str, Callable[[], Any]] = {'graph': graph_workload, 'synthetic': synthetic_workload}
+
+
+@dataclass
+class OverheadResult:
+    mode: str
+    workload: str
+    level: str
+    wall_ms: float
+    records: int
+    caller_logging_ms: float
+    caller_us_per_record: float
+    drain_ms: float
+
+    @property
+    def caller_share(self) -> float:
+        return self.caller_logging_ms / self.wall_ms if self.wall_ms else 0.0
+
+
+def measure(mode: str, workload: str, level: str) -> OverheadResult:
+    with tempfile.TemporaryDirectory(prefix="ta_log_bench_") as log_dir, \
+            open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        manager = setup_logging(logging_config(log_dir, mode, level))
+        with CallerLoggingTimer() as timer:
+            started = time.perf_counter()
+            WORKLOADS[workload]()
+            wall = time.perf_counter() - started
+
+        drain_started = time.perf_counter()
+        manager.shutdown()  # 队列模式：等待后台线程写完；同步模式：只关闭文件
+        drain = time.perf_counter() - drain_started
+
+    records = max(timer.records, 1)
+    return OverheadResult(mode, workload, level, round(wall * 1000, 2), timer.records,
+                          round(timer.seconds * 1000, 2), round(timer.seconds * 1e6 / records, 2),
+                          round(drain * 1000, 2) if mode != "sync" else 0.0)
+
+
+def run(workload: str, level: str, repeat: int) -> List[OverheadResult]:
+    """每种模式重复repeat次，取调用线程日志耗时最小的一次"""
+    results = []
+    for mode in MODES:
+        runs = [measure(mode, workload, level) for _ in range(repeat)]
+        results.append(min(runs, key=lambda result: result.caller_logging_ms))
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="同步日志与队列日志的调用线程开销对比")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="graph", help="负载，默认离线propagate")
+    parser.add_argument("--level", choices=["INFO", "DEBUG"], default="INFO", help="日志级别")
+    parser.add_argument("--repeat", type=int, default=3, help="每种模式的重复次数")
+    parser.add_argument("--output", default=None, help="结果JSON输出路径")
+    args = parser.parse_args(argv)
+
+    workload = args.workload
+    if workload == "graph":
+        try:
+            measure("sync", "graph", args.level)  # 预热：导入模块、生成夹具
+        except ImportError as e:
+            print(f"⚠️ graph负载缺少依赖({e})，改用synthetic负载")
+            workload = "synthetic"
+    else:
+        measure("sync", workload, args.level)
+
+    results = run(workload, args.level, args.repeat)
+    setup_logging()
+
+    print(f"负载: {workload}  级别: {args.level}")
+    print(f"{'模式':<16}{'总耗时(ms)':>12}{'记录数':>8}{'调用线程日志(ms)':>18}{'占比':>8}{'每条(µs)':>10}{'后台写完(ms)':>14}")
+    sync_ms = results[0].caller_logging_ms
+    for result in results:
+        print(f"{result.mode:<16}{result.wall_ms:>12.1f}{result.records:>8}{result.caller_logging_ms:>18.1f}"
+              f"{result.caller_share:>8.1%}{result.caller_us_per_record:>10.1f}{result.drain_ms:>14.1f}")
+    for result in results[1:]:
+        if sync_ms:
+            print(f"{result.mode}: 调用线程日志开销减少 {1 - result.caller_logging_ms / sync_ms:.0%}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps([asdict(result) for result in results], ensure_ascii=False, indent=2),
+                                     encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+离线基准测试入口
+
+示例：
+    python -m tests.benchmarks.run_benchmarks                      # 运行全部阶段并与基线对比
+    python -m tests.benchmarks.run_benchmarks -s dataflow_tushare  # 只运行指定阶段
+    python -m tests.benchmarks.run_benchmarks --update-baseline    # 更新基线 tests/benchmarks/baselines.json（每阶段5次冷启动取中位数）
+    python -m tests.benchmarks.run_benchmarks --ci                 # CI模式：成功运行但缺少基线的阶段视为失败（缺少依赖的阶段跳过）
+    python -m tests.benchmarks.run_benchmarks --synthesize         # 重新生成示例夹具
+    python -m tests.benchmarks.run_benchmarks --record             # 联网录制Tushare/AKShare真实响应
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from tests.benchmarks.fixtures import FixtureStore, ensure_fixtures, record_clients, synthesize_fixtures
+from tests.benchmarks.harness import (
+    BASELINE_FILE,
+    DEFAULT_TIME_TOLERANCE,
+    STAGES,
+    BenchmarkContext,
+    StageResult,
+    compare_with_baseline,
+    is_ci_environment,
+    load_baseline,
+    measure_stage,
+    save_baseline,
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="TradingAgents 离线基准测试")
+    parser.add_argument("-s", "--stage", action="append", choices=sorted(STAGES),
+                        help="要运行的阶段，可重复指定，默认全部")
+    parser.add_argument("-n", "--iterations", type=int, default=2,
+                        help="每个阶段的运行次数（第二次起可命中缓存），默认2")
+    parser.add_argument("--trade-date", default="2025-06-30", help="分析日期，需在夹具范围内")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="假LLM每次调用的模拟延迟（秒）")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TIME_TOLERANCE,
+                        help="耗时/内存相对基线的容差，默认0.25")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="基线文件路径")
+    parser.add_argument("--update-baseline", action="store_true", help="用本次结果更新基线")
+    parser.add_argument("--baseline-runs", type=int, default=5,
+                        help="更新基线时每个阶段在独立进程中测量的次数，取耗时中位数的一次，默认5")
+    parser.add_argument("--ci", action="store_true", default=is_ci_environment(),
+                        help="CI模式：成功运行但缺少基线的阶段视为失败，缺少依赖的阶段跳过（设置了CI环境变量时默认开启）")
+    parser.add_argument("--fixtures", default=None, help="夹具目录，默认 tests/benchmarks/fixtures")
+    parser.add_argument("--synthesize", action="store_true", help="重新生成示例夹具后再运行")
+    parser.add_argument("--record", action="store_true", help="联网录制真实响应（不拦截网络）")
+    parser.add_argument("--output", default=None, help="结果JSON输出路径")
+    return parser.parse_args(argv)
+
+
+def print_report(results, baseline, tolerance, require_baseline: bool = False) -> int:
+    """打印结果表，返回回退数量（require_baseline 时缺少基线也计入）"""
+    header = f"{'阶段':<20}{'状态':<8}{'耗时(s)':>10}{'内存(MB)':>10}{'CSV':>6}{'JSON':>7}{'命中率':>8}{'tokens':>9}{'拦截':>6}"
+    print(header)
+    print("-" * len(header))
+
+    regression_count = 0
+    for result in results:
+        hit_rate = f"{result.cache_hit_rate:.0%}" if result.cache_hit_rate is not None else "-"
+        print(f"{result.name:<20}{result.status:<8}{result.wall_time:>10.3f}{result.peak_memory_mb:>10.1f}"
+              f"{result.parse_counts.get('csv', 0):>6}{result.parse_counts.get('json', 0):>7}"
+              f"{hit_rate:>8}{result.tokens:>9}{result.network_blocked:>6}")
+        if result.reason:
+            print(f"    ↳ {result.reason}")
+
+        stage_baseline = baseline.get(result.name)
+        if result.status == "ok" and not stage_baseline:
+            if require_baseline:
+                regression_count += 1
+                print("    ❌ 无基线（CI模式），请运行 --update-baseline 生成并提交 baselines.json")
+            else:
+                print("    ↳ 无基线")
+        for regression in compare_with_baseline(result, stage_baseline, tolerance):
+            regression_count += 1
+            print(f"    ❌ 回退: {regression}")
+
+        slowest = sorted(result.spans.items(), key=lambda item: item[1], reverse=True)[:5]
+        for span_name, duration in slowest:
+            print(f"      {span_name:<45}{duration:>8.3f}s")
+    return regression_count
+
+
+def measure_stage_median(name: str, args) -> StageResult:
+    """
+    在独立子进程中重复测量一个阶段，返回耗时居中的一次
+
+    单次测量受机器抖动影响大；同一进程内重复测量又会命中模块级缓存，比CI的冷启动快得多，
+    因此基线按冷启动子进程的中位数记录
+    """
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="ta_baseline_") as tmp:
+        for index in range(args.baseline_runs):
+            output = Path(tmp) / f"run_{index}.json"
+            command = [sys.executable, "-m", "tests.benchmarks.run_benchmarks", "-s", name,
+                       "-n", str(args.iterations), "--trade-date", args.trade_date,
+                       "--llm-latency", str(args.llm_latency), "--output", str(output)]
+            if args.fixtures:
+                command += ["--fixtures", args.fixtures]
+            subprocess.run(command, cwd=project_root, env=dict(os.environ, CI=""),
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if not output.exists():
+                continue
+            data = json.loads(output.read_text(encoding='utf-8'))['results'][0]
+            data.pop('cache_hit_rate', None)
+            runs.append(StageResult(**data))
+    if not runs:
+        return StageResult(name, status="error", reason="子进程测量失败")
+    runs.sort(key=lambda result: result.wall_time)
+    return runs[len(runs) // 2]
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    store = FixtureStore(args.fixtures)
+
+    if args.synthesize:
+        print(f"🧪 生成示例夹具: {synthesize_fixtures(store)}个文件 -> {store.root}")
+    elif ensure_fixtures(store):
+        print(f"🧪 夹具目录为空，已生成示例夹具: {store.root}")
+
+    context = BenchmarkContext(store=store, trade_date=args.trade_date, llm_latency=args.llm_latency,
+                               record=args.record)
+    if args.record:
+        context.clients = record_clients(store)
+        print(f"🎙️ 录制模式: {', '.join(context.clients) or '没有可用的数据源客户端'}")
+
+    stage_names = args.stage or list(STAGES)
+    results = []
+    for name in stage_names:
+        print(f"⏱️ 运行阶段 {name} ...", flush=True)
+        if args.update_baseline and args.baseline_runs > 1 and not args.record:
+            results.append(measure_stage_median(name, args))
+        else:
+            results.append(measure_stage(name, STAGES[name], context, args.iterations))
+
+    baseline_path = Path(args.baseline)
+    regressions = print_report(results, load_baseline(baseline_path), args.tolerance,
+                               require_baseline=args.ci and not args.update_baseline)
+
+    output = Path(args.output) if args.output else (
+        Path(os.getenv("TRADINGAGENTS_RESULTS_DIR", "./results")) / "benchmarks"
+        / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'created_at': datetime.now().isoformat(), 'trade_date': args.trade_date,
+                   'iterations': args.iterations, 'results': [r.to_dict() for r in results]},
+                  f, ensure_ascii=False, indent=2)
+    print(f"\n📄 结果已保存: {output}")
+
+    if args.update_baseline:
+        save_baseline(results, baseline_path)
+        print(f"📌 基线已更新: {baseline_path}")
+        return 0
+
+    if regressions:
+        print(f"\n❌ 发现 {regressions} 项性能回退或缺少基线")
+        return 1
+    print("\n✅ 未发现性能回退")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+最终决策提取准确率基准
+用规则提取器处理黄金语料中的历史最终决策，与保存的LLM提取结果逐字段比对，
+统计快速路径（把握度达到阈值、不调用LLM）的覆盖率和准确率
+
+黄金语料每行一个JSON：{"id", "symbol", "source", "signal", "llm": {action, target_price, confidence, risk_score}}；
+source 标明样本来源：handwritten 手写格式样例，review 评审中发现的误提取样例（期望值为人工标注），
+recorded 真实运行时录制的LLM提取结果。设置 SIGNAL_GOLDEN_RECORD_PATH 后，SignalProcessor 每次调用LLM
+都会把输入和结果以 recorded 样本追加到该文件，可直接并入语料：
+    SIGNAL_GOLDEN_RECORD_PATH=tests/benchmarks/fixtures/signal_decisions/golden.jsonl python main.py
+
+运行方式：python -m tests.benchmarks.signal_extraction [--corpus PATH] [--min-certainty 0.8]
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from tradingagents.graph.decision_extractor import extract_decision
+
+GOLDEN_CORPUS = Path(__file__).parent / "fixtures" / "signal_decisions" / "golden.jsonl"
+DEFAULT_MIN_CERTAINTY = 0.8
+
+PRICE_TOLERANCE = 0.01   # 目标价相对误差
+SCORE_TOLERANCE = 0.05   # 置信度/风险评分绝对误差
+FIELDS = ("action", "target_price", "confidence", "risk_score")
+
+
+def load_corpus(path: Path = GOLDEN_CORPUS) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def field_matches(name: str, extracted, expected) -> bool:
+    if name == "action":
+        return extracted == expected
+    if extracted is None or expected is None:
+        return extracted is None and expected is None
+    if name == "target_price":
+        return abs(extracted - expected) <= PRICE_TOLERANCE * max(abs(expected), 1e-9)
+    return abs(extracted - expected) <= SCORE_TOLERANCE
+
+
+@dataclass
+class ExtractionReport:
+    total: int = 0
+    fast_path: int = 0
+    field_accuracy: Dict[str, float] = field(default_factory=dict)
+    fast_path_accuracy: Dict[str, float] = field(default_factory=dict)
+    mismatches: List[Dict] = field(default_factory=list)
+
+    @property
+    def coverage(self) -> float:
+        return self.fast_path / self.total if self.total else 0.0
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), "coverage": round(self.coverage, 4)}
+
+
+def evaluate(corpus: List[Dict], min_certainty: float = DEFAULT_MIN_CERTAINTY) -> ExtractionReport:
+    """
+    逐条比对规则提取与LLM提取结果
+
+    field_accuracy 统计全部语料；fast_path_accuracy 只统计把握度达到阈值、会跳过LLM的样本，
+    它决定快速路径是否安全；mismatches 只记录快速路径上的不一致
+    """
+    report = ExtractionReport(total=len(corpus))
+    hits = {name: 0 for name in FIELDS}
+    fast_hits = {name: 0 for name in FIELDS}
+
+    for case in corpus:
+        extraction = extract_decision(case["signal"])
+        fast = extraction.certainty >= min_certainty
+        report.fast_path += fast
+        for name in FIELDS:
+            ok = field_matches(name, extraction.decision[name], case["llm"].get(name))
+            hits[name] += ok
+            if fast:
+                fast_hits[name] += ok
+                if not ok:
+                    report.mismatches.append({"id": case.get("id"), "field": name,
+                                              "extracted": extraction.decision[name],
+                                              "llm": case["llm"].get(name)})
+
+    report.field_accuracy = {name: round(hits[name] / report.total, 4) if report.total else 0.0 for name in FIELDS}
+    report.fast_path_accuracy = {
+        name: round(fast_hits[name] / report.fast_path, 4) if report.fast_path else 0.0 for name in FIELDS
+    }
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="最终决策规则提取准确率")
+    parser.add_argument("--corpus", default=str(GOLDEN_CORPUS), help="黄金语料路径(JSONL)")
+    parser.add_argument("--min-certainty", type=float, default=DEFAULT_MIN_CERTAINTY, help="快速路径把握度阈值")
+    parser.add_argument("--output", default=None, help="结果JSON输出路径")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(Path(args.corpus))
+    report = evaluate(corpus, args.min_certainty)
+    sources = Counter(case.get("source", "unknown") for case in corpus)
+    print(f"🎯 语料 {report.total} 条（{', '.join(f'{name} {count}' for name, count in sorted(sources.items()))}），"
+          f"快速路径覆盖 {report.fast_path} 条 ({report.coverage:.0%})")
+    print(f"{'字段':<14}{'全部准确率':>12}{'快速路径准确率':>16}")
+    for name in FIELDS:
+        print(f"{name:<14}{report.field_accuracy[name]:>12.0%}{report.fast_path_accuracy[name]:>16.0%}")
+    for mismatch in report.mismatches:
+        print(f"    ❌ {mismatch['id']} {mismatch['field']}: 规则={mismatch['extracted']} LLM={mismatch['llm']}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+    return 1 if report.mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+离线基准测试工具测试
+验证夹具回放、解析计数、网络拦截和基线对比逻辑
+"""
+
+import json
+import os
+import socket
+import sys
+
+import pandas as pd
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tests.benchmarks.fixtures import (
+    FixtureMissingError,
+    FixtureStore,
+    OfflineNetworkError,
+    ReplayClient,
+    block_network,
+)
+from tests.benchmarks.harness import ParseCounter, StageResult, compare_with_baseline
+
+
+def test_replay_prefers_exact_recording(tmp_path):
+    """精确参数的录制优先于default通配夹具，通配夹具按代码过滤"""
+    store = FixtureStore(str(tmp_path))
+    store.save("tushare", "daily", {}, pd.DataFrame([
+        {'ts_code': '000001.SZ', 'close': 10.0},
+        {'ts_code': '600036.SH', 'close': 40.0},
+    ]), default=True)
+    store.save("tushare", "daily", {'ts_code': '000001.SZ', 'start_date': '20250101'},
+               pd.DataFrame([{'ts_code': '000001.SZ', 'close': 11.0}]))
+
+    client = ReplayClient(store, "tushare")
+    assert client.daily(ts_code='000001.SZ', start_date='20250101')['close'].tolist() == [11.0]
+    assert client.daily(ts_code='600036.SH', start_date='20250101')['close'].tolist() == [40.0]
+    with pytest.raises(FixtureMissingError):
+        client.income(ts_code='000001.SZ')
+
+
+def test_parse_counter_counts_once_per_parse(tmp_path):
+    """json.load不会因内部调用json.loads被重复计数"""
+    path = tmp_path / "data.json"
+    path.write_text('{"a": 1}', encoding='utf-8')
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("a,b\n1,2\n", encoding='utf-8')
+
+    with ParseCounter() as counter:
+        with open(path, encoding='utf-8') as f:
+            json.load(f)
+        json.loads('[1]')
+        pd.read_csv(csv_path)
+
+    assert counter.counts == {'csv': 1, 'json': 2}
+
+
+def test_block_network_refuses_remote_hosts():
+    """离线模式拒绝外部连接并计数"""
+    stats = {}
+    with block_network(stats):
+        with pytest.raises(OfflineNetworkError):
+            socket.create_connection(("203.0.113.1", 80), timeout=0.1)
+    assert stats['network_blocked'] == 1
+
+
+def test_compare_with_baseline_flags_regressions():
+    """耗时超出容差、解析次数增加和命中率下降都会报告为回退"""
+    baseline = StageResult(name="dataflow_tushare", wall_time=1.0, peak_memory_mb=10.0,
+                           parse_counts={'csv': 2, 'json': 5}, cache_hits=2, cache_misses=2).to_dict()
+
+    steady = StageResult(name="dataflow_tushare", wall_time=1.1, peak_memory_mb=10.5,
+                         parse_counts={'csv': 2, 'json': 5}, cache_hits=2, cache_misses=2)
+    assert compare_with_baseline(steady, baseline) == []
+
+    slower = StageResult(name="dataflow_tushare", wall_time=2.0, peak_memory_mb=10.0,
+                         parse_counts={'csv': 4, 'json': 5}, cache_hits=0, cache_misses=4)
+    regressions = compare_with_baseline(slower, baseline)
+    assert len(regressions) == 3
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_replay_prefers_exact_recording(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_parse_counter_counts_once_per_parse(Path(tmp))
+    test_block_network_refuses_remote_hosts()
+    test_compare_with_baseline_flags_regressions()
+    print("✅ 基准测试工具测试通过")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+数据源阻塞调用线程池测试
+验证超时后名额保留到调用真正结束、按数据源限制并发、遗留线程统计、requests会话层默认超时、东方财富新闻改用共享线程池，
+遗留调用不挤占并发获取线程池，以及港股超时抛给调用方
+"""
+
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+import requests
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import fetch_executor
+from tradingagents.dataflows.fetch_executor import FetchTimeoutError, get_fetch_metrics, run_blocking
+
+
+def _metrics(provider):
+    return next(item for item in get_fetch_metrics() if item['provider'] == provider)
+
+
+def test_timeout_counts_leak_until_call_finishes():
+    """超时的调用计入遗留线程，真正结束后释放名额并清零"""
+    release = threading.Event()
+
+    def hang():
+        release.wait(2)
+        return "late"
+
+    with mock.patch.object(fetch_executor, '_limiters', {}):
+        started = time.time()
+        try:
+            run_blocking("slow_source", hang, timeout=0.2)
+            assert False, "应当超时"
+        except FetchTimeoutError:
+            pass
+        assert time.time() - started < 1.0
+        assert _metrics("slow_source")['leaked'] == 1
+        assert _metrics("slow_source")['timeouts'] == 1
+
+        release.set()
+        for _ in range(50):
+            if _metrics("slow_source")['in_flight'] == 0:
+                break
+            time.sleep(0.02)
+        metrics = _metrics("slow_source")
+        assert metrics['leaked'] == 0 and metrics['in_flight'] == 0
+        assert run_blocking("slow_source", lambda: "ok", timeout=1) == "ok"
+
+
+def test_in_flight_cap_per_provider():
+    """单个数据源在途请求达到上限时，新请求等待名额超时；其他数据源不受影响"""
+    release = threading.Event()
+
+    with mock.patch.object(fetch_executor, '_limiters', {}), \
+            mock.patch.object(fetch_executor, 'MAX_INFLIGHT_PER_PROVIDER', 1):
+        holder = threading.Thread(target=lambda: run_blocking("capped", lambda: release.wait(2), timeout=2))
+        holder.start()
+        time.sleep(0.1)
+
+        try:
+            run_blocking("capped", lambda: "second", timeout=0.2)
+            assert False, "应当因名额已满超时"
+        except FetchTimeoutError as e:
+            assert "并发请求已满" in str(e)
+        assert run_blocking("other", lambda: "free", timeout=1) == "free"
+        assert _metrics("capped")['rejected'] == 1
+
+        release.set()
+        holder.join()
+        assert _metrics("capped")['completed'] == 1
+
+
+def test_requests_get_default_timeout_in_pool():
+    """线程池内未指定timeout的requests调用获得会话层超时，池外调用不受影响"""
+    seen = []
+
+    def fake_send(adapter, request, **kwargs):
+        seen.append(kwargs.get('timeout'))
+        raise requests.ConnectionError("offline")
+
+    def call():
+        try:
+            requests.get("http://example.invalid/data")
+        except requests.ConnectionError:
+            pass
+
+    with mock.patch.object(fetch_executor, '_limiters', {}), \
+            mock.patch('requests.adapters.HTTPAdapter.send', fake_send):
+        run_blocking("akshare", call, timeout=5)
+        call()
+
+    assert seen[0] is not None and 1.0 <= seen[0] <= 5.0
+    assert seen[1] is None
+
+
+def test_stock_news_em_uses_shared_pool():
+    """东方财富新闻通过共享线程池获取，不再创建独立线程"""
+    from tradingagents.dataflows import akshare_utils
+
+    news = pd.DataFrame({'标题': [f'新闻{i}' for i in range(15)]})
+    provider = SimpleNamespace(connected=True, ak=SimpleNamespace(stock_news_em=lambda symbol: news))
+
+    # 预热线程池，之后的调用复用空闲工作线程
+    run_blocking("warmup", lambda: None, timeout=1)
+
+    with mock.patch.object(fetch_executor, '_limiters', {}), \
+            mock.patch.object(akshare_utils, 'get_akshare_provider', return_value=provider), \
+            mock.patch('threading.Thread.start', side_effect=AssertionError("不应创建新线程")):
+        result = akshare_utils.get_stock_news_em('600000', max_news=10)
+        metrics = _metrics("akshare")
+
+    assert len(result) == 10
+    assert metrics['completed'] == 1
+
+
+def test_abandoned_calls_do_not_starve_concurrent_fetch():
+    """超时后仍在运行的阻塞调用只占用独立线程池，fetch_concurrently 仍有空闲工作线程"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    release = threading.Event()
+    blocking_pool, fetch_pool = ThreadPoolExecutor(max_workers=1), ThreadPoolExecutor(max_workers=1)
+    with mock.patch.object(fetch_executor, '_limiters', {}), \
+            mock.patch.object(fetch_executor, '_blocking_executor', blocking_pool), \
+            mock.patch.object(fetch_executor, '_executor', fetch_pool):
+        try:
+            run_blocking("hanging", lambda: release.wait(5), timeout=0.1)
+            assert False, "应当超时"
+        except FetchTimeoutError:
+            pass
+        assert _metrics("hanging")['leaked'] == 1
+
+        results, errors = fetch_executor.fetch_concurrently({'income': lambda: "ok"}, timeout=1)
+        assert results == {'income': "ok"} and not errors
+    release.set()
+    blocking_pool.shutdown()
+    fetch_pool.shutdown()
+
+
+def test_hk_timeout_reaches_caller():
+    """港股行情/信息超时抛给调用方，其他异常仍按无数据处理"""
+    from tradingagents.dataflows import akshare_utils
+
+    provider = akshare_utils.AKShareProvider.__new__(akshare_utils.AKShareProvider)
+    provider.ak, provider.connected = SimpleNamespace(stock_hk_hist=None, stock_hk_spot_em=None), True
+
+    def timed_out(provider_name, fetch, *args, timeout=None, **kwargs):
+        raise FetchTimeoutError(f"{provider_name}调用超时（{timeout:.0f}秒）")
+
+    with mock.patch.object(fetch_executor, 'run_blocking', timed_out), \
+            mock.patch.object(akshare_utils, 'get_akshare_provider', return_value=provider):
+        for call in (lambda: provider.get_hk_stock_data('0700.HK', '2025-01-01', '2025-01-31'),
+                     lambda: provider.get_hk_stock_info('0700.HK'),
+                     lambda: akshare_utils.get_hk_stock_data_akshare('0700.HK', '2025-01-01', '2025-01-31'),
+                     lambda: akshare_utils.get_hk_stock_info_akshare('0700.HK')):
+            try:
+                call()
+                assert False, "超时应抛给调用方"
+            except FetchTimeoutError:
+                pass
+
+    def broken(provider_name, fetch, *args, timeout=None, **kwargs):
+        raise KeyError('日期')
+
+    with mock.patch.object(fetch_executor, 'run_blocking', broken):
+        assert provider.get_hk_stock_data('0700.HK', '2025-01-01', '2025-01-31') is None
+        assert provider.get_hk_stock_info('0700.HK')['source'] == 'akshare_error'
+
+
+if __name__ == "__main__":
+    test_timeout_counts_leak_until_call_finishes()
+    test_in_flight_cap_per_provider()
+    test_requests_get_default_timeout_in_pool()
+    test_stock_news_em_uses_shared_pool()
+    test_abandoned_calls_do_not_starve_concurrent_fetch()
+    test_hk_timeout_reaches_caller()
+    print("✅ 数据源线程池测试通过")
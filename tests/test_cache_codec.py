@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+缓存数据编解码测试
+验证缓存帧按dtype完整往返、头部记录结构、数据库缓存读写使用缓存帧且仍能读取旧版JSON缓存
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows.cache_codec import decode_frame, encode_frame, is_encoded_frame, read_frame_header
+from tradingagents.dataflows.db_cache_manager import DatabaseCacheManager
+
+
+def _frame():
+    return pd.DataFrame({
+        "日期": pd.date_range("2020-01-01", periods=4),
+        "收盘": [1.5, np.nan, 3.25, 4.0],
+        "成交量": np.arange(4, dtype="int64"),
+        "停牌": [False, True, False, False],
+        "名称": ["招商银行", None, "平安银行", "五粮液"],
+        "时间": pd.date_range("2020-01-01 09:30", periods=4, freq="h", tz="Asia/Shanghai"),
+        "评级": pd.array([1, None, 3, 4], dtype="Int64"),
+    })
+
+
+def test_columnar_round_trip_keeps_dtypes():
+    """数值、缺失值、时区、可空整数和非默认索引都能完整往返"""
+    df = _frame()
+    for frame in (df, df.set_index("日期"), df.iloc[1:]):
+        payload = encode_frame(frame, "columnar")
+        assert is_encoded_frame(payload)
+        pd.testing.assert_frame_equal(decode_frame(payload), frame)
+
+    header = read_frame_header(encode_frame(df, "columnar"))
+    assert header["codec"] == "columnar" and header["rows"] == 4
+    assert ["收盘", "float64"] in header["schema"] and ["时间", "datetime64[ns, Asia/Shanghai]"] in header["schema"]
+
+    # 不支持的结构退回json
+    multi = pd.DataFrame([[1, 2]], columns=pd.MultiIndex.from_tuples([("a", "x"), ("a", "y")]))
+    assert read_frame_header(encode_frame(multi, "columnar"))["codec"] == "json"
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value.encode('utf-8') if isinstance(value, str) else value
+
+    def get(self, key):
+        return self.store.get(key)
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.docs = {}
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = dict(doc)
+
+    def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+
+def _manager():
+    manager = DatabaseCacheManager.__new__(DatabaseCacheManager)
+    manager.redis_client = manager.redis_binary_client = _FakeRedis()
+    manager.mongodb_db = SimpleNamespace(stock_data=_FakeCollection())
+    return manager
+
+
+def test_db_cache_stores_frames_and_reads_legacy_json():
+    """Redis和MongoDB中保存缓存帧并按dtype读回；旧版JSON缓存仍可读取"""
+    manager = _manager()
+    df = _frame().drop(columns=["时间", "评级"])
+    key = manager.save_stock_data("600036", df, "2020-01-01", "2020-01-04", "akshare")
+
+    assert is_encoded_frame(manager.redis_client.store[key])
+    doc = manager.mongodb_db.stock_data.docs[key]
+    assert doc["data_format"] == "dataframe_frame" and ["成交量", "int64"] in doc["schema"]
+    pd.testing.assert_frame_equal(manager.load_stock_data(key), df)
+
+    # Redis过期后从MongoDB读取并回填Redis
+    manager.redis_client.store.clear()
+    pd.testing.assert_frame_equal(manager.load_stock_data(key), df)
+    assert is_encoded_frame(manager.redis_client.store[key])
+
+    legacy = {"data": df.to_json(orient='records', date_format='iso'), "data_format": "dataframe_json",
+              "symbol": "600036", "data_source": "akshare", "created_at": datetime.utcnow().isoformat()}
+    manager.redis_client.store["legacy"] = json.dumps(legacy, ensure_ascii=False).encode('utf-8')
+    assert manager.load_stock_data("legacy")["收盘"].tolist()[2] == 3.25
+
+    text_key = manager.save_stock_data("AAPL", "文本报告", data_source="finnhub")
+    assert manager.load_stock_data(text_key) == "文本报告"
+
+
+if __name__ == "__main__":
+    test_columnar_round_trip_keeps_dtypes()
+    test_db_cache_stores_frames_and_reads_legacy_json()
+    print("✅ 缓存数据编解码测试通过")
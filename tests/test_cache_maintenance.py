@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+缓存容量维护测试
+验证MongoDB文档写入expires_at并建立TTL索引、文件缓存超出预算时按最近访问时间淘汰、后台压缩任务按弱引用注册
+"""
+
+import gc
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows.cache_maintenance import CacheCompactor, FileCacheBudget
+from tradingagents.dataflows.cache_manager import StockDataCache
+from tradingagents.dataflows.db_cache_manager import DatabaseCacheManager
+
+
+class _FakeCollection:
+    def __init__(self, name):
+        self.name = name
+        self.docs = {}
+        self.indexes = []
+        self.updates = []
+
+    def create_index(self, keys, **kwargs):
+        self.indexes.append((keys, kwargs))
+
+    def update_many(self, query, update):
+        self.updates.append((query, update))
+        return SimpleNamespace(modified_count=0)
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = dict(doc)
+
+
+class _FakeDatabase(dict):
+    def __getattr__(self, name):
+        return self[name]
+
+
+def test_mongodb_documents_expire_through_ttl_index(monkeypatch):
+    """各集合建立expires_at TTL索引并补齐旧文档，新文档按数据类型的保留天数写入过期时间"""
+    monkeypatch.setenv("CACHE_RETENTION_DAYS_NEWS_DATA", "2")
+    manager = DatabaseCacheManager.__new__(DatabaseCacheManager)
+    manager.redis_client = manager.redis_binary_client = None
+    manager.mongodb_db = _FakeDatabase({name: _FakeCollection(name) for name in DatabaseCacheManager.CACHE_COLLECTIONS})
+    manager._create_mongodb_indexes()
+
+    for collection in manager.mongodb_db.values():
+        assert ([("expires_at", 1)], {"expireAfterSeconds": 0, "name": "expires_at_ttl"}) in collection.indexes
+        assert collection.updates[0][0]["expires_at"] == {"$exists": False}
+
+    news_key = manager.save_news_data("AAPL", "新闻", "2024-01-01", "2024-01-02", "finnhub")
+    news_doc = manager.mongodb_db.news_data.docs[news_key]
+    assert news_doc["expires_at"] - news_doc["created_at"] == timedelta(days=2)
+
+    stock_key = manager.save_stock_data("AAPL", pd.DataFrame({"close": [1.0]}), data_source="yfinance")
+    stock_doc = manager.mongodb_db.stock_data.docs[stock_key]
+    assert stock_doc["expires_at"] - stock_doc["created_at"] >= timedelta(days=7)
+
+
+def test_file_cache_evicts_least_recently_used(monkeypatch, tmp_path):
+    """超出条目上限时按最近访问时间淘汰到上限的90%，读取过的旧条目被保留"""
+    monkeypatch.setenv("CACHE_COMPACTION_INTERVAL", "0")
+    cache = StockDataCache(str(tmp_path))
+    cache.file_budget = FileCacheBudget("测试缓存", cache._scan_cache_entries, max_bytes=0, max_entries=3)
+
+    keys = []
+    for i, symbol in enumerate(["AAPL", "MSFT", "TSLA"]):
+        keys.append(cache.save_stock_data(symbol, f"{symbol} 行情", data_source="test"))
+        stamp = (datetime.now() - timedelta(hours=3 - i)).timestamp()
+        for entry in cache._scan_cache_entries():
+            if entry.key == keys[-1]:
+                for path in entry.paths:
+                    os.utime(path, (stamp, stamp))
+
+    assert cache.load_stock_data(keys[0]) == "AAPL 行情"  # 最早写入的条目刚被读取
+    keys.append(cache.save_stock_data("NVDA", "NVDA 行情", data_source="test"))
+
+    remaining = {entry.key for entry in cache._scan_cache_entries()}
+    assert remaining == {keys[0], keys[3]}
+    assert cache.load_stock_data(keys[1]) is None and cache.load_stock_data(keys[2]) is None
+    assert cache.compact() == {'expired': 0, 'evicted': 0}
+
+
+def test_compactor_runs_tasks_by_weak_reference():
+    """压缩器执行已注册任务，缓存对象被回收后任务自动移除"""
+    calls = []
+
+    class _Cache:
+        def compact(self):
+            calls.append(1)
+            return {'evicted': 1}
+
+    compactor = CacheCompactor(interval=0)
+    cache = _Cache()
+    compactor.register("cache", cache.compact)
+    assert compactor.run_once() == {"cache": {'evicted': 1}}
+
+    del cache
+    gc.collect()
+    assert compactor.run_once() == {}
+    assert calls == [1]
+
+
+if __name__ == "__main__":
+    class _MonkeyPatch:
+        def setenv(self, name, value):
+            os.environ[name] = value
+
+    test_mongodb_documents_expire_through_ttl_index(_MonkeyPatch())
+    with tempfile.TemporaryDirectory() as tmp:
+        test_file_cache_evicts_least_recently_used(_MonkeyPatch(), Path(tmp))
+    test_compactor_runs_tasks_by_weak_reference()
+    print("✅ 缓存容量维护测试通过")
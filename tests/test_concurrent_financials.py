@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+财务报表并发获取测试
+验证AKShare/Tushare三大报表并发请求、单个失败或超时时返回部分结果
+"""
+
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import fetch_executor
+from tradingagents.dataflows.fundamentals_store import FundamentalsStore
+from tradingagents.dataflows.akshare_utils import AKShareProvider
+from tradingagents.dataflows.tushare_utils import TushareProvider
+
+CALL_LATENCY = 0.2
+
+
+def _statement(**kwargs):
+    time.sleep(CALL_LATENCY)
+    return pd.DataFrame([{'ts_code': kwargs.get('ts_code', kwargs.get('symbol')), 'value': 1}])
+
+
+def _broken(**kwargs):
+    time.sleep(CALL_LATENCY)
+    raise ConnectionError("connection reset")
+
+
+def test_akshare_statements_fetched_concurrently(tmp_path):
+    """四个接口并发执行，总耗时接近单个接口，失败的报表被跳过"""
+    provider = AKShareProvider.__new__(AKShareProvider)
+    provider.connected = True
+    provider.ak = SimpleNamespace(
+        stock_financial_abstract=_statement,
+        stock_balance_sheet_by_report_em=_statement,
+        stock_profit_sheet_by_report_em=_broken,
+        stock_cash_flow_sheet_by_report_em=_statement,
+    )
+
+    with mock.patch('tradingagents.dataflows.fundamentals_store.get_fundamentals_store',
+                    return_value=FundamentalsStore(str(tmp_path))):
+        started = time.time()
+        data = provider.get_financial_data('000001')
+        elapsed = time.time() - started
+
+    assert set(data) == {'main_indicators', 'balance_sheet', 'cash_flow'}
+    assert elapsed < CALL_LATENCY * 3
+
+
+def test_tushare_statement_timeout_returns_partial_results(tmp_path):
+    """超时的报表返回空列表，其他报表正常返回"""
+    def slow(**kwargs):
+        time.sleep(1.0)
+        return pd.DataFrame([{'ts_code': kwargs['ts_code']}])
+
+    provider = TushareProvider.__new__(TushareProvider)
+    provider.connected = True
+    provider.api = SimpleNamespace(balancesheet=_statement, income=slow, cashflow=_statement)
+
+    with mock.patch.object(fetch_executor, 'DEFAULT_FETCH_TIMEOUT', 0.5), \
+            mock.patch('tradingagents.dataflows.fundamentals_store.get_fundamentals_store',
+                       return_value=FundamentalsStore(str(tmp_path))):
+        started = time.time()
+        data = provider.get_financial_data('600036', period='20241231')
+        elapsed = time.time() - started
+
+    assert data['balance_sheet'] == [{'ts_code': '600036.SH', 'value': 1}]
+    assert data['cash_flow'] == [{'ts_code': '600036.SH', 'value': 1}]
+    assert data['income_statement'] == []
+    assert elapsed < 0.9
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_akshare_statements_fetched_concurrently, test_tushare_statement_timeout_returns_partial_results):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ 财务报表并发获取测试通过")
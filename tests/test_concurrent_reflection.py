@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+并发反思测试
+验证五个组件的反思并发执行、单个组件失败不影响其他组件，以及批量反思按交易日顺序一次写入记忆
+"""
+
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.graph.reflection import REFLECTION_COMPONENTS, Reflector
+
+
+def _state(day: int):
+    return {
+        "market_report": f"market{day}",
+        "sentiment_report": "sentiment",
+        "news_report": "news",
+        "fundamentals_report": "fundamentals",
+        "investment_debate_state": {"bull_history": f"bull{day}", "bear_history": f"bear{day}",
+                                    "judge_decision": f"judge{day}"},
+        "trader_investment_decision": f"trader{day}",
+        "risk_debate_state": {"judge_decision": f"risk{day}"},
+    }
+
+
+class _SlowLLM:
+    """每次调用耗时0.2秒，记录最大并发数；报告中含fail的调用抛出异常"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def invoke(self, messages):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.2)
+            if "fail" in messages[1][1]:
+                raise RuntimeError("llm down")
+            return SimpleNamespace(content="lesson: " + messages[1][1].split("Analysis/Decision: ")[1].split("\n")[0])
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class _Memory:
+    def __init__(self):
+        self.calls = []
+
+    def add_situations(self, situations_and_advice):
+        self.calls.append(list(situations_and_advice))
+
+
+def test_reflect_all_runs_concurrently_with_isolation():
+    """五个组件并发反思；某个组件LLM失败时其余组件仍写入记忆，关闭的记忆跳过"""
+    llm = _SlowLLM()
+    memories = {name: _Memory() for name in REFLECTION_COMPONENTS}
+    memories["risk_manager"] = None
+    state = _state(1)
+    state["investment_debate_state"]["bear_history"] = "fail"
+
+    started = time.time()
+    errors = Reflector(llm, max_workers=5).reflect_all(state, 0.05, memories)
+
+    assert time.time() - started < 0.6
+    assert llm.peak == 4
+    assert set(errors) == {"bear"} and "llm down" in errors["bear"]
+    assert memories["bear"].calls == []
+    assert memories["bull"].calls[0][0][1] == "lesson: bull1"
+    assert memories["trader"].calls[0][0][1] == "lesson: trader1"
+
+
+def test_reflect_batch_bounded_and_ordered():
+    """批量反思受并发上限约束，每个组件的记忆按交易日顺序只写入一次"""
+    llm = _SlowLLM()
+    memories = {name: _Memory() for name in REFLECTION_COMPONENTS}
+    states = [(_state(day), day / 100) for day in range(4)]
+
+    errors = Reflector(llm, max_workers=3).reflect_batch(states, memories)
+
+    assert errors == {}
+    assert llm.peak == 3
+    for name, memory in memories.items():
+        assert len(memory.calls) == 1
+        assert [advice for _, advice in memory.calls[0]] == [
+            "lesson: " + REFLECTION_COMPONENTS[name][1](state) for state, _ in states
+        ]
+
+
+if __name__ == "__main__":
+    test_reflect_all_runs_concurrently_with_isolation()
+    test_reflect_batch_bounded_and_ordered()
+    print("✅ 并发反思测试通过")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+连接池注册表测试
+验证相同连接参数共享连接池、不同参数隔离，以及统计信息
+"""
+
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+redis = pytest.importorskip("redis")
+
+from tradingagents.config.connection_pool import ConnectionPoolRegistry
+
+
+def test_redis_clients_share_pool():
+    """相同参数的Redis客户端共享同一个连接池"""
+    registry = ConnectionPoolRegistry()
+    try:
+        client_a = registry.get_redis_client(host="localhost", port=6379, db=0, decode_responses=True)
+        client_b = registry.get_redis_client(host="localhost", port=6379, db=0, decode_responses=True)
+        client_c = registry.get_redis_client(host="localhost", port=6379, db=1, decode_responses=True)
+
+        assert client_a.connection_pool is client_b.connection_pool
+        assert client_a.connection_pool is not client_c.connection_pool
+
+        stats = registry.get_stats()
+        assert len(stats['redis']) == 2
+        requested = sorted(item['clients_requested'] for item in stats['redis'])
+        assert requested == [1, 2]
+    finally:
+        registry.close_all()
+
+
+def test_redis_url_credentials_masked():
+    """统计信息中不暴露连接密码"""
+    registry = ConnectionPoolRegistry()
+    try:
+        registry.get_redis_client(url="redis://:secret@localhost:6380", db=0)
+        target = registry.get_stats()['redis'][0]['target']
+        assert "secret" not in target
+    finally:
+        registry.close_all()
+
+
+def test_mongodb_client_lazy_and_shared():
+    """MongoDB客户端延迟连接且按参数共享"""
+    pytest.importorskip("pymongo")
+    registry = ConnectionPoolRegistry()
+    try:
+        client_a = registry.get_mongodb_client(host="localhost", port=27017, serverSelectionTimeoutMS=100)
+        client_b = registry.get_mongodb_client(host="localhost", port=27017, serverSelectionTimeoutMS=100)
+        assert client_a is client_b
+
+        stats = registry.get_stats()['mongodb'][0]
+        assert stats['clients_requested'] == 2
+        assert stats['open_connections'] == 0
+    finally:
+        registry.close_all()
+
+
+if __name__ == "__main__":
+    test_redis_clients_share_pool()
+    test_redis_url_credentials_masked()
+    test_mongodb_client_lazy_and_shared()
+    print("✅ 连接池测试通过")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+A股全市场日线库测试
+验证按交易日入库、增量回填、前复权读取以及DataSourceManager优先读取本地库
+"""
+
+import os
+import sys
+from datetime import datetime
+from unittest import mock
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows.eod_store import EODIngestor, EODStore
+
+TRADING_DAYS = ['20250102', '20250103', '20250106']
+
+
+class FakeTushareApi:
+    """按 trade_date 返回全市场数据的Tushare接口替身，记录调用次数"""
+
+    def __init__(self):
+        self.calls = []
+
+    def trade_cal(self, exchange, start_date, end_date):
+        self.calls.append('trade_cal')
+        dates = pd.date_range(start_date, end_date).strftime('%Y%m%d')
+        return pd.DataFrame({'cal_date': dates, 'is_open': [int(d in TRADING_DAYS) for d in dates]})
+
+    def stock_basic(self, **kwargs):
+        self.calls.append('stock_basic')
+        return pd.DataFrame({'ts_code': ['000001.SZ', '600036.SH'], 'name': ['平安银行', '招商银行']})
+
+    def daily(self, trade_date):
+        self.calls.append('daily')
+        day = TRADING_DAYS.index(trade_date)
+        return pd.DataFrame({
+            'ts_code': ['600036.SH', '000001.SZ'],
+            'open': [40.0, 10.0 + day], 'high': [41.0, 11.0 + day], 'low': [39.0, 9.0 + day],
+            'close': [40.5, 10.0 + day], 'pct_chg': [0.1, 1.0], 'vol': [1000.0, 2000.0],
+        })
+
+    def adj_factor(self, trade_date):
+        self.calls.append('adj_factor')
+        # 000001 在第三个交易日除权
+        factor = 2.0 if trade_date == TRADING_DAYS[-1] else 1.0
+        return pd.DataFrame({'ts_code': ['000001.SZ', '600036.SH'], 'adj_factor': [factor, 1.0]})
+
+    def daily_basic(self, trade_date, fields):
+        self.calls.append('daily_basic')
+        return pd.DataFrame({'ts_code': ['000001.SZ', '600036.SH'], 'pe': [5.0, 6.0]})
+
+
+def test_backfill_is_incremental(tmp_path):
+    """每个交易日3次全市场请求，重复回填时跳过已入库日期"""
+    api = FakeTushareApi()
+    store = EODStore(str(tmp_path))
+    ingestor = EODIngestor(api, store, min_interval=0)
+
+    summary = ingestor.backfill('20250101', '20250106')
+    assert summary['ingested'] == 3 and summary['rows'] == 6
+    assert api.calls.count('daily') == 3
+    assert store.ingested_dates() == TRADING_DAYS
+
+    api.calls.clear()
+    summary = ingestor.backfill('20250101', '20250106')
+    assert summary['skipped'] == 3
+    assert 'daily' not in api.calls
+
+
+def test_read_symbol_and_coverage(tmp_path):
+    """按代码读取并前复权，只有区间交易日全部入库时才视为覆盖"""
+    store = EODStore(str(tmp_path))
+    EODIngestor(FakeTushareApi(), store, min_interval=0).backfill('20250101', '20250106')
+
+    data = store.read_symbol('000001', '2025-01-01', '2025-01-06')
+    assert len(data) == 3
+    assert data['close_raw'].tolist() == [10.0, 11.0, 12.0]
+    assert data['close'].tolist() == [5.0, 5.5, 12.0]
+    assert data['pe'].tolist() == [5.0, 5.0, 5.0]
+    assert store.get_stock_name('000001') == '平安银行'
+
+    now = datetime(2025, 1, 7, 20)
+    assert store.covers('2025-01-01', '2025-01-06', now=now)
+    assert not store.covers('2024-12-01', '2025-01-06', now=now)
+
+
+def test_data_source_manager_reads_store_first(tmp_path):
+    """日线库覆盖区间时不调用在线数据源"""
+    from tradingagents.dataflows import data_source_manager as dsm_module
+
+    store = EODStore(str(tmp_path))
+    EODIngestor(FakeTushareApi(), store, min_interval=0).backfill('20250101', '20250106')
+    manager = dsm_module.DataSourceManager()
+
+    with mock.patch('tradingagents.dataflows.eod_store.get_eod_store', return_value=store), \
+            mock.patch.object(manager, '_get_tushare_data') as tushare, \
+            mock.patch.object(manager, '_get_akshare_data') as akshare:
+        result = manager.get_stock_data('000001', '2025-01-02', '2025-01-06')
+
+    assert '平安银行(000001) - 本地日线库数据' in result
+    assert '数据条数: 3条' in result
+    tushare.assert_not_called()
+    akshare.assert_not_called()
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_backfill_is_incremental, test_read_symbol_and_coverage, test_data_source_manager_reads_store_first):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ 日线库测试通过")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Finnhub本地数据日期索引库测试
+验证区间查询与原始逐键过滤一致、下载脚本保存的API原始格式可被读取、来源JSON更新后重新入库，
+以及数据目录只读时回退为直接过滤JSON
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from unittest import mock
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import finnhub_store
+from tradingagents.dataflows.finnhub_store import FinnhubStore, normalize_finnhub_data
+from tradingagents.dataflows.finnhub_utils import get_data_in_range
+
+
+def _write_source(root, data_type, name, data):
+    path = root / "finnhub_data" / data_type / f"{name}_data_formatted.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _formatted():
+    return {
+        "2024-03-01": [{"headline": "苹果发布新品", "summary": "..."}],
+        "2024-03-02": [],
+        "2024-03-04": [{"headline": "a"}, {"headline": "b"}],
+        "2024-03-10": [{"headline": "c"}],
+        "2024-04-01": [{"headline": "d"}],
+    }
+
+
+def test_range_matches_key_filter(tmp_path):
+    """区间查询结果与按键过滤完整JSON一致（空日期不返回），且不再解析整个文件"""
+    data = _formatted()
+    _write_source(tmp_path, "news_data", "AAPL", data)
+    _write_source(tmp_path, "fin_as_reported", "AAPL_annual", {"2023-12-31": [{"year": 2023}]})
+
+    for start, end in (("2024-01-01", "2024-12-31"), ("2024-03-02", "2024-03-04"),
+                       ("2024-03-05", "2024-03-09"), ("2024-03-10", "2024-03-10")):
+        expected = {key: value for key, value in data.items() if start <= key <= end and len(value) > 0}
+        assert get_data_in_range("AAPL", start, end, "news_data", str(tmp_path)) == expected
+
+    assert get_data_in_range("AAPL", "2023-01-01", "2023-12-31", "fin_as_reported", str(tmp_path),
+                             period="annual") == {"2023-12-31": [{"year": 2023}]}
+    assert get_data_in_range("MSFT", "2024-01-01", "2024-12-31", "news_data", str(tmp_path)) == {}
+
+    # 已入库后的查询只读取索引和命中的字节
+    with mock.patch.object(finnhub_store.json, "load", side_effect=AssertionError("不应解析完整文件")):
+        assert list(get_data_in_range("AAPL", "2024-03-04", "2024-03-31", "news_data", str(tmp_path))) == \
+            ["2024-03-04", "2024-03-10"]
+
+
+def test_downloader_raw_formats(tmp_path):
+    """新闻列表按发布时间分日，{"data": [...]} 按年月或申报日期分日"""
+    news = [
+        {"datetime": datetime(2024, 5, 2, 15, tzinfo=timezone.utc).timestamp(), "headline": "x"},
+        {"datetime": datetime(2024, 5, 2, 1, tzinfo=timezone.utc).timestamp(), "headline": "y"},
+        {"datetime": 0, "headline": "无日期"},
+    ]
+    assert {day: len(items) for day, items in normalize_finnhub_data(news, "news_data").items()} == {"2024-05-02": 2}
+
+    senti = {"symbol": "TSLA", "data": [{"year": 2024, "month": 3, "mspr": 1.2},
+                                        {"year": 2024, "month": 4, "mspr": -3}]}
+    _write_source(tmp_path, "insider_senti", "TSLA", senti)
+    assert get_data_in_range("TSLA", "2024-04-01", "2024-04-30", "insider_senti", str(tmp_path)) == \
+        {"2024-04-01": [{"year": 2024, "month": 4, "mspr": -3}]}
+
+    trans = {"symbol": "TSLA", "data": [{"name": "A", "filingDate": "2024-04-03", "change": -100},
+                                        {"name": "B", "filingDate": "2024-04-03", "change": 50}]}
+    _write_source(tmp_path, "insider_trans", "TSLA", trans)
+    result = get_data_in_range("TSLA", "2024-04-01", "2024-04-05", "insider_trans", str(tmp_path))
+    assert [item["name"] for item in result["2024-04-03"]] == ["A", "B"]
+
+
+def test_reimport_when_source_changes(tmp_path):
+    """来源JSON重新下载后自动重新入库，旧数据文件被清理"""
+    path = _write_source(tmp_path, "news_data", "NVDA", _formatted())
+    store = FinnhubStore(str(tmp_path))
+    assert store.get_range("NVDA", "news_data", "2024-04-01", "2024-04-30") == {"2024-04-01": [{"headline": "d"}]}
+
+    updated = dict(_formatted(), **{"2024-04-01": [{"headline": "e"}], "2024-04-15": [{"headline": "f"}]})
+    path.write_text(json.dumps(updated), encoding="utf-8")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+    assert store.get_range("NVDA", "news_data", "2024-04-01", "2024-04-30") == \
+        {"2024-04-01": [{"headline": "e"}], "2024-04-15": [{"headline": "f"}]}
+    assert len(list((tmp_path / "finnhub_data" / ".store" / "news_data").glob("NVDA.*.jsonl"))) == 1
+
+    # 只有索引库时（来源文件已删除）仍可查询
+    path.unlink()
+    assert FinnhubStore(str(tmp_path)).get_range("NVDA", "news_data", "2024-04-15", "2024-04-15") == \
+        {"2024-04-15": [{"headline": "f"}]}
+
+
+def test_read_only_data_dir_falls_back_to_json(tmp_path):
+    """数据目录只读、索引库无法写入时直接过滤格式化JSON，结果与索引库一致"""
+    data = _formatted()
+    _write_source(tmp_path, "news_data", "AMZN", data)
+
+    with mock.patch.object(finnhub_store, "_write_atomic", side_effect=PermissionError("Read-only file system")) as write:
+        for start, end in (("2024-01-01", "2024-12-31"), ("2024-03-02", "2024-03-04")):
+            expected = {key: value for key, value in data.items() if start <= key <= end and len(value) > 0}
+            assert get_data_in_range("AMZN", start, end, "news_data", str(tmp_path)) == expected
+        assert write.call_count == 1
+
+    assert not finnhub_store.get_finnhub_store(str(tmp_path)).writable
+    assert not list((tmp_path / "finnhub_data" / ".store").rglob("*.idx"))
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_range_matches_key_filter, test_downloader_raw_formats, test_reimport_when_source_changes,
+                 test_read_only_data_dir_falls_back_to_json):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Finnhub本地数据日期索引库测试通过")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+按报告期保存的财务报表库测试
+验证披露期推算、探测策略，以及AKShare/Tushare只在出现更新报告期或公告时重新下载
+"""
+
+import os
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows.akshare_utils import AKShareProvider
+from tradingagents.dataflows.fundamentals_store import (
+    FundamentalsStore,
+    expected_latest_period,
+    in_disclosure_window,
+)
+from tradingagents.dataflows.tushare_utils import TushareProvider
+
+STORE_PATCH = 'tradingagents.dataflows.fundamentals_store.get_fundamentals_store'
+
+
+def test_disclosure_calendar():
+    """按法定截止日推算已披露的最新报告期"""
+    assert expected_latest_period(datetime(2025, 3, 15)) == "20240930"
+    assert expected_latest_period(datetime(2025, 5, 1)) == "20250331"
+    assert expected_latest_period(datetime(2025, 9, 1)) == "20250630"
+    assert expected_latest_period(datetime(2025, 11, 20)) == "20250930"
+    assert in_disclosure_window(datetime(2025, 4, 20))
+    assert not in_disclosure_window(datetime(2025, 6, 1))
+
+
+def test_needs_probe_policy(tmp_path):
+    """已有应披露的最新报告期且不在披露窗口内时不探测"""
+    store = FundamentalsStore(str(tmp_path), probe_interval_hours=0)
+    store.put('akshare', '000001', '20250331', {'x': 1})
+    entry = dict(store.get('akshare', '000001'), checked_at='2025-05-01T00:00:00')
+
+    assert not store.needs_probe(entry, now=datetime(2025, 6, 1))
+    assert store.needs_probe(entry, now=datetime(2025, 7, 15))
+    assert store.needs_probe(entry, now=datetime(2025, 9, 5))
+
+
+class FakeAKShare:
+    def __init__(self, latest_period="20250331"):
+        self.latest_period = latest_period
+        self.calls = []
+
+    def stock_financial_abstract(self, symbol):
+        self.calls.append('abstract')
+        return pd.DataFrame({'选项': ['常用指标'], '指标': ['净利润'], self.latest_period: [1.0], '20241231': [2.0]})
+
+    def _sheet(self, name):
+        self.calls.append(name)
+        return pd.DataFrame({'REPORT_DATE': ['2025-03-31'], 'NOTICE_DATE': ['2025-04-20']})
+
+    def stock_balance_sheet_by_report_em(self, symbol):
+        return self._sheet('balance')
+
+    def stock_profit_sheet_by_report_em(self, symbol):
+        return self._sheet('profit')
+
+    def stock_cash_flow_sheet_by_report_em(self, symbol):
+        return self._sheet('cash')
+
+
+def test_akshare_refetches_only_on_new_period(tmp_path):
+    """探测到相同报告期时只请求主要指标，出现新报告期才重新下载三大报表"""
+    fake = FakeAKShare()
+    provider = AKShareProvider.__new__(AKShareProvider)
+    provider.connected = True
+    provider.ak = fake
+    store = FundamentalsStore(str(tmp_path))
+
+    with mock.patch(STORE_PATCH, return_value=store):
+        provider.get_financial_data('000001')
+        assert len(fake.calls) == 4
+        assert store.get('akshare', '000001')['ann_date'] == '20250420'
+
+        fake.calls.clear()
+        provider.get_financial_data('000001')
+        assert fake.calls == []
+
+        store.probe_interval = store.probe_interval * 0
+        with mock.patch('tradingagents.dataflows.fundamentals_store.in_disclosure_window', return_value=True):
+            provider.get_financial_data('000001')
+            assert fake.calls == ['abstract']
+
+            fake.calls.clear()
+            fake.latest_period = "20250630"
+            data = provider.get_financial_data('000001')
+            assert sorted(fake.calls) == ['abstract', 'balance', 'cash', 'profit']
+            assert '20250630' in data['main_indicators'].columns
+    assert store.get('akshare', '000001')['period'] == "20250630"
+
+
+def test_tushare_reuses_period_until_new_announcement(tmp_path):
+    """指定报告期的报表在出现新的公告日期前不再下载"""
+    calls = []
+    ann_date = {'value': '20240330'}
+
+    def statement(name):
+        def fetch(ts_code, period, fields):
+            calls.append(name if 'report_type' in fields else 'probe')
+            return pd.DataFrame([{'ts_code': ts_code, 'ann_date': ann_date['value'], 'end_date': period}])
+        return fetch
+
+    provider = TushareProvider.__new__(TushareProvider)
+    provider.connected = True
+    provider.api = SimpleNamespace(balancesheet=statement('balance'), income=statement('income'),
+                                   cashflow=statement('cash'))
+    store = FundamentalsStore(str(tmp_path), probe_interval_hours=0, final_probe_days=0)
+
+    with mock.patch(STORE_PATCH, return_value=store):
+        provider.get_financial_data('000001', period='20231231')
+        assert sorted(calls) == ['balance', 'cash', 'income']
+
+        calls.clear()
+        provider.get_financial_data('000001', period='20231231')
+        assert calls == ['probe']
+
+        calls.clear()
+        ann_date['value'] = '20240615'
+        data = provider.get_financial_data('000001', period='20231231')
+        assert sorted(calls) == ['balance', 'cash', 'income', 'probe']
+        assert data['income_statement'][0]['ann_date'] == '20240615'
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_disclosure_calendar()
+    for test in (test_needs_probe_policy, test_akshare_refetches_only_on_new_period,
+                 test_tushare_reuses_period_until_new_announcement):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ 财务报表库测试通过")
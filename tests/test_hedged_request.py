@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+对冲请求测试
+验证超过对冲延迟后追加请求、提前失败立即切换、日线字段统一、DataSourceManager对冲模式，
+以及提供器不可用时记录为数据源失败
+"""
+
+import os
+import sys
+import time
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import hedged_request
+from tradingagents.dataflows.data_source_manager import DAILY_BAR_COLUMNS, normalize_daily_bars
+from tradingagents.dataflows.source_health import STATE_HALF_OPEN, SourceHealthRegistry
+
+
+def _frame(close):
+    return pd.DataFrame({'date': ['2025-01-02'], 'close': [close], 'high': [close], 'low': [close], 'volume': [1]})
+
+
+def _is_valid(frame):
+    return frame is not None and not frame.empty
+
+
+def test_slow_primary_is_hedged():
+    """首选数据源超过对冲延迟未返回时，备用数据源先返回则采用备用结果"""
+    registry = SourceHealthRegistry()
+
+    def slow():
+        time.sleep(0.5)
+        return _frame(1.0)
+
+    with mock.patch.object(hedged_request, 'get_source_health_registry', return_value=registry):
+        started = time.time()
+        winner, data = hedged_request.hedged_call(
+            [("akshare", slow), ("tushare", lambda: _frame(2.0))], _is_valid, delay=lambda name: 0.05)
+        elapsed = time.time() - started
+
+    assert winner == "tushare"
+    assert data['close'].tolist() == [2.0]
+    assert elapsed < 0.4
+
+
+def test_fast_failure_launches_next_immediately():
+    """首选数据源提前失败时不等待对冲延迟，无效结果不被采用"""
+    registry = SourceHealthRegistry()
+    calls = []
+
+    def broken():
+        calls.append("akshare")
+        raise ConnectionError("reset")
+
+    with mock.patch.object(hedged_request, 'get_source_health_registry', return_value=registry):
+        started = time.time()
+        winner, data = hedged_request.hedged_call(
+            [("akshare", broken), ("baostock", lambda: pd.DataFrame()), ("tushare", lambda: _frame(3.0))],
+            _is_valid, delay=lambda name: 5.0)
+
+    assert winner == "tushare"
+    assert time.time() - started < 1.0
+    assert {item['source']: item['calls'] for item in registry.snapshot()} == {'akshare': 1, 'baostock': 1, 'tushare': 1}
+
+
+class _QueuedExecutor:
+    """只排队不执行的线程池，由测试逐个执行排队的任务"""
+
+    def __init__(self):
+        self.queue = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.queue.append((future, fn, args))
+        return future
+
+    def run_next(self):
+        future, fn, args = self.queue.pop(0)
+        if future.set_running_or_notify_cancel():
+            future.set_result(fn(*args))
+
+
+def test_cancelled_half_open_probe_is_released():
+    """排队中的半开探测请求被取消后归还探测名额，数据源不会一直停留在半开状态"""
+    registry = SourceHealthRegistry(failure_threshold=1, cooldown=0.05)
+    registry.record("akshare", False, 1.0, error="timeout")
+    time.sleep(0.06)
+
+    # 线程池已满，两个请求都在排队；tushare先执行并胜出，akshare探测在执行前被取消
+    executor = _QueuedExecutor()
+    threading.Timer(0.2, executor.run_next).start()
+    probe_calls = []
+
+    with mock.patch.object(hedged_request, 'get_source_health_registry', return_value=registry), \
+            mock.patch.object(hedged_request, 'get_hedge_executor', return_value=executor):
+        winner, _ = hedged_request.hedged_call(
+            [("tushare", lambda: _frame(1.0)), ("akshare", lambda: probe_calls.append(1) or _frame(2.0))],
+            _is_valid, delay=lambda name: 0.05)
+
+    assert winner == "tushare" and probe_calls == []
+    snapshot = {item['source']: item for item in registry.snapshot()}["akshare"]
+    assert snapshot['state'] == STATE_HALF_OPEN and snapshot['calls'] == 1
+    assert registry.allow("akshare")  # 探测名额已归还
+
+
+def test_normalize_daily_bars_unifies_columns():
+    """AKShare中文列与Yahoo Finance列统一为相同字段"""
+    akshare = pd.DataFrame({'日期': ['2025-01-03', '2025-01-02'], '开盘': [1, 2], '收盘': [3, 4],
+                            '最高': [5, 6], '最低': [0, 1], '成交量': [100, 200], '涨跌幅': [1.0, -1.0]})
+    yfinance = pd.DataFrame({'Open': [2], 'High': [6], 'Low': [1], 'Close': [4], 'Volume': [200]},
+                            index=pd.Index(pd.to_datetime(['2025-01-02']), name='Date'))
+
+    first, second = normalize_daily_bars(akshare), normalize_daily_bars(yfinance)
+    assert list(first.columns) == list(second.columns) == DAILY_BAR_COLUMNS
+    assert first['close'].tolist() == [4, 3]
+    assert first.iloc[0][['open', 'high', 'low', 'close', 'volume']].tolist() == \
+        second.iloc[0][['open', 'high', 'low', 'close', 'volume']].tolist()
+
+
+def test_manager_hedged_mode_formats_winner():
+    """对冲模式下DataSourceManager采用获胜数据源的统一字段数据"""
+    from tradingagents.dataflows import data_source_manager as dsm_module
+
+    manager = dsm_module.DataSourceManager()
+    manager.current_source = dsm_module.ChinaDataSource.AKSHARE
+    manager.available_sources = [dsm_module.ChinaDataSource.AKSHARE, dsm_module.ChinaDataSource.TUSHARE]
+
+    def fetch(source, symbol, start_date, end_date):
+        if source == dsm_module.ChinaDataSource.AKSHARE:
+            time.sleep(0.5)
+        return normalize_daily_bars(_frame(10.0))
+
+    registry = SourceHealthRegistry()
+    with mock.patch.object(hedged_request, 'get_source_health_registry', return_value=registry), \
+            mock.patch('tradingagents.dataflows.source_health.get_source_health_registry', return_value=registry), \
+            mock.patch.object(hedged_request, 'hedge_delay_for', return_value=0.05), \
+            mock.patch.dict('tradingagents.default_config.DEFAULT_CONFIG', {'hedged_requests': True, 'hedge_delay': 0.05}), \
+            mock.patch('tradingagents.dataflows.cache_manager.get_cache', side_effect=RuntimeError("no cache")), \
+            mock.patch.object(manager, '_get_eod_store_data', return_value=None), \
+            mock.patch.object(manager, '_fetch_daily_frame', side_effect=fetch):
+        result = manager.get_stock_data('000001', '2025-01-01', '2025-01-31')
+
+    assert "tushare数据" in result
+    assert "¥10.00" in result
+
+
+def test_dead_provider_counts_as_hedge_failure():
+    """提供器网络中断时对冲请求记录数据源失败并采用备用数据源，而不是把空结果记为健康"""
+    import requests
+    from tradingagents.dataflows import data_source_manager as dsm_module
+    from tradingagents.dataflows.akshare_utils import AKShareProvider
+
+    def connection_reset(**kwargs):
+        raise requests.exceptions.ConnectionError("Connection aborted")
+
+    akshare = AKShareProvider.__new__(AKShareProvider)
+    akshare.ak, akshare.connected = SimpleNamespace(stock_zh_a_hist=connection_reset), True
+    tushare = SimpleNamespace(get_stock_data=lambda symbol, start_date, end_date: _frame(10.0))
+
+    manager = dsm_module.DataSourceManager()
+    manager.current_source = dsm_module.ChinaDataSource.AKSHARE
+    manager.available_sources = [dsm_module.ChinaDataSource.AKSHARE, dsm_module.ChinaDataSource.TUSHARE]
+
+    registry = SourceHealthRegistry()
+    with mock.patch.object(hedged_request, 'get_source_health_registry', return_value=registry), \
+            mock.patch('tradingagents.dataflows.source_health.get_source_health_registry', return_value=registry), \
+            mock.patch.object(hedged_request, 'hedge_delay_for', return_value=5.0), \
+            mock.patch.dict('tradingagents.default_config.DEFAULT_CONFIG', {'hedged_requests': True, 'hedge_delay': 5.0}), \
+            mock.patch('tradingagents.dataflows.cache_manager.get_cache', side_effect=RuntimeError("no cache")), \
+            mock.patch('tradingagents.dataflows.akshare_utils.get_akshare_provider', return_value=akshare), \
+            mock.patch('tradingagents.dataflows.tushare_adapter.get_tushare_adapter', return_value=tushare), \
+            mock.patch.object(manager, '_get_eod_store_data', return_value=None):
+        result = manager.get_stock_data('000001', '2025-01-01', '2025-01-31')
+
+    assert "tushare数据" in result
+    health = {item['source']: item for item in registry.snapshot()}
+    assert health["akshare"]['success_rate'] == 0.0 and "Connection aborted" in health["akshare"]['last_error']
+    assert health["tushare"]['success_rate'] == 1.0
+
+
+if __name__ == "__main__":
+    test_slow_primary_is_hedged()
+    test_fast_failure_launches_next_immediately()
+    test_cancelled_half_open_probe_is_released()
+    test_normalize_daily_bars_unifies_columns()
+    test_manager_hedged_mode_formats_winner()
+    test_dead_provider_counts_as_hedge_failure()
+    print("✅ 对冲请求测试通过")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+共享HTTP会话池测试
+验证长连接复用、gzip解压、响应体大小上限、默认超时、按主机延迟统计，以及新闻源改用共享会话
+"""
+
+import gzip
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import http_session
+from tradingagents.dataflows.http_session import (
+    PooledSession,
+    ResponseTooLargeError,
+    get_http_metrics,
+    host_latency_percentile,
+    reset_http_metrics,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        _Handler.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/big'):
+            body = b'x' * 4096
+            self.send_response(200)
+        elif self.path.startswith('/error'):
+            body = b'down'
+            self.send_response(500)
+        else:
+            body = gzip.compress(json.dumps({'path': self.path}).encode())
+            self.send_response(200)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_keep_alive_gzip_and_metrics():
+    """同一主机的请求复用一个连接，gzip响应自动解压，并按主机记录延迟"""
+    server, base_url = _start_server()
+    _Handler.connections = 0
+    reset_http_metrics()
+    try:
+        with mock.patch.object(http_session, 'HTTP_MAX_RETRIES', 0):
+            session = PooledSession()
+        for i in range(5):
+            assert session.get(f"{base_url}/news/{i}").json() == {'path': f'/news/{i}'}
+        assert _Handler.connections == 1
+
+        assert session.get(f"{base_url}/error").status_code == 500
+        metrics = next(item for item in get_http_metrics() if item['host'] == '127.0.0.1')
+        assert metrics['requests'] == 6 and metrics['errors'] == 1
+        assert metrics['p95_ms'] is not None
+        assert host_latency_percentile('127.0.0.1', 50) is not None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_response_size_limit():
+    """超过大小上限的响应体中止读取并计入错误；显式放宽上限后正常返回"""
+    server, base_url = _start_server()
+    reset_http_metrics()
+    try:
+        session = PooledSession()
+        try:
+            session.get(f"{base_url}/big", max_bytes=1024)
+            assert False, "应当超过大小上限"
+        except ResponseTooLargeError as e:
+            assert isinstance(e, requests.exceptions.RequestException)
+        assert len(session.get(f"{base_url}/big", max_bytes=8192).content) == 4096
+        metrics = get_http_metrics()[0]
+        assert metrics['requests'] == 2 and metrics['errors'] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_default_timeout_applied():
+    """未指定timeout的请求使用默认连接/读取超时，显式timeout保持不变"""
+    seen = []
+
+    def fake_send(adapter, request, **kwargs):
+        seen.append(kwargs.get('timeout'))
+        raise requests.ConnectionError("offline")
+
+    session = PooledSession()
+    with mock.patch('requests.adapters.HTTPAdapter.send', fake_send):
+        for timeout in (None, (10, 30)):
+            try:
+                session.get("http://example.invalid/data", timeout=timeout)
+            except requests.ConnectionError:
+                pass
+    assert seen == [http_session.DEFAULT_TIMEOUT, (10, 30)]
+
+
+def test_realtime_news_uses_shared_session():
+    """FinnHub新闻通过共享会话获取"""
+    from tradingagents.dataflows import realtime_news_utils
+
+    response = mock.Mock()
+    response.json.return_value = []
+    with mock.patch.dict(os.environ, {'FINNHUB_API_KEY': 'test'}), \
+            mock.patch.object(realtime_news_utils, 'http_get', return_value=response) as get:
+        aggregator = realtime_news_utils.RealtimeNewsAggregator()
+        assert aggregator._get_finnhub_realtime_news('AAPL', 6) == []
+    assert get.call_args[0][0] == "https://finnhub.io/api/v1/company-news"
+
+
+if __name__ == "__main__":
+    test_keep_alive_gzip_and_metrics()
+    test_response_size_limit()
+    test_default_timeout_applied()
+    test_realtime_news_uses_shared_session()
+    print("✅ 共享HTTP会话池测试通过")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+按需导入测试
+验证导入 dataflows/agents/graph 包时不会提前加载数据源接口和记忆模块，
+以及启动耗时基准对 -X importtime 输出的解析
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tests.benchmarks.import_time import ImportTimeResult, compare_with_baseline, parse_importtime
+
+
+def _loaded_modules(code: str) -> set:
+    script = f"import sys, json\n{code}\nprint(json.dumps(sorted(sys.modules)))"
+    completed = subprocess.run([sys.executable, "-c", script], cwd=project_root,
+                               capture_output=True, text=True, check=True)
+    return set(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+
+def test_package_import_does_not_load_submodules():
+    """导入包本身不加载 interface、memory、trading_graph 等重量级子模块"""
+    modules = _loaded_modules("import tradingagents.dataflows, tradingagents.agents, tradingagents.graph")
+    assert "tradingagents.dataflows.interface" not in modules
+    assert "tradingagents.agents.utils.memory" not in modules
+    assert "tradingagents.graph.trading_graph" not in modules
+    assert "chromadb" not in modules
+
+
+def test_lazy_attributes_resolve_on_access():
+    """首次访问属性时才导入对应子模块，dir()包含按需属性"""
+    import tradingagents.dataflows as dataflows
+    import tradingagents.graph as graph
+
+    assert "get_china_stock_data_unified" in dir(dataflows)
+    assert "TradingAgentsGraph" in dir(graph)
+    assert isinstance(dataflows.YFINANCE_AVAILABLE, bool)
+    try:
+        dataflows.not_a_real_attribute
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("未知属性应抛出AttributeError")
+
+
+def test_parse_importtime_and_baseline():
+    """解析 importtime 输出，耗时超出容差或新增重量级依赖视为回退"""
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:      2000 |       2000 |   json",
+        "import time:     90000 |     120000 | yfinance",
+        "import time:     30000 |     150000 | cli.main",
+    ])
+    parsed = parse_importtime(output, top=2)
+    assert parsed['total_ms'] == 122.0
+    assert parsed['module_count'] == 3
+    assert parsed['heavy_modules'] == ['yfinance']
+    assert [name for name, _ in parsed['slowest']] == ['cli.main', 'yfinance']
+
+    result = ImportTimeResult(target="cli", **parsed)
+    assert compare_with_baseline(result, result.to_dict()) == []
+    regressions = compare_with_baseline(result, {'total_ms': 30.0, 'heavy_modules': []})
+    assert len(regressions) == 2
+
+
+if __name__ == "__main__":
+    test_package_import_does_not_load_submodules()
+    test_lazy_attributes_resolve_on_access()
+    test_parse_importtime_and_baseline()
+    print("✅ 按需导入测试通过")
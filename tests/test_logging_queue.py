@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+队列日志测试
+验证日志经后台线程写入文件、延迟参数只在输出时计算、可变参数在入队时合并，以及按日志器采样/限流
+"""
+
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.utils.logging_manager import ColoredFormatter, LazyMessage, LogSampler, setup_logging
+
+
+def _config(log_dir, sampling=None):
+    return {
+        'level': 'INFO',
+        'format': {'console': '%(message)s', 'file': '%(name)s | %(levelname)s | %(message)s'},
+        'handlers': {
+            'console': {'enabled': False},
+            'file': {'enabled': True, 'level': 'DEBUG', 'max_size': '1MB', 'backup_count': 1, 'directory': str(log_dir)},
+            'structured': {'enabled': False},
+        },
+        'queue': {'enabled': True},
+        'sampling': sampling or {},
+        'loggers': {'queue_test': {'level': 'INFO'}},
+        'docker': {'enabled': False, 'stdout_only': False},
+    }
+
+
+def test_queue_handler_writes_in_background(tmp_path):
+    """记录经后台线程写入文件；未输出的延迟参数不计算；可变参数按入队时的内容输出"""
+    manager = setup_logging(_config(tmp_path))
+    try:
+        assert manager.listener is not None
+        logger = logging.getLogger('queue_test')
+        calls = []
+
+        def build():
+            calls.append(1)
+            return "延迟内容"
+
+        logger.debug("不输出 %s", LazyMessage(build))
+        logger.info("输出 %s", LazyMessage(build))
+        holdings = ["600036"]
+        logger.info("持仓 %s", holdings)
+        holdings.append("000001")
+        logger.error("失败 %d", 3)
+        manager.shutdown()
+    finally:
+        setup_logging()
+
+    lines = (Path(tmp_path) / 'tradingagents.log').read_text(encoding='utf-8').splitlines()
+    assert lines == ["queue_test | INFO | 输出 延迟内容", "queue_test | INFO | 持仓 ['600036']",
+                     "queue_test | ERROR | 失败 3"]
+    assert calls == [1]
+
+
+def _record(name, level, msg="消息"):
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+def test_sampler_limits_debug_heavy_loggers():
+    """前缀匹配的日志器按比例采样/限流，WARNING总是保留，被丢弃的条数附加到下一条记录"""
+    sampler = LogSampler({
+        'agents': {'max_level': 'DEBUG', 'sample_rate': 0.5},
+        'tools.cache': {'max_level': 'INFO', 'max_per_second': 1000, 'burst': 2},
+    })
+    kept = [sampler.filter(_record('agents', logging.DEBUG)) for _ in range(10)]
+    assert kept.count(True) == 5
+    assert sampler.filter(_record('agents.sub', logging.INFO))   # 高于max_level不采样
+    assert sampler.filter(_record('other', logging.DEBUG))        # 无规则不采样
+
+    burst = [sampler.filter(_record('tools.cache.redis', logging.INFO)) for _ in range(5)]
+    assert burst[:2] == [True, True] and burst.count(True) <= 3
+    assert sampler.filter(_record('tools.cache', logging.WARNING))
+
+    record = _record('agents', logging.DEBUG)
+    sampler.filter(_record('agents', logging.DEBUG))
+    assert sampler.filter(record) and record.msg.endswith("[采样省略 1 条]")
+
+
+def test_colored_formatter_keeps_record_intact():
+    """彩色格式化不修改原记录，后续文件处理器看到的仍是原始级别名"""
+    record = _record('agents', logging.WARNING, "警告")
+    output = ColoredFormatter('%(levelname)s %(message)s').format(record)
+    assert '\033[33m' in output and record.levelname == 'WARNING'
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        test_queue_handler_writes_in_background(Path(tmp))
+    test_sampler_limits_debug_heavy_loggers()
+    test_colored_formatter_keeps_record_intact()
+    print("✅ 队列日志测试通过")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+交易日历缓存TTL测试
+验证沪深/港股/美股交易时段与休市日、休市日表过期时的警告、已收盘K线视为不可变、盘中按间隔刷新，以及StockDataCache按交易日历判断缓存有效性
+"""
+
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows.market_calendar import (
+    bar_cache_expiry,
+    exchange_for_symbol,
+    get_exchange_calendar,
+)
+
+SHANGHAI = ZoneInfo("Asia/Shanghai")
+NEW_YORK = ZoneInfo("America/New_York")
+CONFIG = {'calendar_cache_ttl': True, 'intraday_refresh_minutes': 15,
+          'bar_settle_minutes': 30, 'immutable_bar_cache_hours': 168}
+
+
+def _cn_calendar():
+    calendar = get_exchange_calendar("SSE")
+    # 不读取本地日线库中的交易日历，只使用内置休市日
+    return mock.patch.object(calendar, 'trading_days_provider', None)
+
+
+def test_exchange_sessions_and_holidays():
+    """各交易所交易时段、午休、节假日与半日市"""
+    assert exchange_for_symbol('600036') == "SSE"
+    assert exchange_for_symbol('000001') == "SZSE"
+    assert exchange_for_symbol('0700.HK') == "HKEX"
+    assert exchange_for_symbol('AAPL') == "NYSE"
+
+    with _cn_calendar():
+        sse = get_exchange_calendar("SSE")
+        assert sse.is_open(datetime(2025, 6, 3, 10, 0, tzinfo=SHANGHAI))
+        assert not sse.is_open(datetime(2025, 6, 3, 12, 0, tzinfo=SHANGHAI))
+        assert not sse.is_trading_day(date(2025, 10, 8))
+        assert not sse.is_trading_day(date(2025, 6, 7))
+
+    hkex = get_exchange_calendar("HKEX")
+    assert len(hkex.sessions_for(date(2025, 12, 24))) == 1
+    assert hkex.sessions_for(date(2025, 12, 25)) == []
+
+    nyse = get_exchange_calendar("NYSE")
+    # 美股按纽约时间判断：北京时间22:30为纽约开盘时段
+    assert nyse.is_open(datetime(2025, 6, 3, 22, 30, tzinfo=SHANGHAI))
+    assert nyse.sessions_for(date(2025, 11, 28))[-1][1].hour == 13
+
+
+def test_dates_past_holiday_table_warn_once():
+    """休市日表之后的年份按工作日判断，并对每个交易所每年只警告一次"""
+    from tradingagents.dataflows import market_calendar
+
+    nyse = get_exchange_calendar("NYSE")
+    year = nyse.holidays_through + 1
+    with mock.patch.object(nyse, '_warned_years', set()), \
+            mock.patch.object(market_calendar.logger, 'warning') as warning:
+        assert nyse.is_trading_day(date(year, 1, 1)) == (date(year, 1, 1).weekday() < 5)
+        nyse.is_trading_day(date(year, 7, 6))
+        nyse.is_trading_day(date(nyse.holidays_through, 7, 6))
+    assert warning.call_count == 1
+    assert f"{nyse.holidays_through}年" in warning.call_args[0][0] and "NYSE" in warning.call_args[0][0]
+
+
+def test_bar_expiry_policy():
+    """收盘后的K线不可变；盘中按刷新间隔；非交易时段到下一次开盘失效"""
+    with _cn_calendar():
+        sse = get_exchange_calendar("SSE")
+        refresh = timedelta(minutes=15)
+
+        # 截止日期已收盘
+        assert sse.bar_expiry(datetime(2025, 6, 3, 16, 0, tzinfo=SHANGHAI), date(2025, 6, 3)) is None
+        # 国庆长假期间截止到今天的请求不会再有新数据
+        assert sse.bar_expiry(datetime(2025, 10, 4, 10, 0, tzinfo=SHANGHAI), date(2025, 10, 4)) is None
+        # 盘中按刷新间隔
+        assert sse.bar_expiry(datetime(2025, 6, 3, 10, 0, tzinfo=SHANGHAI), None, refresh) == \
+            datetime(2025, 6, 3, 10, 15, tzinfo=SHANGHAI)
+        # 午休期间到下午开盘失效
+        assert sse.bar_expiry(datetime(2025, 6, 3, 12, 0, tzinfo=SHANGHAI)) == \
+            datetime(2025, 6, 3, 13, 0, tzinfo=SHANGHAI)
+        # 收盘后等待数据落定
+        assert sse.bar_expiry(datetime(2025, 6, 3, 15, 10, tzinfo=SHANGHAI)) == \
+            datetime(2025, 6, 3, 15, 30, tzinfo=SHANGHAI)
+        # 周五收盘后到下周一开盘失效
+        assert sse.bar_expiry(datetime(2025, 6, 6, 20, 0, tzinfo=SHANGHAI)) == \
+            datetime(2025, 6, 9, 9, 30, tzinfo=SHANGHAI)
+
+    nyse = get_exchange_calendar("NYSE")
+    # 感恩节休市，下一次开盘为11月28日（半日市）
+    assert nyse.bar_expiry(datetime(2025, 11, 26, 20, 0, tzinfo=NEW_YORK)) == \
+        datetime(2025, 11, 28, 9, 30, tzinfo=NEW_YORK)
+
+
+def test_immutable_bars_capped_and_disable_flag():
+    """不可变K线仍受上限约束；关闭交易日历后回退到固定TTL"""
+    cached_at = datetime(2025, 6, 3, 16, 0, tzinfo=SHANGHAI)
+    with _cn_calendar(), mock.patch.dict('tradingagents.default_config.DEFAULT_CONFIG', CONFIG):
+        assert bar_cache_expiry('600036', cached_at, '2025-06-03') == cached_at + timedelta(hours=168)
+    with mock.patch.dict('tradingagents.default_config.DEFAULT_CONFIG', dict(CONFIG, calendar_cache_ttl=False)):
+        assert bar_cache_expiry('600036', cached_at, '2025-06-03') is None
+
+
+def test_stock_cache_uses_calendar(tmp_path):
+    """StockDataCache：历史区间缓存超过固定TTL仍有效，覆盖当前交易时段的缓存按盘中间隔过期"""
+    from tradingagents.dataflows.cache_manager import StockDataCache
+
+    cache = StockDataCache(str(tmp_path))
+    history_key = cache.save_stock_data('600036', "历史数据", '2025-05-01', '2025-05-30', 'tushare')
+    live_key = cache.save_stock_data('600036', "盘中数据", '2025-06-01', '2025-06-03', 'tushare')
+
+    def backdate(cache_key, cached_at):
+        path = cache._get_metadata_path(cache_key)
+        metadata = json.loads(path.read_text(encoding='utf-8'))
+        # 元数据中保存的是本机时间（无时区）
+        metadata['cached_at'] = cached_at.astimezone().replace(tzinfo=None).isoformat()
+        path.write_text(json.dumps(metadata), encoding='utf-8')
+
+    # 缓存写入于2025-06-03 10:00，当前时间为同日10:30
+    backdate(history_key, datetime(2025, 6, 3, 10, 0, tzinfo=SHANGHAI))
+    backdate(live_key, datetime(2025, 6, 3, 10, 0, tzinfo=SHANGHAI))
+    now = datetime(2025, 6, 3, 10, 30, tzinfo=SHANGHAI)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now.astimezone(tz) if tz else now.astimezone().replace(tzinfo=None)
+
+    with _cn_calendar(), mock.patch.dict('tradingagents.default_config.DEFAULT_CONFIG', CONFIG), \
+            mock.patch('tradingagents.dataflows.cache_manager.datetime', FrozenDatetime):
+        assert cache.is_cache_valid(history_key, symbol='600036', data_type='stock_data')
+        assert not cache.is_cache_valid(live_key, symbol='600036', data_type='stock_data')
+        # 显式指定TTL时仍按固定TTL判断
+        assert cache.is_cache_valid(live_key, max_age_hours=1, symbol='600036', data_type='stock_data')
+        assert cache.find_cached_stock_data('600036', '2025-05-01', '2025-05-30', 'tushare') == history_key
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_exchange_sessions_and_holidays()
+    test_dates_past_holiday_table_warn_once()
+    test_bar_expiry_policy()
+    test_immutable_bars_capped_and_disable_flag()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_stock_cache_uses_calendar(Path(tmp))
+    print("✅ 交易日历缓存TTL测试通过")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+新闻近似重复聚类测试
+验证多来源转载的同一新闻被合并并保留来源列表、不同新闻不会被误合并、聚合器和DataFrame入口都生效
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows.realtime_news_utils import NewsItem, RealtimeNewsAggregator
+from tradingagents.utils.news_dedup import cluster_near_duplicates, deduplicate_news_df, normalize_news_text
+
+BODY = "招商银行今日发布第三季度财报，前三季度实现净利润1,137亿元，同比增长8.2%，不良贷款率0.95%，较年初下降0.01个百分点。"
+
+
+def _news():
+    return pd.DataFrame([
+        {'新闻标题': '招商银行发布2024年第三季度业绩报告', '新闻内容': BODY, '文章来源': '东方财富'},
+        {'新闻标题': '招商银行发布2024年第三季度业绩报告！', '新闻内容': BODY[:40], '文章来源': '新浪财经'},
+        {'新闻标题': '【招商银行】发布2024年第三季度业绩报告', '新闻内容': '来源：证券时报 ' + BODY + '（完）',
+         '文章来源': '证券时报'},
+        {'新闻标题': '招行三季报：净利润同比增长8.2%', '新闻内容': BODY.replace('今日', '周二'), '文章来源': 'Google新闻'},
+        {'新闻标题': '招商银行与某科技公司签署战略合作协议', '新闻内容': '双方将在数字化转型、金融科技方面深度合作。',
+         '文章来源': '东方财富'},
+        {'新闻标题': '银行ETF指数(512730)多只成分股上涨', '新闻内容': None, '文章来源': None},
+    ])
+
+
+def test_reposts_collapse_to_one_representative():
+    """转载的标题/正文近似重复被合并，保留正文最长的一条和全部来源"""
+    news = _news()
+    clusters = cluster_near_duplicates(news['新闻标题'].tolist(), news['新闻内容'].tolist(), news['文章来源'].tolist())
+    assert [cluster.members for cluster in clusters] == [[0, 1, 2, 3], [4], [5]]
+    assert clusters[0].representative == 2
+    assert clusters[0].sources == ['东方财富', '新浪财经', '证券时报', 'Google新闻']
+
+    deduplicated = deduplicate_news_df(news)
+    assert deduplicated['新闻标题'].tolist() == [news['新闻标题'][2], news['新闻标题'][4], news['新闻标题'][5]]
+    assert deduplicated['重复数量'].tolist() == [3, 0, 0]
+    assert deduplicated['来源列表'].tolist()[0] == '东方财富, 新浪财经, 证券时报, Google新闻'
+    assert normalize_news_text('ＡＢＣ，Hello World！') == 'abchelloworld'
+
+
+def test_distinct_stories_are_kept():
+    """同一公司的不同新闻、相似模板的不同股票不会被合并"""
+    titles = [f'{name}发布2024年第三季度业绩报告' for name in ('招商银行', '平安银行', '贵州茅台', '宁德时代')]
+    contents = [f'{name}前三季度净利润同比增长{rate}%，营收{revenue}亿元' for name, rate, revenue in
+                (('招商银行', 8.2, 2500), ('平安银行', -3.1, 1200), ('贵州茅台', 15.0, 1200), ('宁德时代', 22.0, 2800))]
+    assert len(cluster_near_duplicates(titles, contents)) == 4
+
+
+def test_aggregator_merges_sources():
+    """聚合器按近似重复去重，报告中显示全部来源"""
+    now = datetime.now()
+    items = [NewsItem(title='Apple unveils new iPhone lineup at September event', content='Apple today announced...',
+                      source='FinnHub', publish_time=now, url='a', urgency='medium', relevance_score=0.9),
+             NewsItem(title='Apple Unveils New iPhone Lineup At September Event - Reuters',
+                      content='(Reuters) - Apple today announced its new iPhone lineup...', source='Google News',
+                      publish_time=now, url='b', urgency='medium', relevance_score=0.8),
+             NewsItem(title='Short', content='', source='NewsAPI', publish_time=now, url='c', urgency='low',
+                      relevance_score=0.3)]
+    aggregator = RealtimeNewsAggregator()
+    unique = aggregator._deduplicate_news(items)
+    assert len(unique) == 1
+    assert unique[0].sources == ['FinnHub', 'Google News']
+    assert '**来源**: FinnHub, Google News' in aggregator.format_news_report(unique, 'AAPL')
+
+
+if __name__ == "__main__":
+    test_reposts_collapse_to_one_representative()
+    test_distinct_stories_are_kept()
+    test_aggregator_merges_sources()
+    print("✅ 新闻近似重复聚类测试通过")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+新闻相关性批量评分测试
+验证向量化规则评分与逐条规则一致、语义模型对整批新闻只调用一次encode且在过滤器实例间共享
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.utils import enhanced_news_filter
+from tradingagents.utils.enhanced_news_filter import EnhancedNewsFilter, SEMANTIC_MODEL_NAME
+from tradingagents.utils.news_filter import NewsRelevanceFilter
+
+
+def _reference_score(f: NewsRelevanceFilter, title: str, content: str) -> int:
+    """逐条规则评分（批量化之前的实现）"""
+    score = 0
+    title_lower, content_lower = title.lower(), content.lower()
+    score += 50 if f.company_name in title else 25 if f.company_name in content else 0
+    score += 40 if f.stock_code in title else 20 if f.stock_code in content else 0
+    for keywords, in_title, in_content in ((f.strong_keywords, 30, 15), (f.include_keywords, 15, 8),
+                                           (f.exclude_keywords, -40, -20)):
+        for keyword in keywords:
+            score += in_title if keyword in title_lower else in_content if keyword in content_lower else 0
+    if (f.company_name not in title and f.stock_code not in title
+            and any(keyword in title_lower for keyword in f.exclude_keywords)):
+        score -= 30
+    return max(0, min(100, score))
+
+
+def _news():
+    return pd.DataFrame([
+        {'新闻标题': '招商银行发布2024年第三季度业绩报告', '新闻内容': '招商银行今日发布第三季度财报，净利润同比增长8%...'},
+        {'新闻标题': '上证180ETF指数基金（530280）自带杠铃策略', '新闻内容': '前十大权重股分别为贵州茅台、招商银行600036...'},
+        {'新闻标题': '银行ETF指数(512730)多只成分股上涨', '新闻内容': '银行板块今日表现强势，招商银行等多只成分股上涨...'},
+        {'新闻标题': '招商银行与某科技公司签署战略合作协议', '新闻内容': '双方将在数字化转型方面深度合作'},
+        {'新闻标题': '600036停牌公告', '新闻内容': None},
+        {'新闻标题': '无标题', '新闻内容': '指数基金跟踪上证180指数，权重股包括招商银行等金融股...'},
+        {'新闻标题': 'Index FUND flows', '新闻内容': '与公司无关的资金流向'},
+    ])
+
+
+def test_vectorized_rules_match_row_scoring():
+    """批量评分与逐条评分完全一致，过滤结果按评分降序排列"""
+    news_filter = NewsRelevanceFilter('600036', '招商银行')
+    news = _news()
+    expected = [_reference_score(news_filter, row['新闻标题'], row['新闻内容'] or '') for _, row in news.iterrows()]
+
+    scores = news_filter.calculate_relevance_scores(news['新闻标题'], news['新闻内容'])
+    assert scores.tolist() == expected
+    assert news_filter.calculate_relevance_score(news['新闻标题'][0], news['新闻内容'][0]) == expected[0]
+
+    filtered = news_filter.filter_news(news, min_score=30)
+    kept = sorted((score, -i) for i, score in enumerate(expected) if score >= 30)[::-1]
+    assert filtered['relevance_score'].tolist() == [score for score, _ in kept]
+    assert filtered['新闻标题'].tolist() == [news['新闻标题'][-i] for _, i in kept]
+
+    # 兼容 标题/内容 列名
+    renamed = news.rename(columns={'新闻标题': '标题', '新闻内容': '内容'})
+    assert len(news_filter.filter_news(renamed, min_score=30)) == len(filtered)
+
+
+class _CountingSentenceModel:
+    """按字符计数生成向量的假模型，记录encode调用次数"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32):
+        self.calls.append(len(texts))
+        return np.array([[text.count('招商银行') + 0.1, text.count('指数') + 0.1] for text in texts])
+
+
+def test_semantic_scoring_is_one_batched_pass():
+    """整批新闻只调用一次encode，模型在过滤器实例间共享"""
+    model = _CountingSentenceModel()
+    key = f"sentence:{SEMANTIC_MODEL_NAME}"
+    enhanced_news_filter._models[key] = model
+    try:
+        first = EnhancedNewsFilter('600036', '招商银行', use_semantic=True)
+        second = EnhancedNewsFilter('000001', '平安银行', use_semantic=True)
+        assert first.sentence_model is second.sentence_model is model
+        assert model.calls == [6, 6]  # 仅各自的公司文本
+
+        news = pd.concat([_news()] * 20, ignore_index=True)
+        filtered = first.filter_news_enhanced(news, min_score=0)
+        assert model.calls[2:] == [len(news)]
+        assert len(filtered) == len(news)
+        assert {'rule_score', 'semantic_score', 'classification_score', 'final_score'} <= set(filtered.columns)
+        assert filtered['final_score'].is_monotonic_decreasing
+
+        single = first.calculate_enhanced_relevance_score(news['新闻标题'][0], news['新闻内容'][0])
+        expected = 0.4 * single['rule_score'] + 0.35 * single['semantic_score']
+        assert abs(single['final_score'] - expected) < 1e-9 and single['semantic_score'] > 90
+    finally:
+        enhanced_news_filter._models.pop(key, None)
+
+
+if __name__ == "__main__":
+    test_vectorized_rules_match_row_scoring()
+    test_semantic_scoring_is_one_batched_pass()
+    print("✅ 新闻相关性批量评分测试通过")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+进度广播器测试
+验证版本号通知、等待唤醒以及Redis发布
+"""
+
+import os
+import sys
+import threading
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.utils.progress_broadcaster import (
+    PROGRESS_CHANNEL_PREFIX,
+    ProgressBroadcaster,
+    publish_progress_update,
+    get_progress_broadcaster,
+)
+
+
+def test_version_increments_per_analysis():
+    """版本号按分析独立递增"""
+    broadcaster = ProgressBroadcaster()
+    assert broadcaster.get_version("a") is None
+
+    broadcaster.notify("a", "running")
+    broadcaster.notify("a", "completed")
+    broadcaster.notify("b")
+
+    assert broadcaster.get_version("a") == 2
+    assert broadcaster.get_status("a") == "completed"
+    assert broadcaster.get_version("b") == 1
+
+
+def test_wait_for_update_wakes_on_notify():
+    """等待者在通知到达时被唤醒"""
+    broadcaster = ProgressBroadcaster()
+    broadcaster.notify("a")
+
+    timer = threading.Timer(0.05, broadcaster.notify, args=("a",))
+    timer.start()
+    version = broadcaster.wait_for_update("a", since_version=1, timeout=2)
+    timer.join()
+
+    assert version == 2
+
+
+def test_wait_for_update_times_out():
+    """没有更新时按超时返回原版本"""
+    broadcaster = ProgressBroadcaster()
+    broadcaster.notify("a")
+    assert broadcaster.wait_for_update("a", since_version=1, timeout=0.05) == 1
+
+
+def test_publish_progress_update_uses_redis_channel():
+    """提供Redis客户端时发布到进度频道"""
+
+    class FakeRedis:
+        def __init__(self):
+            self.published = []
+
+        def publish(self, channel, message):
+            self.published.append((channel, message))
+
+    redis_client = FakeRedis()
+    before = get_progress_broadcaster().get_version("analysis_pub") or 0
+    publish_progress_update("analysis_pub", "running", redis_client)
+
+    assert redis_client.published == [(f"{PROGRESS_CHANNEL_PREFIX}analysis_pub", "running")]
+    assert get_progress_broadcaster().get_version("analysis_pub") == before + 1
+
+
+if __name__ == "__main__":
+    test_version_increments_per_analysis()
+    test_wait_for_update_wakes_on_notify()
+    test_wait_for_update_times_out()
+    test_publish_progress_update_uses_redis_channel()
+    print("✅ 进度广播器测试通过")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+进度事件总线测试
+验证事件按analysis_id分发、跟踪器按事件推进步骤以及进度写入合并
+"""
+
+import os
+import sys
+import threading
+import time
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.utils.progress_events import (
+    MODULE_COMPLETE,
+    MODULE_START,
+    emit_progress_event,
+    get_progress_event_bus,
+    progress_context,
+    with_progress_events,
+)
+
+
+def test_events_routed_by_analysis_id():
+    """事件只投递给所属分析的订阅者"""
+    bus = get_progress_event_bus()
+    received_a, received_b = [], []
+    bus.subscribe("analysis_a", received_a.append)
+    bus.subscribe("analysis_b", received_b.append)
+
+    try:
+        with progress_context("analysis_a"):
+            emit_progress_event(MODULE_START, "market_analyst", "000001")
+
+        # 其他线程中绑定的分析ID互不干扰
+        def worker():
+            with progress_context("analysis_b"):
+                emit_progress_event(MODULE_COMPLETE, "news_analyst", "AAPL")
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        # 未绑定分析ID时不发布
+        emit_progress_event(MODULE_START, "trader", "AAPL")
+    finally:
+        bus.unsubscribe("analysis_a")
+        bus.unsubscribe("analysis_b")
+
+    assert [e.module_name for e in received_a] == ["market_analyst"]
+    assert [e.module_name for e in received_b] == ["news_analyst"]
+    assert received_b[0].event_type == MODULE_COMPLETE
+
+
+def test_with_progress_events_wraps_node():
+    """节点包装器发布开始/完成事件并透传返回值"""
+    bus = get_progress_event_bus()
+    received = []
+    bus.subscribe("analysis_node", received.append)
+
+    def node(state):
+        return {"market_report": "ok"}
+
+    wrapped = with_progress_events("market_analyst", node)
+    try:
+        with progress_context("analysis_node"):
+            result = wrapped({"company_of_interest": "600519"})
+    finally:
+        bus.unsubscribe("analysis_node")
+
+    assert result == {"market_report": "ok"}
+    assert [e.event_type for e in received] == [MODULE_START, MODULE_COMPLETE]
+    assert all(e.stock_symbol == "600519" for e in received)
+
+
+def test_tracker_coalesces_writes(tmp_path, monkeypatch):
+    """跟踪器按事件推进步骤，并合并高频写入"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('REDIS_ENABLED', 'false')
+    monkeypatch.setenv('PROGRESS_SAVE_INTERVAL', '0.2')
+    sys.path.insert(0, os.path.join(project_root, 'web'))
+
+    from utils.async_progress_tracker import AsyncProgressTracker
+
+    tracker = AsyncProgressTracker("analysis_tracker", ["market", "news"], 2, "dashscope")
+    writes = []
+    original_write = tracker._write_progress
+    monkeypatch.setattr(tracker, '_write_progress', lambda: (writes.append(1), original_write()))
+
+    with progress_context("analysis_tracker"):
+        for _ in range(20):
+            emit_progress_event(MODULE_START, "market_analyst", "AAPL")
+        emit_progress_event(MODULE_COMPLETE, "market_analyst", "AAPL")
+
+    market_step = tracker._find_step_by_keyword(["市场分析"])
+    assert tracker.current_step == market_step + 1
+
+    # 重复完成（辩论多轮、节点重入）停在模块自身的位置，未知模块不推进
+    bull_step = tracker._find_step_by_keyword(["多头观点"])
+    with progress_context("analysis_tracker"):
+        for _ in range(3):
+            emit_progress_event(MODULE_COMPLETE, "bull_researcher", "AAPL")
+        emit_progress_event(MODULE_COMPLETE, "unknown_node", "AAPL")
+    assert tracker.current_step == bull_step + 1
+    # 较早模块的完成事件不会让进度倒退
+    with progress_context("analysis_tracker"):
+        emit_progress_event(MODULE_COMPLETE, "market_analyst", "AAPL")
+    assert tracker.current_step == bull_step + 1
+    assert tracker.progress_data['status'] == 'running'
+
+    time.sleep(0.4)
+    assert 1 <= len(writes) <= 2
+
+    tracker.mark_completed("✅ 分析成功完成！")
+    assert tracker.progress_data['status'] == 'completed'
+    assert not get_progress_event_bus().has_subscribers("analysis_tracker")
+
+
+if __name__ == "__main__":
+    test_events_routed_by_analysis_id()
+    test_with_progress_events_wraps_node()
+    print("✅ 进度事件测试通过")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Reddit离线数据索引库测试
+验证索引库查询结果与原始逐行扫描一致、倒排索引只命中提及公司的帖子、原始转储变化后才重新入库
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import reddit_utils
+from tradingagents.dataflows.reddit_store import RedditStore, get_reddit_store
+
+
+def _ts(day: str, hour: int = 12) -> float:
+    return datetime.strptime(f"{day} {hour}", "%Y-%m-%d %H").replace(tzinfo=timezone.utc).timestamp()
+
+
+def _post(day, title, ups, selftext="", hour=12):
+    return {"created_utc": _ts(day, hour), "title": title, "selftext": selftext,
+            "url": f"https://reddit.com/{title.replace(' ', '_')}", "ups": ups}
+
+
+def _write_raw(root, category, subreddit, posts):
+    path = root / category / f"{subreddit}.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for post in posts:
+            f.write(json.dumps(post) + "\n")
+
+
+def _build_raw(root):
+    _write_raw(root, "company_news", "stocks", [
+        _post("2024-05-01", "Apple beats earnings", 120),
+        _post("2024-05-01", "Tesla deliveries slump", 80),
+        _post("2024-05-01", "Why I bought more AAPL", 300, hour=23),
+        _post("2024-05-02", "Nvidia guidance", 50, selftext="apple is a customer too"),
+    ])
+    _write_raw(root, "company_news", "investing", [
+        _post("2024-05-01", "Macro outlook", 10),
+        _post("2024-05-01", "Apple services growth", 60),
+    ])
+    _write_raw(root, "global_news", "worldnews", [
+        _post("2024-05-01", "Rates held", 500),
+        _post("2024-05-02", "Oil rises", 200),
+        _post("2024-05-02", "Elections", 900),
+    ])
+
+
+def _raw_scan(root, category, date, limit, query=None):
+    """绕过索引库的原始逐行扫描结果"""
+    store = get_reddit_store(str(root))
+    original = store.is_current
+    store.is_current = lambda *args: False
+    try:
+        return reddit_utils.fetch_top_from_category(category, date, limit, query, data_path=str(root))
+    finally:
+        store.is_current = original
+
+
+def _key(posts):
+    return sorted((post["title"], post["upvotes"], post["posted_date"]) for post in posts)
+
+
+def test_store_matches_raw_scan(tmp_path):
+    """公司新闻和全球新闻的查询结果与原始扫描一致"""
+    _build_raw(tmp_path)
+    store = get_reddit_store(str(tmp_path))
+    store.ingest(str(tmp_path))
+
+    for category, query in (("company_news", "AAPL"), ("company_news", "TSLA"), ("global_news", None)):
+        for date in ("2024-05-01", "2024-05-02", "2024-05-03"):
+            for limit in (2, 4):
+                expected = _raw_scan(tmp_path, category, date, limit, query)
+                assert store.is_current(str(tmp_path), category)
+                assert _key(reddit_utils.fetch_top_from_category(category, date, limit, query,
+                                                                 data_path=str(tmp_path))) == _key(expected)
+
+    try:
+        store.top_posts("company_news", "2024-05-01", 1, "AAPL")
+        assert False, "上限小于文件数时应报错"
+    except ValueError:
+        pass
+
+
+def test_inverted_index_range_lookup(tmp_path):
+    """倒排索引只记录提及公司的帖子，区间查询只访问命中的日期"""
+    _build_raw(tmp_path)
+    store = RedditStore(str(tmp_path / ".store"))
+    store.ingest(str(tmp_path), ["company_news"])
+
+    index = store._get_index("company_news")
+    assert sorted(index["tickers"]["AAPL"]) == ["2024-05-01", "2024-05-02"]
+    assert len(index["tickers"]["AAPL"]["2024-05-01"]) == 3
+    assert "NVDA" in index["tickers"] and "2024-05-02" not in index["tickers"]["TSLA"]
+
+    posts = store.range_top_posts("company_news", "2024-04-01", "2024-05-31", 4, "TSLA")
+    assert [post["title"] for post in posts] == ["Tesla deliveries slump"]
+    posts = store.range_top_posts("company_news", "2024-05-01", "2024-05-01", 2, "AAPL")
+    assert [post["title"] for post in posts] == ["Apple services growth", "Why I bought more AAPL"]
+
+
+def test_reingest_only_when_source_changes(tmp_path):
+    """原始转储未变化时跳过入库；追加帖子后重新入库并立即可见"""
+    _build_raw(tmp_path)
+    store = RedditStore(str(tmp_path / ".store"))
+    assert store.ingest_category(str(tmp_path), "global_news")["skipped"] is False
+    assert store.ingest_category(str(tmp_path), "global_news")["skipped"] is True
+
+    with open(tmp_path / "global_news" / "worldnews.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(_post("2024-05-03", "Markets rally", 700)) + "\n")
+    assert not store.is_current(str(tmp_path), "global_news")
+    assert store.ingest_category(str(tmp_path), "global_news")["skipped"] is False
+    assert [post["title"] for post in store.top_posts("global_news", "2024-05-03", 5)] == ["Markets rally"]
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_store_matches_raw_scan, test_inverted_index_range_lookup, test_reingest_only_when_source_changes):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Reddit离线数据索引库测试通过")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+报告导出后台渲染测试
+验证缓存键只取决于分析结果内容和格式、渲染在后台线程执行并上报进度、相同报告重复导出命中内存/磁盘缓存、
+渲染中重复提交复用同一任务、失败任务可以重新提交、缓存命中不会让任务表无限增长
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from web.utils.export_render_worker import (
+    MEMORY_CACHE_ENTRIES, ExportRenderCache, ExportRenderWorker, compute_export_key
+)
+
+RESULTS = {
+    'stock_symbol': '600036',
+    'decision': {'action': '买入', 'confidence': 0.8},
+    'state': {'market_report': '# 市场分析\n上涨趋势'},
+}
+
+
+def _wait(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while not job.finished and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.finished
+
+
+def test_export_key_depends_on_content_and_format():
+    """键顺序不影响缓存键，内容或格式变化时缓存键不同"""
+    reordered = {'state': RESULTS['state'], 'decision': {'confidence': 0.8, 'action': '买入'}, 'stock_symbol': '600036'}
+    assert compute_export_key(RESULTS, 'pdf') == compute_export_key(reordered, 'pdf')
+    assert compute_export_key(RESULTS, 'pdf') != compute_export_key(RESULTS, 'docx')
+    changed = dict(RESULTS, decision={'action': '卖出', 'confidence': 0.8})
+    assert compute_export_key(RESULTS, 'pdf') != compute_export_key(changed, 'pdf')
+
+
+def test_rendered_reports_are_served_from_cache(tmp_path):
+    """首次导出在后台渲染并上报进度，之后同一报告从内存缓存、新进程从磁盘缓存直接读取"""
+    calls, progress_seen = [], []
+
+    def render(results, progress):
+        calls.append(threading.current_thread().name)
+        progress(0.5, "使用PDF引擎 默认 渲染...")
+        progress_seen.append(worker.get_job(compute_export_key(results, 'pdf')).progress)
+        return f"PDF {results['stock_symbol']}".encode('utf-8')
+
+    worker = ExportRenderWorker(ExportRenderCache(tmp_path))
+    job = worker.submit(RESULTS, 'pdf', render)
+    _wait(job)
+    assert job.status == 'done' and job.content == b"PDF 600036" and not job.cached
+    assert calls[0].startswith("export-render") and progress_seen == [0.5] and job.progress == 1.0
+    assert worker.submit(RESULTS, 'pdf', render) is job and len(calls) == 1
+
+    restarted = ExportRenderWorker(ExportRenderCache(tmp_path))
+    cached = restarted.submit(RESULTS, 'pdf', render)
+    assert cached.status == 'done' and cached.cached and cached.content == b"PDF 600036"
+    assert len(calls) == 1 and restarted.get_job(cached.key) is cached
+    assert [path.name for path in tmp_path.iterdir()] == [f"{job.key}.pdf"]
+    worker.shutdown()
+    restarted.shutdown()
+
+
+def test_concurrent_submissions_share_one_job_and_failures_retry():
+    """渲染中重复提交返回同一任务；失败的任务记录错误，重新提交时再次渲染"""
+    release = threading.Event()
+    calls = []
+
+    def slow_render(results, progress):
+        calls.append(1)
+        release.wait(5)
+        raise RuntimeError("所有PDF引擎均失败")
+
+    worker = ExportRenderWorker(ExportRenderCache(None))
+    job = worker.submit(RESULTS, 'pdf', slow_render)
+    assert worker.submit(RESULTS, 'pdf', slow_render) is job and not job.finished
+    release.set()
+    _wait(job)
+    assert job.status == 'failed' and "所有PDF引擎均失败" in job.error and len(calls) == 1
+
+    retried = worker.submit(RESULTS, 'pdf', lambda results, progress: b"%PDF")
+    _wait(retried)
+    assert retried is not job and retried.status == 'done' and retried.content == b"%PDF"
+    worker.shutdown()
+
+
+def test_cache_hits_keep_job_table_bounded(tmp_path):
+    """缓存命中创建的已完成任务同样按上限清理"""
+    reports = [dict(RESULTS, stock_symbol=f"{600000 + i}") for i in range(MEMORY_CACHE_ENTRIES * 2)]
+    cache = ExportRenderCache(tmp_path)
+    for report in reports:
+        cache.put(compute_export_key(report, 'pdf'), 'pdf', b"%PDF")
+
+    worker = ExportRenderWorker(cache)
+    jobs = [worker.submit(report, 'pdf', lambda results, progress: b"unused") for report in reports]
+    assert all(job.cached for job in jobs)
+    assert len(worker._jobs) == MEMORY_CACHE_ENTRIES
+    assert worker.get_job(jobs[-1].key) is jobs[-1] and worker.get_job(jobs[0].key) is None
+    worker.shutdown()
+
+
+if __name__ == "__main__":
+    test_export_key_depends_on_content_and_format()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_rendered_reports_are_served_from_cache(Path(tmp))
+    test_concurrent_submissions_share_one_job_and_failures_retry()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_cache_hits_keep_job_table_bounded(Path(tmp))
+    print("✅ 报告导出后台渲染测试通过")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+运行剖析器测试
+验证span树构建、关键路径、指标汇总以及JSON/Chrome trace导出
+"""
+
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.utils.run_profiler import (
+    CATEGORY_DATA_SOURCE,
+    CATEGORY_NODE,
+    ProfilerCallbackHandler,
+    load_profile,
+    profile_run,
+    profile_span,
+    profiled,
+    record_span_metrics,
+)
+
+
+@profiled("fake_source")
+def _fetch(symbol):
+    record_span_metrics(cache_misses=1)
+    return f"data for {symbol}"
+
+
+def test_span_tree_and_critical_path():
+    """节点下的数据源调用挂在节点span下，关键路径沿最晚结束的子span"""
+    with profile_run("propagate", company="AAPL") as profiler:
+        with profile_span("market_analyst", CATEGORY_NODE):
+            _fetch("AAPL")
+        with profile_span("trader", CATEGORY_NODE):
+            time.sleep(0.01)
+
+    market, trader = profiler.root.children
+    assert market.children[0].name == "fake_source"
+    assert market.children[0].metrics == {"cache_misses": 1, "bytes": len("data for AAPL")}
+    assert [span.name for span in profiler.critical_path()] == ["propagate", "trader"]
+    assert profiler.top_spans(1)[0].name == "trader"
+
+    summary = profiler.summary()
+    assert summary[CATEGORY_NODE]["count"] == 2
+    assert summary[CATEGORY_DATA_SOURCE]["cache_misses"] == 1
+
+
+def test_no_profiler_is_noop():
+    """没有进行中的剖析时装饰器和指标记录不产生副作用"""
+    assert _fetch("000001") == "data for 000001"
+    with profile_span("orphan", CATEGORY_NODE) as span:
+        assert span is None
+
+
+def test_callback_handler_records_token_usage():
+    """LLM回调记录为当前节点下的span并提取token用量"""
+    with profile_run() as profiler:
+        handler = ProfilerCallbackHandler(profiler)
+        with profile_span("news_analyst", CATEGORY_NODE) as node:
+            handler.on_chat_model_start({}, [], run_id="r1", invocation_params={"model": "qwen-plus"})
+            response = SimpleNamespace(llm_output={"token_usage": {"prompt_tokens": 120, "completion_tokens": 30}})
+            handler.on_llm_end(response, run_id="r1")
+
+    llm_span = node.children[0]
+    assert llm_span.name == "llm:qwen-plus"
+    assert llm_span.metrics == {"tokens_in": 120, "tokens_out": 30}
+
+
+def test_export_round_trip(tmp_path):
+    """JSON导出可以重新加载，Chrome trace包含完整事件"""
+    with profile_run("propagate", company="600036") as profiler:
+        with profile_span("fundamentals_analyst", CATEGORY_NODE):
+            _fetch("600036")
+
+    json_path, trace_path = profiler.save(str(tmp_path), prefix="600036")
+
+    loaded = load_profile(json_path)
+    assert loaded.metadata == {"company": "600036"}
+    assert [span.name for span in loaded.critical_path()] == ["propagate", "fundamentals_analyst", "fake_source"]
+
+    with open(trace_path, encoding="utf-8") as f:
+        trace = json.load(f)
+    assert {event["name"] for event in trace["traceEvents"]} == {"propagate", "fundamentals_analyst", "fake_source"}
+    assert all(event["ph"] == "X" for event in trace["traceEvents"])
+
+
+if __name__ == "__main__":
+    test_span_tree_and_critical_path()
+    test_no_profiler_is_noop()
+    test_callback_handler_records_token_usage()
+    print("✅ 运行剖析器测试通过")
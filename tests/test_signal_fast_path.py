@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+最终决策规则提取测试
+验证常见中英文格式的提取结果、把握度不足时回退LLM，以及黄金语料上快速路径与LLM结果一致
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+from unittest import mock
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.graph.decision_extractor import extract_decision
+from tests.benchmarks.signal_extraction import evaluate, load_corpus
+
+
+def test_extract_common_formats():
+    """中文加粗标签、区间目标价、百分比/分数/档位评分、英文提案"""
+    extraction = extract_decision(
+        "**投资建议**：持有\n**目标价位**：¥11.50-12.50\n**置信度**：65%\n**风险评分**：7/10\n"
+        "理由：零售信贷修复仍需时间。\n最终交易建议: **持有**")
+    assert extraction.certainty == 1.0
+    assert extraction.decision == {'action': '持有', 'target_price': 12.0, 'confidence': 0.65,
+                                   'risk_score': 0.7, 'reasoning': '零售信贷修复仍需时间。'}
+
+    english = extract_decision("FINAL TRANSACTION PROPOSAL: **SELL**\nTarget Price: US$1,250.00\nRisk rating: high")
+    assert english.decision['action'] == '卖出'
+    assert english.decision['target_price'] == 1250.0
+    assert english.decision['risk_score'] == 0.8
+
+
+def test_ambiguous_text_defers_to_llm():
+    """否定句、转述和缺少目标价都会降低把握度"""
+    assert extract_decision("激进派认为应该买入，保守派建议卖出一部分仓位").certainty == 0.0
+    negated = extract_decision("暂不建议买入，已有仓位继续持有")
+    assert negated.decision['action'] == '持有' and negated.certainty < 0.8
+    assert extract_decision("投资建议：买入\n置信度：0.66").missing == ['target_price', 'risk_score', 'reasoning']
+
+
+# 评审中发现的误提取：期限/年份被当成目标价、10分制评分被按百分制换算、缺少评分时仍以高把握度跳过LLM
+REVIEW_REGRESSIONS = [
+    ("目标价: 2025年底达到50元", 'target_price', 50.0),
+    ("最终决策：买入\n目标价位：12个月 30元", 'target_price', 30.0),
+    ("风险评分: 7", 'risk_score', 0.7),
+    ("置信度: 8", 'confidence', 0.8),
+    ("风险评分: 3/5", 'risk_score', 0.6),
+]
+
+# 目标价行有多个候选价格或Q1这类字母数字混写时不猜测，目标价留空并交给LLM
+AMBIGUOUS_PRICES = [
+    "最终交易建议: **买入**\n目标价位: 当前价30元，上看45元\n置信度: 0.8\n风险评分: 0.4\n理由：估值修复空间充足。",
+    "最终交易建议: **持有**\n目标价位: 2026年Q1 28元\n置信度: 0.6\n风险评分: 0.55\n理由：行业出清仍需时间。",
+    "最终交易建议: **卖出**\n目标价位: 165元（止损价位：190元）\n置信度: 0.7\n风险评分: 0.7\n理由：毛利率承压。",
+]
+
+
+def test_review_regressions_defer_to_llm():
+    """期限和涨幅不当作目标价，不带单位的1-10评分按10分制、x/5按5分制，缺少评分或目标价有歧义时把握度低于快速路径阈值"""
+    for text, name, expected in REVIEW_REGRESSIONS:
+        extraction = extract_decision(text)
+        assert extraction.decision[name] == expected, text
+        assert extraction.certainty < 0.8, text
+
+    assert extract_decision("目标价位：较现价上涨20%，即¥240.00").decision['target_price'] == 240.0
+    assert extract_decision("目标价位：20倍PE对应 45 元").decision['target_price'] == 45.0
+    assert extract_decision("风险评分: 35").decision['risk_score'] == 0.35
+    # 只缺一项评分也要交给LLM，默认值不能以高把握度返回
+    partial = extract_decision("投资建议：买入\n目标价位：¥42.50\n置信度：0.8\n最终交易建议: **买入**")
+    assert partial.missing == ['risk_score', 'reasoning'] and partial.certainty < 0.8
+
+    for text in AMBIGUOUS_PRICES:
+        extraction = extract_decision(text)
+        assert extraction.decision['target_price'] is None and 'target_price' in extraction.missing, text
+        assert extraction.certainty <= 0.5, text
+
+
+def test_golden_corpus_fast_path_matches_llm():
+    """快速路径上的样本与保存的LLM提取结果逐字段一致；评审样例全部覆盖"""
+    corpus = load_corpus()
+    report = evaluate(corpus)
+    assert report.mismatches == []
+    # 缺少评分、目标价行有多个候选价格的样本改走LLM后覆盖率下降，快速路径只保留字段齐全且无歧义的决策
+    assert report.coverage >= 0.55
+    assert report.field_accuracy['action'] == 1.0
+    assert sum(case.get('source') == 'review' for case in corpus) >= 7
+
+
+def test_process_signal_skips_llm_when_certain():
+    """把握度足够时不调用LLM；不足时调用LLM"""
+    from tradingagents.graph.signal_processing import SignalProcessor
+
+    llm = mock.Mock()
+    llm.invoke.return_value = SimpleNamespace(
+        content='{"action": "持有", "target_price": 138, "confidence": 0.6, "risk_score": 0.5, "reasoning": "等待验证"}')
+    processor = SignalProcessor(llm)
+
+    decision = processor.process_signal(
+        "投资建议：买入\n目标价位：¥42.50\n置信度：0.78\n风险评分：0.35\n最终交易建议: **买入**", "600036")
+    assert decision['action'] == '买入' and decision['target_price'] == 42.5 and decision['risk_score'] == 0.35
+    llm.invoke.assert_not_called()
+
+    decision = processor.process_signal("综合来看以持有为主，等待旺季数据验证", "000858")
+    assert decision['target_price'] == 138.0
+    llm.invoke.assert_called_once()
+
+    # 评审中发现的误提取样例都交给LLM
+    for text in [text for text, _, _ in REVIEW_REGRESSIONS] + AMBIGUOUS_PRICES:
+        llm.invoke.reset_mock()
+        processor.process_signal(text, "600036")
+        llm.invoke.assert_called_once()
+
+
+if __name__ == "__main__":
+    test_extract_common_formats()
+    test_ambiguous_text_defers_to_llm()
+    test_review_regressions_defer_to_llm()
+    test_golden_corpus_fast_path_matches_llm()
+    test_process_signal_skips_llm_when_certain()
+    print("✅ 最终决策规则提取测试通过")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+数据源熔断器测试
+验证连续失败熔断、半开探测恢复、健康度排序、DataSourceManager跳过熔断数据源，
+以及只有数据源不可用（网络中断、超时、未连接）才计入熔断
+"""
+
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows.source_health import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    SourceHealthRegistry,
+)
+
+
+def _state(registry, source):
+    return {item['source']: item for item in registry.snapshot()}[source]['state']
+
+
+def test_breaker_opens_and_recovers_after_probe():
+    """连续失败后熔断，冷却结束只放行一个探测，探测成功后恢复"""
+    registry = SourceHealthRegistry(failure_threshold=3, cooldown=0.05)
+    for _ in range(3):
+        assert registry.allow("akshare")
+        registry.record("akshare", False, 1.0, error="timeout")
+    assert _state(registry, "akshare") == STATE_OPEN
+    assert not registry.allow("akshare")
+
+    time.sleep(0.06)
+    assert _state(registry, "akshare") == STATE_HALF_OPEN
+    assert registry.allow("akshare")
+    assert not registry.allow("akshare")
+    registry.record("akshare", True, 0.2)
+    assert _state(registry, "akshare") == STATE_CLOSED
+
+
+def test_failed_probe_backs_off():
+    """探测失败重新熔断且冷却时间加倍"""
+    registry = SourceHealthRegistry(failure_threshold=1, cooldown=0.05)
+    registry.record("tushare", False, 1.0)
+    time.sleep(0.06)
+    assert registry.allow("tushare")
+    registry.record("tushare", False, 1.0)
+    snapshot = {item['source']: item for item in registry.snapshot()}["tushare"]
+    assert snapshot['state'] == STATE_OPEN
+    assert snapshot['trips'] == 2
+
+
+def test_rank_prefers_healthy_and_fast_sources():
+    """成功率高、延迟低的数据源排在前面，熔断的数据源排在最后"""
+    registry = SourceHealthRegistry(failure_threshold=2, cooldown=60)
+    for _ in range(5):
+        registry.record("tushare", True, 0.3)
+        registry.record("baostock", True, 8.0)
+    registry.record("akshare", False, 30.0)
+    registry.record("akshare", False, 30.0)
+
+    assert registry.rank(["akshare", "tushare", "baostock"], preferred="akshare") == ["tushare", "baostock", "akshare"]
+    # 无历史记录时保持原有顺序
+    assert SourceHealthRegistry().rank(["akshare", "tushare"]) == ["akshare", "tushare"]
+
+
+def test_manager_skips_open_source():
+    """当前数据源熔断时DataSourceManager直接路由到健康的数据源"""
+    from tradingagents.dataflows import data_source_manager as dsm_module
+
+    registry = SourceHealthRegistry(failure_threshold=1, cooldown=60)
+    registry.record("akshare", False, 60.0, error="timeout")
+
+    manager = dsm_module.DataSourceManager()
+    manager.current_source = dsm_module.ChinaDataSource.AKSHARE
+    manager.available_sources = [dsm_module.ChinaDataSource.AKSHARE, dsm_module.ChinaDataSource.TUSHARE]
+
+    with mock.patch('tradingagents.dataflows.source_health.get_source_health_registry', return_value=registry), \
+            mock.patch.object(manager, '_get_eod_store_data', return_value=None), \
+            mock.patch.object(manager, '_get_akshare_data') as akshare, \
+            mock.patch.object(manager, '_get_tushare_data', return_value="📊 平安银行(000001) - Tushare数据"):
+        result = manager.get_stock_data('000001', '2025-01-01', '2025-01-31')
+
+    assert "Tushare数据" in result
+    akshare.assert_not_called()
+    assert {item['source']: item for item in registry.snapshot()}["tushare"]['calls'] == 1
+
+
+def test_no_data_replies_do_not_open_breaker():
+    """错误代码/退市/停牌等无数据应答不计为数据源失败，异常才计入熔断"""
+    from tradingagents.dataflows import data_source_manager as dsm_module
+
+    registry = SourceHealthRegistry(failure_threshold=3, cooldown=60)
+    manager = dsm_module.DataSourceManager()
+    manager.current_source = dsm_module.ChinaDataSource.AKSHARE
+    manager.available_sources = [dsm_module.ChinaDataSource.AKSHARE, dsm_module.ChinaDataSource.TUSHARE]
+
+    with mock.patch('tradingagents.dataflows.source_health.get_source_health_registry', return_value=registry), \
+            mock.patch.object(manager, '_get_eod_store_data', return_value=None), \
+            mock.patch.object(manager, '_get_akshare_data', return_value="❌ 未能获取999999的股票数据"), \
+            mock.patch.object(manager, '_get_tushare_data', return_value="❌ 未获取到999999的有效数据"):
+        for _ in range(5):
+            assert "❌" in manager.get_stock_data('999999', '2025-01-01', '2025-01-31')
+
+    states = {item['source']: item for item in registry.snapshot()}
+    assert states["akshare"]['state'] == STATE_CLOSED and states["akshare"]['success_rate'] == 1.0
+    assert states["tushare"]['state'] == STATE_CLOSED and states["tushare"]['calls'] == 5
+
+
+def _akshare_provider(stock_zh_a_hist, connected=True):
+    """构造使用指定stock_zh_a_hist的AKShareProvider（不依赖akshare安装）"""
+    from tradingagents.dataflows.akshare_utils import AKShareProvider
+
+    provider = AKShareProvider.__new__(AKShareProvider)
+    provider.ak = SimpleNamespace(stock_zh_a_hist=stock_zh_a_hist)
+    provider.connected = connected
+    return provider
+
+
+def test_provider_outage_opens_breaker():
+    """经过真实的AKShareProvider：网络异常、超时和未连接计入熔断，无数据应答和代码错误不计入"""
+    import requests
+    from tradingagents.dataflows import data_source_manager as dsm_module
+    from tradingagents.dataflows.source_health import DataSourceUnavailableError
+
+    def fetch(provider):
+        with mock.patch('tradingagents.dataflows.source_health.get_source_health_registry', return_value=registry), \
+                mock.patch('tradingagents.dataflows.akshare_utils.get_akshare_provider', return_value=provider):
+            return manager._fetch_from_source(dsm_module.ChinaDataSource.AKSHARE, '000001', '2025-01-01', '2025-01-31')
+
+    def unknown_symbol(**kwargs):
+        raise KeyError('date')
+
+    def connection_reset(**kwargs):
+        raise requests.exceptions.ConnectionError("Connection aborted")
+
+    def read_timeout(**kwargs):
+        raise requests.exceptions.ReadTimeout("Read timed out")
+
+    registry = SourceHealthRegistry(failure_threshold=3, cooldown=60)
+    manager = dsm_module.DataSourceManager()
+
+    for reply in (lambda **kwargs: pd.DataFrame(), unknown_symbol):
+        assert "❌" in fetch(_akshare_provider(reply))
+    assert _state(registry, "akshare") == STATE_CLOSED
+
+    for provider in (_akshare_provider(connection_reset), _akshare_provider(read_timeout),
+                     _akshare_provider(None, connected=False)):
+        try:
+            fetch(provider)
+            assert False, "数据源不可用时应抛出DataSourceUnavailableError"
+        except DataSourceUnavailableError:
+            pass
+    assert _state(registry, "akshare") == STATE_OPEN
+    assert "AKShare未连接" in {item['source']: item for item in registry.snapshot()}["akshare"]['last_error']
+
+
+if __name__ == "__main__":
+    test_breaker_opens_and_recovers_after_probe()
+    test_failed_probe_backs_off()
+    test_rank_prefers_healthy_and_fast_sources()
+    test_manager_skips_open_source()
+    test_no_data_replies_do_not_open_breaker()
+    test_provider_outage_opens_breaker()
+    print("✅ 数据源熔断器测试通过")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+统一证券代码表测试
+验证代码格式归一、代码/名称子串/拼音首字母检索、快照读写、过期刷新调度、Tushare搜索接入代码表，
+以及后台刷新保留刷新期间合并的条目
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import symbol_master
+from tradingagents.dataflows.symbol_master import (
+    MARKET_CHINA,
+    MARKET_HK,
+    MARKET_US,
+    SymbolMaster,
+    normalize_symbol,
+    pinyin_initials,
+)
+
+ENTRIES = [
+    (MARKET_CHINA, '000001', '平安银行'),
+    (MARKET_CHINA, '600036', '招商银行'),
+    (MARKET_CHINA, '600519', '贵州茅台'),
+    (MARKET_CHINA, '601318', '中国平安'),
+    (MARKET_HK, '00700', '腾讯控股'),
+    (MARKET_US, 'AAPL', '苹果公司'),
+]
+
+
+def test_normalize_and_lookup():
+    """各种代码格式都能O(1)解析到名称"""
+    assert normalize_symbol('000001.SZ') == (MARKET_CHINA, '000001')
+    assert normalize_symbol('sh600036') == (MARKET_CHINA, '600036')
+    assert normalize_symbol('0700.HK') == (MARKET_HK, '00700')
+    assert normalize_symbol('aapl') == (MARKET_US, 'AAPL')
+
+    master = SymbolMaster(ENTRIES)
+    assert master.get_name('000001.SZ') == '平安银行'
+    assert master.get_name('700') == '腾讯控股'
+    assert master.get_name('AAPL') == '苹果公司'
+    assert master.get_name('999999') is None
+
+
+def test_search_by_code_name_and_pinyin():
+    """代码前缀、名称子串、拼音首字母前缀检索，精确代码排在最前"""
+    master = SymbolMaster(ENTRIES)
+    assert pinyin_initials('贵州茅台') == 'GZMT'
+
+    assert [item['code'] for item in master.search('6005')] == ['600519']
+    assert {item['code'] for item in master.search('银行')} == {'000001', '600036'}
+    assert {item['code'] for item in master.search('平安')} == {'000001', '601318'}
+    assert [item['name'] for item in master.search('gzm')] == ['贵州茅台']
+    assert master.search('600036')[0]['name'] == '招商银行'
+    assert master.search('银行', market=MARKET_HK) == []
+    assert len(master.search('6', limit=1)) == 1
+
+
+def test_snapshot_and_scheduled_refresh(tmp_path):
+    """快照读写；代码表过期时调度后台刷新，查询不阻塞"""
+    path = tmp_path / "symbol_master.json"
+    built_at = datetime(2025, 6, 3, 8, 0)
+    SymbolMaster(ENTRIES, built_at).save(path)
+    loaded = SymbolMaster.load(path)
+    assert len(loaded) == len(ENTRIES) and loaded.built_at == built_at
+    assert loaded.merged([(MARKET_CHINA, '000001', '平安银行A')]).get_name('000001') == '平安银行A'
+
+    with mock.patch.object(symbol_master, '_master', loaded), \
+            mock.patch.object(symbol_master, '_schedule_refresh') as schedule:
+        assert symbol_master.get_stock_name('600519') == '贵州茅台'
+        schedule.assert_called_once()
+
+    fresh = SymbolMaster(ENTRIES, datetime.now() - timedelta(hours=1))
+    with mock.patch.object(symbol_master, '_master', fresh), \
+            mock.patch.object(symbol_master, '_schedule_refresh') as schedule:
+        assert symbol_master.get_stock_name('601318.SH') == '中国平安'
+        schedule.assert_not_called()
+
+
+def test_tushare_search_uses_symbol_master():
+    """Tushare搜索只加载一次股票列表，按代码表索引检索并保留原有字段"""
+    from tradingagents.dataflows.tushare_utils import TushareProvider
+
+    stock_list = pd.DataFrame({
+        'ts_code': ['000001.SZ', '600036.SH', '600519.SH'],
+        'symbol': [1, 600036, 600519],  # CSV缓存读取后前导零丢失
+        'name': ['平安银行', '招商银行', '贵州茅台'],
+        'industry': ['银行', '银行', '白酒'],
+    })
+    provider = TushareProvider.__new__(TushareProvider)
+    provider.connected = True
+    master = SymbolMaster([], datetime.now())
+
+    with mock.patch.object(symbol_master, '_master', master), \
+            mock.patch.object(TushareProvider, 'get_stock_list', return_value=stock_list) as get_stock_list:
+        results = provider.search_stocks('银行')
+        assert results['symbol'].tolist() == ['000001', '600036']
+        assert results['industry'].tolist() == ['银行', '银行']
+        assert provider.search_stocks('GZMT')['name'].tolist() == ['贵州茅台']
+        assert symbol_master.get_stock_name('600519') == '贵州茅台'
+        assert get_stock_list.call_count == 1
+
+
+def test_refresh_keeps_concurrent_updates(tmp_path):
+    """刷新期间其他线程合并进代码表的条目（如Tushare股票列表）不会被刷新结果覆盖丢失"""
+    remote = [(MARKET_CHINA, '600519', '贵州茅台')]
+    tushare = [(MARKET_CHINA, '300750', '宁德时代')]
+
+    def load_china_entries():
+        # 刷新下载列表期间，搜索接口把Tushare股票列表合并进代码表
+        symbol_master.update_symbol_master(tushare)
+        return remote
+
+    with mock.patch.object(symbol_master, '_master', SymbolMaster(ENTRIES, datetime(2025, 6, 3))), \
+            mock.patch.object(symbol_master, '_load_china_entries', load_china_entries), \
+            mock.patch.object(symbol_master, '_load_hk_entries', return_value=[]), \
+            mock.patch.object(symbol_master, '_schedule_refresh'), \
+            mock.patch.object(symbol_master, '_snapshot_path', return_value=tmp_path / "symbol_master.json"), \
+            mock.patch.object(SymbolMaster, 'save', side_effect=lambda path: symbol_master.update_symbol_master(
+                [(MARKET_CHINA, '002594', '比亚迪')])):
+        master = symbol_master.refresh_symbol_master()
+        current = symbol_master._master
+        assert not master.is_stale(timedelta(hours=1))
+        assert current.get_name('300750') == '宁德时代' and current.get_name('002594') == '比亚迪'
+        assert current.get_name('600519') == '贵州茅台' and current.get_name('00700') == '腾讯控股'
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_normalize_and_lookup()
+    test_search_by_code_name_and_pinyin()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_snapshot_and_scheduled_refresh(Path(tmp))
+    test_tushare_search_uses_symbol_master()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_refresh_keeps_concurrent_updates(Path(tmp))
+    print("✅ 统一证券代码表测试通过")
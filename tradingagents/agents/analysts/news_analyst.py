@@ -35,6 +35,13 @@ def create_news_analyst(llm, toolkit):
         def _get_company_name(ticker: str, market_info: dict) -> str:
             """根据股票代码获取公司名称"""
             try:
+                # 优先使用证券代码表（内存索引，不发起网络请求）
+                from tradingagents.dataflows.symbol_master import get_stock_name
+                company_name = get_stock_name(ticker)
+                if company_name:
+                    logger.debug(f"📊 [DEBUG] 从证券代码表获取名称: {ticker} -> {company_name}")
+                    return company_name
+
                 if market_info['is_china']:
                     # 中国A股：使用统一接口获取股票信息
                     from tradingagents.dataflows.interface import get_china_stock_info_unified
@@ -63,21 +70,8 @@ def create_news_analyst(llm, toolkit):
                         return f"港股{clean_ticker}"
                         
                 elif market_info['is_us']:
-                    # 美股：使用简单映射或返回代码
-                    us_stock_names = {
-                        'AAPL': '苹果公司',
-                        'TSLA': '特斯拉',
-                        'NVDA': '英伟达',
-                        'MSFT': '微软',
-                        'GOOGL': '谷歌',
-                        'AMZN': '亚马逊',
-                        'META': 'Meta',
-                        'NFLX': '奈飞'
-                    }
-                    
-                    company_name = us_stock_names.get(ticker.upper(), f"美股{ticker}")
-                    logger.debug(f"📊 [DEBUG] 美股名称映射: {ticker} -> {company_name}")
-                    return company_name
+                    # 美股：证券代码表未收录时返回代码
+                    return f"美股{ticker}"
                     
                 else:
                     return f"股票{ticker}"
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+数据库连接池注册表
+为进度跟踪、会话、缓存和报告等模块统一提供池化的Redis/MongoDB客户端，
+相同连接参数的调用方共享同一个连接池，避免每次轮询都重新建立连接
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+try:
+    from pymongo import MongoClient
+    from pymongo import monitoring
+    MONGODB_AVAILABLE = True
+except ImportError:
+    MongoClient = None
+    monitoring = None
+    MONGODB_AVAILABLE = False
+
+
+# 默认池参数，可通过环境变量调整
+DEFAULT_REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_POOL_MAX_CONNECTIONS", "50"))
+DEFAULT_REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_POOL_HEALTH_CHECK_INTERVAL", "30"))
+DEFAULT_MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_POOL_MAX_SIZE", "50"))
+
+
+if MONGODB_AVAILABLE:
+    class _MongoPoolListener(monitoring.ConnectionPoolListener):
+        """统计MongoDB连接池事件"""
+
+        def __init__(self):
+            self.counters = {
+                'connections_created': 0,
+                'connections_closed': 0,
+                'checkouts': 0,
+                'checkins': 0,
+                'checkout_failures': 0,
+            }
+
+        def pool_created(self, event):
+            pass
+
+        def pool_ready(self, event):
+            pass
+
+        def pool_cleared(self, event):
+            pass
+
+        def pool_closed(self, event):
+            pass
+
+        def connection_created(self, event):
+            self.counters['connections_created'] += 1
+
+        def connection_ready(self, event):
+            pass
+
+        def connection_closed(self, event):
+            self.counters['connections_closed'] += 1
+
+        def connection_check_out_started(self, event):
+            pass
+
+        def connection_check_out_failed(self, event):
+            self.counters['checkout_failures'] += 1
+
+        def connection_checked_out(self, event):
+            self.counters['checkouts'] += 1
+
+        def connection_checked_in(self, event):
+            self.counters['checkins'] += 1
+
+
+class ConnectionPoolRegistry:
+    """Redis/MongoDB连接池注册表"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._redis_pools: Dict[Tuple, Any] = {}
+        self._mongodb_clients: Dict[Tuple, Any] = {}
+        # 每个池的使用统计：客户端获取次数、健康检查结果
+        self._pool_info: Dict[Tuple, Dict[str, Any]] = {}
+
+    # ------------------------------------------------------------------ Redis
+
+    def get_redis_client(self, url: Optional[str] = None, host: str = "localhost", port: int = 6379,
+                         password: Optional[str] = None, db: int = 0, decode_responses: bool = False,
+                         socket_timeout: float = 5, socket_connect_timeout: float = 5):
+        """
+        获取共享连接池的Redis客户端
+
+        连接在首次执行命令时才建立，断开后由连接池自动重连。
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis未安装")
+
+        key = ('redis', url, host, int(port), password, int(db), decode_responses)
+        with self._lock:
+            pool = self._redis_pools.get(key)
+            if pool is None:
+                pool_kwargs = {
+                    'db': int(db),
+                    'decode_responses': decode_responses,
+                    'socket_timeout': socket_timeout,
+                    'socket_connect_timeout': socket_connect_timeout,
+                    'max_connections': DEFAULT_REDIS_MAX_CONNECTIONS,
+                    'health_check_interval': DEFAULT_REDIS_HEALTH_CHECK_INTERVAL,
+                    'retry_on_timeout': True,
+                }
+                if url:
+                    pool = redis.ConnectionPool.from_url(url, **pool_kwargs)
+                else:
+                    pool = redis.ConnectionPool(host=host, port=int(port), password=password, **pool_kwargs)
+                self._redis_pools[key] = pool
+                self._pool_info[key] = self._new_pool_info(self._mask_credentials(url or f"{host}:{port}/{db}"))
+                logger.info(f"🔌 [连接池] 创建Redis连接池: {self._pool_info[key]['target']}")
+            self._pool_info[key]['clients_requested'] += 1
+
+        return redis.Redis(connection_pool=pool)
+
+    def get_default_redis_client(self, decode_responses: bool = True):
+        """按REDIS_HOST/REDIS_PORT/REDIS_PASSWORD/REDIS_DB环境变量获取Redis客户端"""
+        return self.get_redis_client(
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', 6379)),
+            password=os.getenv('REDIS_PASSWORD') or None,
+            db=int(os.getenv('REDIS_DB', 0)),
+            decode_responses=decode_responses,
+        )
+
+    # ---------------------------------------------------------------- MongoDB
+
+    def get_mongodb_client(self, uri: Optional[str] = None, **kwargs):
+        """
+        获取共享的MongoDB客户端（MongoClient自带连接池）
+
+        客户端以connect=False方式创建，首次操作时才建立连接，断线后自动重连。
+        不要对返回的客户端调用close()，其生命周期由注册表管理。
+        """
+        if not MONGODB_AVAILABLE:
+            raise ImportError("pymongo未安装")
+
+        key = ('mongodb', uri, tuple(sorted((k, str(v)) for k, v in kwargs.items())))
+        with self._lock:
+            client = self._mongodb_clients.get(key)
+            if client is None:
+                listener = _MongoPoolListener()
+                client_kwargs = {
+                    'maxPoolSize': DEFAULT_MONGODB_MAX_POOL_SIZE,
+                    'connect': False,
+                    'event_listeners': [listener],
+                    **kwargs,
+                }
+                client = MongoClient(uri, **client_kwargs) if uri else MongoClient(**client_kwargs)
+                self._mongodb_clients[key] = client
+                target = uri or f"{kwargs.get('host', 'localhost')}:{kwargs.get('port', 27017)}"
+                self._pool_info[key] = self._new_pool_info(self._mask_credentials(target))
+                self._pool_info[key]['listener'] = listener
+                logger.info(f"🔌 [连接池] 创建MongoDB客户端: {self._pool_info[key]['target']}")
+            self._pool_info[key]['clients_requested'] += 1
+
+        return client
+
+    def get_default_mongodb_client(self, timeout_ms: int = 5000):
+        """按MONGODB_HOST/MONGODB_PORT/MONGODB_USERNAME等环境变量获取MongoDB客户端"""
+        connect_kwargs = {
+            "host": os.getenv("MONGODB_HOST", "localhost"),
+            "port": int(os.getenv("MONGODB_PORT", "27017")),
+            "serverSelectionTimeoutMS": timeout_ms,
+            "connectTimeoutMS": timeout_ms,
+        }
+        username = os.getenv("MONGODB_USERNAME")
+        password = os.getenv("MONGODB_PASSWORD")
+        if username and password:
+            connect_kwargs.update({
+                "username": username,
+                "password": password,
+                "authSource": os.getenv("MONGODB_AUTH_SOURCE", "admin"),
+            })
+        return self.get_mongodb_client(**connect_kwargs)
+
+    # ------------------------------------------------------------ 健康与统计
+
+    def health_check(self) -> Dict[str, bool]:
+        """对所有已创建的连接池执行ping，返回 {目标: 是否健康}"""
+        with self._lock:
+            redis_pools = list(self._redis_pools.items())
+            mongodb_clients = list(self._mongodb_clients.items())
+
+        results = {}
+        for key, pool in redis_pools:
+            results[self._pool_info[key]['target']] = self._record_health(
+                key, lambda: redis.Redis(connection_pool=pool).ping())
+        for key, client in mongodb_clients:
+            results[self._pool_info[key]['target']] = self._record_health(
+                key, lambda: client.admin.command('ping'))
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取连接池使用统计"""
+        stats = {'redis': [], 'mongodb': []}
+        with self._lock:
+            for key, pool in self._redis_pools.items():
+                info = self._pool_info[key]
+                stats['redis'].append({
+                    'target': info['target'],
+                    'max_connections': pool.max_connections,
+                    'created_connections': getattr(pool, '_created_connections', 0),
+                    'available_connections': len(getattr(pool, '_available_connections', [])),
+                    'in_use_connections': len(getattr(pool, '_in_use_connections', [])),
+                    'clients_requested': info['clients_requested'],
+                    'healthy': info['healthy'],
+                    'last_health_check': info['last_health_check'],
+                })
+            for key, client in self._mongodb_clients.items():
+                info = self._pool_info[key]
+                counters = dict(info['listener'].counters)
+                stats['mongodb'].append({
+                    'target': info['target'],
+                    'max_pool_size': client.options.pool_options.max_pool_size,
+                    'open_connections': counters['connections_created'] - counters['connections_closed'],
+                    'in_use_connections': counters['checkouts'] - counters['checkins'],
+                    'clients_requested': info['clients_requested'],
+                    'healthy': info['healthy'],
+                    'last_health_check': info['last_health_check'],
+                    **counters,
+                })
+        return stats
+
+    def close_all(self):
+        """关闭所有连接池（进程退出或测试清理时使用）"""
+        with self._lock:
+            for pool in self._redis_pools.values():
+                try:
+                    pool.disconnect()
+                except Exception as e:
+                    logger.debug(f"关闭Redis连接池失败: {e}")
+            for client in self._mongodb_clients.values():
+                try:
+                    client.close()
+                except Exception as e:
+                    logger.debug(f"关闭MongoDB客户端失败: {e}")
+            self._redis_pools.clear()
+            self._mongodb_clients.clear()
+            self._pool_info.clear()
+
+    def _record_health(self, key: Tuple, ping) -> bool:
+        try:
+            ping()
+            healthy = True
+        except Exception as e:
+            logger.warning(f"⚠️ [连接池] 健康检查失败 {self._pool_info[key]['target']}: {e}")
+            healthy = False
+        with self._lock:
+            if key in self._pool_info:
+                self._pool_info[key]['healthy'] = healthy
+                self._pool_info[key]['last_health_check'] = time.time()
+        return healthy
+
+    @staticmethod
+    def _new_pool_info(target: str) -> Dict[str, Any]:
+        return {
+            'target': target,
+            'created_at': time.time(),
+            'clients_requested': 0,
+            'healthy': None,
+            'last_health_check': None,
+        }
+
+    @staticmethod
+    def _mask_credentials(target: str) -> str:
+        """隐藏连接串中的密码"""
+        if '@' in target and '://' in target:
+            scheme, rest = target.split('://', 1)
+            return f"{scheme}://***@{rest.rsplit('@', 1)[1]}"
+        return target
+
+
+# 全局连接池注册表实例
+_connection_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_connection_registry() -> ConnectionPoolRegistry:
+    """获取全局连接池注册表"""
+    global _connection_registry
+    if _connection_registry is None:
+        with _registry_lock:
+            if _connection_registry is None:
+                _connection_registry = ConnectionPoolRegistry()
+    return _connection_registry
+
+
+def get_pooled_redis_client(**kwargs):
+    """获取池化的Redis客户端"""
+    return get_connection_registry().get_redis_client(**kwargs)
+
+
+def get_pooled_mongodb_client(uri: Optional[str] = None, **kwargs):
+    """获取池化的MongoDB客户端"""
+    return get_connection_registry().get_mongodb_client(uri, **kwargs)
@@ -86,29 +86,12 @@ class DatabaseManager:
 
         try:
             import pymongo
-            from pymongo import MongoClient
 
-            # 构建连接参数
-            connect_kwargs = {
-                "host": self.mongodb_config["host"],
-                "port": self.mongodb_config["port"],
-                "serverSelectionTimeoutMS": self.mongodb_config["timeout"],
-                "connectTimeoutMS": self.mongodb_config["timeout"]
-            }
-
-            # 如果有用户名和密码，添加认证
-            if self.mongodb_config["username"] and self.mongodb_config["password"]:
-                connect_kwargs.update({
-                    "username": self.mongodb_config["username"],
-                    "password": self.mongodb_config["password"],
-                    "authSource": self.mongodb_config["auth_source"]
-                })
-
-            client = MongoClient(**connect_kwargs)
-
-            # 测试连接
+            client = self._get_pooled_mongodb_client()
+
+            # 测试连接（客户端来自共享连接池，检测后直接复用）
             client.server_info()
-            client.close()
+            self.mongodb_client = client
 
             return True, "MongoDB连接成功"
 
@@ -126,23 +109,11 @@ class DatabaseManager:
         try:
             import redis
 
-            # 构建连接参数
-            connect_kwargs = {
-                "host": self.redis_config["host"],
-                "port": self.redis_config["port"],
-                "db": self.redis_config["db"],
-                "socket_timeout": self.redis_config["timeout"],
-                "socket_connect_timeout": self.redis_config["timeout"]
-            }
-
-            # 如果有密码，添加密码
-            if self.redis_config["password"]:
-                connect_kwargs["password"] = self.redis_config["password"]
+            client = self._get_pooled_redis_client()
 
-            client = redis.Redis(**connect_kwargs)
-
-            # 测试连接
+            # 测试连接（客户端来自共享连接池，检测后直接复用）
             client.ping()
+            self.redis_client = client
 
             return True, "Redis连接成功"
 
@@ -189,55 +160,59 @@ class DatabaseManager:
         self.logger.info(f"主要缓存后端: {self.primary_backend}")
     
     def _initialize_connections(self):
-        """初始化数据库连接"""
+        """初始化数据库连接（复用检测阶段从连接池获取的客户端）"""
         # 初始化MongoDB连接
-        if self.mongodb_available:
+        if self.mongodb_available and self.mongodb_client is None:
             try:
-                import pymongo
-
-                # 构建连接参数
-                connect_kwargs = {
-                    "host": self.mongodb_config["host"],
-                    "port": self.mongodb_config["port"],
-                    "serverSelectionTimeoutMS": self.mongodb_config["timeout"]
-                }
-
-                # 如果有用户名和密码，添加认证
-                if self.mongodb_config["username"] and self.mongodb_config["password"]:
-                    connect_kwargs.update({
-                        "username": self.mongodb_config["username"],
-                        "password": self.mongodb_config["password"],
-                        "authSource": self.mongodb_config["auth_source"]
-                    })
-
-                self.mongodb_client = pymongo.MongoClient(**connect_kwargs)
+                self.mongodb_client = self._get_pooled_mongodb_client()
                 self.logger.info("MongoDB客户端初始化成功")
             except Exception as e:
                 self.logger.error(f"MongoDB客户端初始化失败: {e}")
                 self.mongodb_available = False
 
         # 初始化Redis连接
-        if self.redis_available:
+        if self.redis_available and self.redis_client is None:
             try:
-                import redis
-
-                # 构建连接参数
-                connect_kwargs = {
-                    "host": self.redis_config["host"],
-                    "port": self.redis_config["port"],
-                    "db": self.redis_config["db"],
-                    "socket_timeout": self.redis_config["timeout"]
-                }
-
-                # 如果有密码，添加密码
-                if self.redis_config["password"]:
-                    connect_kwargs["password"] = self.redis_config["password"]
-
-                self.redis_client = redis.Redis(**connect_kwargs)
+                self.redis_client = self._get_pooled_redis_client()
                 self.logger.info("Redis客户端初始化成功")
             except Exception as e:
                 self.logger.error(f"Redis客户端初始化失败: {e}")
                 self.redis_available = False
+
+    def _get_pooled_mongodb_client(self):
+        """从连接池注册表获取MongoDB客户端"""
+        from .connection_pool import get_pooled_mongodb_client
+
+        # 构建连接参数
+        connect_kwargs = {
+            "host": self.mongodb_config["host"],
+            "port": self.mongodb_config["port"],
+            "serverSelectionTimeoutMS": self.mongodb_config["timeout"],
+            "connectTimeoutMS": self.mongodb_config["timeout"]
+        }
+
+        # 如果有用户名和密码，添加认证
+        if self.mongodb_config["username"] and self.mongodb_config["password"]:
+            connect_kwargs.update({
+                "username": self.mongodb_config["username"],
+                "password": self.mongodb_config["password"],
+                "authSource": self.mongodb_config["auth_source"]
+            })
+
+        return get_pooled_mongodb_client(**connect_kwargs)
+
+    def _get_pooled_redis_client(self):
+        """从连接池注册表获取Redis客户端"""
+        from .connection_pool import get_pooled_redis_client
+
+        return get_pooled_redis_client(
+            host=self.redis_config["host"],
+            port=self.redis_config["port"],
+            password=self.redis_config["password"] or None,
+            db=self.redis_config["db"],
+            socket_timeout=self.redis_config["timeout"],
+            socket_connect_timeout=self.redis_config["timeout"]
+        )
     
     def get_mongodb_client(self):
         """获取MongoDB客户端"""
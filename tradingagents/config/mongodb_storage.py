@@ -9,6 +9,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import asdict
 from .config_manager import UsageRecord
+from .connection_pool import get_pooled_mongodb_client
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -54,7 +55,7 @@ class MongoDBStorage:
     def _connect(self):
         """连接到MongoDB"""
         try:
-            self.client = MongoClient(
+            self.client = get_pooled_mongodb_client(
                 self.connection_string,
                 serverSelectionTimeoutMS=5000  # 5秒超时
             )
@@ -283,8 +284,8 @@ class MongoDBStorage:
             return 0
     
     def close(self):
-        """关闭MongoDB连接"""
+        """释放MongoDB连接（客户端由连接池注册表共享管理，不在此关闭）"""
         if self.client:
-            self.client.close()
+            self.client = None
             self._connected = False
-            logger.info(f"MongoDB连接已关闭")
\ No newline at end of file
+            logger.info(f"MongoDB连接已释放")
\ No newline at end of file
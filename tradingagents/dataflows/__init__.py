@@ -1,65 +1,21 @@
-# 导入基础模块
-from .finnhub_utils import get_data_in_range
-from .googlenews_utils import getNewsData
-from .reddit_utils import fetch_top_from_category
+# 数据流模块按需导入（PEP 562）
+# 导入本包不会加载 interface 及 yfinance/stockstats/akshare/tushare 等数据源依赖，
+# 只有首次访问对应属性时才导入提供该属性的子模块
+import importlib
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
 
-# 尝试导入yfinance相关模块，如果失败则跳过
-try:
-    from .yfin_utils import YFinanceUtils
-    YFINANCE_AVAILABLE = True
-except ImportError as e:
-    logger.warning(f"⚠️ yfinance模块不可用: {e}")
-    YFinanceUtils = None
-    YFINANCE_AVAILABLE = False
+# 属性名 -> 提供该属性的子模块
+_LAZY_ATTRIBUTES = {
+    # 基础模块
+    "get_data_in_range": ".finnhub_utils",
+    "getNewsData": ".googlenews_utils",
+    "fetch_top_from_category": ".reddit_utils",
+}
 
-try:
-    from .stockstats_utils import StockstatsUtils
-    STOCKSTATS_AVAILABLE = True
-except ImportError as e:
-    logger.warning(f"⚠️ stockstats模块不可用: {e}")
-    StockstatsUtils = None
-    STOCKSTATS_AVAILABLE = False
-
-from .interface import (
-
-    # News and sentiment functions
-    get_finnhub_news,
-    get_finnhub_company_insider_sentiment,
-    get_finnhub_company_insider_transactions,
-    get_google_news,
-    get_reddit_global_news,
-    get_reddit_company_news,
-    # Financial statements functions
-    get_simfin_balance_sheet,
-    get_simfin_cashflow,
-    get_simfin_income_statements,
-    # Technical analysis functions
-    get_stock_stats_indicators_window,
-    get_stockstats_indicator,
-    # Market data functions
-    get_YFin_data_window,
-    get_YFin_data,
-    # Tushare data functions
-    get_china_stock_data_tushare,
-    search_china_stocks_tushare,
-    get_china_stock_fundamentals_tushare,
-    get_china_stock_info_tushare,
-    # Unified China data functions (recommended)
-    get_china_stock_data_unified,
-    get_china_stock_info_unified,
-    switch_china_data_source,
-    get_current_china_data_source,
-    # Hong Kong stock functions
-    get_hk_stock_data_unified,
-    get_hk_stock_info_unified,
-    get_stock_data_by_market,
-)
-
-__all__ = [
+_INTERFACE_FUNCTIONS = [
     # News and sentiment functions
     "get_finnhub_news",
     "get_finnhub_company_insider_sentiment",
@@ -82,7 +38,7 @@ __all__ = [
     "search_china_stocks_tushare",
     "get_china_stock_fundamentals_tushare",
     "get_china_stock_info_tushare",
-    # Unified China data functions
+    # Unified China data functions (recommended)
     "get_china_stock_data_unified",
     "get_china_stock_info_unified",
     "switch_china_data_source",
@@ -92,3 +48,45 @@ __all__ = [
     "get_hk_stock_info_unified",
     "get_stock_data_by_market",
 ]
+_LAZY_ATTRIBUTES.update({name: ".interface" for name in _INTERFACE_FUNCTIONS})
+
+# 可选依赖：导入失败时值为None，对应的 *_AVAILABLE 标志为False
+_OPTIONAL_ATTRIBUTES = {
+    "YFinanceUtils": (".yfin_utils", "YFINANCE_AVAILABLE", "yfinance"),
+    "StockstatsUtils": (".stockstats_utils", "STOCKSTATS_AVAILABLE", "stockstats"),
+}
+_AVAILABILITY_FLAGS = {flag: name for name, (_, flag, _) in _OPTIONAL_ATTRIBUTES.items()}
+
+
+def _load_optional(name: str):
+    module_name, flag, label = _OPTIONAL_ATTRIBUTES[name]
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+        available = True
+    except ImportError as e:
+        logger.warning(f"⚠️ {label}模块不可用: {e}")
+        value = None
+        available = False
+    globals()[name] = value
+    globals()[flag] = available
+    return value
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    if name in _OPTIONAL_ATTRIBUTES:
+        return _load_optional(name)
+    if name in _AVAILABILITY_FLAGS:
+        _load_optional(_AVAILABILITY_FLAGS[name])
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_OPTIONAL_ATTRIBUTES) | set(_AVAILABILITY_FLAGS))
+
+
+__all__ = list(_INTERFACE_FUNCTIONS)
@@ -15,6 +15,10 @@ from typing import Any, Dict, Optional, Union
 import pandas as pd
 
 from ..config.database_manager import get_database_manager
+from .market_calendar import bar_cache_expiry, bar_cache_ttl_seconds
+from .cache_codec import decode_frame, encode_frame, frame_schema
+from .cache_maintenance import (FileCacheBudget, FileCacheEntry, ensure_ttl_index, get_cache_compactor,
+                                touch_cache_file)
 
 class AdaptiveCacheSystem:
     """自适应缓存系统"""
@@ -37,16 +41,41 @@ class AdaptiveCacheSystem:
         self.primary_backend = self.cache_config["primary_backend"]
         self.fallback_enabled = self.cache_config["fallback_enabled"]
         
+        # 文件缓存容量预算（LRU淘汰），MongoDB缓存集合由TTL索引自动过期
+        self.file_budget = FileCacheBudget(f"文件缓存({self.cache_dir})", self._scan_file_entries)
+        self._ensure_mongodb_ttl_index()
+        get_cache_compactor().register(f"adaptive:{self.cache_dir.resolve()}", self.compact)
+        
         self.logger.info(f"自适应缓存系统初始化 - 主要后端: {self.primary_backend}")
     
+    def _ensure_mongodb_ttl_index(self):
+        mongodb_client = self.db_manager.get_mongodb_client()
+        if mongodb_client:
+            ensure_ttl_index(mongodb_client.tradingagents.cache)
+    
+    def _scan_file_entries(self):
+        entries = []
+        for cache_file in self.cache_dir.glob("*.pkl"):
+            try:
+                stat = cache_file.stat()
+            except FileNotFoundError:
+                continue
+            entries.append(FileCacheEntry(cache_file.stem, [cache_file], stat.st_size, stat.st_mtime))
+        return entries
+    
     def _get_cache_key(self, symbol: str, start_date: str = "", end_date: str = "", 
                       data_source: str = "default", data_type: str = "stock_data") -> str:
         """生成缓存键"""
         key_data = f"{symbol}_{start_date}_{end_date}_{data_source}_{data_type}"
         return hashlib.md5(key_data.encode()).hexdigest()
     
-    def _get_ttl_seconds(self, symbol: str, data_type: str = "stock_data") -> int:
-        """获取TTL秒数"""
+    def _get_ttl_seconds(self, symbol: str, data_type: str = "stock_data", end_date: str = "") -> int:
+        """获取TTL秒数（行情数据按交易日历计算）"""
+        if data_type == "stock_data":
+            ttl_seconds = bar_cache_ttl_seconds(symbol, end_date)
+            if ttl_seconds is not None:
+                return ttl_seconds
+
         # 判断市场类型
         if len(symbol) == 6 and symbol.isdigit():
             market = "china"
@@ -66,6 +95,17 @@ class AdaptiveCacheSystem:
         expiry_time = cache_time + timedelta(seconds=ttl_seconds)
         return datetime.now() < expiry_time
     
+    def _is_entry_valid(self, cache_data: Dict) -> bool:
+        """检查文件缓存条目是否有效，行情数据按写入时间和交易日历判断"""
+        metadata = cache_data['metadata']
+        symbol = metadata.get('symbol', '')
+        data_type = metadata.get('data_type', 'stock_data')
+        if data_type == "stock_data" and cache_data['timestamp'] is not None:
+            expiry = bar_cache_expiry(symbol, cache_data['timestamp'], metadata.get('end_date'))
+            if expiry is not None:
+                return datetime.now(expiry.tzinfo) < expiry
+        return self._is_cache_valid(cache_data['timestamp'], self._get_ttl_seconds(symbol, data_type))
+    
     def _save_to_file(self, cache_key: str, data: Any, metadata: Dict) -> bool:
         """保存到文件缓存"""
         try:
@@ -77,8 +117,10 @@ class AdaptiveCacheSystem:
                 'backend': 'file'
             }
             
+            is_new = not cache_file.exists()
             with open(cache_file, 'wb') as f:
                 pickle.dump(cache_data, f)
+            self.file_budget.record_write(cache_file.stat().st_size, new_entry=is_new)
             
             self.logger.debug(f"文件缓存保存成功: {cache_key}")
             return True
@@ -96,6 +138,7 @@ class AdaptiveCacheSystem:
             
             with open(cache_file, 'rb') as f:
                 cache_data = pickle.load(f)
+            touch_cache_file(cache_file)
             
             self.logger.debug(f"文件缓存加载成功: {cache_key}")
             return cache_data
@@ -111,14 +154,17 @@ class AdaptiveCacheSystem:
             return False
         
         try:
+            # DataFrame先编码为紧凑的缓存帧，外层只pickle一个小字典
+            is_frame = isinstance(data, pd.DataFrame)
             cache_data = {
-                'data': data,
+                'data': encode_frame(data) if is_frame else data,
+                'data_codec': 'frame' if is_frame else None,
                 'metadata': metadata,
                 'timestamp': datetime.now().isoformat(),
                 'backend': 'redis'
             }
             
-            serialized_data = pickle.dumps(cache_data)
+            serialized_data = pickle.dumps(cache_data, protocol=pickle.HIGHEST_PROTOCOL)
             redis_client.setex(cache_key, ttl_seconds, serialized_data)
             
             self.logger.debug(f"Redis缓存保存成功: {cache_key}")
@@ -140,6 +186,8 @@ class AdaptiveCacheSystem:
                 return None
             
             cache_data = pickle.loads(serialized_data)
+            if cache_data.get('data_codec') == 'frame':
+                cache_data['data'] = decode_frame(cache_data['data'])
             
             # 转换时间戳
             if isinstance(cache_data['timestamp'], str):
@@ -163,9 +211,11 @@ class AdaptiveCacheSystem:
             collection = db.cache
             
             # 序列化数据
+            schema = None
             if isinstance(data, pd.DataFrame):
-                serialized_data = data.to_json()
-                data_type = 'dataframe'
+                serialized_data = encode_frame(data)
+                data_type = 'dataframe_frame'
+                schema = frame_schema(data)
             else:
                 serialized_data = pickle.dumps(data).hex()
                 data_type = 'pickle'
@@ -174,9 +224,11 @@ class AdaptiveCacheSystem:
                 '_id': cache_key,
                 'data': serialized_data,
                 'data_type': data_type,
+                'schema': schema,
                 'metadata': metadata,
                 'timestamp': datetime.now(),
-                'expires_at': datetime.now() + timedelta(seconds=ttl_seconds),
+                # TTL索引按UTC比较
+                'expires_at': datetime.utcnow() + timedelta(seconds=ttl_seconds),
                 'backend': 'mongodb'
             }
             
@@ -203,13 +255,16 @@ class AdaptiveCacheSystem:
             if not doc:
                 return None
             
-            # 检查是否过期
-            if doc.get('expires_at') and doc['expires_at'] < datetime.now():
+            # 检查是否过期（TTL索引后台每分钟清理一次，到期但尚未删除的文档不再返回）
+            if doc.get('expires_at') and doc['expires_at'] < datetime.utcnow():
                 collection.delete_one({'_id': cache_key})
                 return None
             
             # 反序列化数据
-            if doc['data_type'] == 'dataframe':
+            if doc['data_type'] == 'dataframe_frame':
+                data = decode_frame(doc['data'])
+            elif doc['data_type'] == 'dataframe':
+                # 旧版缓存
                 data = pd.read_json(doc['data'])
             else:
                 data = pickle.loads(bytes.fromhex(doc['data']))
@@ -244,7 +299,7 @@ class AdaptiveCacheSystem:
         }
         
         # 获取TTL
-        ttl_seconds = self._get_ttl_seconds(symbol, data_type)
+        ttl_seconds = self._get_ttl_seconds(symbol, data_type, end_date)
         
         # 根据主要后端保存
         success = False
@@ -290,11 +345,7 @@ class AdaptiveCacheSystem:
         
         # 检查缓存是否有效（仅对文件缓存，数据库缓存有自己的TTL机制）
         if cache_data.get('backend') == 'file':
-            symbol = cache_data['metadata'].get('symbol', '')
-            data_type = cache_data['metadata'].get('data_type', 'stock_data')
-            ttl_seconds = self._get_ttl_seconds(symbol, data_type)
-            
-            if not self._is_cache_valid(cache_data['timestamp'], ttl_seconds):
+            if not self._is_entry_valid(cache_data):
                 self.logger.debug(f"文件缓存已过期: {cache_key}")
                 return None
         
@@ -321,6 +372,7 @@ class AdaptiveCacheSystem:
             'redis_available': self.db_manager.is_redis_available(),
             'file_cache_directory': str(self.cache_dir),
             'file_cache_count': len(list(self.cache_dir.glob("*.pkl"))),
+            'file_cache_budget': self.file_budget.usage(),
         }
         
         # Redis统计
@@ -355,11 +407,7 @@ class AdaptiveCacheSystem:
                 with open(cache_file, 'rb') as f:
                     cache_data = pickle.load(f)
                 
-                symbol = cache_data['metadata'].get('symbol', '')
-                data_type = cache_data['metadata'].get('data_type', 'stock_data')
-                ttl_seconds = self._get_ttl_seconds(symbol, data_type)
-                
-                if not self._is_cache_valid(cache_data['timestamp'], ttl_seconds):
+                if not self._is_entry_valid(cache_data):
                     cache_file.unlink()
                     cleared_files += 1
                     
@@ -368,8 +416,13 @@ class AdaptiveCacheSystem:
         
         self.logger.info(f"文件缓存清理完成，删除 {cleared_files} 个过期文件")
         
-        # MongoDB会自动清理过期文档（通过expires_at字段）
+        # MongoDB由expires_at上的TTL索引自动清理过期文档
         # Redis会自动清理过期键
+        return cleared_files
+    
+    def compact(self) -> Dict[str, int]:
+        """后台压缩任务：删除过期文件缓存，再按容量预算淘汰最久未访问的文件"""
+        return {'expired': self.clear_expired_cache(), 'evicted': self.file_budget.enforce()}
 
 
 # 全局缓存系统实例
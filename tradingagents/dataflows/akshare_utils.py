@@ -67,9 +67,19 @@ class AKShareProvider:
             logger.info(f"🔧 使用默认超时设置")
     
     def get_stock_data(self, symbol: str, start_date: str = None, end_date: str = None) -> Optional[pd.DataFrame]:
-        """获取股票历史数据"""
+        """
+        获取股票历史数据
+
+        Returns:
+            DataFrame: 股票历史数据；数据源正常应答但没有数据时返回None或空表
+
+        Raises:
+            DataSourceUnavailableError: AKShare未连接，或网络中断、超时
+        """
+        from .source_health import DataSourceUnavailableError, is_transport_error
+
         if not self.connected:
-            return None
+            raise DataSourceUnavailableError("AKShare未连接")
         
         try:
             # 转换股票代码格式
@@ -91,6 +101,8 @@ class AKShareProvider:
             
         except Exception as e:
             logger.error(f"❌ AKShare获取股票数据失败: {e}")
+            if is_transport_error(e):
+                raise DataSourceUnavailableError(f"AKShare获取股票数据失败: {e}") from e
             return None
     
     def get_stock_info(self, symbol: str) -> Dict[str, Any]:
@@ -127,7 +139,12 @@ class AKShareProvider:
 
         Returns:
             DataFrame: 港股历史数据
+
+        Raises:
+            FetchTimeoutError: 调用超时
         """
+        from .fetch_executor import FetchTimeoutError, run_blocking
+
         if not self.connected:
             logger.error(f"❌ AKShare未连接")
             return None
@@ -142,42 +159,17 @@ class AKShareProvider:
             start_date_formatted = start_date.replace('-', '') if start_date else "20240101"
             end_date_formatted = end_date.replace('-', '') if end_date else "20241231"
 
-            # 使用AKShare获取港股历史数据（带超时保护）
-            import threading
-
-            result = [None]
-            exception = [None]
-
-            def fetch_hist_data():
-                try:
-                    result[0] = self.ak.stock_hk_hist(
-                        symbol=hk_symbol,
-                        period="daily",
-                        start_date=start_date_formatted,
-                        end_date=end_date_formatted,
-                        adjust=""
-                    )
-                except Exception as e:
-                    exception[0] = e
-
-            # 启动线程
-            thread = threading.Thread(target=fetch_hist_data)
-            thread.daemon = True
-            thread.start()
-
-            # 等待60秒
-            thread.join(timeout=60)
-
-            if thread.is_alive():
-                # 超时了
-                logger.warning(f"⚠️ AKShare港股历史数据获取超时（60秒）: {symbol}")
-                raise Exception(f"AKShare港股历史数据获取超时（60秒）: {symbol}")
-            elif exception[0]:
-                # 有异常
-                raise exception[0]
-            else:
-                # 成功
-                data = result[0]
+            # 使用AKShare获取港股历史数据（阻塞调用线程池，带超时保护）
+            data = run_blocking(
+                "akshare",
+                self.ak.stock_hk_hist,
+                symbol=hk_symbol,
+                period="daily",
+                start_date=start_date_formatted,
+                end_date=end_date_formatted,
+                adjust="",
+                timeout=60,
+            )
 
             if not data.empty:
                 # 数据预处理
@@ -205,6 +197,10 @@ class AKShareProvider:
                 logger.warning(f"⚠️ AKShare港股数据为空: {symbol}")
                 return None
 
+        except FetchTimeoutError:
+            # 超时交给调用方，与无数据区分开（计入数据源失败并切换备用数据源）
+            logger.warning(f"⚠️ AKShare港股历史数据获取超时（60秒）: {symbol}")
+            raise
         except Exception as e:
             logger.error(f"❌ AKShare获取港股数据失败: {e}")
             return None
@@ -218,7 +214,12 @@ class AKShareProvider:
 
         Returns:
             Dict: 港股基本信息
+
+        Raises:
+            FetchTimeoutError: 调用超时
         """
+        from .fetch_executor import FetchTimeoutError, run_blocking
+
         if not self.connected:
             return {
                 'symbol': symbol,
@@ -233,39 +234,8 @@ class AKShareProvider:
 
             logger.info(f"🇭🇰 AKShare获取港股信息: {hk_symbol}")
 
-            # 尝试获取港股实时行情数据来获取基本信息
-            # 使用线程超时包装（兼容Windows）
-            import threading
-            import time
-
-
-            result = [None]
-            exception = [None]
-
-            def fetch_data():
-                try:
-                    result[0] = self.ak.stock_hk_spot_em()
-                except Exception as e:
-                    exception[0] = e
-
-            # 启动线程
-            thread = threading.Thread(target=fetch_data)
-            thread.daemon = True
-            thread.start()
-
-            # 等待60秒
-            thread.join(timeout=60)
-
-            if thread.is_alive():
-                # 超时了
-                logger.warning(f"⚠️ AKShare港股信息获取超时（60秒），使用备用方案")
-                raise Exception("AKShare港股信息获取超时（60秒）")
-            elif exception[0]:
-                # 有异常
-                raise exception[0]
-            else:
-                # 成功
-                spot_data = result[0]
+            # 尝试获取港股实时行情数据来获取基本信息（阻塞调用线程池，带超时保护）
+            spot_data = run_blocking("akshare", self.ak.stock_hk_spot_em, timeout=60)
 
             # 查找对应的股票信息
             if not spot_data.empty:
@@ -292,6 +262,9 @@ class AKShareProvider:
                 'source': 'akshare'
             }
 
+        except FetchTimeoutError:
+            logger.warning(f"⚠️ AKShare港股信息获取超时（60秒），使用备用方案")
+            raise
         except Exception as e:
             logger.error(f"❌ AKShare获取港股信息失败: {e}")
             return {
@@ -341,57 +314,55 @@ class AKShareProvider:
         
         try:
             logger.info(f"🔍 开始获取{symbol}的AKShare财务数据")
+
+            # 财务报表按报告期保存，只有出现更新的报告期时才重新下载三大报表
+            from .fundamentals_store import get_fundamentals_store
+            from tradingagents.utils.run_profiler import record_span_metrics
+            store = get_fundamentals_store()
+            stored = store.get('akshare', symbol)
+            probe = None
+            if stored is not None:
+                if not store.needs_probe(stored):
+                    logger.info(f"📦 [财报库] 使用已保存的{symbol}财务数据: 报告期{stored['period']}")
+                    record_span_metrics(cache_hits=1)
+                    return stored['data']
+                # 只请求主要财务指标，探测是否有更新的报告期
+                try:
+                    probe = self.ak.stock_financial_abstract(symbol=symbol)
+                except Exception as e:
+                    logger.warning(f"⚠️ [财报库] {symbol}最新报告期探测失败，使用已保存数据: {e}")
+                    return stored['data']
+                probe_period = self._latest_report_period(probe)
+                if probe_period and probe_period <= stored['period']:
+                    logger.info(f"📦 [财报库] {symbol}无更新报告期({stored['period']})，复用已保存的报表")
+                    store.mark_checked('akshare', symbol, stored['period'])
+                    record_span_metrics(cache_hits=1)
+                    return dict(stored['data'], main_indicators=probe)
+            record_span_metrics(cache_misses=1)
             
+            # 主要财务指标和三大报表相互独立，并发获取，单个失败不影响其他结果
+            from .fetch_executor import fetch_concurrently
+            statements = {
+                'main_indicators': ('主要财务指标', self.ak.stock_financial_abstract),
+                'balance_sheet': ('资产负债表', self.ak.stock_balance_sheet_by_report_em),
+                'income_statement': ('利润表', self.ak.stock_profit_sheet_by_report_em),
+                'cash_flow': ('现金流量表', self.ak.stock_cash_flow_sheet_by_report_em),
+            }
+            tasks = {key: (lambda fetch=fetch: fetch(symbol=symbol)) for key, (_, fetch) in statements.items()}
+            if probe is not None:
+                tasks['main_indicators'] = lambda: probe
+            results, errors = fetch_concurrently(tasks)
+
             financial_data = {}
-            
-            # 1. 优先获取主要财务指标
-            try:
-                logger.debug(f"📊 尝试获取{symbol}主要财务指标...")
-                main_indicators = self.ak.stock_financial_abstract(symbol=symbol)
-                if main_indicators is not None and not main_indicators.empty:
-                    financial_data['main_indicators'] = main_indicators
-                    logger.info(f"✅ 成功获取{symbol}主要财务指标: {len(main_indicators)}条记录")
-                    logger.debug(f"主要财务指标列名: {list(main_indicators.columns)}")
-                else:
-                    logger.warning(f"⚠️ {symbol}主要财务指标为空")
-            except Exception as e:
-                logger.warning(f"❌ 获取{symbol}主要财务指标失败: {e}")
-            
-            # 2. 尝试获取资产负债表（可能失败，降级为debug日志）
-            try:
-                logger.debug(f"📊 尝试获取{symbol}资产负债表...")
-                balance_sheet = self.ak.stock_balance_sheet_by_report_em(symbol=symbol)
-                if balance_sheet is not None and not balance_sheet.empty:
-                    financial_data['balance_sheet'] = balance_sheet
-                    logger.debug(f"✅ 成功获取{symbol}资产负债表: {len(balance_sheet)}条记录")
-                else:
-                    logger.debug(f"⚠️ {symbol}资产负债表为空")
-            except Exception as e:
-                logger.debug(f"❌ 获取{symbol}资产负债表失败: {e}")
-            
-            # 3. 尝试获取利润表（可能失败，降级为debug日志）
-            try:
-                logger.debug(f"📊 尝试获取{symbol}利润表...")
-                income_statement = self.ak.stock_profit_sheet_by_report_em(symbol=symbol)
-                if income_statement is not None and not income_statement.empty:
-                    financial_data['income_statement'] = income_statement
-                    logger.debug(f"✅ 成功获取{symbol}利润表: {len(income_statement)}条记录")
-                else:
-                    logger.debug(f"⚠️ {symbol}利润表为空")
-            except Exception as e:
-                logger.debug(f"❌ 获取{symbol}利润表失败: {e}")
-            
-            # 4. 尝试获取现金流量表（可能失败，降级为debug日志）
-            try:
-                logger.debug(f"📊 尝试获取{symbol}现金流量表...")
-                cash_flow = self.ak.stock_cash_flow_sheet_by_report_em(symbol=symbol)
-                if cash_flow is not None and not cash_flow.empty:
-                    financial_data['cash_flow'] = cash_flow
-                    logger.debug(f"✅ 成功获取{symbol}现金流量表: {len(cash_flow)}条记录")
+            for key, (label, _) in statements.items():
+                data = results.get(key)
+                if data is not None and not data.empty:
+                    financial_data[key] = data
+                    logger.debug(f"✅ 成功获取{symbol}{label}: {len(data)}条记录")
+                elif key in errors:
+                    logger.debug(f"❌ 获取{symbol}{label}失败: {errors[key]}")
                 else:
-                    logger.debug(f"⚠️ {symbol}现金流量表为空")
-            except Exception as e:
-                logger.debug(f"❌ 获取{symbol}现金流量表失败: {e}")
+                    logger.debug(f"⚠️ {symbol}{label}为空")
             
             # 记录最终结果
             if financial_data:
@@ -399,6 +370,11 @@ class AKShareProvider:
                 for key, value in financial_data.items():
                     if hasattr(value, '__len__'):
                         logger.info(f"  - {key}: {len(value)}条记录")
+                # 三大报表齐全时才保存，避免部分失败的结果长期占用该报告期
+                period = self._latest_report_period(financial_data.get('main_indicators'))
+                if period and not errors:
+                    store.put('akshare', symbol, period, financial_data,
+                              ann_date=self._latest_notice_date(financial_data.get('balance_sheet')))
             else:
                 logger.warning(f"⚠️ 未能获取{symbol}的任何AKShare财务数据")
             
@@ -408,6 +384,23 @@ class AKShareProvider:
             logger.error(f"❌ AKShare获取{symbol}财务数据失败: {e}")
             return {}
 
+    @staticmethod
+    def _latest_report_period(main_indicators) -> Optional[str]:
+        """主要财务指标的列为报告期(YYYYMMDD)，取最新一期"""
+        if main_indicators is None or getattr(main_indicators, 'empty', True):
+            return None
+        periods = [str(column) for column in main_indicators.columns
+                   if str(column).isdigit() and len(str(column)) == 8]
+        return max(periods) if periods else None
+
+    @staticmethod
+    def _latest_notice_date(statement) -> Optional[str]:
+        """东方财富报表的公告日期(NOTICE_DATE)，取最新一期"""
+        if statement is None or getattr(statement, 'empty', True) or 'NOTICE_DATE' not in statement.columns:
+            return None
+        dates = pd.to_datetime(statement['NOTICE_DATE'], errors='coerce').dropna()
+        return dates.max().strftime('%Y%m%d') if not dates.empty else None
+
 def get_akshare_provider() -> AKShareProvider:
     """获取AKShare提供器实例"""
     return AKShareProvider()
@@ -425,7 +418,12 @@ def get_hk_stock_data_akshare(symbol: str, start_date: str = None, end_date: str
 
     Returns:
         str: 格式化的港股数据
+
+    Raises:
+        FetchTimeoutError: 调用超时
     """
+    from .fetch_executor import FetchTimeoutError
+
     try:
         provider = get_akshare_provider()
         data = provider.get_hk_stock_data(symbol, start_date, end_date)
@@ -435,6 +433,8 @@ def get_hk_stock_data_akshare(symbol: str, start_date: str = None, end_date: str
         else:
             return f"❌ 无法获取港股 {symbol} 的AKShare数据"
 
+    except FetchTimeoutError:
+        raise
     except Exception as e:
         return f"❌ AKShare港股数据获取失败: {e}"
 
@@ -448,10 +448,17 @@ def get_hk_stock_info_akshare(symbol: str) -> Dict[str, Any]:
 
     Returns:
         Dict: 港股信息
+
+    Raises:
+        FetchTimeoutError: 调用超时
     """
+    from .fetch_executor import FetchTimeoutError
+
     try:
         provider = get_akshare_provider()
         return provider.get_hk_stock_info(symbol)
+    except FetchTimeoutError:
+        raise
     except Exception as e:
         return {
             'symbol': symbol,
@@ -563,47 +570,19 @@ def get_stock_news_em(symbol: str, max_news: int = 10) -> pd.DataFrame:
 
         logger.info(f"[东方财富新闻] 📰 准备调用AKShare API获取个股新闻: {symbol}")
 
-        # 使用线程超时包装（兼容Windows）
-        import threading
-        import time
-
-        result = [None]
-        exception = [None]
-
-        def fetch_news():
-            try:
-                logger.debug(f"[东方财富新闻] 线程开始执行 stock_news_em API调用: {symbol}")
-                thread_start = time.time()
-                result[0] = provider.ak.stock_news_em(symbol=symbol)
-                thread_end = time.time()
-                logger.debug(f"[东方财富新闻] 线程执行完成，耗时: {thread_end - thread_start:.2f}秒")
-            except Exception as e:
-                logger.error(f"[东方财富新闻] 线程执行异常: {e}")
-                exception[0] = e
-
-        # 启动线程
-        thread = threading.Thread(target=fetch_news)
-        thread.daemon = True
-        logger.debug(f"[东方财富新闻] 启动线程获取新闻数据")
-        thread.start()
-
-        # 等待30秒
-        logger.debug(f"[东方财富新闻] 等待线程完成，最长等待30秒")
-        thread.join(timeout=30)
-
-        if thread.is_alive():
-            # 超时了
+        # 通过共享线程池调用（兼容Windows的超时保护，超时后不遗留线程）
+        from .fetch_executor import FetchTimeoutError, run_blocking
+
+        try:
+            news_df = run_blocking("akshare", provider.ak.stock_news_em, symbol=symbol, timeout=30)
+        except FetchTimeoutError:
             elapsed_time = (datetime.now() - start_time).total_seconds()
             logger.warning(f"[东方财富新闻] ⚠️ 获取超时（30秒）: {symbol}，总耗时: {elapsed_time:.2f}秒")
-            raise Exception(f"东方财富个股新闻获取超时（30秒）: {symbol}")
-        elif exception[0]:
-            # 有异常
+            raise
+        except Exception as e:
             elapsed_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"[东方财富新闻] ❌ API调用异常: {exception[0]}，总耗时: {elapsed_time:.2f}秒")
-            raise exception[0]
-        else:
-            # 成功
-            news_df = result[0]
+            logger.error(f"[东方财富新闻] ❌ API调用异常: {e}，总耗时: {elapsed_time:.2f}秒")
+            raise
 
         if news_df is not None and not news_df.empty:
             # 限制新闻数量为最新的max_news条
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+缓存数据编解码
+DataFrame写入Redis/MongoDB前编码为紧凑的二进制帧，按列保留dtype，读取时无需重新解析JSON
+
+帧格式: MAGIC | 头部长度(4字节) | 头部JSON(编码器名、行数、列名及dtype) | 编码器负载
+可选编码器:
+    arrow    Arrow IPC流 + zstd压缩（需要pyarrow）
+    columnar 按列的原始numpy缓冲区 + zstd/zlib压缩（仅依赖numpy，始终可用）
+    json     与旧版一致的 to_json(orient='records')，用于对比和兼容
+默认(auto)优先arrow，不可用时使用columnar；可通过环境变量 CACHE_CODEC 指定
+"""
+
+import io
+import json
+import os
+import struct
+import threading
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+FRAME_MAGIC = b"TACF"
+_HEADER_LENGTH = struct.Struct(">I")
+
+
+class CacheCodecError(ValueError):
+    """缓存帧无法编码或解码"""
+
+
+def frame_schema(df: pd.DataFrame) -> List[List[str]]:
+    """[[列名, dtype], ...]，写入帧头部和MongoDB文档，便于不解码就查看结构"""
+    return [[str(name), str(dtype)] for name, dtype in df.dtypes.items()]
+
+
+def _json_default(value):
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class _Compressor:
+    """zstd（已安装时）或zlib"""
+
+    def __init__(self, name: str):
+        if name == "zstd" and not ZSTD_AVAILABLE:
+            raise CacheCodecError("zstandard未安装，无法使用zstd压缩")
+        self.name = name
+
+    def compress(self, payload: bytes) -> bytes:
+        if self.name == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(payload)
+        return zlib.compress(payload, 1)
+
+    def decompress(self, payload: bytes) -> bytes:
+        if self.name == "zstd":
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return zlib.decompress(payload)
+
+
+class JsonCodec:
+    """旧版JSON记录格式（不保留dtype和索引）"""
+    name = "json"
+
+    def encode(self, df: pd.DataFrame) -> bytes:
+        return df.to_json(orient='records', date_format='iso').encode('utf-8')
+
+    def decode(self, payload: bytes) -> pd.DataFrame:
+        return pd.read_json(io.StringIO(payload.decode('utf-8')), orient='records')
+
+
+class ColumnarCodec:
+    """
+    按列编码：numpy原生dtype(数值/布尔/时间)直接保存缓冲区，带时区的时间转UTC后保存并记录时区，
+    其余(字符串/对象/扩展类型)按JSON数组保存并在解码时恢复dtype；非默认索引作为额外的列保存
+    """
+    name = "columnar"
+
+    def __init__(self, compression: Optional[str] = None):
+        self.compressor = _Compressor(compression or ("zstd" if ZSTD_AVAILABLE else "zlib"))
+
+    @staticmethod
+    def _has_default_index(df: pd.DataFrame) -> bool:
+        index = df.index
+        return (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1
+                and index.name is None)
+
+    def encode(self, df: pd.DataFrame) -> bytes:
+        if isinstance(df.columns, pd.MultiIndex) or not df.columns.is_unique:
+            raise CacheCodecError("columnar编码不支持多级或重复列名")
+        index_names = None
+        if not self._has_default_index(df):
+            index_names = list(df.index.names)
+            df = df.reset_index(names=[f"__index_level_{i}__" for i in range(len(index_names))])
+
+        columns, buffers, offset = [], [], 0
+        for name, series in df.items():
+            spec: Dict[str, Any] = {"name": name, "dtype": str(series.dtype)}
+            dtype = series.dtype
+            if isinstance(dtype, pd.DatetimeTZDtype):
+                spec.update(kind="tz", tz=str(dtype.tz))
+                buffer = series.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy("datetime64[ns]").tobytes()
+            elif isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+                spec["kind"] = "raw"
+                spec["dtype"] = dtype.str
+                buffer = np.ascontiguousarray(series.to_numpy()).tobytes()
+            else:
+                spec["kind"] = "json"
+                values = series.astype(object).where(series.notna(), None).tolist()
+                buffer = json.dumps(values, ensure_ascii=False, default=_json_default).encode('utf-8')
+            spec["offset"], spec["length"] = offset, len(buffer)
+            offset += len(buffer)
+            columns.append(spec)
+            buffers.append(buffer)
+
+        header = json.dumps({"rows": len(df), "columns": columns, "index": index_names,
+                             "compression": self.compressor.name}, ensure_ascii=False).encode('utf-8')
+        body = self.compressor.compress(b"".join(buffers))
+        return _HEADER_LENGTH.pack(len(header)) + header + body
+
+    def decode(self, payload: bytes) -> pd.DataFrame:
+        (header_length,) = _HEADER_LENGTH.unpack_from(payload)
+        header = json.loads(payload[_HEADER_LENGTH.size:_HEADER_LENGTH.size + header_length])
+        body = _Compressor(header["compression"]).decompress(payload[_HEADER_LENGTH.size + header_length:])
+
+        data = {}
+        for spec in header["columns"]:
+            buffer = body[spec["offset"]:spec["offset"] + spec["length"]]
+            if spec["kind"] == "raw":
+                data[spec["name"]] = np.frombuffer(buffer, dtype=np.dtype(spec["dtype"])).copy()
+            elif spec["kind"] == "tz":
+                values = pd.Series(np.frombuffer(buffer, dtype="datetime64[ns]").copy())
+                data[spec["name"]] = values.dt.tz_localize("UTC").dt.tz_convert(spec["tz"])
+            else:
+                values = pd.Series(json.loads(buffer), dtype=object)
+                if spec["dtype"] != "object":
+                    try:
+                        values = values.astype(spec["dtype"])
+                    except (TypeError, ValueError):
+                        pass  # 无法恢复的扩展类型保持为object
+                data[spec["name"]] = values
+
+        df = pd.DataFrame(data, index=pd.RangeIndex(header["rows"]))
+        if header["index"] is not None:
+            index_columns = [f"__index_level_{i}__" for i in range(len(header["index"]))]
+            df = df.set_index(index_columns)
+            df.index.names = header["index"]
+        return df
+
+
+class ArrowCodec:
+    """Arrow IPC流格式，schema中带有pandas元数据，可完整恢复dtype和索引"""
+    name = "arrow"
+
+    def __init__(self, compression: str = "zstd"):
+        if not ARROW_AVAILABLE:
+            raise CacheCodecError("pyarrow未安装，无法使用arrow编码")
+        self.compression = compression
+
+    def encode(self, df: pd.DataFrame) -> bytes:
+        table = pa.Table.from_pandas(df)
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def decode(self, payload: bytes) -> pd.DataFrame:
+        return pa.ipc.open_stream(pa.py_buffer(payload)).read_all().to_pandas()
+
+
+_codecs: Dict[str, Any] = {}
+_codecs_lock = threading.Lock()
+
+
+def get_cache_codec(name: Optional[str] = None):
+    """按名称获取编码器；auto 优先arrow，不可用时使用columnar"""
+    name = (name or os.getenv("CACHE_CODEC", "auto")).lower()
+    if name == "auto":
+        name = "arrow" if ARROW_AVAILABLE else "columnar"
+    codec = _codecs.get(name)
+    if codec is None:
+        with _codecs_lock:
+            codec = _codecs.get(name)
+            if codec is None:
+                factories = {"arrow": ArrowCodec, "columnar": ColumnarCodec, "json": JsonCodec}
+                if name not in factories:
+                    raise CacheCodecError(f"未知的缓存编码器: {name}")
+                codec = _codecs[name] = factories[name]()
+    return codec
+
+
+def encode_frame(df: pd.DataFrame, codec=None) -> bytes:
+    """
+    DataFrame编码为缓存帧；所选编码器不支持该DataFrame时退回json
+
+    Args:
+        codec: 编码器名称或实例，默认按 CACHE_CODEC 选择
+    """
+    if codec is None or isinstance(codec, str):
+        codec = get_cache_codec(codec)
+    try:
+        payload = codec.encode(df)
+    except Exception as e:
+        logger.warning(f"⚠️ [缓存编码] {codec.name}编码失败，使用json: {e}")
+        codec = get_cache_codec("json")
+        payload = codec.encode(df)
+    header = json.dumps({"codec": codec.name, "rows": len(df), "schema": frame_schema(df)},
+                        ensure_ascii=False).encode('utf-8')
+    return FRAME_MAGIC + _HEADER_LENGTH.pack(len(header)) + header + payload
+
+
+def is_encoded_frame(payload) -> bool:
+    return isinstance(payload, (bytes, bytearray, memoryview)) and bytes(payload[:len(FRAME_MAGIC)]) == FRAME_MAGIC
+
+
+def read_frame_header(payload: bytes) -> Dict[str, Any]:
+    """只读取帧头部（编码器、行数、列结构）"""
+    if not is_encoded_frame(payload):
+        raise CacheCodecError("不是缓存帧")
+    start = len(FRAME_MAGIC)
+    (header_length,) = _HEADER_LENGTH.unpack_from(payload, start)
+    start += _HEADER_LENGTH.size
+    return json.loads(bytes(payload[start:start + header_length]))
+
+
+def decode_frame(payload: bytes) -> pd.DataFrame:
+    """缓存帧解码为DataFrame"""
+    payload = bytes(payload)
+    header = read_frame_header(payload)
+    start = len(FRAME_MAGIC) + _HEADER_LENGTH.size + _HEADER_LENGTH.unpack_from(payload, len(FRAME_MAGIC))[0]
+    return get_cache_codec(header["codec"]).decode(payload[start:])
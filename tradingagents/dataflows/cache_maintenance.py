@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+缓存容量维护
+把过期和容量控制下沉到存储层，缓存大小在持续负载下保持平稳，无需在缓存管理页面手动清理：
+    MongoDB   各数据类型的文档写入 expires_at，集合上建立TTL索引，由服务端自动删除
+    文件缓存  按总字节数/条目数设置容量预算，超出时按最近访问时间淘汰（LRU）
+    后台压缩  守护线程定期执行各缓存注册的压缩任务（清理过期条目 + 容量淘汰）
+
+环境变量:
+    CACHE_RETENTION_DAYS_<DATA_TYPE>  MongoDB各数据类型的保留天数，如 CACHE_RETENTION_DAYS_NEWS_DATA=3
+    FILE_CACHE_MAX_MB                 单个文件缓存目录的容量上限，默认512，0表示不限制
+    FILE_CACHE_MAX_ENTRIES            单个文件缓存目录的条目上限，默认5000，0表示不限制
+    CACHE_COMPACTION_INTERVAL         后台压缩间隔秒数，默认600，0表示不启动后台压缩
+"""
+
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+try:
+    from pymongo.errors import OperationFailure
+except ImportError:
+    OperationFailure = Exception
+
+# MongoDB各数据类型默认保留天数：新闻时效性最强，基本面按季度变化保留更久
+DEFAULT_RETENTION_DAYS = {
+    "stock_data": 7,
+    "news_data": 3,
+    "fundamentals_data": 14,
+}
+TTL_INDEX_NAME = "expires_at_ttl"
+EVICTION_LOW_WATERMARK = 0.9  # 淘汰到上限的90%，避免每次写入都触发淘汰
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"⚠️ 环境变量 {name} 不是数字，使用默认值 {default}")
+        return default
+
+
+def get_retention_days(data_type: str) -> float:
+    """MongoDB中某数据类型的保留天数"""
+    return _env_number(f"CACHE_RETENTION_DAYS_{data_type.upper()}", DEFAULT_RETENTION_DAYS.get(data_type, 7))
+
+
+def compute_expires_at(data_type: str, created_at: datetime, min_ttl_seconds: Optional[int] = None) -> datetime:
+    """
+    文档过期时间：创建时间 + 保留天数；min_ttl_seconds 不为空时不早于该TTL
+    （行情数据按交易日历计算的有效期可能超过保留天数，例如长假期间）
+    """
+    ttl_seconds = get_retention_days(data_type) * 86400
+    if min_ttl_seconds:
+        ttl_seconds = max(ttl_seconds, min_ttl_seconds)
+    return created_at + timedelta(seconds=ttl_seconds)
+
+
+def ensure_ttl_index(collection, field_name: str = "expires_at") -> bool:
+    """
+    在集合上建立 expireAfterSeconds=0 的TTL索引，文档到达 field_name 的时间后由MongoDB后台删除
+
+    已存在同字段的普通索引时改为TTL索引（collMod），不影响已有数据
+    """
+    try:
+        collection.create_index([(field_name, 1)], expireAfterSeconds=0, name=TTL_INDEX_NAME)
+        return True
+    except OperationFailure as e:
+        error = e
+        try:
+            collection.database.command("collMod", collection.name,
+                                        index={"keyPattern": {field_name: 1}, "expireAfterSeconds": 0})
+            return True
+        except Exception:
+            pass
+    except Exception as e:
+        error = e
+    logger.warning(f"⚠️ [缓存维护] {collection.name} TTL索引创建失败: {error}")
+    return False
+
+
+def backfill_expires_at(collection, data_type: str) -> int:
+    """为旧版本写入的、缺少 expires_at 的文档补上过期时间（created_at + 保留天数），使TTL索引生效"""
+    retention_ms = int(get_retention_days(data_type) * 86400 * 1000)
+    try:
+        result = collection.update_many(
+            {"expires_at": {"$exists": False}, "created_at": {"$type": "date"}},
+            [{"$set": {"expires_at": {"$add": ["$created_at", retention_ms]}}}]
+        )
+        if result.modified_count:
+            logger.info(f"🗓️ [缓存维护] {collection.name} 补充过期时间: {result.modified_count} 条")
+        return result.modified_count
+    except Exception as e:
+        logger.warning(f"⚠️ [缓存维护] {collection.name} 补充过期时间失败: {e}")
+        return 0
+
+
+def touch_cache_file(path: Path):
+    """读取缓存后更新修改时间，作为LRU的最近访问时间（atime在noatime/relatime挂载下不可靠）"""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+@dataclass
+class FileCacheEntry:
+    """一个缓存条目：可能由多个文件组成（如数据文件 + 元数据文件）"""
+    key: str
+    paths: List[Path]
+    size: int
+    last_access: float
+
+
+class FileCacheBudget:
+    """
+    文件缓存容量预算
+    写入时累计字节数和条目数，超出上限后扫描目录，按最近访问时间从旧到新淘汰，直到回落到上限的90%
+    """
+
+    def __init__(self, name: str, scan: Callable[[], List[FileCacheEntry]],
+                 max_bytes: Optional[int] = None, max_entries: Optional[int] = None):
+        """
+        Args:
+            name: 日志中显示的缓存名称
+            scan: 列出全部缓存条目的函数
+            max_bytes: 容量上限，默认按 FILE_CACHE_MAX_MB，0表示不限制
+            max_entries: 条目上限，默认按 FILE_CACHE_MAX_ENTRIES，0表示不限制
+        """
+        self.name = name
+        self._scan = scan
+        self.max_bytes = int(_env_number("FILE_CACHE_MAX_MB", 512) * 1024 * 1024) if max_bytes is None else max_bytes
+        self.max_entries = int(_env_number("FILE_CACHE_MAX_ENTRIES", 5000)) if max_entries is None else max_entries
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # 首次写入时扫描一次，之后按写入累计
+        self._total_entries = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self.max_entries > 0
+
+    def _over_budget(self, total_bytes: int, total_entries: int, ratio: float = 1.0) -> bool:
+        return ((self.max_bytes > 0 and total_bytes > self.max_bytes * ratio)
+                or (self.max_entries > 0 and total_entries > self.max_entries * ratio))
+
+    def record_write(self, size: int, new_entry: bool = True) -> int:
+        """记录一次写入，超出预算时立即淘汰；返回淘汰的条目数"""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            if self._total_bytes is None:
+                entries = self._scan()
+                self._total_bytes = sum(entry.size for entry in entries)
+                self._total_entries = len(entries)
+            else:
+                self._total_bytes += size
+                self._total_entries += 1 if new_entry else 0
+            over = self._over_budget(self._total_bytes, self._total_entries)
+        return self.enforce() if over else 0
+
+    def enforce(self) -> int:
+        """扫描目录并按LRU淘汰到预算以内，返回淘汰的条目数"""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            entries = sorted(self._scan(), key=lambda entry: entry.last_access)
+            total_bytes = sum(entry.size for entry in entries)
+            total_entries = len(entries)
+            evicted = 0
+            if self._over_budget(total_bytes, total_entries):
+                for entry in entries:
+                    if not self._over_budget(total_bytes, total_entries, EVICTION_LOW_WATERMARK):
+                        break
+                    for path in entry.paths:
+                        try:
+                            path.unlink()
+                        except FileNotFoundError:
+                            pass
+                        except OSError as e:
+                            logger.warning(f"⚠️ [缓存维护] 删除缓存文件失败 {path}: {e}")
+                    total_bytes -= entry.size
+                    total_entries -= 1
+                    evicted += 1
+            self._total_bytes, self._total_entries = total_bytes, total_entries
+
+        if evicted:
+            logger.info(f"🧹 [缓存维护] {self.name} 超出容量预算，按LRU淘汰 {evicted} 个条目，"
+                        f"剩余 {total_entries} 个 / {total_bytes / (1024 * 1024):.1f} MB")
+        return evicted
+
+    def usage(self) -> Dict[str, float]:
+        """当前用量和上限，用于缓存统计"""
+        entries = self._scan()
+        return {
+            'entries': len(entries),
+            'size_mb': round(sum(entry.size for entry in entries) / (1024 * 1024), 2),
+            'max_entries': self.max_entries,
+            'max_size_mb': round(self.max_bytes / (1024 * 1024), 2),
+        }
+
+
+@dataclass
+class _CompactionTask:
+    name: str
+    callback: Callable[[], Optional[Callable[[], object]]]  # 弱引用，缓存对象被回收后任务自动失效
+
+
+class CacheCompactor:
+    """后台压缩线程：按固定间隔执行各缓存注册的压缩任务"""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = _env_number("CACHE_COMPACTION_INTERVAL", 600) if interval is None else interval
+        self._tasks: Dict[str, _CompactionTask] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, method: Callable[[], object]):
+        """
+        注册压缩任务（同名任务覆盖），并在需要时启动后台线程
+
+        Args:
+            method: 缓存对象的绑定方法，按弱引用保存，不会延长缓存对象的生命周期
+        """
+        callback = weakref.WeakMethod(method) if hasattr(method, "__self__") else (lambda: method)
+        with self._lock:
+            self._tasks[name] = _CompactionTask(name, callback)
+        self.start()
+
+    def run_once(self) -> Dict[str, object]:
+        """立即执行一次全部任务，返回各任务的结果"""
+        with self._lock:
+            tasks = list(self._tasks.values())
+        results = {}
+        for task in tasks:
+            method = task.callback()
+            if method is None:
+                with self._lock:
+                    self._tasks.pop(task.name, None)
+                continue
+            try:
+                results[task.name] = method()
+            except Exception as e:
+                logger.warning(f"⚠️ [缓存维护] 压缩任务 {task.name} 失败: {e}")
+        return results
+
+    def start(self) -> bool:
+        """启动后台线程（只启动一次）；间隔为0时不启动"""
+        if self.interval <= 0:
+            return False
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="cache-compactor", daemon=True)
+            self._thread.start()
+        logger.info(f"🧹 [缓存维护] 后台压缩已启动，间隔 {self.interval:.0f}s")
+        return True
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+
+_compactor: Optional[CacheCompactor] = None
+_compactor_lock = threading.Lock()
+
+
+def get_cache_compactor() -> CacheCompactor:
+    """获取全局后台压缩器"""
+    global _compactor
+    if _compactor is None:
+        with _compactor_lock:
+            if _compactor is None:
+                _compactor = CacheCompactor()
+    return _compactor
@@ -15,6 +15,9 @@ import hashlib
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.run_profiler import record_span_metrics
+from .market_calendar import bar_cache_expiry
+from .cache_maintenance import FileCacheBudget, FileCacheEntry, get_cache_compactor, touch_cache_file
 logger = get_logger('agents')
 
 
@@ -92,6 +95,11 @@ class StockDataCache:
             'enable_length_check': os.getenv('ENABLE_CACHE_LENGTH_CHECK', 'false').lower() == 'true'  # 文件缓存默认不限制
         }
 
+        # 文件缓存保留天数和容量预算，由后台压缩任务定期执行
+        self.max_age_days = float(os.getenv('FILE_CACHE_MAX_AGE_DAYS', '7'))
+        self.file_budget = FileCacheBudget(f"文件缓存({self.cache_dir})", self._scan_cache_entries)
+        get_cache_compactor().register(f"stock_data_cache:{self.cache_dir.resolve()}", self.compact)
+
         logger.info(f"📁 缓存管理器初始化完成，缓存目录: {self.cache_dir}")
         logger.info(f"🗄️ 数据库缓存管理器初始化完成")
         logger.info(f"   美股数据: ✅ 已配置")
@@ -209,13 +217,41 @@ class StockDataCache:
         return self.metadata_dir / f"{cache_key}_meta.json"
     
     def _save_metadata(self, cache_key: str, metadata: Dict[str, Any]):
-        """保存元数据"""
+        """保存元数据，并把数据文件和元数据计入容量预算"""
         metadata_path = self._get_metadata_path(cache_key)
         metadata_path.parent.mkdir(parents=True, exist_ok=True)  # 确保目录存在
         metadata['cached_at'] = datetime.now().isoformat()
+        is_new = not metadata_path.exists()
         
         with open(metadata_path, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+        try:
+            size = metadata_path.stat().st_size + Path(metadata['file_path']).stat().st_size
+        except (KeyError, OSError):
+            size = metadata_path.stat().st_size
+        self.file_budget.record_write(size, new_entry=is_new)
+
+    def _scan_cache_entries(self) -> List[FileCacheEntry]:
+        """列出全部缓存条目（元数据 + 数据文件），最近访问时间取两者中较晚的修改时间"""
+        entries = []
+        for metadata_file in self.metadata_dir.glob("*_meta.json"):
+            try:
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    file_path = json.load(f).get('file_path')
+            except Exception:
+                file_path = None
+            paths = [metadata_file]
+            if file_path and Path(file_path).exists():
+                paths.insert(0, Path(file_path))
+            try:
+                stats = [path.stat() for path in paths]
+            except FileNotFoundError:
+                continue
+            cache_key = metadata_file.name[:-len("_meta.json")]
+            entries.append(FileCacheEntry(cache_key, paths, sum(stat.st_size for stat in stats),
+                                          max(stat.st_mtime for stat in stats)))
+        return entries
     
     def _load_metadata(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """加载元数据"""
@@ -231,11 +267,23 @@ class StockDataCache:
             return None
     
     def is_cache_valid(self, cache_key: str, max_age_hours: int = None, symbol: str = None, data_type: str = None) -> bool:
-        """检查缓存是否有效 - 支持智能TTL配置"""
+        """检查缓存是否有效 - 支持智能TTL配置，行情数据未指定TTL时按交易日历判断"""
         metadata = self._load_metadata(cache_key)
         if not metadata:
             return False
 
+        cached_at = datetime.fromisoformat(metadata['cached_at'])
+        if max_age_hours is None and (data_type or metadata.get('data_type')) == 'stock_data':
+            expiry = bar_cache_expiry(symbol or metadata.get('symbol', ''), cached_at, metadata.get('end_date'))
+            if expiry is not None:
+                is_valid = datetime.now(expiry.tzinfo) < expiry
+                if is_valid:
+                    market_type = self._determine_market_type(metadata.get('symbol', ''))
+                    desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
+                    logger.info(f"✅ 缓存有效: {desc} - {metadata.get('symbol')} "
+                                f"(交易日历: 有效至 {expiry.strftime('%Y-%m-%d %H:%M %Z')})")
+                return is_valid
+
         # 如果没有指定TTL，根据数据类型和市场自动确定
         if max_age_hours is None:
             if symbol and data_type:
@@ -250,7 +298,6 @@ class StockDataCache:
                 cache_type = f"{market_type}_{data_type}"
                 max_age_hours = self.cache_config.get(cache_type, {}).get('ttl_hours', 24)
 
-        cached_at = datetime.fromisoformat(metadata['cached_at'])
         age = datetime.now() - cached_at
 
         is_valid = age.total_seconds() < max_age_hours * 3600
@@ -341,6 +388,7 @@ class StockDataCache:
         if not cache_path.exists():
             return None
         
+        touch_cache_file(cache_path)
         try:
             if metadata['file_format'] == 'csv':
                 return pd.read_csv(cache_path, index_col=0)
@@ -362,17 +410,14 @@ class StockDataCache:
             start_date: 开始日期
             end_date: 结束日期
             data_source: 数据源
-            max_age_hours: 最大缓存时间（小时），None时使用智能配置
+            max_age_hours: 最大缓存时间（小时），None时按交易日历判断
 
         Returns:
             cache_key: 如果找到有效缓存则返回缓存键，否则返回None
         """
         market_type = self._determine_market_type(symbol)
 
-        # 如果没有指定TTL，使用智能配置
-        if max_age_hours is None:
-            cache_type = f"{market_type}_stock_data"
-            max_age_hours = self.cache_config.get(cache_type, {}).get('ttl_hours', 24)
+        # 没有指定TTL时由 is_cache_valid 按交易日历（或市场默认TTL）判断
 
         # 生成查找键
         search_key = self._generate_cache_key("stock_data", symbol,
@@ -385,6 +430,7 @@ class StockDataCache:
         if self.is_cache_valid(search_key, max_age_hours, symbol, 'stock_data'):
             desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
             logger.info(f"🎯 找到精确匹配的{desc}: {symbol} -> {search_key}")
+            record_span_metrics(cache_hits=1)
             return search_key
 
         # 如果没有精确匹配，查找部分匹配（相同股票代码的其他缓存）
@@ -402,12 +448,14 @@ class StockDataCache:
                     if self.is_cache_valid(cache_key, max_age_hours, symbol, 'stock_data'):
                         desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
                         logger.info(f"📋 找到部分匹配的{desc}: {symbol} -> {cache_key}")
+                        record_span_metrics(cache_hits=1)
                         return cache_key
             except Exception:
                 continue
 
         desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
         logger.error(f"❌ 未找到有效的{desc}缓存: {symbol}")
+        record_span_metrics(cache_misses=1)
         return None
     
     def save_news_data(self, symbol: str, news_data: str, 
@@ -501,6 +549,7 @@ class StockDataCache:
         if not cache_path.exists():
             return None
         
+        touch_cache_file(cache_path)
         try:
             with open(cache_path, 'r', encoding='utf-8') as f:
                 return f.read()
@@ -543,12 +592,14 @@ class StockDataCache:
                     if self.is_cache_valid(cache_key, max_age_hours, symbol, 'fundamentals'):
                         desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
                         logger.info(f"🎯 找到匹配的{desc}缓存: {symbol} ({data_source}) -> {cache_key}")
+                        record_span_metrics(cache_hits=1)
                         return cache_key
             except Exception:
                 continue
         
         desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
         logger.error(f"❌ 未找到有效的{desc}缓存: {symbol} ({data_source})")
+        record_span_metrics(cache_misses=1)
         return None
     
     def clear_old_cache(self, max_age_days: int = 7):
@@ -576,6 +627,15 @@ class StockDataCache:
                 logger.warning(f"⚠️ 清理缓存时出错: {e}")
         
         logger.info(f"🧹 已清理 {cleared_count} 个过期缓存文件")
+        return cleared_count
+
+    def clear_expired_cache(self) -> int:
+        """清理超过保留天数（FILE_CACHE_MAX_AGE_DAYS，默认7天）的缓存"""
+        return self.clear_old_cache(self.max_age_days)
+
+    def compact(self) -> Dict[str, int]:
+        """后台压缩任务：清理超过保留天数的缓存，再按容量预算淘汰最久未访问的条目"""
+        return {'expired': self.clear_expired_cache(), 'evicted': self.file_budget.enforce()}
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
@@ -615,6 +675,8 @@ class StockDataCache:
                 continue
         
         stats['total_size_mb'] = round(stats['total_size_mb'], 2)
+        stats['max_size_mb'] = round(self.file_budget.max_bytes / (1024 * 1024), 2)
+        stats['max_files'] = self.file_budget.max_entries
         return stats
 
     def get_content_length_config_status(self) -> Dict[str, Any]:
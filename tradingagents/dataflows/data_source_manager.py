@@ -4,6 +4,8 @@
 统一管理中国股票数据源的选择和切换，支持Tushare、AKShare、BaoStock等
 """
 
+import importlib.util
+import logging
 import os
 import time
 from typing import Dict, List, Optional, Any
@@ -13,6 +15,7 @@ import pandas as pd
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.run_profiler import profiled, record_span_metrics
 logger = get_logger('agents')
 warnings.filterwarnings('ignore')
 
@@ -21,6 +24,44 @@ from tradingagents.utils.logging_init import setup_dataflow_logging
 logger = setup_dataflow_logging()
 
 
+def _is_package_installed(name: str) -> bool:
+    """检查包是否已安装而不导入它"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# 日线数据统一字段（与TushareDataAdapter标准化后的列名一致）
+DAILY_BAR_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume', 'amount', 'pct_change']
+_DAILY_BAR_ALIASES = {
+    'trade_date': 'date', '日期': 'date', 'Date': 'date',
+    '开盘': 'open', 'Open': 'open',
+    '最高': 'high', 'High': 'high',
+    '最低': 'low', 'Low': 'low',
+    '收盘': 'close', 'Close': 'close',
+    'vol': 'volume', '成交量': 'volume', 'Volume': 'volume',
+    '成交额': 'amount',
+    'pct_chg': 'pct_change', '涨跌幅': 'pct_change',
+}
+
+
+def normalize_daily_bars(data: pd.DataFrame) -> pd.DataFrame:
+    """将不同数据源的日线数据转换为统一字段，缓存和报告不再依赖具体数据源"""
+    if data is None or data.empty:
+        return pd.DataFrame(columns=DAILY_BAR_COLUMNS)
+    renamed = data.rename(columns={k: v for k, v in _DAILY_BAR_ALIASES.items()
+                                   if k in data.columns and v not in data.columns})
+    if 'date' not in renamed.columns and renamed.index.name in ('date', 'Date', 'trade_date'):
+        renamed = renamed.reset_index().rename(columns={renamed.index.name: 'date'})
+    normalized = pd.DataFrame({column: renamed[column] if column in renamed.columns else pd.NA
+                               for column in DAILY_BAR_COLUMNS})
+    normalized['date'] = pd.to_datetime(normalized['date'])
+    for column in DAILY_BAR_COLUMNS[1:]:
+        normalized[column] = pd.to_numeric(normalized[column], errors='coerce')
+    return normalized.sort_values('date').reset_index(drop=True)
+
+
 class ChinaDataSource(Enum):
     """中国股票数据源枚举"""
     TUSHARE = "tushare"
@@ -187,35 +228,32 @@ class DataSourceManager:
             return f"❌ 获取{symbol}股票信息失败: {e}"
     
     def _check_available_sources(self) -> List[ChinaDataSource]:
-        """检查可用的数据源"""
+        """检查可用的数据源（只查找包是否已安装，不导入，实际使用时才加载）"""
         available = []
         
         # 检查Tushare
-        try:
-            import tushare as ts
+        if _is_package_installed('tushare'):
             token = os.getenv('TUSHARE_TOKEN')
             if token:
                 available.append(ChinaDataSource.TUSHARE)
                 logger.info("✅ Tushare数据源可用")
             else:
                 logger.warning("⚠️ Tushare数据源不可用: 未设置TUSHARE_TOKEN")
-        except ImportError:
+        else:
             logger.warning("⚠️ Tushare数据源不可用: 库未安装")
         
         # 检查AKShare
-        try:
-            import akshare as ak
+        if _is_package_installed('akshare'):
             available.append(ChinaDataSource.AKSHARE)
             logger.info("✅ AKShare数据源可用")
-        except ImportError:
+        else:
             logger.warning("⚠️ AKShare数据源不可用: 库未安装")
         
         # 检查BaoStock
-        try:
-            import baostock as bs
+        if _is_package_installed('baostock'):
             available.append(ChinaDataSource.BAOSTOCK)
             logger.info(f"✅ BaoStock数据源可用")
-        except ImportError:
+        else:
             logger.warning(f"⚠️ BaoStock数据源不可用: 库未安装")
         
         return available
@@ -294,30 +332,39 @@ class DataSourceManager:
                        'event_type': 'data_fetch_start'
                    })
 
-        # 添加详细的股票代码追踪日志
-        logger.info(f"🔍 [股票代码追踪] DataSourceManager.get_stock_data 接收到的股票代码: '{symbol}' (类型: {type(symbol)})")
-        logger.info(f"🔍 [股票代码追踪] 股票代码长度: {len(str(symbol))}")
-        logger.info(f"🔍 [股票代码追踪] 股票代码字符: {list(str(symbol))}")
-        logger.info(f"🔍 [股票代码追踪] 当前数据源: {self.current_source.value}")
+        # 股票代码追踪（调试级别，%r可显示不可见字符）
+        logger.debug("🔍 [股票代码追踪] DataSourceManager.get_stock_data 接收到的股票代码: %r (类型: %s), 当前数据源: %s",
+                     symbol, type(symbol).__name__, self.current_source.value)
 
         start_time = time.time()
 
+        # 优先读取本地全市场日线库
+        local_result = self._get_eod_store_data(symbol, start_date, end_date)
+        if local_result:
+            return local_result
+
+        # 对冲模式：并发请求等价数据源，取最先返回的有效数据
+        from .hedged_request import is_hedging_enabled
+        if is_hedging_enabled():
+            hedged_result = self._get_hedged_data(symbol, start_date, end_date)
+            if hedged_result:
+                return hedged_result
+
+        source = None
         try:
-            # 根据数据源调用相应的获取方法
-            if self.current_source == ChinaDataSource.TUSHARE:
-                logger.info(f"🔍 [股票代码追踪] 调用 Tushare 数据源，传入参数: symbol='{symbol}'")
-                result = self._get_tushare_data(symbol, start_date, end_date)
-            elif self.current_source == ChinaDataSource.AKSHARE:
-                result = self._get_akshare_data(symbol, start_date, end_date)
-            elif self.current_source == ChinaDataSource.BAOSTOCK:
-                result = self._get_baostock_data(symbol, start_date, end_date)
+            # 按健康度选择数据源，熔断中的数据源直接跳过
+            source = self._select_source()
+            if source is None:
+                result = f"❌ 所有数据源均处于熔断状态，暂时无法获取{symbol}的数据"
             else:
-                result = f"❌ 不支持的数据源: {self.current_source.value}"
+                logger.debug("🔍 [股票代码追踪] 调用 %s 数据源，传入参数: symbol=%r", source.value, symbol)
+                result = self._fetch_from_source(source, symbol, start_date, end_date)
 
             # 记录详细的输出结果
             duration = time.time() - start_time
             result_length = len(result) if result else 0
-            is_success = result and "❌" not in result and "错误" not in result
+            is_success = self._is_valid_result(result)
+            source_name = source.value if source else 'none'
 
             if is_success:
                 logger.info(f"✅ [数据获取] 成功获取股票数据",
@@ -325,7 +372,7 @@ class DataSourceManager:
                                'symbol': symbol,
                                'start_date': start_date,
                                'end_date': end_date,
-                               'data_source': self.current_source.value,
+                               'data_source': source_name,
                                'duration': duration,
                                'result_length': result_length,
                                'result_preview': result[:200] + '...' if result_length > 200 else result,
@@ -338,7 +385,7 @@ class DataSourceManager:
                                   'symbol': symbol,
                                   'start_date': start_date,
                                   'end_date': end_date,
-                                  'data_source': self.current_source.value,
+                                  'data_source': source_name,
                                   'duration': duration,
                                   'result_length': result_length,
                                   'result_preview': result[:200] + '...' if result_length > 200 else result,
@@ -346,8 +393,8 @@ class DataSourceManager:
                               })
 
                 # 数据质量异常时也尝试降级到其他数据源
-                fallback_result = self._try_fallback_sources(symbol, start_date, end_date)
-                if fallback_result and "❌" not in fallback_result and "错误" not in fallback_result:
+                fallback_result = self._try_fallback_sources(symbol, start_date, end_date, exclude=source)
+                if self._is_valid_result(fallback_result):
                     logger.info(f"✅ [数据获取] 降级成功获取数据")
                     return fallback_result
                 else:
@@ -361,30 +408,145 @@ class DataSourceManager:
                             'symbol': symbol,
                             'start_date': start_date,
                             'end_date': end_date,
-                            'data_source': self.current_source.value,
+                            'data_source': source.value if source else 'none',
                             'duration': duration,
                             'error': str(e),
                             'event_type': 'data_fetch_exception'
                         }, exc_info=True)
-            return self._try_fallback_sources(symbol, start_date, end_date)
-    
+            return self._try_fallback_sources(symbol, start_date, end_date, exclude=source)
+
+    def _fetch_daily_frame(self, source: ChinaDataSource, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        从指定数据源获取日线DataFrame并转换为统一字段
+
+        数据源未连接、网络中断或超时时提供器抛出DataSourceUnavailableError，这里不捕获，
+        由对冲请求记录为数据源失败；正常应答但没有数据时返回空表
+        """
+        if source == ChinaDataSource.TUSHARE:
+            from .tushare_adapter import get_tushare_adapter
+            data = get_tushare_adapter().get_stock_data(symbol, start_date, end_date)
+        elif source == ChinaDataSource.AKSHARE:
+            from .akshare_utils import get_akshare_provider
+            data = get_akshare_provider().get_stock_data(symbol, start_date, end_date)
+        elif source == ChinaDataSource.BAOSTOCK:
+            from .baostock_utils import get_baostock_provider
+            data = get_baostock_provider().get_stock_data(symbol, start_date, end_date)
+        else:
+            raise ValueError(f"不支持的数据源: {source.value}")
+        return normalize_daily_bars(data)
+
+    @profiled("hedged")
+    def _get_hedged_data(self, symbol: str, start_date: str, end_date: str) -> Optional[str]:
+        """对冲请求：按健康度依次发出请求，统一字段后缓存为与数据源无关的结果"""
+        from functools import partial
+        from .hedged_request import hedged_call
+
+        cache = None
+        try:
+            from .cache_manager import get_cache
+            cache = get_cache()
+            cache_key = cache.find_cached_stock_data(symbol=symbol, start_date=start_date,
+                                                     end_date=end_date, data_source="unified")
+            if cache_key:
+                cached = cache.load_stock_data(cache_key)
+                if isinstance(cached, pd.DataFrame) and not cached.empty:
+                    return self._format_hedged_report(cached, symbol, start_date, end_date)
+        except Exception as e:
+            logger.debug(f"统一日线缓存不可用: {e}")
+
+        candidates = [(source.value, partial(self._fetch_daily_frame, source, symbol, start_date, end_date))
+                      for source in self._ranked_sources()]
+        winner, data = hedged_call(candidates, is_valid=lambda frame: frame is not None and not frame.empty)
+        if winner is None or data is None or data.empty:
+            logger.warning(f"⚠️ [对冲请求] 所有数据源均未返回{symbol}的有效数据，回退到顺序降级")
+            return None
+
+        data.attrs['source'] = winner
+        if cache is not None:
+            try:
+                cache.save_stock_data(symbol=symbol, data=data, start_date=start_date,
+                                      end_date=end_date, data_source="unified")
+            except Exception as e:
+                logger.warning(f"⚠️ 统一日线缓存保存失败: {e}")
+        return self._format_hedged_report(data, symbol, start_date, end_date)
+
+    def _format_hedged_report(self, data: pd.DataFrame, symbol: str, start_date: str, end_date: str) -> str:
+        from .eod_store import get_eod_store
+        stock_name = get_eod_store().get_stock_name(symbol) or f'股票{symbol}'
+        source = data.attrs.get('source', 'unified')
+        return self._format_daily_report(data, stock_name, symbol, start_date, end_date, f"{source}数据")
+
+    @staticmethod
+    def _is_valid_result(result: str) -> bool:
+        return bool(result) and "❌" not in result and "错误" not in result
+
+    def _candidate_sources(self, exclude: ChinaDataSource = None) -> List[ChinaDataSource]:
+        """候选数据源：当前数据源 + 可用的备用数据源（AKShare > Tushare > BaoStock）"""
+        candidates = [self.current_source] + [
+            source for source in (ChinaDataSource.AKSHARE, ChinaDataSource.TUSHARE, ChinaDataSource.BAOSTOCK)
+            if source != self.current_source and source in self.available_sources
+        ]
+        return [source for source in candidates if source != exclude]
+
+    def _ranked_sources(self, exclude: ChinaDataSource = None) -> List[ChinaDataSource]:
+        """按健康度排序候选数据源，当前配置的数据源在健康度接近时优先"""
+        from .source_health import get_source_health_registry
+        ranked = get_source_health_registry().rank(
+            [source.value for source in self._candidate_sources(exclude)],
+            preferred=self.current_source.value,
+        )
+        return [ChinaDataSource(name) for name in ranked]
+
+    def _select_source(self) -> Optional[ChinaDataSource]:
+        """选择最健康且熔断器允许调用的数据源"""
+        from .source_health import get_source_health_registry
+        registry = get_source_health_registry()
+        for source in self._ranked_sources():
+            if registry.allow(source.value):
+                if source != self.current_source:
+                    logger.info(f"🔀 [数据源路由] {self.current_source.value}健康度较低或熔断中，改用{source.value}")
+                return source
+        return None
+
+    def _fetch_from_source(self, source: ChinaDataSource, symbol: str, start_date: str, end_date: str) -> str:
+        """
+        调用指定数据源并记录成功率和延迟
+
+        只有异常计为数据源失败：数据源未连接、网络中断或超时时抛出DataSourceUnavailableError；
+        数据源正常应答但没有数据（代码错误、退市、停牌）计为成功调用，避免少量错误代码的查询把健康的数据源熔断
+        """
+        from .source_health import get_source_health_registry
+        registry = get_source_health_registry()
+        call_start = time.time()
+        try:
+            if source == ChinaDataSource.TUSHARE:
+                result = self._get_tushare_data(symbol, start_date, end_date)
+            elif source == ChinaDataSource.AKSHARE:
+                result = self._get_akshare_data(symbol, start_date, end_date)
+            elif source == ChinaDataSource.BAOSTOCK:
+                result = self._get_baostock_data(symbol, start_date, end_date)
+            else:
+                raise ValueError(f"不支持的数据源: {source.value}")
+        except Exception as e:
+            registry.record(source.value, False, time.time() - call_start, error=str(e))
+            raise
+
+        registry.record(source.value, True, time.time() - call_start)
+        return result
+
+    @profiled("tushare")
     def _get_tushare_data(self, symbol: str, start_date: str, end_date: str) -> str:
         """使用Tushare获取数据 - 直接调用适配器，避免循环调用"""
         logger.debug(f"📊 [Tushare] 调用参数: symbol={symbol}, start_date={start_date}, end_date={end_date}")
 
-        # 添加详细的股票代码追踪日志
-        logger.info(f"🔍 [股票代码追踪] _get_tushare_data 接收到的股票代码: '{symbol}' (类型: {type(symbol)})")
-        logger.info(f"🔍 [股票代码追踪] 股票代码长度: {len(str(symbol))}")
-        logger.info(f"🔍 [股票代码追踪] 股票代码字符: {list(str(symbol))}")
-        logger.info(f"🔍 [DataSourceManager详细日志] _get_tushare_data 开始执行")
-        logger.info(f"🔍 [DataSourceManager详细日志] 当前数据源: {self.current_source.value}")
+        logger.debug("🔍 [股票代码追踪] _get_tushare_data 接收到的股票代码: %r (类型: %s), 当前数据源: %s",
+                     symbol, type(symbol).__name__, self.current_source.value)
 
         start_time = time.time()
         try:
             # 直接调用适配器，避免循环调用interface
             from .tushare_adapter import get_tushare_adapter
-            logger.info(f"🔍 [股票代码追踪] 调用 tushare_adapter，传入参数: symbol='{symbol}'")
-            logger.info(f"🔍 [DataSourceManager详细日志] 开始调用tushare_adapter...")
+            logger.debug("🔍 [股票代码追踪] 调用 tushare_adapter，传入参数: symbol=%r", symbol)
 
             adapter = get_tushare_adapter()
             data = adapter.get_stock_data(symbol, start_date, end_date)
@@ -393,42 +555,13 @@ class DataSourceManager:
                 # 获取股票基本信息
                 stock_info = adapter.get_stock_info(symbol)
                 stock_name = stock_info.get('name', f'股票{symbol}') if stock_info else f'股票{symbol}'
-
-                # 计算最新价格和涨跌幅
-                latest_data = data.iloc[-1]
-                latest_price = latest_data.get('close', 0)
-                prev_close = data.iloc[-2].get('close', latest_price) if len(data) > 1 else latest_price
-                change = latest_price - prev_close
-                change_pct = (change / prev_close * 100) if prev_close != 0 else 0
-
-                # 格式化数据报告
-                result = f"📊 {stock_name}({symbol}) - Tushare数据\n"
-                result += f"数据期间: {start_date} 至 {end_date}\n"
-                result += f"数据条数: {len(data)}条\n\n"
-
-                result += f"💰 最新价格: ¥{latest_price:.2f}\n"
-                result += f"📈 涨跌额: {change:+.2f} ({change_pct:+.2f}%)\n\n"
-
-                # 添加统计信息
-                result += f"📊 价格统计:\n"
-                result += f"   最高价: ¥{data['high'].max():.2f}\n"
-                result += f"   最低价: ¥{data['low'].min():.2f}\n"
-                result += f"   平均价: ¥{data['close'].mean():.2f}\n"
-                # 防御性获取成交量数据
-                volume_value = self._get_volume_safely(data)
-                result += f"   成交量: {volume_value:,.0f}股\n"
-
-                return result
+                return self._format_daily_report(data, stock_name, symbol, start_date, end_date, "Tushare数据")
             else:
                 result = f"❌ 未获取到{symbol}的有效数据"
 
             duration = time.time() - start_time
-            logger.info(f"🔍 [DataSourceManager详细日志] interface调用完成，耗时: {duration:.3f}秒")
-            logger.info(f"🔍 [股票代码追踪] get_china_stock_data_tushare 返回结果前200字符: {result[:200] if result else 'None'}")
-            logger.info(f"🔍 [DataSourceManager详细日志] 返回结果类型: {type(result)}")
-            logger.info(f"🔍 [DataSourceManager详细日志] 返回结果长度: {len(result) if result else 0}")
-
-            logger.debug(f"📊 [Tushare] 调用完成: 耗时={duration:.2f}s, 结果长度={len(result) if result else 0}")
+            logger.debug("📊 [Tushare] 调用完成: 耗时=%.2fs, 结果长度=%d, 前200字符: %s",
+                         duration, len(result) if result else 0, result[:200] if result else 'None')
 
             return result
         except Exception as e:
@@ -440,6 +573,66 @@ class DataSourceManager:
             logger.error(f"❌ [DataSourceManager详细日志] 异常堆栈: {traceback.format_exc()}")
             raise
     
+    def _format_daily_report(self, data: pd.DataFrame, stock_name: str, symbol: str,
+                             start_date: str, end_date: str, source_label: str) -> str:
+        """格式化日线数据报告"""
+        # 计算最新价格和涨跌幅
+        latest_data = data.iloc[-1]
+        latest_price = latest_data.get('close', 0)
+        prev_close = data.iloc[-2].get('close', latest_price) if len(data) > 1 else latest_price
+        change = latest_price - prev_close
+        change_pct = (change / prev_close * 100) if prev_close != 0 else 0
+
+        # 格式化数据报告
+        result = f"📊 {stock_name}({symbol}) - {source_label}\n"
+        result += f"数据期间: {start_date} 至 {end_date}\n"
+        result += f"数据条数: {len(data)}条\n\n"
+
+        result += f"💰 最新价格: ¥{latest_price:.2f}\n"
+        result += f"📈 涨跌额: {change:+.2f} ({change_pct:+.2f}%)\n\n"
+
+        # 添加统计信息
+        result += f"📊 价格统计:\n"
+        result += f"   最高价: ¥{data['high'].max():.2f}\n"
+        result += f"   最低价: ¥{data['low'].min():.2f}\n"
+        result += f"   平均价: ¥{data['close'].mean():.2f}\n"
+        # 防御性获取成交量数据
+        volume_value = self._get_volume_safely(data)
+        result += f"   成交量: {volume_value:,.0f}股\n"
+
+        return result
+
+    @profiled("eod_store")
+    def _get_eod_store_data(self, symbol: str, start_date: str, end_date: str) -> Optional[str]:
+        """从本地全市场日线库读取数据，区间未完整入库时返回None"""
+        if not start_date or not end_date or not str(symbol).isdigit() or len(str(symbol)) != 6:
+            return None
+
+        from tradingagents.default_config import DEFAULT_CONFIG
+        if not DEFAULT_CONFIG.get("eod_store_enabled", True):
+            return None
+
+        try:
+            from .eod_store import get_eod_store
+            store = get_eod_store()
+            if store.is_empty() or not store.covers(start_date, end_date):
+                record_span_metrics(cache_misses=1)
+                return None
+
+            data = store.read_symbol(symbol, start_date, end_date)
+            if data.empty:
+                record_span_metrics(cache_misses=1)
+                return None
+
+            record_span_metrics(cache_hits=1)
+            stock_name = store.get_stock_name(symbol) or f'股票{symbol}'
+            logger.info(f"📦 [日线库] 本地读取{symbol}数据: {len(data)}条")
+            return self._format_daily_report(data, stock_name, symbol, start_date, end_date, "本地日线库数据")
+        except Exception as e:
+            logger.warning(f"⚠️ [日线库] 读取失败，回退到在线数据源: {e}")
+            return None
+
+    @profiled("akshare")
     def _get_akshare_data(self, symbol: str, start_date: str, end_date: str) -> str:
         """使用AKShare获取数据"""
         logger.debug(f"📊 [AKShare] 调用参数: symbol={symbol}, start_date={start_date}, end_date={end_date}")
@@ -494,8 +687,9 @@ class DataSourceManager:
         except Exception as e:
             duration = time.time() - start_time
             logger.error(f"❌ [AKShare] 调用失败: {e}, 耗时={duration:.2f}s", exc_info=True)
-            return f"❌ AKShare获取{symbol}数据失败: {e}"
+            raise  # 交给调用方记录数据源失败并降级
     
+    @profiled("baostock")
     def _get_baostock_data(self, symbol: str, start_date: str, end_date: str) -> str:
         """使用BaoStock获取数据"""
         # 这里需要实现BaoStock的统一接口
@@ -541,42 +735,33 @@ class DataSourceManager:
             logger.error(f"❌ 获取成交量失败: {e}")
             return 0
 
-    def _try_fallback_sources(self, symbol: str, start_date: str, end_date: str) -> str:
-        """尝试备用数据源 - 避免递归调用"""
-        logger.error(f"🔄 {self.current_source.value}失败，尝试备用数据源...")
+    def _try_fallback_sources(self, symbol: str, start_date: str, end_date: str,
+                              exclude: ChinaDataSource = None) -> str:
+        """尝试备用数据源 - 避免递归调用，按健康度排序并跳过熔断中的数据源"""
+        from .source_health import get_source_health_registry
+        exclude = exclude or self.current_source
+        logger.error(f"🔄 {exclude.value}失败，尝试备用数据源...")
+
+        registry = get_source_health_registry()
+        for source in self._ranked_sources(exclude=exclude):
+            if not registry.allow(source.value):
+                logger.info(f"⛔ 备用数据源{source.value}熔断中，跳过")
+                continue
+            try:
+                logger.info(f"🔄 尝试备用数据源: {source.value}")
 
-        # 备用数据源优先级: AKShare > Tushare > BaoStock
-        fallback_order = [
-            ChinaDataSource.AKSHARE,
-            ChinaDataSource.TUSHARE,
-            ChinaDataSource.BAOSTOCK
-        ]
+                # 直接调用具体的数据源方法，避免递归
+                result = self._fetch_from_source(source, symbol, start_date, end_date)
 
-        for source in fallback_order:
-            if source != self.current_source and source in self.available_sources:
-                try:
-                    logger.info(f"🔄 尝试备用数据源: {source.value}")
-
-                    # 直接调用具体的数据源方法，避免递归
-                    if source == ChinaDataSource.TUSHARE:
-                        result = self._get_tushare_data(symbol, start_date, end_date)
-                    elif source == ChinaDataSource.AKSHARE:
-                        result = self._get_akshare_data(symbol, start_date, end_date)
-                    elif source == ChinaDataSource.BAOSTOCK:
-                        result = self._get_baostock_data(symbol, start_date, end_date)
-                    else:
-                        logger.warning(f"⚠️ 未知数据源: {source.value}")
-                        continue
-
-                    if "❌" not in result:
-                        logger.info(f"✅ 备用数据源{source.value}获取成功")
-                        return result
-                    else:
-                        logger.warning(f"⚠️ 备用数据源{source.value}返回错误结果")
+                if self._is_valid_result(result):
+                    logger.info(f"✅ 备用数据源{source.value}获取成功")
+                    return result
+                else:
+                    logger.warning(f"⚠️ 备用数据源{source.value}返回错误结果")
 
-                except Exception as e:
-                    logger.error(f"❌ 备用数据源{source.value}也失败: {e}")
-                    continue
+            except Exception as e:
+                logger.error(f"❌ 备用数据源{source.value}也失败: {e}")
+                continue
         
         return f"❌ 所有数据源都无法获取{symbol}的数据"
     
@@ -809,24 +994,22 @@ def get_china_stock_data_unified(symbol: str, start_date: str, end_date: str) ->
     from tradingagents.utils.logging_init import get_logger
 
 
-    # 添加详细的股票代码追踪日志
-    logger.info(f"🔍 [股票代码追踪] data_source_manager.get_china_stock_data_unified 接收到的股票代码: '{symbol}' (类型: {type(symbol)})")
-    logger.info(f"🔍 [股票代码追踪] 股票代码长度: {len(str(symbol))}")
-    logger.info(f"🔍 [股票代码追踪] 股票代码字符: {list(str(symbol))}")
+    logger.debug("🔍 [股票代码追踪] data_source_manager.get_china_stock_data_unified 接收到的股票代码: %r (类型: %s), "
+                 "start_date=%r, end_date=%r", symbol, type(symbol).__name__, start_date, end_date)
 
     manager = get_data_source_manager()
-    logger.info(f"🔍 [股票代码追踪] 调用 manager.get_stock_data，传入参数: symbol='{symbol}', start_date='{start_date}', end_date='{end_date}'")
     result = manager.get_stock_data(symbol, start_date, end_date)
-    # 分析返回结果的详细信息
-    if result:
-        lines = result.split('\n')
-        data_lines = [line for line in lines if '2025-' in line and symbol in line]
-        logger.info(f"🔍 [股票代码追踪] 返回结果统计: 总行数={len(lines)}, 数据行数={len(data_lines)}, 结果长度={len(result)}字符")
-        logger.info(f"🔍 [股票代码追踪] 返回结果前500字符: {result[:500]}")
-        if len(data_lines) > 0:
-            logger.info(f"🔍 [股票代码追踪] 数据行示例: 第1行='{data_lines[0][:100]}', 最后1行='{data_lines[-1][:100]}'")
-    else:
-        logger.info(f"🔍 [股票代码追踪] 返回结果: None")
+    # 分析返回结果的详细信息（需要逐行扫描，只在调试级别启用时执行）
+    if logger.isEnabledFor(logging.DEBUG):
+        if result:
+            lines = result.split('\n')
+            data_lines = [line for line in lines if '2025-' in line and symbol in line]
+            logger.debug("🔍 [股票代码追踪] 返回结果统计: 总行数=%d, 数据行数=%d, 结果长度=%d字符, 前500字符: %s",
+                         len(lines), len(data_lines), len(result), result[:500])
+            if data_lines:
+                logger.debug("🔍 [股票代码追踪] 数据行示例: 第1行=%r, 最后1行=%r", data_lines[0][:100], data_lines[-1][:100])
+        else:
+            logger.debug("🔍 [股票代码追踪] 返回结果: None")
     return result
 
 
@@ -4,6 +4,7 @@ MongoDB + Redis 数据库缓存管理器
 提供高性能的股票数据缓存和持久化存储
 """
 
+import io
 import os
 import json
 import pickle
@@ -14,6 +15,10 @@ import pandas as pd
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.run_profiler import record_span_metrics
+from .market_calendar import bar_cache_ttl_seconds
+from .cache_codec import decode_frame, encode_frame, frame_schema, is_encoded_frame
+from .cache_maintenance import backfill_expires_at, compute_expires_at, ensure_ttl_index, get_retention_days
 logger = get_logger('agents')
 
 # MongoDB
@@ -34,9 +39,14 @@ except ImportError:
     REDIS_AVAILABLE = False
     logger.warning(f"⚠️ redis 未安装，Redis功能不可用")
 
+from ..config.connection_pool import get_pooled_mongodb_client, get_pooled_redis_client
+
 
 class DatabaseCacheManager:
     """MongoDB + Redis 数据库缓存管理器"""
+
+    # 缓存集合名即数据类型，保留天数见 cache_maintenance.get_retention_days
+    CACHE_COLLECTIONS = ("stock_data", "news_data", "fundamentals_data")
     
     def __init__(self,
                  mongodb_url: Optional[str] = None,
@@ -67,6 +77,7 @@ class DatabaseCacheManager:
         self.mongodb_client = None
         self.mongodb_db = None
         self.redis_client = None
+        self.redis_binary_client = None  # 二进制缓存帧使用，不做响应解码
         
         self._init_mongodb()
         self._init_redis()
@@ -81,7 +92,7 @@ class DatabaseCacheManager:
             return
         
         try:
-            self.mongodb_client = MongoClient(
+            self.mongodb_client = get_pooled_mongodb_client(
                 self.mongodb_url,
                 serverSelectionTimeoutMS=5000,  # 5秒超时
                 connectTimeoutMS=5000
@@ -106,8 +117,8 @@ class DatabaseCacheManager:
             return
         
         try:
-            self.redis_client = redis.from_url(
-                self.redis_url,
+            self.redis_client = get_pooled_redis_client(
+                url=self.redis_url,
                 db=self.redis_db,
                 socket_timeout=5,
                 socket_connect_timeout=5,
@@ -115,15 +126,23 @@ class DatabaseCacheManager:
             )
             # 测试连接
             self.redis_client.ping()
+            self.redis_binary_client = get_pooled_redis_client(
+                url=self.redis_url,
+                db=self.redis_db,
+                socket_timeout=5,
+                socket_connect_timeout=5,
+                decode_responses=False
+            )
             
             logger.info(f"✅ Redis连接成功: {self.redis_url}")
             
         except Exception as e:
             logger.error(f"❌ Redis连接失败: {e}")
             self.redis_client = None
+            self.redis_binary_client = None
     
     def _create_mongodb_indexes(self):
-        """创建MongoDB索引"""
+        """创建MongoDB索引（各集合在 expires_at 上建立TTL索引，过期文档由MongoDB自动删除）"""
         if self.mongodb_db is None:
             return
         
@@ -156,6 +175,12 @@ class DatabaseCacheManager:
             ])
             fundamentals_collection.create_index([("created_at", 1)])
             
+            # TTL索引：旧版本写入的文档先补上过期时间
+            for collection_name in self.CACHE_COLLECTIONS:
+                collection = self.mongodb_db[collection_name]
+                backfill_expires_at(collection, collection_name)
+                ensure_ttl_index(collection)
+            
             logger.info(f"✅ MongoDB索引创建完成")
             
         except Exception as e:
@@ -203,6 +228,8 @@ class DatabaseCacheManager:
                 market_type = "us"
         
         # 准备文档数据
+        created_at = datetime.utcnow()
+        ttl_seconds = bar_cache_ttl_seconds(symbol, end_date) or 6 * 3600
         doc = {
             "_id": cache_key,
             "symbol": symbol,
@@ -211,14 +238,16 @@ class DatabaseCacheManager:
             "start_date": start_date,
             "end_date": end_date,
             "data_source": data_source,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "created_at": created_at,
+            "updated_at": created_at,
+            "expires_at": compute_expires_at("stock_data", created_at, ttl_seconds)
         }
         
-        # 处理数据格式
+        # 处理数据格式：DataFrame编码为保留dtype的二进制缓存帧
         if isinstance(data, pd.DataFrame):
-            doc["data"] = data.to_json(orient='records', date_format='iso')
-            doc["data_format"] = "dataframe_json"
+            doc["data"] = encode_frame(data)
+            doc["data_format"] = "dataframe_frame"
+            doc["schema"] = frame_schema(data)
         else:
             doc["data"] = str(data)
             doc["data_format"] = "text"
@@ -232,42 +261,58 @@ class DatabaseCacheManager:
             except Exception as e:
                 logger.error(f"⚠️ MongoDB保存失败: {e}")
         
-        # 保存到Redis（快速缓存，6小时过期）
+        # 保存到Redis（快速缓存，按交易日历过期，未启用时6小时过期）
         if self.redis_client:
             try:
-                redis_data = {
-                    "data": doc["data"],
-                    "data_format": doc["data_format"],
-                    "symbol": symbol,
-                    "data_source": data_source,
-                    "created_at": doc["created_at"].isoformat()
-                }
-                self.redis_client.setex(
-                    cache_key,
-                    6 * 3600,  # 6小时过期
-                    json.dumps(redis_data, ensure_ascii=False)
-                )
-                logger.info(f"⚡ 股票数据已缓存到Redis: {symbol} -> {cache_key}")
+                self._cache_stock_doc_in_redis(cache_key, doc, ttl_seconds)
+                logger.info(f"⚡ 股票数据已缓存到Redis: {symbol} -> {cache_key} (TTL {ttl_seconds / 3600:.1f}h)")
             except Exception as e:
                 logger.error(f"⚠️ Redis缓存失败: {e}")
         
         return cache_key
     
+    def _cache_stock_doc_in_redis(self, cache_key: str, doc: Dict[str, Any], ttl_seconds: int):
+        """DataFrame缓存帧直接以二进制写入Redis，文本数据沿用JSON包装"""
+        if doc["data_format"] == "dataframe_frame" and self.redis_binary_client is not None:
+            self.redis_binary_client.setex(cache_key, ttl_seconds, doc["data"])
+            return
+        redis_data = {
+            "data": doc["data"],
+            "data_format": doc["data_format"],
+            "symbol": doc["symbol"],
+            "data_source": doc["data_source"],
+            "created_at": doc["created_at"].isoformat()
+        }
+        if doc["data_format"] == "dataframe_frame":
+            redis_data["data"] = decode_frame(doc["data"]).to_json(orient='records', date_format='iso')
+            redis_data["data_format"] = "dataframe_json"
+        self.redis_client.setex(cache_key, ttl_seconds, json.dumps(redis_data, ensure_ascii=False))
+
+    @staticmethod
+    def _decode_stock_data(data, data_format: str) -> Union[pd.DataFrame, str]:
+        if data_format == "dataframe_frame":
+            return decode_frame(data)
+        if data_format == "dataframe_json":
+            # 旧版缓存
+            return pd.read_json(io.StringIO(data), orient='records')
+        return data
+
     def load_stock_data(self, cache_key: str) -> Optional[Union[pd.DataFrame, str]]:
         """从Redis或MongoDB加载股票数据"""
         
         # 首先尝试从Redis加载（更快）
         if self.redis_client:
             try:
-                redis_data = self.redis_client.get(cache_key)
+                client = self.redis_binary_client if self.redis_binary_client is not None else self.redis_client
+                redis_data = client.get(cache_key)
                 if redis_data:
-                    data_dict = json.loads(redis_data)
                     logger.info(f"⚡ 从Redis加载数据: {cache_key}")
-                    
-                    if data_dict["data_format"] == "dataframe_json":
-                        return pd.read_json(data_dict["data"], orient='records')
-                    else:
-                        return data_dict["data"]
+                    if is_encoded_frame(redis_data):
+                        return decode_frame(redis_data)
+                    if isinstance(redis_data, bytes):
+                        redis_data = redis_data.decode('utf-8')
+                    data_dict = json.loads(redis_data)
+                    return self._decode_stock_data(data_dict["data"], data_dict["data_format"])
             except Exception as e:
                 logger.error(f"⚠️ Redis加载失败: {e}")
         
@@ -283,26 +328,12 @@ class DatabaseCacheManager:
                     # 同时更新到Redis缓存
                     if self.redis_client:
                         try:
-                            redis_data = {
-                                "data": doc["data"],
-                                "data_format": doc["data_format"],
-                                "symbol": doc["symbol"],
-                                "data_source": doc["data_source"],
-                                "created_at": doc["created_at"].isoformat()
-                            }
-                            self.redis_client.setex(
-                                cache_key,
-                                6 * 3600,
-                                json.dumps(redis_data, ensure_ascii=False)
-                            )
+                            self._cache_stock_doc_in_redis(cache_key, doc, 6 * 3600)
                             logger.info(f"⚡ 数据已同步到Redis缓存")
                         except Exception as e:
                             logger.error(f"⚠️ Redis同步失败: {e}")
                     
-                    if doc["data_format"] == "dataframe_json":
-                        return pd.read_json(doc["data"], orient='records')
-                    else:
-                        return doc["data"]
+                    return self._decode_stock_data(doc["data"], doc["data_format"])
                         
             except Exception as e:
                 logger.error(f"⚠️ MongoDB加载失败: {e}")
@@ -323,6 +354,7 @@ class DatabaseCacheManager:
         # 检查Redis中是否有精确匹配
         if self.redis_client and self.redis_client.exists(exact_key):
             logger.info(f"⚡ Redis中找到精确匹配: {symbol} -> {exact_key}")
+            record_span_metrics(cache_hits=1)
             return exact_key
         
         # 检查MongoDB中的匹配项
@@ -348,12 +380,14 @@ class DatabaseCacheManager:
                 if doc:
                     cache_key = doc["_id"]
                     logger.info(f"💾 MongoDB中找到匹配: {symbol} -> {cache_key}")
+                    record_span_metrics(cache_hits=1)
                     return cache_key
                     
             except Exception as e:
                 logger.error(f"⚠️ MongoDB查询失败: {e}")
         
         logger.error(f"❌ 未找到有效缓存: {symbol}")
+        record_span_metrics(cache_misses=1)
         return None
 
     def save_news_data(self, symbol: str, news_data: str,
@@ -377,6 +411,7 @@ class DatabaseCacheManager:
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
+        doc["expires_at"] = compute_expires_at("news_data", doc["created_at"])
 
         # 保存到MongoDB
         if self.mongodb_db is not None:
@@ -428,6 +463,7 @@ class DatabaseCacheManager:
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
+        doc["expires_at"] = compute_expires_at("fundamentals_data", doc["created_at"])
 
         # 保存到MongoDB
         if self.mongodb_db is not None:
@@ -469,13 +505,14 @@ class DatabaseCacheManager:
         # MongoDB统计
         if self.mongodb_db is not None:
             try:
-                for collection_name in ["stock_data", "news_data", "fundamentals_data"]:
+                for collection_name in self.CACHE_COLLECTIONS:
                     collection = self.mongodb_db[collection_name]
                     count = collection.count_documents({})
                     size = self.mongodb_db.command("collStats", collection_name).get("size", 0)
                     stats["mongodb"]["collections"][collection_name] = {
                         "count": count,
-                        "size_mb": round(size / (1024 * 1024), 2)
+                        "size_mb": round(size / (1024 * 1024), 2),
+                        "retention_days": get_retention_days(collection_name)
                     }
             except Exception as e:
                 logger.error(f"⚠️ MongoDB统计获取失败: {e}")
@@ -492,14 +529,17 @@ class DatabaseCacheManager:
         return stats
 
     def clear_old_cache(self, max_age_days: int = 7):
-        """清理过期缓存"""
+        """
+        手动清理早于 max_age_days 的缓存
+        日常过期由 expires_at 上的TTL索引在MongoDB服务端完成，这里只用于提前清理
+        """
         cutoff_time = datetime.utcnow() - timedelta(days=max_age_days)
         cleared_count = 0
 
         # 清理MongoDB
         if self.mongodb_db is not None:
             try:
-                for collection_name in ["stock_data", "news_data", "fundamentals_data"]:
+                for collection_name in self.CACHE_COLLECTIONS:
                     collection = self.mongodb_db[collection_name]
                     result = collection.delete_many({"created_at": {"$lt": cutoff_time}})
                     cleared_count += result.deleted_count
@@ -512,14 +552,15 @@ class DatabaseCacheManager:
         return cleared_count
 
     def close(self):
-        """关闭数据库连接"""
+        """释放数据库连接（连接归还共享连接池，由连接池注册表统一管理生命周期）"""
         if self.mongodb_client:
-            self.mongodb_client.close()
-            logger.info(f"🔒 MongoDB连接已关闭")
+            self.mongodb_client = None
+            self.mongodb_db = None
+            logger.info(f"🔒 MongoDB连接已释放")
 
         if self.redis_client:
-            self.redis_client.close()
-            logger.info(f"🔒 Redis连接已关闭")
+            self.redis_client = None
+            logger.info(f"🔒 Redis连接已释放")
 
 
 # 全局数据库缓存实例
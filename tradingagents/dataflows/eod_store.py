@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+A股全市场日线本地库
+每个交易日通过 Tushare daily/adj_factor/daily_basic 的 trade_date 接口一次拉取全市场数据，
+按日期分区写入本地列式文件，分析时按代码读取本地数据，避免逐只股票调用API
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+# 列式存储：优先Parquet（需要pyarrow或fastparquet），否则退回pickle分区
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pq = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import fastparquet  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = PYARROW_AVAILABLE
+
+PARTITION_SUFFIX = ".parquet" if PARQUET_AVAILABLE else ".pkl"
+
+DAILY_BASIC_FIELDS = (
+    "ts_code,turnover_rate,turnover_rate_f,volume_ratio,pe,pe_ttm,pb,ps,ps_ttm,"
+    "dv_ratio,dv_ttm,total_share,float_share,free_share,total_mv,circ_mv"
+)
+
+# 当日收盘数据通常在此时刻之后才完整可用
+EOD_READY_HOUR = 18
+
+
+def _normalize_date(value) -> str:
+    """统一为 YYYYMMDD 字符串"""
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return value.strftime('%Y%m%d')
+    return str(value).replace('-', '')[:8]
+
+
+def to_ts_code(symbol: str) -> str:
+    """6位A股代码转换为Tushare格式"""
+    symbol = str(symbol).replace('sh.', '').replace('sz.', '').upper()
+    if '.' in symbol:
+        return symbol
+    if symbol.startswith('6'):
+        return f"{symbol}.SH"
+    if symbol.startswith('8') or symbol.startswith('4'):
+        return f"{symbol}.BJ"
+    return f"{symbol}.SZ"
+
+
+def _write_json_atomic(path: Path, payload: Dict):
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+class EODStore:
+    """按交易日分区的全市场日线库
+
+    目录结构:
+        <root>/daily/<YYYY>/<YYYYMMDD>.parquet  全市场日线(含复权因子和每日指标)
+        <root>/stock_basic.parquet                股票列表(代码、名称)
+        <root>/manifest.json                      已入库日期及行数
+        <root>/calendar.json                      交易日历
+    """
+
+    def __init__(self, root: str = None):
+        if root is None:
+            from tradingagents.default_config import DEFAULT_CONFIG
+            root = DEFAULT_CONFIG["eod_store_dir"]
+        self.root = Path(root)
+        self._lock = threading.RLock()
+        self._manifest: Optional[Dict] = None
+        self._manifest_mtime = None
+        self._calendar: Optional[Dict] = None
+        self._calendar_mtime = None
+        self._names: Optional[Dict[str, str]] = None
+
+    # ------------------------------------------------------------------
+    # 元数据
+    # ------------------------------------------------------------------
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    @property
+    def calendar_path(self) -> Path:
+        return self.root / "calendar.json"
+
+    def _load_json(self, path: Path, cached: Optional[Dict], cached_mtime, default: Dict):
+        """按修改时间重新加载，入库任务可能在其他进程中运行"""
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return default, None
+        if cached is not None and cached_mtime == mtime:
+            return cached, cached_mtime
+        try:
+            return json.loads(path.read_text(encoding='utf-8')), mtime
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ 日线库元数据读取失败 {path}: {e}")
+            return default, None
+
+    def _get_manifest(self) -> Dict:
+        with self._lock:
+            self._manifest, self._manifest_mtime = self._load_json(
+                self.manifest_path, self._manifest, self._manifest_mtime, {'dates': {}})
+            return self._manifest
+
+    def _get_calendar(self) -> Dict:
+        with self._lock:
+            self._calendar, self._calendar_mtime = self._load_json(
+                self.calendar_path, self._calendar, self._calendar_mtime, {})
+            return self._calendar
+
+    def ingested_dates(self) -> List[str]:
+        return sorted(self._get_manifest().get('dates', {}))
+
+    def has_partition(self, trade_date) -> bool:
+        return _normalize_date(trade_date) in self._get_manifest().get('dates', {})
+
+    def is_empty(self) -> bool:
+        return not self._get_manifest().get('dates')
+
+    def save_calendar(self, start_date, end_date, open_dates: Iterable[str]):
+        """合并保存交易日历（start~end 区间内的开市日）"""
+        with self._lock:
+            calendar = dict(self._get_calendar())
+            start, end = _normalize_date(start_date), _normalize_date(end_date)
+            existing = set(calendar.get('open_dates', []))
+            if calendar:
+                # 只替换本次覆盖区间内的开市日
+                existing = {d for d in existing if d < start or d > end}
+                start = min(start, calendar['start'])
+                end = max(end, calendar['end'])
+            existing.update(_normalize_date(d) for d in open_dates)
+            self.root.mkdir(parents=True, exist_ok=True)
+            _write_json_atomic(self.calendar_path, {'start': start, 'end': end, 'open_dates': sorted(existing)})
+
+    def trading_days(self, start_date, end_date) -> Optional[List[str]]:
+        """返回区间内的开市日；日历未覆盖该区间时返回None"""
+        calendar = self._get_calendar()
+        start, end = _normalize_date(start_date), _normalize_date(end_date)
+        if not calendar or calendar['start'] > start or calendar['end'] < end:
+            return None
+        return [d for d in calendar.get('open_dates', []) if start <= d <= end]
+
+    def covers(self, start_date, end_date, now: datetime = None) -> bool:
+        """区间内所有已收盘的交易日是否都已入库"""
+        now = now or datetime.now()
+        today = now.strftime('%Y%m%d')
+        start = _normalize_date(start_date)
+        end = min(_normalize_date(end_date), today)
+        if start > end:
+            return False
+        days = self.trading_days(start, end)
+        if not days:
+            return False
+        if days[-1] == today and now.hour < EOD_READY_HOUR:
+            days = days[:-1]
+        ingested = self._get_manifest().get('dates', {})
+        return bool(days) and all(day in ingested for day in days)
+
+    # ------------------------------------------------------------------
+    # 分区读写
+    # ------------------------------------------------------------------
+    def _partition_path(self, trade_date: str) -> Path:
+        return self.root / "daily" / trade_date[:4] / f"{trade_date}{PARTITION_SUFFIX}"
+
+    def _write_frame(self, path: Path, frame: pd.DataFrame):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        if PARQUET_AVAILABLE:
+            # 按代码排序并使用较小的行组，读取单只股票时可按统计信息跳过行组
+            frame.to_parquet(tmp_path, index=False, row_group_size=512)
+        else:
+            frame.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_frame(path: Path) -> pd.DataFrame:
+        if path.suffix == ".parquet":
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def write_partition(self, trade_date, frame: pd.DataFrame):
+        """写入一个交易日的全市场数据并登记到manifest"""
+        trade_date = _normalize_date(trade_date)
+        frame = frame.copy()
+        frame['trade_date'] = trade_date
+        frame = frame.sort_values('ts_code').reset_index(drop=True)
+        self._write_frame(self._partition_path(trade_date), frame)
+
+        with self._lock:
+            manifest = dict(self._get_manifest())
+            dates = dict(manifest.get('dates', {}))
+            dates[trade_date] = {'rows': len(frame), 'ingested_at': datetime.now().isoformat(timespec='seconds')}
+            manifest['dates'] = dates
+            _write_json_atomic(self.manifest_path, manifest)
+
+    def read_partition(self, trade_date, ts_code: str = None) -> pd.DataFrame:
+        path = self._partition_path(_normalize_date(trade_date))
+        if not path.exists():
+            return pd.DataFrame()
+        frame = self._read_frame(path)
+        if ts_code is not None:
+            frame = frame[frame['ts_code'] == ts_code]
+        return frame
+
+    def read_symbol(self, symbol: str, start_date, end_date, adjust: str = "qfq") -> pd.DataFrame:
+        """读取单只股票区间日线，adjust='qfq'时按复权因子计算前复权价格"""
+        ts_code = to_ts_code(symbol)
+        start, end = _normalize_date(start_date), _normalize_date(end_date)
+        dates = [d for d in self.ingested_dates() if start <= d <= end]
+        paths = [p for p in (self._partition_path(d) for d in dates) if p.exists()]
+        if not paths:
+            return pd.DataFrame()
+
+        if PYARROW_AVAILABLE and paths[0].suffix == ".parquet":
+            table = pq.read_table([str(p) for p in paths], filters=[('ts_code', '=', ts_code)])
+            data = table.to_pandas()
+        else:
+            frames = [self._read_frame(p) for p in paths]
+            frames = [f[f['ts_code'] == ts_code] for f in frames]
+            data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+        if data.empty:
+            return data
+        data = data.sort_values('trade_date').reset_index(drop=True)
+        data['trade_date'] = pd.to_datetime(data['trade_date'], format='%Y%m%d')
+        if adjust == "qfq":
+            data = self._forward_adjust(data)
+        return data
+
+    @staticmethod
+    def _forward_adjust(data: pd.DataFrame) -> pd.DataFrame:
+        """前复权：价格 × 当日复权因子 / 最新复权因子"""
+        if 'adj_factor' not in data.columns or data['adj_factor'].isna().all():
+            return data
+        factors = data['adj_factor'].ffill().bfill()
+        ratio = factors / factors.iloc[-1]
+        for column in ('open', 'high', 'low', 'close'):
+            data[f'{column}_raw'] = data[column]
+            data[column] = data[column] * ratio
+        data['price_type'] = 'forward_adjusted'
+        return data
+
+    # ------------------------------------------------------------------
+    # 股票列表
+    # ------------------------------------------------------------------
+    def save_stock_basic(self, frame: pd.DataFrame):
+        self._write_frame(self.root / f"stock_basic{PARTITION_SUFFIX}", frame.reset_index(drop=True))
+        with self._lock:
+            self._names = None
+
+    def read_stock_basic(self) -> Optional[pd.DataFrame]:
+        """读取股票列表，尚未入库时返回None"""
+        path = self.root / f"stock_basic{PARTITION_SUFFIX}"
+        if not path.exists():
+            return None
+        return self._read_frame(path)
+
+    def get_stock_name(self, symbol: str) -> Optional[str]:
+        with self._lock:
+            if self._names is None:
+                basic = self.read_stock_basic()
+                if basic is None:
+                    return None
+                self._names = dict(zip(basic['ts_code'], basic['name']))
+            return self._names.get(to_ts_code(symbol))
+
+
+class EODIngestor:
+    """全市场日线入库任务：每个交易日3次请求，按日期增量回填"""
+
+    def __init__(self, api, store: EODStore = None, min_interval: float = 0.35, exchange: str = "SSE"):
+        self.api = api
+        self.store = store or get_eod_store()
+        self.min_interval = min_interval
+        self.exchange = exchange
+        self._last_call = 0.0
+
+    def _call(self, method: str, **kwargs) -> pd.DataFrame:
+        """调用Tushare接口并控制请求频率"""
+        wait = self.min_interval - (time.time() - self._last_call)
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            return getattr(self.api, method)(**kwargs)
+        finally:
+            self._last_call = time.time()
+
+    def sync_calendar(self, start_date, end_date) -> List[str]:
+        start, end = _normalize_date(start_date), _normalize_date(end_date)
+        calendar = self._call('trade_cal', exchange=self.exchange, start_date=start, end_date=end)
+        open_dates = []
+        if calendar is not None and not calendar.empty:
+            open_dates = sorted(calendar.loc[calendar['is_open'].astype(int) == 1, 'cal_date'].astype(str))
+        self.store.save_calendar(start, end, open_dates)
+        return open_dates
+
+    def refresh_stock_basic(self):
+        basic = self._call('stock_basic', exchange='', list_status='L', fields='ts_code,symbol,name,industry,market,list_date')
+        if basic is not None and not basic.empty:
+            self.store.save_stock_basic(basic)
+            logger.info(f"💾 [日线库] 股票列表已更新: {len(basic)}只")
+
+    def ingest_date(self, trade_date) -> int:
+        """拉取并写入单个交易日的全市场数据，返回行数"""
+        trade_date = _normalize_date(trade_date)
+        daily = self._call('daily', trade_date=trade_date)
+        if daily is None or daily.empty:
+            logger.warning(f"⚠️ [日线库] {trade_date} 无日线数据")
+            return 0
+
+        adj = self._call('adj_factor', trade_date=trade_date)
+        if adj is not None and not adj.empty:
+            daily = daily.merge(adj[['ts_code', 'adj_factor']], on='ts_code', how='left')
+        basic = self._call('daily_basic', trade_date=trade_date, fields=DAILY_BASIC_FIELDS)
+        if basic is not None and not basic.empty:
+            daily = daily.merge(basic, on='ts_code', how='left')
+
+        self.store.write_partition(trade_date, daily)
+        logger.info(f"💾 [日线库] {trade_date} 入库 {len(daily)} 条")
+        return len(daily)
+
+    def backfill(self, start_date, end_date=None, force: bool = False) -> Dict:
+        """回填区间内缺失的交易日（force=True时重新拉取已入库日期）"""
+        end = _normalize_date(end_date or datetime.now())
+        start = _normalize_date(start_date)
+        open_dates = self.sync_calendar(start, end)
+        today = datetime.now().strftime('%Y%m%d')
+        if datetime.now().hour < EOD_READY_HOUR:
+            open_dates = [d for d in open_dates if d < today]
+
+        pending = [d for d in open_dates if force or not self.store.has_partition(d)]
+        summary = {'trading_days': len(open_dates), 'ingested': 0, 'skipped': len(open_dates) - len(pending),
+                   'failed': [], 'rows': 0}
+        logger.info(f"🔄 [日线库] 回填 {start}~{end}: 待拉取 {len(pending)} 个交易日，已存在 {summary['skipped']} 个")
+
+        if pending:
+            self.refresh_stock_basic()
+        for trade_date in pending:
+            try:
+                rows = self.ingest_date(trade_date)
+                summary['rows'] += rows
+                summary['ingested'] += 1 if rows else 0
+            except Exception as e:
+                logger.error(f"❌ [日线库] {trade_date} 入库失败: {e}")
+                summary['failed'].append(trade_date)
+        return summary
+
+    def update(self, lookback_days: int = 365) -> Dict:
+        """增量更新：从最后入库日期(或lookback_days前)回填到今天"""
+        dates = self.store.ingested_dates()
+        if dates:
+            start = (datetime.strptime(dates[-1], '%Y%m%d') + timedelta(days=1)).strftime('%Y%m%d')
+        else:
+            start = (datetime.now() - timedelta(days=lookback_days)).strftime('%Y%m%d')
+        return self.backfill(start)
+
+
+_eod_store: Optional[EODStore] = None
+_eod_store_lock = threading.Lock()
+
+
+def get_eod_store() -> EODStore:
+    """获取全局日线库实例"""
+    global _eod_store
+    if _eod_store is None:
+        with _eod_store_lock:
+            if _eod_store is None:
+                _eod_store = EODStore()
+    return _eod_store
+
+
+def get_eod_ingestor(min_interval: float = 0.35) -> EODIngestor:
+    """使用全局Tushare连接创建入库任务"""
+    from .tushare_utils import get_tushare_provider
+    provider = get_tushare_provider()
+    if not provider.connected:
+        raise RuntimeError("Tushare未连接，请设置TUSHARE_TOKEN")
+    return EODIngestor(provider.api, get_eod_store(), min_interval=min_interval)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+数据获取共享线程池
+多个相互独立的HTTP请求（如三大财务报表）通过有界线程池并发执行，
+每个请求单独超时，失败或超时的请求不影响其他请求的结果；
+阻塞的数据源调用通过 run_blocking 提交到独立线程池，按数据源限制并发，
+并在HTTP会话层设置超时，避免超时后遗留的线程长期占用连接；
+超时后仍在运行的调用只占用独立线程池，不会挤占 fetch_concurrently 的工作线程
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+DEFAULT_FETCH_TIMEOUT = float(os.getenv('DATA_FETCH_TIMEOUT', '30'))
+MAX_INFLIGHT_PER_PROVIDER = int(os.getenv('DATA_FETCH_MAX_INFLIGHT_PER_PROVIDER', '4'))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """获取全局数据获取线程池（线程数由 DATA_FETCH_MAX_WORKERS 控制）"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=int(os.getenv('DATA_FETCH_MAX_WORKERS', '8')),
+                                               thread_name_prefix="data_fetch")
+    return _executor
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """获取阻塞数据源调用专用线程池（线程数由 DATA_FETCH_BLOCKING_WORKERS 控制）"""
+    global _blocking_executor
+    if _blocking_executor is None:
+        with _executor_lock:
+            if _blocking_executor is None:
+                _blocking_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv('DATA_FETCH_BLOCKING_WORKERS', '8')),
+                    thread_name_prefix="blocking_fetch")
+    return _blocking_executor
+
+
+def fetch_concurrently(tasks: Dict[str, Callable[[], Any]],
+                       timeout: float = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    并发执行多个独立的获取任务
+
+    Args:
+        tasks: 任务名称 -> 无参获取函数
+        timeout: 单个任务超时（秒），从提交时开始计算
+
+    Returns:
+        (成功结果, 失败原因)：超时或异常的任务只出现在失败原因中
+    """
+    timeout = timeout or DEFAULT_FETCH_TIMEOUT
+    executor = get_fetch_executor()
+    submitted_at = time.time()
+    # 复制上下文，保证剖析span等ContextVar在工作线程中可见
+    pending: Dict[Future, str] = {
+        executor.submit(contextvars.copy_context().run, fetch): name for name, fetch in tasks.items()
+    }
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    deadline = submitted_at + timeout
+
+    while pending:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        done, _ = wait(list(pending), timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = pending.pop(future)
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+
+    for future, name in pending.items():
+        future.cancel()
+        errors[name] = f"超时({timeout:.0f}s)"
+    if errors:
+        logger.warning(f"⚠️ [并发获取] {len(errors)}/{len(tasks)}个请求失败: {errors}")
+    logger.debug(f"⚡ [并发获取] {len(tasks)}个请求完成，耗时{time.time() - submitted_at:.2f}s")
+    return results, errors
+
+
+class FetchTimeoutError(TimeoutError):
+    """数据源调用超时（包括等待并发名额超时）"""
+
+
+# 工作线程内未显式指定timeout的requests调用使用的超时（秒）
+_request_timeout: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar('request_timeout', default=None)
+_guard_installed = False
+_guard_lock = threading.Lock()
+
+
+def _install_request_timeout_guard():
+    """
+    为requests会话补充默认超时
+
+    AKShare等第三方库内部调用requests时不传timeout，连接挂起后线程永远不会结束；
+    只在 run_blocking 提交的任务中生效，其他调用保持原有行为
+    """
+    global _guard_installed
+    if _guard_installed:
+        return
+    with _guard_lock:
+        if _guard_installed:
+            return
+        try:
+            import requests
+        except ImportError:
+            _guard_installed = True
+            return
+
+        original_request = requests.Session.request
+
+        def request_with_timeout(session, method, url, **kwargs):
+            timeout = _request_timeout.get()
+            if timeout is not None and kwargs.get('timeout') is None:
+                kwargs['timeout'] = timeout
+            return original_request(session, method, url, **kwargs)
+
+        requests.Session.request = request_with_timeout
+        _guard_installed = True
+
+
+class ProviderLimiter:
+    """单个数据源的并发名额和调用统计"""
+
+    def __init__(self, provider: str, max_in_flight: int):
+        self.provider = provider
+        self.max_in_flight = max_in_flight
+        self.slots = threading.BoundedSemaphore(max_in_flight)
+        self.lock = threading.Lock()
+        self.waiting = 0
+        self.queued = 0
+        self.running = 0
+        self.abandoned = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'provider': self.provider,
+                'max_in_flight': self.max_in_flight,
+                'in_flight': self.queued + self.running,
+                'waiting': self.waiting,
+                'max_queue_depth': self.max_queue_depth,
+                'completed': self.completed,
+                'failed': self.failed,
+                'timeouts': self.timeouts,
+                'rejected': self.rejected,
+                'leaked': self.abandoned,
+            }
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_provider_limiter(provider: str) -> ProviderLimiter:
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(provider)
+            if limiter is None:
+                limiter = _limiters[provider] = ProviderLimiter(provider, MAX_INFLIGHT_PER_PROVIDER)
+    return limiter
+
+
+def get_fetch_metrics() -> List[Dict[str, Any]]:
+    """各数据源的在途请求、排队深度、超时和遗留（超时后仍在运行）线程数"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [limiter.snapshot() for limiter in limiters]
+
+
+def run_blocking(provider: str, fetch: Callable[..., Any], *args, timeout: float = None, **kwargs) -> Any:
+    """
+    在阻塞调用专用线程池中执行数据源调用
+
+    Args:
+        provider: 数据源名称，用于并发限制和统计
+        fetch: 阻塞调用
+        timeout: 总超时（秒），包括等待并发名额的时间；同时作为HTTP请求的连接/读取超时
+
+    Raises:
+        FetchTimeoutError: 等待名额或调用超时；超时的调用由会话层超时终止，其名额在真正结束后才释放
+    """
+    timeout = timeout or DEFAULT_FETCH_TIMEOUT
+    _install_request_timeout_guard()
+    limiter = get_provider_limiter(provider)
+    deadline = time.time() + timeout
+
+    with limiter.lock:
+        limiter.waiting += 1
+    acquired = limiter.slots.acquire(timeout=timeout)
+    with limiter.lock:
+        limiter.waiting -= 1
+        if not acquired:
+            limiter.rejected += 1
+    if not acquired:
+        raise FetchTimeoutError(f"{provider}并发请求已满({limiter.max_in_flight})，等待{timeout:.0f}秒超时")
+
+    state = {'abandoned': False, 'finished': False}
+
+    def task():
+        with limiter.lock:
+            limiter.queued -= 1
+            limiter.running += 1
+        _request_timeout.set(max(1.0, deadline - time.time()))
+        failed = True
+        try:
+            result = fetch(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            # 在结果交给调用方之前完成统计并释放名额
+            with limiter.lock:
+                limiter.running -= 1
+                state['finished'] = True
+                if state['abandoned']:
+                    limiter.abandoned -= 1
+                elif failed:
+                    limiter.failed += 1
+                else:
+                    limiter.completed += 1
+            limiter.slots.release()
+
+    def on_cancelled(future: Future):
+        if future.cancelled():
+            with limiter.lock:
+                limiter.queued -= 1
+            limiter.slots.release()
+
+    with limiter.lock:
+        limiter.queued += 1
+        limiter.max_queue_depth = max(limiter.max_queue_depth, limiter.queued)
+    future = get_blocking_executor().submit(contextvars.copy_context().run, task)
+    future.add_done_callback(on_cancelled)
+
+    try:
+        return future.result(timeout=max(0.0, deadline - time.time()))
+    except FutureTimeoutError:
+        # 取消会同步触发完成回调，需在持锁之前执行
+        cancelled = future.cancel()
+        with limiter.lock:
+            limiter.timeouts += 1
+            if not cancelled and not state['finished']:
+                state['abandoned'] = True
+                limiter.abandoned += 1
+            leaked = limiter.abandoned
+        logger.warning(f"⚠️ [数据源线程池] {provider}调用超时({timeout:.0f}s)，超时后仍在运行的调用: {leaked}")
+        raise FetchTimeoutError(f"{provider}调用超时（{timeout:.0f}秒）")
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Finnhub本地数据日期索引库
+每个(股票, 数据类型[, 报告周期])保存为一对紧凑文件：按日期排序、每天一行JSON的数据文件，
+以及记录日期、字节偏移和长度的索引；区间查询二分定位日期后，从内存映射中只切出命中的连续字节，
+耗时与结果大小成正比，不再为每次查询完整解析整个 *_data_formatted.json
+"""
+
+import bisect
+import json
+import mmap
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+STORE_DIRNAME = ".store"
+INDEX_VERSION = 1
+
+
+def _write_atomic(path: Path, payload: bytes):
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def _file_signature(path: Path) -> Optional[List]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _item_date(item: Dict[str, Any], data_type: str) -> Optional[str]:
+    """API原始条目的归属日期"""
+    if data_type == "insider_senti" and "year" in item and "month" in item:
+        return f"{int(item['year']):04d}-{int(item['month']):02d}-01"
+    for key in ("filingDate", "transactionDate", "date", "filedDate", "acceptedDate"):
+        value = item.get(key)
+        if value:
+            return str(value)[:10]
+    timestamp = item.get("datetime")
+    if isinstance(timestamp, (int, float)) and timestamp > 0:
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+    return None
+
+
+def normalize_finnhub_data(data: Any, data_type: str) -> Dict[str, List]:
+    """
+    统一为 {YYYY-MM-DD: [条目, ...]}
+
+    支持已按日期整理的格式化文件，以及下载脚本保存的API原始响应（新闻列表、{"data": [...]}）
+    """
+    if isinstance(data, dict) and not isinstance(data.get("data"), list):
+        return {str(key): value for key, value in data.items() if isinstance(value, list)}
+
+    items = data.get("data", []) if isinstance(data, dict) else data
+    grouped: Dict[str, List] = defaultdict(list)
+    for item in items or []:
+        if isinstance(item, dict):
+            date = _item_date(item, data_type)
+            if date:
+                grouped[date].append(item)
+    return dict(grouped)
+
+
+def filter_range(data_by_date: Dict[str, List], start_date: str, end_date: str) -> Dict[str, List]:
+    """在内存中按日期过滤（闭区间，空日期不返回），索引库不可写时使用"""
+    return {date: data_by_date[date] for date in sorted(data_by_date)
+            if start_date <= date <= end_date and data_by_date[date]}
+
+
+class _Series:
+    """一个(股票, 数据类型)的已加载索引；数据文件在查询时内存映射，只切出命中的字节"""
+
+    def __init__(self, index: Dict, data_path: Path):
+        self.dates: List[str] = index["dates"]
+        self.offsets: List[int] = index["offsets"]
+        self.lengths: List[int] = index["lengths"]
+        self.source = index.get("source")
+        self.data_path = data_path
+
+    def range(self, start_date: str, end_date: str) -> Dict[str, List]:
+        lo = bisect.bisect_left(self.dates, start_date)
+        hi = bisect.bisect_right(self.dates, end_date)
+        if lo >= hi:
+            return {}
+        begin = self.offsets[lo]
+        end = self.offsets[hi - 1] + self.lengths[hi - 1]
+        with open(self.data_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            chunk = mapped[begin:end]
+        return {date: json.loads(line) for date, line in zip(self.dates[lo:hi], chunk.splitlines())}
+
+
+class FinnhubStore:
+    """按日期索引的Finnhub数据库
+
+    目录结构:
+        <data_dir>/finnhub_data/.store/<数据类型>/<股票>[_<周期>].<写入时间>.jsonl  每个日期一行（条目列表的紧凑JSON）
+        <data_dir>/finnhub_data/.store/<数据类型>/<股票>[_<周期>].idx              日期、偏移、长度、数据文件名和来源文件签名
+    """
+
+    def __init__(self, data_dir: str):
+        self.data_dir = Path(data_dir)
+        self.root = self.data_dir / "finnhub_data" / STORE_DIRNAME
+        self._lock = threading.Lock()
+        self._series: Dict[Path, Tuple[List, _Series]] = {}
+        # 数据目录只读（如Docker只读卷）时不再尝试入库，直接过滤格式化JSON
+        self.writable = True
+
+    @staticmethod
+    def _name(ticker: str, period: str = None) -> str:
+        return f"{ticker}_{period}" if period else ticker
+
+    def source_path(self, ticker: str, data_type: str, period: str = None) -> Path:
+        """下载脚本保存的格式化JSON文件"""
+        return self.data_dir / "finnhub_data" / data_type / f"{self._name(ticker, period)}_data_formatted.json"
+
+    def _index_path(self, ticker: str, data_type: str, period: str = None) -> Path:
+        return self.root / data_type / f"{self._name(ticker, period)}.idx"
+
+    def write(self, ticker: str, data_type: str, data_by_date: Dict[str, List], period: str = None,
+              source: List = None):
+        """
+        写入(覆盖)一个序列；空日期不入库
+
+        每次写入新的数据文件(文件名带写入时间)再替换索引，正在读取旧索引的查询仍能读到完整的旧数据
+        """
+        index_path = self._index_path(ticker, data_type, period)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        data_name = f"{self._name(ticker, period)}.{time.time_ns()}.jsonl"
+
+        dates, offsets, lengths, chunks = [], [], [], []
+        offset = 0
+        for date in sorted(data_by_date):
+            entries = data_by_date[date]
+            if not entries:
+                continue
+            line = json.dumps(entries, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            dates.append(date)
+            offsets.append(offset)
+            lengths.append(len(line))
+            chunks.append(line + b"\n")
+            offset += len(line) + 1
+
+        index = {"version": INDEX_VERSION, "data_file": data_name, "dates": dates, "offsets": offsets,
+                 "lengths": lengths, "source": source}
+        previous = self._read_index(index_path)
+        _write_atomic(index_path.parent / data_name, b"".join(chunks))
+        _write_atomic(index_path, json.dumps(index).encode("utf-8"))
+        if previous and previous.get("data_file") != data_name:
+            try:
+                (index_path.parent / previous["data_file"]).unlink()
+            except OSError:
+                pass  # Windows下仍被读取时无法删除，下次写入再清理
+        logger.debug(f"💾 [Finnhub索引] {ticker} {data_type}: {len(dates)}个日期, {offset}字节")
+
+    @staticmethod
+    def _read_index(index_path: Path) -> Optional[Dict]:
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ [Finnhub索引] 索引读取失败 {index_path}: {e}")
+            return None
+        return index if index.get("version") == INDEX_VERSION else None
+
+    def _load_source(self, ticker: str, data_type: str, period: str = None) -> Optional[Tuple[List, Dict[str, List]]]:
+        """读取格式化JSON文件，返回(文件签名, 按日期整理的数据)；文件不存在或无法解析时返回None"""
+        source_path = self.source_path(ticker, data_type, period)
+        signature = _file_signature(source_path)
+        if signature is None:
+            return None
+        try:
+            with open(source_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ [Finnhub索引] 读取{source_path}失败: {e}")
+            return None
+        return signature, normalize_finnhub_data(data, data_type)
+
+    def import_json(self, ticker: str, data_type: str, period: str = None) -> bool:
+        """把格式化JSON文件转换入库，返回是否成功"""
+        source = self._load_source(ticker, data_type, period)
+        if source is None:
+            return False
+        signature, data_by_date = source
+        self.write(ticker, data_type, data_by_date, period, source=signature)
+        return True
+
+    def _open(self, ticker: str, data_type: str, period: str = None) -> Optional[_Series]:
+        """加载序列索引（按索引文件签名缓存）；来源JSON在入库后有变化时视为过期"""
+        index_path = self._index_path(ticker, data_type, period)
+        signature = _file_signature(index_path)
+        if signature is None:
+            return None
+        with self._lock:
+            cached = self._series.get(index_path)
+            if cached is None or cached[0] != signature:
+                index = self._read_index(index_path)
+                if index is None:
+                    return None
+                cached = self._series[index_path] = (signature, _Series(index, index_path.parent / index["data_file"]))
+        series = cached[1]
+        source_signature = _file_signature(self.source_path(ticker, data_type, period))
+        if source_signature is not None and series.source != source_signature:
+            return None
+        return series
+
+    def get_range(self, ticker: str, data_type: str, start_date: str, end_date: str,
+                  period: str = None) -> Optional[Dict[str, List]]:
+        """
+        区间查询 {日期: 条目列表}（闭区间）
+
+        索引不存在或落后于格式化JSON时先从JSON转换入库，索引库无法写入时直接在内存中过滤JSON；
+        两者都没有时返回None
+        """
+        for _ in range(2):
+            series = self._open(ticker, data_type, period)
+            if series is None:
+                source = self._load_source(ticker, data_type, period)
+                if source is None:
+                    return None
+                signature, data_by_date = source
+                if not self.writable:
+                    return filter_range(data_by_date, start_date, end_date)
+                try:
+                    self.write(ticker, data_type, data_by_date, period, source=signature)
+                except OSError as e:
+                    self.writable = False
+                    logger.warning(f"⚠️ [Finnhub索引] 索引库无法写入({self.root})，改为直接读取JSON: {e}")
+                    return filter_range(data_by_date, start_date, end_date)
+                series = self._open(ticker, data_type, period)
+                if series is None:
+                    return None
+            try:
+                return series.range(start_date, end_date)
+            except FileNotFoundError:
+                # 读取期间另一个进程重写了该序列，重新加载索引
+                with self._lock:
+                    self._series.pop(self._index_path(ticker, data_type, period), None)
+        return None
+
+
+_stores: Dict[str, FinnhubStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_finnhub_store(data_dir: str) -> FinnhubStore:
+    """获取数据目录对应的Finnhub索引库"""
+    key = os.path.abspath(data_dir)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = _stores[key] = FinnhubStore(key)
+    return store
@@ -1,10 +1,11 @@
-import json
 import os
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
 
+from .finnhub_store import get_finnhub_store
+
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -18,39 +19,16 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
         period (str): Default to none, if there is a period specified, should be annual or quarterly.
     """
 
-    if period:
-        data_path = os.path.join(
-            data_dir,
-            "finnhub_data",
-            data_type,
-            f"{ticker}_{period}_data_formatted.json",
-        )
-    else:
-        data_path = os.path.join(
-            data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
-        )
-
+    # 按日期索引的本地库：二分定位后只读取区间内的数据；首次查询时从格式化JSON自动转换
     try:
-        if not os.path.exists(data_path):
-            logger.warning(f"⚠️ [DEBUG] 数据文件不存在: {data_path}")
-            logger.warning(f"⚠️ [DEBUG] 请确保已下载相关数据或检查数据目录配置")
-            return {}
-        
-        with open(data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        logger.error(f"❌ [ERROR] 文件未找到: {data_path}")
-        return {}
-    except json.JSONDecodeError as e:
-        logger.error(f"❌ [ERROR] JSON解析错误: {e}")
-        return {}
+        data = get_finnhub_store(data_dir).get_range(ticker, data_type, start_date, end_date, period)
     except Exception as e:
         logger.error(f"❌ [ERROR] 读取数据文件时发生错误: {e}")
         return {}
+    if data is not None:
+        return data
 
-    # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+    data_path = get_finnhub_store(data_dir).source_path(ticker, data_type, period)
+    logger.warning(f"⚠️ [DEBUG] 数据文件不存在: {data_path}")
+    logger.warning(f"⚠️ [DEBUG] 请确保已下载相关数据或检查数据目录配置")
+    return {}
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+按报告期存储的财务报表库
+财务报表只在定期报告披露时变化，按 (数据源, 股票代码, 报告期) 长期保存，
+不再使用固定TTL；只有在披露窗口内或出现更新的报告期/公告日期(ann_date)时才重新下载
+"""
+
+import json
+import os
+import pickle
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+# A股定期报告法定披露截止日：(报告期月日, 截止月日, 截止年份偏移)
+_DISCLOSURE_DEADLINES = [
+    ("0331", "0430", 0),
+    ("0630", "0831", 0),
+    ("0930", "1031", 0),
+    ("1231", "0430", 1),
+]
+
+
+def expected_latest_period(now: datetime = None) -> str:
+    """按法定披露截止日推算，当前必然已披露的最新报告期"""
+    now = now or datetime.now()
+    today = now.strftime('%m%d')
+    if today > "1031":
+        return f"{now.year}0930"
+    if today > "0831":
+        return f"{now.year}0630"
+    if today > "0430":
+        return f"{now.year}0331"
+    return f"{now.year - 1}0930"
+
+
+def in_disclosure_window(now: datetime = None) -> bool:
+    """年报/一季报(1-4月)、半年报(7-8月)、三季报(10月)披露期间"""
+    now = now or datetime.now()
+    return now.month in (1, 2, 3, 4, 7, 8, 10)
+
+
+def period_deadline(period: str) -> datetime:
+    """报告期的法定披露截止日"""
+    for period_suffix, deadline, year_offset in _DISCLOSURE_DEADLINES:
+        if period.endswith(period_suffix):
+            return datetime.strptime(f"{int(period[:4]) + year_offset}{deadline}", '%Y%m%d')
+    return datetime.strptime(period, '%Y%m%d') + timedelta(days=120)
+
+
+class FundamentalsStore:
+    """财务报表库
+
+    目录结构:
+        <root>/<source>/<symbol>/<period>.pkl   报表数据
+        <root>/<source>/<symbol>/index.json     各报告期的公告日期和检查时间
+    """
+
+    def __init__(self, root: str = None, probe_interval_hours: float = None, final_probe_days: float = 30):
+        if root is None:
+            from tradingagents.default_config import DEFAULT_CONFIG
+            root = DEFAULT_CONFIG["fundamentals_store_dir"]
+        self.root = Path(root)
+        self.probe_interval = timedelta(
+            hours=probe_interval_hours if probe_interval_hours is not None
+            else float(os.getenv('FUNDAMENTALS_PROBE_INTERVAL_HOURS', '24')))
+        self.final_probe_interval = timedelta(days=final_probe_days)
+        self._lock = threading.Lock()
+
+    def _symbol_dir(self, source: str, symbol: str) -> Path:
+        return self.root / source / str(symbol).replace('/', '_')
+
+    def _load_index(self, source: str, symbol: str) -> Dict[str, Dict]:
+        path = self._symbol_dir(source, symbol) / "index.json"
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, source: str, symbol: str, index: Dict[str, Dict]):
+        path = self._symbol_dir(source, symbol) / "index.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(index, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+    def get(self, source: str, symbol: str, period: str = None) -> Optional[Dict[str, Any]]:
+        """读取指定报告期（默认最新报告期）的报表，返回包含data/period/ann_date等字段的条目"""
+        with self._lock:
+            index = self._load_index(source, symbol)
+            if not index:
+                return None
+            period = period or max(index)
+            meta = index.get(period)
+            if meta is None:
+                return None
+            path = self._symbol_dir(source, symbol) / f"{period}.pkl"
+            try:
+                with open(path, 'rb') as f:
+                    data = pickle.load(f)
+            except (OSError, pickle.PickleError, EOFError) as e:
+                logger.warning(f"⚠️ [财报库] 读取失败 {source}/{symbol}/{period}: {e}")
+                return None
+            return dict(meta, period=period, data=data)
+
+    def put(self, source: str, symbol: str, period: str, data: Any, ann_date: str = None):
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            symbol_dir = self._symbol_dir(source, symbol)
+            symbol_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = symbol_dir / f"{period}.pkl.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, symbol_dir / f"{period}.pkl")
+
+            index = self._load_index(source, symbol)
+            index[period] = {'ann_date': ann_date or "", 'fetched_at': now, 'checked_at': now}
+            self._save_index(source, symbol, index)
+        logger.info(f"💾 [财报库] 保存 {source}/{symbol} 报告期{period} (公告日期: {ann_date or '未知'})")
+
+    def mark_checked(self, source: str, symbol: str, period: str):
+        """探测确认没有更新的报表后刷新检查时间"""
+        with self._lock:
+            index = self._load_index(source, symbol)
+            if period in index:
+                index[period]['checked_at'] = datetime.now().isoformat(timespec='seconds')
+                self._save_index(source, symbol, index)
+
+    def needs_probe(self, entry: Dict[str, Any], pinned: bool = False, now: datetime = None) -> bool:
+        """
+        是否需要探测更新
+
+        Args:
+            entry: get() 返回的条目
+            pinned: 是否为指定报告期的请求（否则为"最新报告期"请求）
+        """
+        now = now or datetime.now()
+        checked_at = datetime.fromisoformat(entry['checked_at'])
+        if now - checked_at < self.probe_interval:
+            return False
+
+        if pinned:
+            # 截止日之后获取的报表视为定稿，只偶尔检查更正公告
+            fetched_at = datetime.fromisoformat(entry['fetched_at'])
+            if fetched_at > period_deadline(entry['period']):
+                return now - checked_at >= self.final_probe_interval
+            return True
+
+        # 已有法定应披露的最新报告期且不在披露窗口内，不可能出现更新的报表
+        return entry['period'] < expected_latest_period(now) or in_disclosure_window(now)
+
+
+_fundamentals_store: Optional[FundamentalsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_fundamentals_store() -> FundamentalsStore:
+    """获取全局财务报表库实例"""
+    global _fundamentals_store
+    if _fundamentals_store is None:
+        with _store_lock:
+            if _fundamentals_store is None:
+                _fundamentals_store = FundamentalsStore()
+    return _fundamentals_store
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+对冲请求（hedged requests）
+先向首选数据源发出请求，超过对冲延迟（默认取该数据源的p95延迟）仍未返回、
+或提前失败时再向下一个等价数据源发出请求，采用最先返回的有效结果，其余请求被取消
+（已在执行的请求无法中断，其结果被丢弃，但仍计入数据源健康度）
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+from .source_health import get_source_health_registry
+
+DEFAULT_HEDGE_DELAY = 2.0
+MIN_HEDGE_DELAY = 0.2
+MAX_HEDGE_DELAY = 10.0
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def is_hedging_enabled() -> bool:
+    from tradingagents.default_config import DEFAULT_CONFIG
+    return DEFAULT_CONFIG.get("hedged_requests", False)
+
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """对冲请求共享线程池"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=int(os.getenv('HEDGE_MAX_WORKERS', '8')),
+                                               thread_name_prefix="hedge")
+    return _executor
+
+
+def hedge_delay_for(source: str) -> float:
+    """对冲延迟：配置的固定值，否则取数据源p95延迟（限制在合理区间内）"""
+    from tradingagents.default_config import DEFAULT_CONFIG
+    configured = DEFAULT_CONFIG.get("hedge_delay")
+    if configured:
+        return float(configured)
+    p95 = get_source_health_registry().latency_percentile(source, 95)
+    if p95 is None:
+        return DEFAULT_HEDGE_DELAY
+    return min(MAX_HEDGE_DELAY, max(MIN_HEDGE_DELAY, p95))
+
+
+def hedged_call(candidates: Sequence[Tuple[str, Callable[[], Any]]],
+                is_valid: Callable[[Any], bool],
+                delay: Callable[[str], float] = hedge_delay_for,
+                timeout: float = 120.0) -> Tuple[Optional[str], Any]:
+    """
+    按顺序对冲调用等价数据源
+
+    Args:
+        candidates: (数据源名称, 无参获取函数) 列表，按优先级排序
+        is_valid: 判断结果是否有效
+        delay: 根据数据源名称返回对冲延迟（秒）
+        timeout: 整体超时（秒）
+
+    Returns:
+        (获胜数据源名称, 结果)；全部失败时返回最后一个无效结果，没有任何结果时为 (None, None)
+    """
+    registry = get_source_health_registry()
+    executor = get_hedge_executor()
+    queue = list(candidates)
+    pending: Dict[Future, str] = {}
+    last_result: Tuple[Optional[str], Any] = (None, None)
+    deadline = time.time() + timeout
+    next_launch = deadline
+
+    def record(name: str, started: float, future: Future):
+        if future.cancelled():
+            # 排队中被取消的请求没有真正发出，归还熔断器放行的名额（半开探测）
+            registry.release(name)
+            return
+        # 只有异常计为数据源失败；正常应答但无数据（代码错误、停牌等）不影响健康度
+        error = future.exception()
+        registry.record(name, error is None, time.time() - started, error=str(error) if error else "")
+
+    def launch() -> bool:
+        """发出下一个熔断器允许的请求"""
+        nonlocal next_launch
+        while queue:
+            name, fetch = queue.pop(0)
+            if not registry.allow(name):
+                logger.info(f"⛔ [对冲请求] {name} 熔断中，跳过")
+                continue
+            started = time.time()
+            # 复制上下文，保证剖析span等ContextVar在工作线程中可见
+            future = executor.submit(contextvars.copy_context().run, fetch)
+            future.add_done_callback(lambda f, n=name, s=started: record(n, s, f))
+            pending[future] = name
+            next_launch = time.time() + delay(name)
+            if len(pending) > 1:
+                logger.info(f"🔀 [对冲请求] 等待超过对冲延迟，追加请求 {name}")
+            return True
+        return False
+
+    launch()
+    while pending:
+        now = time.time()
+        if now >= deadline:
+            break
+        wait_until = min(next_launch, deadline) if queue else deadline
+        done, _ = wait(list(pending), timeout=max(0.0, wait_until - now), return_when=FIRST_COMPLETED)
+
+        if not done:
+            if queue and time.time() >= next_launch:
+                launch()
+            continue
+
+        failed = False
+        for future in done:
+            name = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.warning(f"⚠️ [对冲请求] {name} 失败: {e}")
+                failed = True
+                continue
+            if is_valid(result):
+                for other in pending:
+                    other.cancel()
+                if pending:
+                    logger.info(f"✅ [对冲请求] {name} 先返回有效数据，放弃 {', '.join(pending.values())}")
+                return name, result
+            last_result = (name, result)
+            failed = True
+
+        # 请求提前失败时立即发出下一个，不必等待对冲延迟
+        if failed or not pending:
+            launch()
+
+    for future in pending:
+        future.cancel()
+    if pending:
+        logger.warning(f"⏰ [对冲请求] 超时 {timeout:.0f}s，放弃 {', '.join(pending.values())}")
+    return last_result
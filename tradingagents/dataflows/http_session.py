@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+共享HTTP会话池
+所有REST数据源/新闻源共用一个requests会话：按主机保持长连接池，复用DNS/TCP/TLS握手，
+统一gzip压缩、连接/读取超时、5xx重试和响应体大小上限；
+安装了 httpx[http2] 且开启 HTTP2_ENABLED 时，HTTPS请求走HTTP/2多路复用；
+按主机统计请求数、错误数、流量和延迟分位数，供剖析器和数据源健康度页面读取
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+try:
+    import httpx
+    import h2  # noqa: F401  httpx的HTTP/2支持依赖h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP2_ENABLED = os.getenv('HTTP2_ENABLED', 'false').lower() == 'true'
+HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', '32'))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '10'))
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '2'))
+HTTP_MAX_RESPONSE_BYTES = int(os.getenv('HTTP_MAX_RESPONSE_BYTES', str(20 * 1024 * 1024)))
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+_CHUNK_SIZE = 64 * 1024
+# httpx只接管这些参数，带有proxies/verify/cookies等参数的请求仍走requests
+_HTTP2_KWARGS = {'params', 'headers', 'data', 'json', 'timeout', 'allow_redirects', 'max_bytes', 'stream'}
+
+
+class ResponseTooLargeError(requests.exceptions.RequestException):
+    """响应体超过大小上限"""
+
+
+def _percentile(values: List[float], percent: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class HostStats:
+    """单个主机的滚动延迟和累计计数"""
+
+    def __init__(self, host: str, window: int = 200):
+        self.host = host
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.last_error = ""
+
+    def record(self, latency: float, size: int, error: str = ""):
+        self.requests += 1
+        self.bytes += size
+        if error:
+            self.errors += 1
+            self.last_error = error[:200]
+        else:
+            self.latencies.append(latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = list(self.latencies)
+        p50 = _percentile(latencies, 50)
+        p95 = _percentile(latencies, 95)
+        return {
+            'host': self.host,
+            'requests': self.requests,
+            'errors': self.errors,
+            'kb': round(self.bytes / 1024, 1),
+            'p50_ms': round(p50 * 1000) if p50 is not None else None,
+            'p95_ms': round(p95 * 1000) if p95 is not None else None,
+            'last_error': self.last_error,
+        }
+
+
+_host_stats: Dict[str, HostStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(host: str, latency: float, size: int, error: str = ""):
+    with _stats_lock:
+        stats = _host_stats.get(host)
+        if stats is None:
+            stats = _host_stats[host] = HostStats(host)
+        stats.record(latency, size, error)
+
+    from tradingagents.utils.run_profiler import record_span_metrics
+    record_span_metrics(http_requests=1, http_bytes=size, http_ms=round(latency * 1000, 1),
+                        http_errors=1 if error else 0)
+
+
+def get_http_metrics() -> List[Dict[str, Any]]:
+    """按主机返回请求数、错误数、流量(KB)和成功请求的p50/p95延迟"""
+    with _stats_lock:
+        return [stats.to_dict() for stats in _host_stats.values()]
+
+
+def host_latency_percentile(host: str, percent: float) -> Optional[float]:
+    """主机成功请求的延迟分位数（秒），无记录时返回None"""
+    with _stats_lock:
+        stats = _host_stats.get(host.lower())
+        return _percentile(list(stats.latencies), percent) if stats else None
+
+
+def reset_http_metrics():
+    with _stats_lock:
+        _host_stats.clear()
+
+
+def _read_limited(chunks, content_length: Optional[str], max_bytes: int, url: str) -> bytes:
+    """按块读取（已解压的）响应体，超过上限立即中止"""
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise ResponseTooLargeError(f"响应体{int(content_length)}字节超过上限{max_bytes}: {url}")
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer.extend(chunk)
+        if len(buffer) > max_bytes:
+            raise ResponseTooLargeError(f"响应体超过上限{max_bytes}字节: {url}")
+    return bytes(buffer)
+
+
+class PooledSession(requests.Session):
+    """
+    带默认超时、重试、响应大小上限和主机级统计的会话
+
+    调用方式与 requests.Session 相同，额外支持 max_bytes 参数；
+    未显式 stream=True 时响应体在返回前读完，连接随即归还连接池
+    """
+
+    def __init__(self):
+        super().__init__()
+        retry = Retry(
+            total=HTTP_MAX_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+        self.headers['Accept-Encoding'] = 'gzip, deflate'
+        self._http2_client = None
+        self._http2_lock = threading.Lock()
+
+    def request(self, method, url, max_bytes: int = None, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = DEFAULT_TIMEOUT
+        max_bytes = max_bytes or HTTP_MAX_RESPONSE_BYTES
+        host = (urlsplit(url).hostname or '').lower()
+        started = time.time()
+        try:
+            if self._use_http2(url, kwargs):
+                response = self._http2_request(method, url, max_bytes, **kwargs)
+            else:
+                response = self._http1_request(method, url, max_bytes, **kwargs)
+        except Exception as e:
+            _record(host, time.time() - started, 0, f"{type(e).__name__}: {e}")
+            raise
+
+        size = len(response._content) if response._content not in (False, None) else 0
+        error = f"HTTP {response.status_code}" if response.status_code >= 500 else ""
+        _record(host, time.time() - started, size, error)
+        return response
+
+    def _http1_request(self, method, url, max_bytes: int, **kwargs):
+        if kwargs.pop('stream', False):
+            return super().request(method, url, stream=True, **kwargs)
+        response = super().request(method, url, stream=True, **kwargs)
+        try:
+            response._content = _read_limited(response.iter_content(_CHUNK_SIZE),
+                                               response.headers.get('Content-Length'), max_bytes, url)
+        except Exception:
+            response.close()
+            raise
+        return response
+
+    def _use_http2(self, url: str, kwargs: Dict[str, Any]) -> bool:
+        return (HTTP2_ENABLED and HTTP2_AVAILABLE and url.startswith('https://')
+                and not kwargs.get('stream') and set(kwargs) <= _HTTP2_KWARGS)
+
+    def _get_http2_client(self):
+        if self._http2_client is None:
+            with self._http2_lock:
+                if self._http2_client is None:
+                    limits = httpx.Limits(max_connections=HTTP_POOL_HOSTS * HTTP_POOL_MAXSIZE,
+                                          max_keepalive_connections=HTTP_POOL_HOSTS)
+                    self._http2_client = httpx.Client(http2=True, limits=limits,
+                                                      transport=httpx.HTTPTransport(http2=True, retries=HTTP_MAX_RETRIES))
+                    logger.info("🚀 [HTTP会话] HTTP/2客户端已启用")
+        return self._http2_client
+
+    def _http2_request(self, method, url, max_bytes: int, params=None, headers=None, data=None, json=None,
+                       timeout=None, allow_redirects=True):
+        """通过httpx发送HTTP/2请求，返回值和异常都转换成requests的类型，调用方无需区分"""
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        merged_headers = dict(self.headers)
+        merged_headers.update(headers or {})
+        try:
+            with self._get_http2_client().stream(
+                    method, url, params=params, headers=merged_headers, data=data, json=json,
+                    timeout=httpx.Timeout(read, connect=connect), follow_redirects=allow_redirects) as upstream:
+                content = _read_limited(upstream.iter_bytes(_CHUNK_SIZE),
+                                        upstream.headers.get('Content-Length'), max_bytes, url)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+        response = requests.Response()
+        response.status_code = upstream.status_code
+        response.headers = CaseInsensitiveDict(upstream.headers)
+        response._content = content
+        response.url = str(upstream.url)
+        response.reason = upstream.reason_phrase
+        response.encoding = upstream.encoding
+        response.elapsed = upstream.elapsed
+        return response
+
+
+_session: Optional[PooledSession] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> PooledSession:
+    """获取全局共享HTTP会话（线程安全，请求头请按次传入，不要修改会话级headers）"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = PooledSession()
+                logger.debug(f"🔌 [HTTP会话] 共享连接池已创建: {HTTP_POOL_HOSTS}个主机 x {HTTP_POOL_MAXSIZE}个连接, "
+                             f"超时{DEFAULT_TIMEOUT}, 重试{HTTP_MAX_RETRIES}次")
+    return _session
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """通过共享会话发送GET请求"""
+    return get_http_session().get(url, **kwargs)
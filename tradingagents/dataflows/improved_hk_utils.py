@@ -15,6 +15,66 @@ from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
 
+# 内置港股名称映射（避免API调用）
+HK_STOCK_NAMES = {
+    # 腾讯系
+    '0700.HK': '腾讯控股', '0700': '腾讯控股', '00700': '腾讯控股',
+    
+    # 电信运营商
+    '0941.HK': '中国移动', '0941': '中国移动', '00941': '中国移动',
+    '0762.HK': '中国联通', '0762': '中国联通', '00762': '中国联通',
+    '0728.HK': '中国电信', '0728': '中国电信', '00728': '中国电信',
+    
+    # 银行
+    '0939.HK': '建设银行', '0939': '建设银行', '00939': '建设银行',
+    '1398.HK': '工商银行', '1398': '工商银行', '01398': '工商银行',
+    '3988.HK': '中国银行', '3988': '中国银行', '03988': '中国银行',
+    '0005.HK': '汇丰控股', '0005': '汇丰控股', '00005': '汇丰控股',
+    
+    # 保险
+    '1299.HK': '友邦保险', '1299': '友邦保险', '01299': '友邦保险',
+    '2318.HK': '中国平安', '2318': '中国平安', '02318': '中国平安',
+    '2628.HK': '中国人寿', '2628': '中国人寿', '02628': '中国人寿',
+    
+    # 石油化工
+    '0857.HK': '中国石油', '0857': '中国石油', '00857': '中国石油',
+    '0386.HK': '中国石化', '0386': '中国石化', '00386': '中国石化',
+    
+    # 地产
+    '1109.HK': '华润置地', '1109': '华润置地', '01109': '华润置地',
+    '1997.HK': '九龙仓置业', '1997': '九龙仓置业', '01997': '九龙仓置业',
+    
+    # 科技
+    '9988.HK': '阿里巴巴', '9988': '阿里巴巴', '09988': '阿里巴巴',
+    '3690.HK': '美团', '3690': '美团', '03690': '美团',
+    '1024.HK': '快手', '1024': '快手', '01024': '快手',
+    '9618.HK': '京东集团', '9618': '京东集团', '09618': '京东集团',
+    
+    # 消费
+    '1876.HK': '百威亚太', '1876': '百威亚太', '01876': '百威亚太',
+    '0291.HK': '华润啤酒', '0291': '华润啤酒', '00291': '华润啤酒',
+    
+    # 医药
+    '1093.HK': '石药集团', '1093': '石药集团', '01093': '石药集团',
+    '0867.HK': '康师傅', '0867': '康师傅', '00867': '康师傅',
+    
+    # 汽车
+    '2238.HK': '广汽集团', '2238': '广汽集团', '02238': '广汽集团',
+    '1211.HK': '比亚迪', '1211': '比亚迪', '01211': '比亚迪',
+    
+    # 航空
+    '0753.HK': '中国国航', '0753': '中国国航', '00753': '中国国航',
+    '0670.HK': '中国东航', '0670': '中国东航', '00670': '中国东航',
+    
+    # 钢铁
+    '0347.HK': '鞍钢股份', '0347': '鞍钢股份', '00347': '鞍钢股份',
+    
+    # 电力
+    '0902.HK': '华能国际', '0902': '华能国际', '00902': '华能国际',
+    '0991.HK': '大唐发电', '0991': '大唐发电', '00991': '大唐发电'
+}
+
+
 class ImprovedHKStockProvider:
     """改进的港股数据提供器"""
     
@@ -25,63 +85,7 @@ class ImprovedHKStockProvider:
         self.last_request_time = 0
         
         # 内置港股名称映射（避免API调用）
-        self.hk_stock_names = {
-            # 腾讯系
-            '0700.HK': '腾讯控股', '0700': '腾讯控股', '00700': '腾讯控股',
-            
-            # 电信运营商
-            '0941.HK': '中国移动', '0941': '中国移动', '00941': '中国移动',
-            '0762.HK': '中国联通', '0762': '中国联通', '00762': '中国联通',
-            '0728.HK': '中国电信', '0728': '中国电信', '00728': '中国电信',
-            
-            # 银行
-            '0939.HK': '建设银行', '0939': '建设银行', '00939': '建设银行',
-            '1398.HK': '工商银行', '1398': '工商银行', '01398': '工商银行',
-            '3988.HK': '中国银行', '3988': '中国银行', '03988': '中国银行',
-            '0005.HK': '汇丰控股', '0005': '汇丰控股', '00005': '汇丰控股',
-            
-            # 保险
-            '1299.HK': '友邦保险', '1299': '友邦保险', '01299': '友邦保险',
-            '2318.HK': '中国平安', '2318': '中国平安', '02318': '中国平安',
-            '2628.HK': '中国人寿', '2628': '中国人寿', '02628': '中国人寿',
-            
-            # 石油化工
-            '0857.HK': '中国石油', '0857': '中国石油', '00857': '中国石油',
-            '0386.HK': '中国石化', '0386': '中国石化', '00386': '中国石化',
-            
-            # 地产
-            '1109.HK': '华润置地', '1109': '华润置地', '01109': '华润置地',
-            '1997.HK': '九龙仓置业', '1997': '九龙仓置业', '01997': '九龙仓置业',
-            
-            # 科技
-            '9988.HK': '阿里巴巴', '9988': '阿里巴巴', '09988': '阿里巴巴',
-            '3690.HK': '美团', '3690': '美团', '03690': '美团',
-            '1024.HK': '快手', '1024': '快手', '01024': '快手',
-            '9618.HK': '京东集团', '9618': '京东集团', '09618': '京东集团',
-            
-            # 消费
-            '1876.HK': '百威亚太', '1876': '百威亚太', '01876': '百威亚太',
-            '0291.HK': '华润啤酒', '0291': '华润啤酒', '00291': '华润啤酒',
-            
-            # 医药
-            '1093.HK': '石药集团', '1093': '石药集团', '01093': '石药集团',
-            '0867.HK': '康师傅', '0867': '康师傅', '00867': '康师傅',
-            
-            # 汽车
-            '2238.HK': '广汽集团', '2238': '广汽集团', '02238': '广汽集团',
-            '1211.HK': '比亚迪', '1211': '比亚迪', '01211': '比亚迪',
-            
-            # 航空
-            '0753.HK': '中国国航', '0753': '中国国航', '00753': '中国国航',
-            '0670.HK': '中国东航', '0670': '中国东航', '00670': '中国东航',
-            
-            # 钢铁
-            '0347.HK': '鞍钢股份', '0347': '鞍钢股份', '00347': '鞍钢股份',
-            
-            # 电力
-            '0902.HK': '华能国际', '0902': '华能国际', '00902': '华能国际',
-            '0991.HK': '大唐发电', '0991': '大唐发电', '00991': '大唐发电'
-        }
+        self.hk_stock_names = HK_STOCK_NAMES
         
         self._load_cache()
     
@@ -148,24 +152,12 @@ class ImprovedHKStockProvider:
                 logger.debug(f"📊 [港股缓存] 从缓存获取公司名称: {symbol} -> {cached_name}")
                 return cached_name
             
-            # 方案1：使用内置映射
-            normalized_symbol = self._normalize_hk_symbol(symbol)
-            
-            # 尝试多种格式匹配
-            for format_symbol in [symbol, normalized_symbol, f"{normalized_symbol}.HK"]:
-                if format_symbol in self.hk_stock_names:
-                    company_name = self.hk_stock_names[format_symbol]
-                    
-                    # 缓存结果
-                    self.cache[cache_key] = {
-                        'data': company_name,
-                        'timestamp': time.time(),
-                        'source': 'builtin_mapping'
-                    }
-                    self._save_cache()
-                    
-                    logger.debug(f"📊 [港股映射] 获取公司名称: {symbol} -> {company_name}")
-                    return company_name
+            # 方案1：使用证券代码表（包含内置映射和每日刷新的港股列表，内存查找）
+            from .symbol_master import get_stock_name
+            company_name = get_stock_name(symbol)
+            if company_name:
+                logger.debug(f"📊 [港股代码表] 获取公司名称: {symbol} -> {company_name}")
+                return company_name
             
             # 方案2：优先尝试AKShare API获取（有速率限制保护）
             try:
@@ -2,6 +2,7 @@ from typing import Annotated, Dict
 import time
 import os
 from .reddit_utils import fetch_top_from_category
+from .reddit_store import get_reddit_store
 from .chinese_finance_utils import get_chinese_social_sentiment
 from .googlenews_utils import *
 from .finnhub_utils import get_data_in_range
@@ -409,22 +410,28 @@ def get_reddit_global_news(
     # iterate from start_date to end_date
     curr_date = datetime.strptime(before, "%Y-%m-%d")
 
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {start_date}", total=total_iterations)
-
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            max_limit_per_day,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-        pbar.update(1)
+    # 索引库可用时一次区间查询，否则逐日扫描原始转储
+    data_path = os.path.join(DATA_DIR, "reddit_data")
+    store = get_reddit_store(data_path)
+    if store.is_current(data_path, "global_news"):
+        posts = store.range_top_posts("global_news", before, start_date.strftime("%Y-%m-%d"), max_limit_per_day)
+    else:
+        total_iterations = (start_date - curr_date).days + 1
+        pbar = tqdm(desc=f"Getting Global News on {start_date}", total=total_iterations)
+
+        while curr_date <= start_date:
+            curr_date_str = curr_date.strftime("%Y-%m-%d")
+            fetch_result = fetch_top_from_category(
+                "global_news",
+                curr_date_str,
+                max_limit_per_day,
+                data_path=os.path.join(DATA_DIR, "reddit_data"),
+            )
+            posts.extend(fetch_result)
+            curr_date += relativedelta(days=1)
+            pbar.update(1)
 
-    pbar.close()
+        pbar.close()
 
     if len(posts) == 0:
         return ""
@@ -436,7 +443,7 @@ def get_reddit_global_news(
         else:
             news_str += f"### {post['title']}\n\n{post['content']}\n\n"
 
-    return f"## Global News Reddit, from {before} to {curr_date}:\n{news_str}"
+    return f"## Global News Reddit, from {before} to {start_date + relativedelta(days=1)}:\n{news_str}"
 
 
 def get_reddit_company_news(
@@ -463,27 +470,34 @@ def get_reddit_company_news(
     # iterate from start_date to end_date
     curr_date = datetime.strptime(before, "%Y-%m-%d")
 
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {ticker} on {start_date}",
-        total=total_iterations,
-    )
-
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            max_limit_per_day,
-            ticker,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
+    # 索引库可用时按倒排索引只访问该代码出现过的日期，否则逐日扫描原始转储
+    data_path = os.path.join(DATA_DIR, "reddit_data")
+    store = get_reddit_store(data_path)
+    if store.is_current(data_path, "company_news"):
+        posts = store.range_top_posts("company_news", before, start_date.strftime("%Y-%m-%d"),
+                                      max_limit_per_day, ticker)
+    else:
+        total_iterations = (start_date - curr_date).days + 1
+        pbar = tqdm(
+            desc=f"Getting Company News for {ticker} on {start_date}",
+            total=total_iterations,
         )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
 
-        pbar.update(1)
+        while curr_date <= start_date:
+            curr_date_str = curr_date.strftime("%Y-%m-%d")
+            fetch_result = fetch_top_from_category(
+                "company_news",
+                curr_date_str,
+                max_limit_per_day,
+                ticker,
+                data_path=os.path.join(DATA_DIR, "reddit_data"),
+            )
+            posts.extend(fetch_result)
+            curr_date += relativedelta(days=1)
+
+            pbar.update(1)
 
-    pbar.close()
+        pbar.close()
 
     if len(posts) == 0:
         return ""
@@ -495,7 +509,7 @@ def get_reddit_company_news(
         else:
             news_str += f"### {post['title']}\n\n{post['content']}\n\n"
 
-    return f"##{ticker} News Reddit, from {before} to {curr_date}:\n\n{news_str}"
+    return f"##{ticker} News Reddit, from {before} to {start_date + relativedelta(days=1)}:\n\n{news_str}"
 
 
 def get_stock_stats_indicators_window(
@@ -1106,9 +1120,8 @@ def get_china_stock_data_tushare(
 
         logger.debug(f"📊 [Tushare] 获取{ticker}股票数据...")
 
-        # 添加详细的股票代码追踪日志
-        logger.info(f"🔍 [股票代码追踪] get_china_stock_data_tushare 接收到的股票代码: '{ticker}' (类型: {type(ticker)})")
-        logger.info(f"🔍 [股票代码追踪] 重定向到data_source_manager")
+        logger.debug("🔍 [股票代码追踪] get_china_stock_data_tushare 接收到的股票代码: %r，重定向到data_source_manager",
+                     ticker)
 
         manager = get_data_source_manager()
         return manager.get_china_stock_data_tushare(ticker, start_date, end_date)
@@ -1135,7 +1148,7 @@ def search_china_stocks_tushare(
         from .data_source_manager import get_data_source_manager
 
         logger.debug(f"🔍 [Tushare] 搜索股票: {keyword}")
-        logger.info(f"🔍 [股票代码追踪] 重定向到data_source_manager")
+        logger.debug("🔍 [股票代码追踪] 重定向到data_source_manager")
 
         manager = get_data_source_manager()
         return manager.search_china_stocks_tushare(keyword)
@@ -1162,7 +1175,7 @@ def get_china_stock_fundamentals_tushare(
         from .data_source_manager import get_data_source_manager
 
         logger.debug(f"📊 [Tushare] 获取{ticker}基本面数据...")
-        logger.info(f"🔍 [股票代码追踪] 重定向到data_source_manager")
+        logger.debug("🔍 [股票代码追踪] 重定向到data_source_manager")
 
         manager = get_data_source_manager()
         return manager.get_china_stock_fundamentals_tushare(ticker)
@@ -1189,7 +1202,7 @@ def get_china_stock_info_tushare(
         from .data_source_manager import get_data_source_manager
 
         logger.debug(f"📊 [Tushare] 获取{ticker}基本信息...")
-        logger.info(f"🔍 [股票代码追踪] 重定向到data_source_manager")
+        logger.debug("🔍 [股票代码追踪] 重定向到data_source_manager")
 
         manager = get_data_source_manager()
         return manager.get_china_stock_info_tushare(ticker)
@@ -1228,10 +1241,8 @@ def get_china_stock_data_unified(
                    'event_type': 'unified_data_call_start'
                })
 
-    # 添加详细的股票代码追踪日志
-    logger.info(f"🔍 [股票代码追踪] get_china_stock_data_unified 接收到的原始股票代码: '{ticker}' (类型: {type(ticker)})")
-    logger.info(f"🔍 [股票代码追踪] 股票代码长度: {len(str(ticker))}")
-    logger.info(f"🔍 [股票代码追踪] 股票代码字符: {list(str(ticker))}")
+    logger.debug("🔍 [股票代码追踪] get_china_stock_data_unified 接收到的原始股票代码: %r (类型: %s)",
+                 ticker, type(ticker).__name__)
 
     start_time = time.time()
 
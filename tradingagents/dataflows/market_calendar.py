@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+交易所交易日历
+提供沪深(SSE/SZSE)、港交所(HKEX)、纽交所(NYSE)的交易时段与休市日，用于判断行情缓存是否新鲜：
+已收盘交易日的K线不会再变化，只有当前交易时段内才按盘中间隔刷新，周末、节假日和收盘后不再重复拉取
+"""
+
+import re
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+# 向后查找下一个交易日的最大天数（覆盖春节、国庆等长假）
+MAX_LOOKAHEAD_DAYS = 31
+
+Session = Tuple[time, time]
+
+
+def _dates(values: Iterable[str]) -> frozenset:
+    return frozenset(datetime.strptime(value, '%Y%m%d').date() for value in values)
+
+
+# 工作日休市日（周末本身不开市，不再列出）；每年需补充下一年的休市日，超出表中年份时按工作日判断并警告
+_CN_HOLIDAYS = _dates([
+    "20240101", "20240209", "20240212", "20240213", "20240214", "20240215", "20240216",
+    "20240404", "20240405", "20240501", "20240502", "20240503", "20240610", "20240916",
+    "20240917", "20241001", "20241002", "20241003", "20241004", "20241007",
+    "20250101", "20250128", "20250129", "20250130", "20250131", "20250203", "20250204",
+    "20250404", "20250501", "20250502", "20250505", "20250602", "20251001", "20251002",
+    "20251003", "20251006", "20251007", "20251008",
+    "20260101", "20260102", "20260216", "20260217", "20260218", "20260219", "20260220",
+    "20260223", "20260406", "20260501", "20260504", "20260505", "20260619", "20260925",
+    "20261001", "20261002", "20261005", "20261006", "20261007",
+])
+
+_HK_HOLIDAYS = _dates([
+    "20240101", "20240212", "20240213", "20240329", "20240401", "20240404", "20240501",
+    "20240515", "20240610", "20240701", "20240918", "20241001", "20241011", "20241225",
+    "20241226",
+    "20250101", "20250129", "20250130", "20250131", "20250404", "20250418", "20250421",
+    "20250501", "20250505", "20250701", "20251001", "20251007", "20251029", "20251225",
+    "20251226",
+    "20260101", "20260217", "20260218", "20260219", "20260403", "20260406", "20260407",
+    "20260501", "20260525", "20260619", "20260701", "20261001", "20261019", "20261225",
+])
+# 农历除夕、平安夜、除夕只开上午市
+_HK_HALF_DAYS = _dates([
+    "20240209", "20241224", "20241231",
+    "20250128", "20251224", "20251231",
+    "20260216", "20261224", "20261231",
+])
+
+_NYSE_HOLIDAYS = _dates([
+    "20240101", "20240115", "20240219", "20240329", "20240527", "20240619", "20240704",
+    "20240902", "20241128", "20241225",
+    "20250101", "20250109", "20250120", "20250217", "20250418", "20250526", "20250619",
+    "20250704", "20250901", "20251127", "20251225",
+    "20260101", "20260119", "20260216", "20260403", "20260525", "20260619", "20260703",
+    "20260907", "20261126", "20261225",
+])
+# 独立日前一天、感恩节次日、平安夜13:00提前收市
+_NYSE_HALF_DAYS = _dates([
+    "20240703", "20241129", "20241224",
+    "20250703", "20251128", "20251224",
+    "20261127", "20261224",
+])
+
+
+class ExchangeCalendar:
+    """单个交易所的交易日历"""
+
+    def __init__(self, code: str, name: str, timezone: str, sessions: List[Session],
+                 holidays: frozenset = frozenset(), half_days: frozenset = frozenset(),
+                 half_day_sessions: List[Session] = None,
+                 trading_days_provider: Callable[[date], Optional[bool]] = None):
+        """
+        Args:
+            sessions: 交易时段（交易所当地时间），午休拆分为多个时段
+            holidays: 工作日休市日
+            half_days: 半日市日期，使用 half_day_sessions
+            trading_days_provider: 外部日历（如Tushare交易日历），返回None表示未覆盖该日期
+
+        内置休市日表只覆盖到表中最后一年，之后的日期按工作日判断并记录一次警告
+        """
+        self.code = code
+        self.name = name
+        self.tz = ZoneInfo(timezone)
+        self.sessions = sessions
+        self.holidays = holidays
+        self.half_days = half_days
+        self.half_day_sessions = half_day_sessions or sessions
+        self.trading_days_provider = trading_days_provider
+        self.holidays_through = max((day.year for day in holidays), default=None)
+        self._warned_years = set()
+
+    def is_trading_day(self, day: date) -> bool:
+        if self.trading_days_provider is not None:
+            is_open = self.trading_days_provider(day)
+            if is_open is not None:
+                return is_open
+        if self.holidays_through is not None and day.year > self.holidays_through:
+            self._warn_uncovered_year(day.year)
+        return day.weekday() < 5 and day not in self.holidays
+
+    def _warn_uncovered_year(self, year: int):
+        if year in self._warned_years:
+            return
+        self._warned_years.add(year)
+        logger.warning(f"⚠️ [交易日历] {self.code} 休市日表只覆盖到{self.holidays_through}年，"
+                       f"{year}年的节假日将按交易日处理（缓存会多刷新），请更新 market_calendar.py 中的休市日表")
+
+    def sessions_for(self, day: date) -> List[Tuple[datetime, datetime]]:
+        """指定日期的交易时段（带时区），休市日返回空列表"""
+        if not self.is_trading_day(day):
+            return []
+        sessions = self.half_day_sessions if day in self.half_days else self.sessions
+        return [(datetime.combine(day, start, self.tz), datetime.combine(day, end, self.tz))
+                for start, end in sessions]
+
+    def is_open(self, at: datetime = None) -> bool:
+        """当前是否处于交易时段"""
+        local = self._localize(at)
+        return any(start <= local < end for start, end in self.sessions_for(local.date()))
+
+    def _localize(self, at: datetime = None) -> datetime:
+        # 无时区的时间视为本机时间（与缓存元数据中的 datetime.now() 一致）
+        return (at or datetime.now()).astimezone(self.tz)
+
+    def bar_expiry(self, cached_at: datetime, end_date: date = None,
+                   intraday_refresh: timedelta = timedelta(minutes=15),
+                   settle: timedelta = timedelta(minutes=30)) -> Optional[datetime]:
+        """
+        K线缓存的失效时间
+
+        Args:
+            cached_at: 缓存写入时间
+            end_date: 请求的截止日期，之后的交易时段不影响该缓存
+            intraday_refresh: 交易时段内的刷新间隔
+            settle: 收盘后等待数据源落定最终日线的时间
+
+        Returns:
+            失效时间（交易所当地时间）；None 表示缓存覆盖的交易时段均已收盘，数据不再变化
+        """
+        local = self._localize(cached_at)
+        day = local.date()
+        for _ in range(MAX_LOOKAHEAD_DAYS):
+            if end_date is not None and day > end_date:
+                return None
+            sessions = self.sessions_for(day)
+            if sessions:
+                day_close = sessions[-1][1]
+                for start, end in sessions:
+                    if local < start:
+                        # 下一个交易时段开盘后才会出现新数据
+                        return start
+                    if local < end:
+                        boundary = day_close + settle if end == day_close else end
+                        return min(local + intraday_refresh, boundary)
+                if local < day_close + settle:
+                    return day_close + settle
+            day += timedelta(days=1)
+        logger.warning(f"⚠️ [交易日历] {self.code} {MAX_LOOKAHEAD_DAYS}天内没有交易日，请检查休市日配置")
+        return None
+
+
+def _cn_trading_day_from_eod_store(day: date) -> Optional[bool]:
+    """优先使用日线库中同步的Tushare交易日历（scripts/ingest_a_share_eod.py）"""
+    try:
+        from .eod_store import get_eod_store
+        key = day.strftime('%Y%m%d')
+        open_dates = get_eod_store().trading_days(key, key)
+    except Exception:
+        return None
+    if open_dates is None:
+        return None
+    return key in open_dates
+
+
+def _build_calendars() -> Dict[str, ExchangeCalendar]:
+    china = ExchangeCalendar(
+        "SSE", "沪深交易所", "Asia/Shanghai",
+        sessions=[(time(9, 30), time(11, 30)), (time(13, 0), time(15, 0))],
+        holidays=_CN_HOLIDAYS,
+        trading_days_provider=_cn_trading_day_from_eod_store,
+    )
+    hkex = ExchangeCalendar(
+        "HKEX", "香港交易所", "Asia/Hong_Kong",
+        sessions=[(time(9, 30), time(12, 0)), (time(13, 0), time(16, 0))],
+        holidays=_HK_HOLIDAYS, half_days=_HK_HALF_DAYS,
+        half_day_sessions=[(time(9, 30), time(12, 0))],
+    )
+    nyse = ExchangeCalendar(
+        "NYSE", "纽约证券交易所", "America/New_York",
+        sessions=[(time(9, 30), time(16, 0))],
+        holidays=_NYSE_HOLIDAYS, half_days=_NYSE_HALF_DAYS,
+        half_day_sessions=[(time(9, 30), time(13, 0))],
+    )
+    # 沪深两市交易日历和交易时段相同
+    return {"SSE": china, "SZSE": china, "HKEX": hkex, "NYSE": nyse}
+
+
+_calendars: Optional[Dict[str, ExchangeCalendar]] = None
+_calendars_lock = threading.Lock()
+
+
+def get_exchange_calendar(exchange: str) -> Optional[ExchangeCalendar]:
+    """按交易所代码(SSE/SZSE/HKEX/NYSE)获取交易日历"""
+    global _calendars
+    if _calendars is None:
+        with _calendars_lock:
+            if _calendars is None:
+                _calendars = _build_calendars()
+    return _calendars.get(exchange.upper())
+
+
+def exchange_for_symbol(symbol: str) -> str:
+    """根据股票代码推断交易所"""
+    symbol = str(symbol).strip().upper()
+    if symbol.endswith('.HK') or re.match(r'^\d{4,5}$', symbol):
+        return "HKEX"
+    code = symbol.split('.')[0]
+    if re.match(r'^\d{6}$', code):
+        return "SSE" if code.startswith(('5', '6', '9')) else "SZSE"
+    return "NYSE"
+
+
+def _parse_date(value) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(str(value).replace('-', '')[:8], '%Y%m%d').date()
+    except ValueError:
+        return None
+
+
+def bar_cache_expiry(symbol: str, cached_at: datetime, end_date=None) -> Optional[datetime]:
+    """
+    行情K线缓存的失效时间
+
+    覆盖的交易时段均已收盘的缓存视为不可变，仍按 immutable_bar_cache_hours 设置上限，
+    以便吸收除权除息导致的复权价格变化
+
+    Returns:
+        失效时间；未启用交易日历时返回None，由调用方回退到固定TTL
+    """
+    from tradingagents.default_config import DEFAULT_CONFIG
+
+    if not DEFAULT_CONFIG.get("calendar_cache_ttl", True):
+        return None
+    calendar = get_exchange_calendar(exchange_for_symbol(symbol))
+    if calendar is None:
+        return None
+
+    expiry = calendar.bar_expiry(
+        cached_at, _parse_date(end_date),
+        intraday_refresh=timedelta(minutes=DEFAULT_CONFIG.get("intraday_refresh_minutes", 15)),
+        settle=timedelta(minutes=DEFAULT_CONFIG.get("bar_settle_minutes", 30)),
+    )
+    cap = calendar._localize(cached_at) + timedelta(hours=DEFAULT_CONFIG.get("immutable_bar_cache_hours", 168))
+    return cap if expiry is None else min(expiry, cap)
+
+
+def bar_cache_ttl_seconds(symbol: str, end_date=None, now: datetime = None) -> Optional[int]:
+    """为Redis/MongoDB等按TTL过期的缓存计算现在写入的K线缓存应保留的秒数"""
+    now = now or datetime.now().astimezone()
+    expiry = bar_cache_expiry(symbol, now, end_date)
+    if expiry is None:
+        return None
+    return max(1, int((expiry - now).total_seconds()))
@@ -16,6 +16,7 @@ from .config import get_config
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.run_profiler import profiled
 logger = get_logger('agents')
 
 
@@ -42,6 +43,7 @@ class OptimizedUSDataProvider:
         
         self.last_api_call = time.time()
     
+    @profiled("us_stock_data")
     def get_stock_data(self, symbol: str, start_date: str, end_date: str, 
                       force_refresh: bool = False) -> str:
         """
@@ -77,6 +79,15 @@ class OptimizedUSDataProvider:
                     data_source="yfinance"
                 )
 
+            # 对冲模式下缓存的统一格式数据（与具体数据源无关）
+            if not cache_key:
+                cache_key = self.cache.find_cached_stock_data(
+                    symbol=symbol,
+                    start_date=start_date,
+                    end_date=end_date,
+                    data_source="unified"
+                )
+
             if cache_key:
                 cached_data = self.cache.load_stock_data(cache_key)
                 if cached_data:
@@ -87,22 +98,32 @@ class OptimizedUSDataProvider:
         formatted_data = None
         data_source = None
 
+        # 对冲模式：港股同时向AKShare和Yahoo Finance请求日线，取最先返回的有效数据
+        from .hedged_request import is_hedging_enabled
+        if is_hedging_enabled():
+            from tradingagents.utils.stock_utils import StockUtils
+            if StockUtils.get_market_info(symbol)['is_hk']:
+                formatted_data = self._get_hk_data_hedged(symbol, start_date, end_date)
+                if formatted_data:
+                    data_source = "unified"
+
         # 尝试FINNHUB API（优先）
-        try:
-            logger.info(f"🌐 从FINNHUB API获取数据: {symbol}")
-            self._wait_for_rate_limit()
+        if not formatted_data:
+            try:
+                logger.info(f"🌐 从FINNHUB API获取数据: {symbol}")
+                self._wait_for_rate_limit()
 
-            formatted_data = self._get_data_from_finnhub(symbol, start_date, end_date)
-            if formatted_data and "❌" not in formatted_data:
-                data_source = "finnhub"
-                logger.info(f"✅ FINNHUB数据获取成功: {symbol}")
-            else:
-                logger.error(f"⚠️ FINNHUB数据获取失败，尝试备用方案")
-                formatted_data = None
+                formatted_data = self._get_data_from_finnhub(symbol, start_date, end_date)
+                if formatted_data and "❌" not in formatted_data:
+                    data_source = "finnhub"
+                    logger.info(f"✅ FINNHUB数据获取成功: {symbol}")
+                else:
+                    logger.error(f"⚠️ FINNHUB数据获取失败，尝试备用方案")
+                    formatted_data = None
 
-        except Exception as e:
-            logger.error(f"❌ FINNHUB API调用失败: {e}")
-            formatted_data = None
+            except Exception as e:
+                logger.error(f"❌ FINNHUB API调用失败: {e}")
+                formatted_data = None
 
         # 备用方案：根据股票类型选择合适的数据源
         if not formatted_data:
@@ -179,8 +200,33 @@ class OptimizedUSDataProvider:
 
         return formatted_data
     
+    def _get_hk_data_hedged(self, symbol: str, start_date: str, end_date: str) -> Optional[str]:
+        """港股对冲请求：AKShare与Yahoo Finance日线统一字段后格式化，结果与数据源无关"""
+        from .data_source_manager import normalize_daily_bars
+        from .hedged_request import hedged_call
+
+        def fetch_akshare():
+            from .akshare_utils import get_akshare_provider
+            return normalize_daily_bars(get_akshare_provider().get_hk_stock_data(symbol, start_date, end_date))
+
+        def fetch_yfinance():
+            self._wait_for_rate_limit()
+            return normalize_daily_bars(yf.Ticker(symbol).history(start=start_date, end=end_date))
+
+        winner, data = hedged_call(
+            [("akshare_hk", fetch_akshare), ("yfinance_hk", fetch_yfinance)],
+            is_valid=lambda frame: frame is not None and not frame.empty,
+        )
+        if winner is None or data is None or data.empty:
+            logger.warning(f"⚠️ [对冲请求] 港股数据源均未返回有效数据: {symbol}")
+            return None
+
+        bars = data.set_index('date').rename(columns=str.capitalize)
+        logger.info(f"✅ [对冲请求] 港股数据由{winner}提供: {symbol}")
+        return self._format_stock_data(symbol, bars, start_date, end_date, source_label=winner)
+
     def _format_stock_data(self, symbol: str, data: pd.DataFrame, 
-                          start_date: str, end_date: str) -> str:
+                          start_date: str, end_date: str, source_label: str = "Yahoo Finance API") -> str:
         """格式化股票数据为字符串"""
         
         # 移除时区信息
@@ -234,7 +280,7 @@ class OptimizedUSDataProvider:
 ## 📋 最近5日数据
 {data.tail().to_string()}
 
-数据来源: Yahoo Finance API
+数据来源: {source_label}
 更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
         
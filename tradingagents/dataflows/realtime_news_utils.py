@@ -4,16 +4,17 @@
 解决新闻滞后性问题
 """
 
-import requests
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import time
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.dataflows.http_session import get_http_session, http_get
+from tradingagents.utils.news_dedup import deduplicate_news_df, deduplicate_news_items
 logger = get_logger('agents')
 
 
@@ -28,6 +29,11 @@ class NewsItem:
     url: str
     urgency: str  # high, medium, low
     relevance_score: float
+    sources: List[str] = field(default_factory=list)  # 近似重复合并后的全部来源
+
+    @property
+    def source_label(self) -> str:
+        return ", ".join(self.sources) if len(self.sources) > 1 else self.source
 
 
 class RealtimeNewsAggregator:
@@ -159,7 +165,7 @@ class RealtimeNewsAggregator:
                 'token': self.finnhub_key
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = http_get(url, params=params, headers=self.headers)
             response.raise_for_status()
             
             news_data = response.json()
@@ -204,7 +210,7 @@ class RealtimeNewsAggregator:
                 'limit': 50
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = http_get(url, params=params, headers=self.headers)
             response.raise_for_status()
             
             data = response.json()
@@ -264,7 +270,7 @@ class RealtimeNewsAggregator:
                 'apiKey': self.newsapi_key
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = http_get(url, params=params, headers=self.headers)
             response.raise_for_status()
             
             data = response.json()
@@ -436,7 +442,9 @@ class RealtimeNewsAggregator:
             import feedparser
             
             logger.info(f"[RSS解析] 尝试获取RSS源内容")
-            feed = feedparser.parse(rss_url)
+            response = get_http_session().get(rss_url, headers=self.headers)
+            response.raise_for_status()
+            feed = feedparser.parse(response.content)
             
             if not feed or not feed.entries:
                 logger.warning(f"[RSS解析] RSS源未返回有效内容")
@@ -563,34 +571,30 @@ class RealtimeNewsAggregator:
         return 0.3  # 默认相关性
     
     def _deduplicate_news(self, news_items: List[NewsItem]) -> List[NewsItem]:
-        """去重新闻"""
+        """去重新闻：多个来源转载的同一新闻（标题/正文近似重复）只保留一条，并记录全部来源"""
         logger.info(f"[新闻去重] 开始对 {len(news_items)} 条新闻进行去重处理")
         start_time = datetime.now()
         
-        seen_titles = set()
-        unique_news = []
-        duplicate_count = 0
+        candidates = []
         short_title_count = 0
-        
         for item in news_items:
-            # 简单的标题去重
-            title_key = item.title.lower().strip()
-            
             # 检查标题长度
-            if len(title_key) <= 10:
+            if len(item.title.lower().strip()) <= 10:
                 logger.debug(f"[新闻去重] 跳过标题过短的新闻: '{item.title}'，来源: {item.source}")
                 short_title_count += 1
                 continue
-                
-            # 检查是否重复
-            if title_key in seen_titles:
-                logger.debug(f"[新闻去重] 检测到重复新闻: '{item.title[:50]}...'，来源: {item.source}")
-                duplicate_count += 1
-                continue
-                
-            # 添加到结果集
-            seen_titles.add(title_key)
+            candidates.append(item)
+
+        unique_news = []
+        for cluster in deduplicate_news_items(candidates, lambda item: item.title, lambda item: item.content,
+                                              lambda item: item.source):
+            item = candidates[cluster.representative]
+            item.sources = cluster.sources
+            if cluster.duplicate_count:
+                logger.debug(f"[新闻去重] 合并 {cluster.duplicate_count} 条重复新闻: '{item.title[:50]}...'，"
+                             f"来源: {', '.join(cluster.sources)}")
             unique_news.append(item)
+        duplicate_count = len(candidates) - len(unique_news)
         
         # 记录去重结果
         time_taken = (datetime.now() - start_time).total_seconds()
@@ -636,14 +640,14 @@ class RealtimeNewsAggregator:
             report += "## 🚨 紧急新闻\n\n"
             for news in high_urgency[:3]:  # 最多显示3条
                 report += f"### {news.title}\n"
-                report += f"**来源**: {news.source} | **时间**: {news.publish_time.strftime('%H:%M')}\n"
+                report += f"**来源**: {news.source_label} | **时间**: {news.publish_time.strftime('%H:%M')}\n"
                 report += f"{news.content}\n\n"
         
         if medium_urgency:
             report += "## 📢 重要新闻\n\n"
             for news in medium_urgency[:5]:  # 最多显示5条
                 report += f"### {news.title}\n"
-                report += f"**来源**: {news.source} | **时间**: {news.publish_time.strftime('%H:%M')}\n"
+                report += f"**来源**: {news.source_label} | **时间**: {news.publish_time.strftime('%H:%M')}\n"
                 report += f"{news.content}\n\n"
         
         # 添加时效性说明
@@ -764,6 +768,8 @@ def get_realtime_stock_news(ticker: str, curr_date: str, hours_back: int = 6) ->
                 logger.info(f"[新闻分析] 东方财富API返回数据: {news_df}")
             
             if not news_df.empty:
+                # 合并近似重复的转载，同一新闻只写入报告一次
+                news_df = deduplicate_news_df(news_df)
                 # 构建简单的新闻报告
                 news_count = len(news_df)
                 logger.info(f"[新闻分析] 成功获取 {news_count} 条东方财富新闻，耗时 {time_taken:.2f} 秒")
@@ -865,6 +871,8 @@ def get_realtime_stock_news(ticker: str, curr_date: str, hours_back: int = 6) ->
             time_taken = (end_time - start_time).total_seconds()
             
             if not news_df.empty:
+                # 合并近似重复的转载，同一新闻只写入报告一次
+                news_df = deduplicate_news_df(news_df)
                 # 构建简单的新闻报告
                 news_count = len(news_df)
                 logger.info(f"[新闻分析] 成功获取 {news_count} 条东方财富港股新闻，耗时 {time_taken:.2f} 秒")
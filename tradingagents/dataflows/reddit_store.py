@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Reddit离线数据按日期分区索引库
+把 reddit_data/<分类>/*.jsonl 原始转储一次性转换为按日期分区的帖子文件，
+入库时预先计算每个帖子提及的股票代码/公司标签并建立倒排索引(代码 -> 日期 -> 行偏移)，
+查询时只读取目标日期分区中命中的行，不再为每个股票、每一天重新扫描全部转储
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+STORE_DIRNAME = ".store"
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 1
+
+
+def _write_json_atomic(path: Path, payload: Dict):
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+def _compile_company_patterns(ticker_to_company: Dict[str, str]) -> Dict[str, List[re.Pattern]]:
+    """与原始扫描相同的匹配规则：公司名(按" OR "拆分)和代码本身，均按正则、忽略大小写匹配"""
+    patterns = {}
+    for ticker, names in ticker_to_company.items():
+        terms = names.split(" OR ") if "OR" in names else [names]
+        terms.append(ticker)
+        patterns[ticker] = [re.compile(term, re.IGNORECASE) for term in terms]
+    return patterns
+
+
+def _post_date(created_utc) -> str:
+    return datetime.fromtimestamp(created_utc, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _date_range(start_date: str, end_date: str) -> Iterable[str]:
+    current = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    while current <= end:
+        yield current.strftime("%Y-%m-%d")
+        current += timedelta(days=1)
+
+
+class RedditStore:
+    """按日期分区、带代码倒排索引的Reddit帖子库
+
+    目录结构:
+        <root>/<分类>/<YYYY>/<YYYY-MM-DD>.jsonl  当天帖子，按(子版块, 点赞数降序)排列
+        <root>/<分类>/index.json                 原始文件签名、每日帖子数和 代码 -> 日期 -> 行字节偏移
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._lock = threading.RLock()
+        self._indexes: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+
+    # ------------------------------------------------------------------
+    # 元数据
+    # ------------------------------------------------------------------
+    def _index_path(self, category: str) -> Path:
+        return self.root / category / INDEX_FILENAME
+
+    def _get_index(self, category: str) -> Optional[Dict]:
+        """按修改时间重新加载，入库可能在其他进程中运行"""
+        path = self._index_path(category)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        mtime = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._indexes.get(category)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            try:
+                index = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Reddit索引读取失败 {path}: {e}")
+                return None
+            if index.get('version') != INDEX_VERSION:
+                return None
+            self._indexes[category] = (mtime, index)
+            return index
+
+    def has_category(self, category: str) -> bool:
+        return self._get_index(category) is not None
+
+    def _partition_path(self, category: str, date: str) -> Path:
+        return self.root / category / date[:4] / f"{date}.jsonl"
+
+    # ------------------------------------------------------------------
+    # 入库
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _source_signature(category_dir: Path) -> Dict[str, List]:
+        return {entry.name: [entry.stat().st_size, entry.stat().st_mtime]
+                for entry in sorted(category_dir.iterdir()) if entry.name.endswith(".jsonl")}
+
+    def is_current(self, source_root: str, category: str) -> bool:
+        """原始转储自上次入库后没有变化"""
+        index = self._get_index(category)
+        category_dir = Path(source_root) / category
+        return index is not None and index.get('sources') == self._source_signature(category_dir)
+
+    def ingest_category(self, source_root: str, category: str, ticker_to_company: Dict[str, str] = None,
+                        force: bool = False) -> Dict:
+        """
+        转换一个分类的原始转储；原始文件未变化时跳过
+
+        分类名含"company"时为每个帖子预先计算股票标签（规则与原始扫描一致）；
+        先写入临时目录，完成后整体替换，查询方不会读到半成品
+        """
+        category_dir = Path(source_root) / category
+        if not force and self.is_current(source_root, category):
+            return {'category': category, 'skipped': True}
+
+        if ticker_to_company is None:
+            from .reddit_utils import ticker_to_company
+        patterns = _compile_company_patterns(ticker_to_company) if "company" in category else {}
+
+        days: Dict[str, List[Dict]] = defaultdict(list)
+        for data_file in sorted(category_dir.iterdir()):
+            if not data_file.name.endswith(".jsonl"):
+                continue
+            subreddit = data_file.name[:-len(".jsonl")]
+            with open(data_file, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    parsed_line = json.loads(line)
+                    title, content = parsed_line["title"], parsed_line["selftext"]
+                    days[_post_date(parsed_line["created_utc"])].append({
+                        "title": title,
+                        "content": content,
+                        "url": parsed_line["url"],
+                        "upvotes": parsed_line["ups"],
+                        "subreddit": subreddit,
+                        "tags": [ticker for ticker, terms in patterns.items()
+                                 if any(term.search(title) or term.search(content) for term in terms)],
+                    })
+
+        staging = self.root / f"{category}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        index = {
+            'version': INDEX_VERSION,
+            'category': category,
+            # 原始扫描按分类目录下的文件总数平分每日上限，这里保留同样的口径
+            'file_count': len(os.listdir(category_dir)),
+            'sources': self._source_signature(category_dir),
+            'dates': {},
+            'tickers': defaultdict(dict),
+            'built_at': datetime.now().isoformat(),
+        }
+        for date, posts in sorted(days.items()):
+            posts.sort(key=lambda post: (post["subreddit"], -post["upvotes"]))
+            path = staging / date[:4] / f"{date}.jsonl"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            offsets = defaultdict(list)
+            with open(path, "wb") as f:
+                for post in posts:
+                    offset = f.tell()
+                    for ticker in post["tags"]:
+                        offsets[ticker].append(offset)
+                    f.write(json.dumps(post, ensure_ascii=False).encode('utf-8') + b"\n")
+            index['dates'][date] = len(posts)
+            for ticker, ticker_offsets in offsets.items():
+                index['tickers'][ticker][date] = ticker_offsets
+        staging.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(staging / INDEX_FILENAME, index)
+
+        target = self.root / category
+        with self._lock:
+            retired = self.root / f"{category}.old"
+            shutil.rmtree(retired, ignore_errors=True)
+            if target.exists():
+                os.replace(target, retired)
+            os.replace(staging, target)
+            shutil.rmtree(retired, ignore_errors=True)
+            self._indexes.pop(category, None)
+
+        total = sum(index['dates'].values())
+        logger.info(f"📥 [Reddit索引] {category}: {len(index['sources'])}个文件, {len(index['dates'])}天, "
+                    f"{total}条帖子, {len(index['tickers'])}个代码")
+        return {'category': category, 'skipped': False, 'days': len(index['dates']), 'posts': total}
+
+    def ingest(self, source_root: str, categories: Iterable[str] = None, force: bool = False) -> List[Dict]:
+        """转换原始数据目录下的全部（或指定）分类"""
+        source = Path(source_root)
+        if categories is None:
+            categories = sorted(entry.name for entry in source.iterdir()
+                                if entry.is_dir() and not entry.name.startswith('.'))
+        return [self.ingest_category(source_root, category, force=force) for category in categories]
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def _read_posts(self, category: str, date: str, offsets: Optional[List[int]]) -> List[Dict]:
+        """读取当天分区；给出偏移时只读取命中的行"""
+        path = self._partition_path(category, date)
+        if not path.exists():
+            return []
+        with open(path, "rb") as f:
+            if offsets is None:
+                return [json.loads(line) for line in f if line.strip()]
+            posts = []
+            for offset in offsets:
+                f.seek(offset)
+                posts.append(json.loads(f.readline()))
+            return posts
+
+    def top_posts(self, category: str, date: str, max_limit: int, ticker: str = None) -> List[Dict]:
+        """
+        与 fetch_top_from_category 结果一致：每个子版块取点赞数最高的 max_limit // 文件数 条
+
+        分类名含"company"且给出代码时只读取倒排索引命中的帖子
+        """
+        index = self._get_index(category)
+        if index is None:
+            raise FileNotFoundError(f"Reddit索引不存在: {category}")
+        if max_limit < index['file_count']:
+            raise ValueError(
+                "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
+            )
+        if date not in index['dates']:
+            return []
+
+        offsets = None
+        if "company" in category and ticker:
+            offsets = index['tickers'].get(ticker, {}).get(date)
+            if not offsets:
+                return []
+
+        limit_per_subreddit = max_limit // index['file_count']
+        taken: Dict[str, int] = defaultdict(int)
+        results = []
+        for post in self._read_posts(category, date, offsets):
+            if taken[post["subreddit"]] >= limit_per_subreddit:
+                continue
+            taken[post["subreddit"]] += 1
+            results.append({
+                "title": post["title"],
+                "content": post["content"],
+                "url": post["url"],
+                "upvotes": post["upvotes"],
+                "posted_date": date,
+            })
+        return results
+
+    def range_top_posts(self, category: str, start_date: str, end_date: str, max_limit_per_day: int,
+                        ticker: str = None) -> List[Dict]:
+        """日期区间内逐日取热门帖子；公司新闻只访问该代码出现过的日期"""
+        index = self._get_index(category)
+        if index is None:
+            raise FileNotFoundError(f"Reddit索引不存在: {category}")
+        if max_limit_per_day < index['file_count']:
+            raise ValueError(
+                "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
+            )
+        if "company" in category and ticker:
+            dates = index['tickers'].get(ticker, {})
+        else:
+            dates = index['dates']
+
+        posts = []
+        for date in _date_range(start_date, end_date):
+            if date in dates:
+                posts.extend(self.top_posts(category, date, max_limit_per_day, ticker))
+        return posts
+
+
+_stores: Dict[str, RedditStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_reddit_store(data_path: str) -> RedditStore:
+    """获取原始数据目录对应的索引库（位于 <data_path>/.store）"""
+    root = os.path.abspath(os.path.join(data_path, STORE_DIRNAME))
+    store = _stores.get(root)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(root)
+            if store is None:
+                store = _stores[root] = RedditStore(root)
+    return store
@@ -63,6 +63,12 @@ def fetch_top_from_category(
 ):
     base_path = data_path
 
+    # 已转换为索引库且原始转储未变化时，只读取当天分区中命中的帖子
+    from .reddit_store import get_reddit_store
+    store = get_reddit_store(base_path)
+    if store.is_current(base_path, category):
+        return store.top_posts(category, date, max_limit, query)
+
     all_content = []
 
     if max_limit < len(os.listdir(os.path.join(base_path, category))):
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+数据源健康度与熔断器
+记录每个数据源最近调用的成功率和延迟(p50/p95)，连续失败或成功率过低时熔断，
+冷却期结束后放行单个半开探测请求，探测成功即恢复；路由时优先选择健康度最高的数据源
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class DataSourceUnavailableError(Exception):
+    """
+    数据源不可用（未连接、网络中断、超时），计入熔断统计
+
+    数据源正常应答但没有数据（代码错误、退市、停牌）时返回空结果，不抛出此异常
+    """
+
+
+def is_transport_error(error: BaseException) -> bool:
+    """是否为超时、连接中断等传输层错误"""
+    if isinstance(error, (DataSourceUnavailableError, TimeoutError, ConnectionError)):
+        return True
+    try:
+        import requests
+    except ImportError:
+        return False
+    return isinstance(error, requests.exceptions.RequestException)
+
+
+def _percentile(values: List[float], percent: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+@dataclass
+class SourceHealth:
+    """单个数据源的滚动统计和熔断状态"""
+    name: str
+    window: int = 50
+    calls: Deque[Tuple[float, bool, float]] = field(default_factory=deque)
+    state: str = STATE_CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    cooldown: float = 0.0
+    trips: int = 0
+    probe_in_flight: bool = False
+    last_error: str = ""
+
+    def record(self, success: bool, latency: float):
+        self.calls.append((time.time(), success, latency))
+        while len(self.calls) > self.window:
+            self.calls.popleft()
+        self.consecutive_failures = 0 if success else self.consecutive_failures + 1
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        if not self.calls:
+            return None
+        return sum(1 for _, ok, _ in self.calls if ok) / len(self.calls)
+
+    def latency_percentile(self, percent: float) -> Optional[float]:
+        return _percentile([latency for _, ok, latency in self.calls if ok], percent)
+
+    def score(self, latency_reference: float) -> float:
+        """健康度评分：平滑后的成功率，按p95延迟折减；无历史记录的数据源视为中等健康"""
+        successes = sum(1 for _, ok, _ in self.calls if ok)
+        smoothed_rate = (successes + 1) / (len(self.calls) + 2)
+        p95 = self.latency_percentile(95) or 0.0
+        return smoothed_rate / (1 + p95 / latency_reference)
+
+    def to_dict(self, latency_reference: float) -> Dict:
+        p50, p95 = self.latency_percentile(50), self.latency_percentile(95)
+        rate = self.success_rate
+        return {
+            'source': self.name,
+            'state': self.state,
+            'calls': len(self.calls),
+            'success_rate': round(rate, 3) if rate is not None else None,
+            'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+            'p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+            'score': round(self.score(latency_reference), 3),
+            'consecutive_failures': self.consecutive_failures,
+            'trips': self.trips,
+            'retry_in_s': round(max(0.0, self.opened_at + self.cooldown - time.time()), 1)
+            if self.state == STATE_OPEN else 0.0,
+            'last_error': self.last_error,
+        }
+
+
+class SourceHealthRegistry:
+    """数据源熔断器注册表"""
+
+    def __init__(self, failure_threshold: int = None, min_calls: int = 5, min_success_rate: float = 0.5,
+                 cooldown: float = None, max_cooldown: float = 600.0, latency_reference: float = 5.0,
+                 window: int = 50):
+        self.failure_threshold = failure_threshold or int(os.getenv('DATA_SOURCE_BREAKER_FAILURES', '3'))
+        self.min_calls = min_calls
+        self.min_success_rate = min_success_rate
+        self.base_cooldown = cooldown if cooldown is not None else float(os.getenv('DATA_SOURCE_BREAKER_COOLDOWN', '60'))
+        self.max_cooldown = max_cooldown
+        self.latency_reference = latency_reference
+        self.window = window
+        self._sources: Dict[str, SourceHealth] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, source: str) -> SourceHealth:
+        health = self._sources.get(source)
+        if health is None:
+            health = self._sources[source] = SourceHealth(name=source, window=self.window)
+        return health
+
+    def _refresh_state(self, health: SourceHealth):
+        if health.state == STATE_OPEN and time.time() - health.opened_at >= health.cooldown:
+            health.state = STATE_HALF_OPEN
+            health.probe_in_flight = False
+
+    def allow(self, source: str) -> bool:
+        """是否允许调用；半开状态下只放行一个探测请求"""
+        with self._lock:
+            health = self._get(source)
+            self._refresh_state(health)
+            if health.state == STATE_CLOSED:
+                return True
+            if health.state == STATE_HALF_OPEN and not health.probe_in_flight:
+                health.probe_in_flight = True
+                logger.info(f"🔎 [熔断器] {source} 半开探测")
+                return True
+            return False
+
+    def record(self, source: str, success: bool, latency: float, error: str = ""):
+        with self._lock:
+            health = self._get(source)
+            health.record(success, latency)
+            if not success:
+                health.last_error = error[:200]
+
+            if health.state == STATE_HALF_OPEN:
+                health.probe_in_flight = False
+                if success:
+                    health.state = STATE_CLOSED
+                    health.cooldown = 0.0
+                    logger.info(f"✅ [熔断器] {source} 探测成功，恢复正常")
+                else:
+                    self._trip(health, min(health.cooldown * 2, self.max_cooldown))
+                return
+
+            if health.state == STATE_CLOSED and not success:
+                rate = health.success_rate
+                if (health.consecutive_failures >= self.failure_threshold
+                        or (len(health.calls) >= self.min_calls and rate is not None and rate < self.min_success_rate)):
+                    self._trip(health, self.base_cooldown)
+
+    def release(self, source: str):
+        """
+        放弃已获准的调用而不计入成功或失败（如对冲请求在执行前被取消）；
+        半开状态下归还探测名额，否则该数据源会一直停留在半开状态被拒绝
+        """
+        with self._lock:
+            health = self._sources.get(source)
+            if health is not None and health.state == STATE_HALF_OPEN:
+                health.probe_in_flight = False
+
+    def _trip(self, health: SourceHealth, cooldown: float):
+        health.state = STATE_OPEN
+        health.opened_at = time.time()
+        health.cooldown = max(cooldown, self.base_cooldown)
+        health.trips += 1
+        logger.warning(f"⛔ [熔断器] {health.name} 熔断 {health.cooldown:.0f}秒 "
+                       f"(连续失败{health.consecutive_failures}次, 成功率{health.success_rate:.0%})")
+
+    def rank(self, sources: Iterable[str], preferred: str = None, preference_bonus: float = 0.05) -> List[str]:
+        """按健康度排序可调用的数据源（熔断中的数据源排在最后），首选数据源获得少量加分"""
+        sources = list(sources)
+        with self._lock:
+            for source in sources:
+                self._refresh_state(self._get(source))
+
+            def key(item):
+                position, source = item
+                health = self._sources[source]
+                score = health.score(self.latency_reference) + (preference_bonus if source == preferred else 0.0)
+                return (health.state == STATE_OPEN, -score, position)
+
+            return [source for _, source in sorted(enumerate(sources), key=key)]
+
+    def latency_percentile(self, source: str, percent: float) -> Optional[float]:
+        """成功调用的延迟分位数（秒），无记录时返回None"""
+        with self._lock:
+            health = self._sources.get(source)
+            return health.latency_percentile(percent) if health else None
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            for health in self._sources.values():
+                self._refresh_state(health)
+            return [health.to_dict(self.latency_reference) for health in self._sources.values()]
+
+    def reset(self, source: str = None):
+        with self._lock:
+            if source is None:
+                self._sources.clear()
+            else:
+                self._sources.pop(source, None)
+
+
+_registry: Optional[SourceHealthRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_source_health_registry() -> SourceHealthRegistry:
+    """获取全局数据源健康度注册表"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SourceHealthRegistry()
+    return _registry
@@ -80,7 +80,21 @@ class StockDataService:
             except Exception as e:
                 logger.error(f"⚠️ MongoDB查询失败: {e}")
         
-        # 2. 降级到增强获取器
+        # 2. 单只股票先查证券代码表，避免为查一个名称下载全部股票列表
+        if stock_code:
+            from .symbol_master import get_stock_name
+            name = get_stock_name(stock_code)
+            if name:
+                return {
+                    'code': stock_code,
+                    'name': name,
+                    'market': self._get_market_name(stock_code),
+                    'category': self._get_stock_category(stock_code),
+                    'source': 'symbol_master',
+                    'updated_at': datetime.now().isoformat()
+                }
+        
+        # 3. 降级到增强获取器
         logger.info(f"🔄 MongoDB不可用，降级到增强获取器")
         if ENHANCED_FETCHER_AVAILABLE:
             try:
@@ -93,7 +107,7 @@ class StockDataService:
             except Exception as e:
                 logger.error(f"⚠️ 增强获取器查询失败: {e}")
         
-        # 3. 最后的降级方案
+        # 4. 最后的降级方案
         logger.error(f"❌ 所有数据源都不可用")
         return self._get_fallback_data(stock_code)
     
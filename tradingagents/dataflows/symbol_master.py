@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+统一证券代码表
+A股/港股/美股代码与名称集中存放在一个内存结构中：代码→名称为O(1)字典查找，
+代码、名称（子串）和拼音首字母支持前缀检索；每日后台刷新并保存快照，启动时直接加载快照
+"""
+
+import json
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+# 拼音首字母（可选依赖，未安装时使用GB2312一级汉字表推算）
+try:
+    from pypinyin import Style, lazy_pinyin
+    PYPINYIN_AVAILABLE = True
+except ImportError:
+    PYPINYIN_AVAILABLE = False
+
+MARKET_CHINA = "china"
+MARKET_HK = "hk"
+MARKET_US = "us"
+
+# 美股常用中文名称
+US_STOCK_NAMES = {
+    'AAPL': '苹果公司',
+    'TSLA': '特斯拉',
+    'NVDA': '英伟达',
+    'MSFT': '微软',
+    'GOOGL': '谷歌',
+    'AMZN': '亚马逊',
+    'META': 'Meta',
+    'NFLX': '奈飞',
+}
+
+# GB2312一级汉字按拼音排序，各声母首字的编码区间起点
+_GB2312_INITIAL_STARTS = [45217, 45253, 45761, 46318, 46826, 47010, 47297, 47614, 48119, 49062, 49324, 49896,
+                          50371, 50614, 50622, 50906, 51387, 51446, 52218, 52698, 52980, 53689, 54481]
+_GB2312_INITIALS = "ABCDEFGHJKLMNOPQRSTWXYZ"
+_GB2312_LEVEL1_END = 55290
+
+Entry = Tuple[str, str, str]  # (market, code, name)
+
+
+def normalize_symbol(symbol: str) -> Tuple[str, str]:
+    """
+    统一股票代码格式
+
+    Returns:
+        (市场, 代码)：A股为6位代码，港股补齐为5位，美股为大写代码
+    """
+    symbol = str(symbol).strip().upper()
+    match = re.match(r'^(?:SH|SZ|BJ)?(\d{6})(?:\.(?:SH|SZ|SS|BJ))?$', symbol)
+    if match:
+        return MARKET_CHINA, match.group(1)
+    match = re.match(r'^(\d{1,5})(?:\.HK)?$', symbol)
+    if match:
+        return MARKET_HK, match.group(1).zfill(5)
+    if symbol.endswith('.US'):
+        symbol = symbol[:-3]
+    return MARKET_US, symbol
+
+
+def _gb2312_initial(char: str) -> str:
+    try:
+        encoded = char.encode('gb2312')
+    except UnicodeEncodeError:
+        return ''
+    if len(encoded) != 2:
+        return ''
+    code = encoded[0] * 256 + encoded[1]
+    if not _GB2312_INITIAL_STARTS[0] <= code < _GB2312_LEVEL1_END:
+        return ''
+    return _GB2312_INITIALS[bisect_right(_GB2312_INITIAL_STARTS, code) - 1]
+
+
+def pinyin_initials(text: str) -> str:
+    """名称的拼音首字母（如 平安银行 -> PAYH），字母数字原样保留"""
+    if PYPINYIN_AVAILABLE:
+        parts = lazy_pinyin(text, style=Style.FIRST_LETTER)
+        return ''.join(ch for ch in ''.join(parts).upper() if ch.isascii() and ch.isalnum())
+    initials = []
+    for ch in text:
+        if ch.isascii():
+            if ch.isalnum():
+                initials.append(ch.upper())
+        else:
+            initials.append(_gb2312_initial(ch))
+    return ''.join(initials)
+
+
+class PrefixIndex:
+    """前缀树的紧凑实现：键排序后存放在数组中，前缀查询为一次二分定位加顺序扫描"""
+
+    __slots__ = ('_keys', '_ids')
+
+    def __init__(self, items: Iterable[Tuple[str, int]]):
+        pairs = sorted(set(items))
+        self._keys = [key for key, _ in pairs]
+        self._ids = array('i', [entry_id for _, entry_id in pairs])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def search(self, prefix: str) -> Iterator[int]:
+        start = bisect_left(self._keys, prefix)
+        for pos in range(start, len(self._keys)):
+            if not self._keys[pos].startswith(prefix):
+                break
+            yield self._ids[pos]
+
+
+class SymbolMaster:
+    """
+    证券代码表（构建后只读，刷新时整体替换）
+
+    名称索引存放名称的全部后缀，因此名称子串检索（如"银行"）也是一次前缀查询
+    """
+
+    def __init__(self, entries: Iterable[Entry] = (), built_at: datetime = None):
+        merged: Dict[Tuple[str, str], str] = {}
+        for market, code, name in entries:
+            if code and name:
+                merged[(market, code)] = name
+        self.built_at = built_at
+        self._markets = [market for market, _ in merged]
+        self._codes = [code for _, code in merged]
+        self._names = list(merged.values())
+        self._by_code = {key: entry_id for entry_id, key in enumerate(merged)}
+
+        self._code_index = PrefixIndex((code, i) for i, code in enumerate(self._codes))
+        self._name_index = PrefixIndex((name[start:], i) for i, name in enumerate(self._names)
+                                       for start in range(len(name)))
+        self._pinyin_index = PrefixIndex((pinyin_initials(name), i) for i, name in enumerate(self._names))
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def count(self, market: str) -> int:
+        return sum(1 for item in self._markets if item == market)
+
+    def entries(self) -> Iterator[Entry]:
+        return zip(self._markets, self._codes, self._names)
+
+    def merged(self, entries: Iterable[Entry], built_at: datetime = None) -> 'SymbolMaster':
+        """返回合并新条目后的代码表（同一代码以新条目为准）"""
+        return SymbolMaster(list(self.entries()) + list(entries), built_at or self.built_at)
+
+    def is_stale(self, max_age: timedelta, now: datetime = None) -> bool:
+        return self.built_at is None or (now or datetime.now()) - self.built_at >= max_age
+
+    def get_name(self, symbol: str) -> Optional[str]:
+        """代码→名称（支持 000001 / 000001.SZ / 0700.HK / 00700 / AAPL 等格式）"""
+        entry_id = self._by_code.get(normalize_symbol(symbol))
+        return None if entry_id is None else self._names[entry_id]
+
+    def search(self, keyword: str, market: str = None, limit: Optional[int] = 50) -> List[Dict[str, str]]:
+        """
+        按代码前缀、名称子串、拼音首字母前缀检索
+
+        Args:
+            keyword: 检索关键词
+            market: 只返回指定市场（china/hk/us）
+            limit: 最多返回条数，None表示不限
+
+        Returns:
+            [{'market', 'code', 'name'}]，精确代码匹配排在最前
+        """
+        keyword = str(keyword).strip()
+        if not keyword:
+            return []
+
+        exact = self._by_code.get(normalize_symbol(keyword))
+        upper = keyword.upper()
+        sources = (
+            [] if exact is None else [exact],
+            self._code_index.search(upper),
+            self._name_index.search(keyword),
+            self._pinyin_index.search(upper) if upper.isascii() else (),
+        )
+
+        results: List[Dict[str, str]] = []
+        seen = set()
+        for source in sources:
+            for entry_id in source:
+                if entry_id in seen or (market and self._markets[entry_id] != market):
+                    continue
+                seen.add(entry_id)
+                results.append({'market': self._markets[entry_id], 'code': self._codes[entry_id],
+                                'name': self._names[entry_id]})
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'built_at': self.built_at.isoformat(timespec='seconds') if self.built_at else None,
+                   'entries': [list(entry) for entry in self.entries()]}
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['SymbolMaster']:
+        try:
+            payload = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        built_at = datetime.fromisoformat(payload['built_at']) if payload.get('built_at') else None
+        return cls((tuple(entry) for entry in payload.get('entries', [])), built_at)
+
+
+def _builtin_entries() -> List[Entry]:
+    from .improved_hk_utils import HK_STOCK_NAMES
+
+    entries = [(MARKET_US, code, name) for code, name in US_STOCK_NAMES.items()]
+    entries.extend((MARKET_HK, normalize_symbol(code)[1], name) for code, name in HK_STOCK_NAMES.items())
+    return entries
+
+
+def _china_entries_from_frame(frame, code_column: str, name_column: str) -> List[Entry]:
+    return [(MARKET_CHINA, str(code).zfill(6), str(name))
+            for code, name in zip(frame[code_column], frame[name_column])]
+
+
+def _load_china_entries() -> List[Entry]:
+    """A股列表：日线库 -> Tushare -> AKShare"""
+    try:
+        from .eod_store import get_eod_store
+        basic = get_eod_store().read_stock_basic()
+        if basic is not None and not basic.empty:
+            return _china_entries_from_frame(basic, 'symbol', 'name')
+    except Exception as e:
+        logger.debug(f"📋 [代码表] 日线库股票列表不可用: {e}")
+
+    try:
+        from .tushare_utils import get_tushare_provider
+        provider = get_tushare_provider()
+        if provider.connected:
+            stock_list = provider.get_stock_list()
+            if hasattr(stock_list, 'empty') and not stock_list.empty:
+                return _china_entries_from_frame(stock_list, 'symbol', 'name')
+    except Exception as e:
+        logger.debug(f"📋 [代码表] Tushare股票列表不可用: {e}")
+
+    try:
+        import akshare as ak
+        frame = ak.stock_info_a_code_name()
+        if frame is not None and not frame.empty:
+            return _china_entries_from_frame(frame, 'code', 'name')
+    except Exception as e:
+        logger.debug(f"📋 [代码表] AKShare A股列表不可用: {e}")
+    return []
+
+
+def _load_hk_entries() -> List[Entry]:
+    try:
+        import akshare as ak
+        frame = ak.stock_hk_spot_em()
+        if frame is not None and not frame.empty:
+            return [(MARKET_HK, str(code).zfill(5), str(name)) for code, name in zip(frame['代码'], frame['名称'])]
+    except Exception as e:
+        logger.debug(f"📋 [代码表] AKShare港股列表不可用: {e}")
+    return []
+
+
+def _refresh_interval() -> timedelta:
+    from tradingagents.default_config import DEFAULT_CONFIG
+    return timedelta(hours=DEFAULT_CONFIG.get("symbol_master_refresh_hours", 24))
+
+
+def _snapshot_path() -> Path:
+    from tradingagents.default_config import DEFAULT_CONFIG
+    return Path(DEFAULT_CONFIG["symbol_master_path"])
+
+
+_master: Optional[SymbolMaster] = None
+_master_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_refreshing = False
+
+
+def refresh_symbol_master() -> SymbolMaster:
+    """重新下载A股/港股列表并保存快照（同步执行）"""
+    global _master, _refreshing
+    try:
+        remote = _load_china_entries() + _load_hk_entries()
+        now = datetime.now()
+        if not remote:
+            # 数据源均不可用时1小时后重试
+            now = now - _refresh_interval() + timedelta(hours=1)
+            logger.warning(f"⚠️ [代码表] 未能获取股票列表，仅使用已有条目")
+        # 在锁内合并到当前代码表并替换，保留刷新期间 update_symbol_master 合并的条目
+        with _master_lock:
+            current = _master or SymbolMaster(_builtin_entries())
+            master = _master = current.merged(_builtin_entries() + remote, built_at=now)
+        try:
+            master.save(_snapshot_path())
+        except OSError as e:
+            logger.warning(f"⚠️ [代码表] 保存快照失败: {e}")
+        logger.info(f"📋 [代码表] 刷新完成: A股{master.count(MARKET_CHINA)}只, "
+                    f"港股{master.count(MARKET_HK)}只, 美股{master.count(MARKET_US)}只")
+        return master
+    finally:
+        with _refresh_lock:
+            _refreshing = False
+
+
+def _schedule_refresh():
+    global _refreshing
+    with _refresh_lock:
+        if _refreshing:
+            return
+        _refreshing = True
+    # 下载全市场列表耗时较长，使用单独的后台线程，不占用数据获取线程池
+    threading.Thread(target=refresh_symbol_master, name="symbol-master-refresh", daemon=True).start()
+
+
+def get_symbol_master() -> SymbolMaster:
+    """获取全局证券代码表，过期时在后台刷新，不阻塞当前查询"""
+    global _master
+    if _master is None:
+        with _master_lock:
+            if _master is None:
+                _master = SymbolMaster.load(_snapshot_path()) or SymbolMaster(_builtin_entries())
+    master = _master
+    if master.is_stale(_refresh_interval()):
+        _schedule_refresh()
+    return master
+
+
+def update_symbol_master(entries: Iterable[Entry]):
+    """将数据源已加载的股票列表合并进代码表（如Tushare股票列表）"""
+    global _master
+    get_symbol_master()
+    with _master_lock:
+        _master = _master.merged(entries)
+
+
+def get_stock_name(symbol: str, default: str = None) -> Optional[str]:
+    """代码→名称的统一入口，代码表未收录时返回default"""
+    return get_symbol_master().get_name(symbol) or default
@@ -80,11 +80,16 @@ class TushareDataAdapter:
             data_type: 数据类型 ("daily", "realtime")
             
         Returns:
-            DataFrame: 股票数据
+            DataFrame: 股票数据；数据源正常应答但没有数据时返回空表
+
+        Raises:
+            DataSourceUnavailableError: Tushare未连接，或网络中断、超时
         """
+        from .source_health import DataSourceUnavailableError
+
         if not self.provider or not self.provider.connected:
             logger.error("❌ Tushare数据源不可用")
-            return pd.DataFrame()
+            raise DataSourceUnavailableError("Tushare数据源不可用")
 
         try:
             logger.debug(f"🔄 获取{symbol}数据 (类型: {data_type})...")
@@ -102,7 +107,9 @@ class TushareDataAdapter:
             else:
                 logger.error(f"❌ 不支持的数据类型: {data_type}")
                 return pd.DataFrame()
-                
+
+        except DataSourceUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"❌ 获取{symbol}数据失败: {e}")
             return pd.DataFrame()
@@ -473,6 +480,9 @@ def get_china_stock_data_tushare_adapter(symbol: str, start_date: str = None, en
         
     Returns:
         DataFrame: 股票数据
+
+    Raises:
+        DataSourceUnavailableError: Tushare未连接，或网络中断、超时
     """
     adapter = get_tushare_adapter()
     return adapter.get_stock_data(symbol, start_date, end_date)
@@ -161,8 +161,13 @@ class TushareProvider:
             end_date: 结束日期（YYYYMMDD）
             
         Returns:
-            DataFrame: 日线数据
+            DataFrame: 日线数据；数据源正常应答但没有数据时返回空表
+
+        Raises:
+            DataSourceUnavailableError: Tushare未连接，或网络中断、超时
         """
+        from .source_health import DataSourceUnavailableError, is_transport_error
+
         # 记录详细的调用信息
         logger.info(f"🔍 [Tushare详细日志] get_stock_daily 开始执行")
         logger.info(f"🔍 [Tushare详细日志] 输入参数: symbol='{symbol}', start_date='{start_date}', end_date='{end_date}'")
@@ -171,7 +176,7 @@ class TushareProvider:
 
         if not self.connected:
             logger.error(f"❌ [Tushare详细日志] Tushare未连接，无法获取数据")
-            return pd.DataFrame()
+            raise DataSourceUnavailableError("Tushare未连接")
 
         try:
             # 标准化股票代码
@@ -284,6 +289,8 @@ class TushareProvider:
             logger.error(f"❌ [Tushare详细日志] 异常信息: {str(e)}")
             import traceback
             logger.error(f"❌ [Tushare详细日志] 异常堆栈: {traceback.format_exc()}")
+            if is_transport_error(e):
+                raise DataSourceUnavailableError(f"Tushare获取{symbol}数据失败: {e}") from e
             return pd.DataFrame()
 
     def _calculate_forward_adjusted_prices(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -422,44 +429,48 @@ class TushareProvider:
         
         try:
             ts_code = self._normalize_symbol(symbol)
+
+            # 财务报表按报告期保存，只有出现更新的公告日期(ann_date)时才重新下载
+            from .fundamentals_store import get_fundamentals_store
+            from tradingagents.utils.run_profiler import record_span_metrics
+            store = get_fundamentals_store()
+            stored = store.get('tushare', ts_code, period)
+            if stored is not None:
+                if not store.needs_probe(stored, pinned=True):
+                    logger.info(f"📦 [财报库] 使用已保存的{ts_code}财务数据: 报告期{period}")
+                    record_span_metrics(cache_hits=1)
+                    return stored['data']
+                latest_ann_date = self._probe_ann_date(ts_code, period)
+                if latest_ann_date is None or latest_ann_date <= stored['ann_date']:
+                    logger.info(f"📦 [财报库] {ts_code}报告期{period}无新公告，复用已保存的报表")
+                    store.mark_checked('tushare', ts_code, period)
+                    record_span_metrics(cache_hits=1)
+                    return stored['data']
+                logger.info(f"🔄 [财报库] {ts_code}报告期{period}有新公告({latest_ann_date})，重新下载")
+            record_span_metrics(cache_misses=1)
             
+            # 三大报表相互独立，并发获取，单个失败时该报表返回空列表
+            from .fetch_executor import fetch_concurrently
+            statements = {
+                'balance_sheet': (self.api.balancesheet, 'ts_code,ann_date,f_ann_date,end_date,report_type,comp_type,total_assets,total_liab,total_hldr_eqy_exc_min_int'),
+                'income_statement': (self.api.income, 'ts_code,ann_date,f_ann_date,end_date,report_type,comp_type,total_revenue,total_cogs,operate_profit,total_profit,n_income'),
+                'cash_flow': (self.api.cashflow, 'ts_code,ann_date,f_ann_date,end_date,report_type,comp_type,net_profit,finan_exp,c_fr_sale_sg,c_paid_goods_s'),
+            }
+            results, errors = fetch_concurrently({
+                key: (lambda fetch=fetch, fields=fields: fetch(ts_code=ts_code, period=period, fields=fields))
+                for key, (fetch, fields) in statements.items()
+            })
+
             financials = {}
-            
-            # 获取资产负债表
-            try:
-                balance_sheet = self.api.balancesheet(
-                    ts_code=ts_code,
-                    period=period,
-                    fields='ts_code,ann_date,f_ann_date,end_date,report_type,comp_type,total_assets,total_liab,total_hldr_eqy_exc_min_int'
-                )
-                financials['balance_sheet'] = balance_sheet.to_dict('records') if balance_sheet is not None and not balance_sheet.empty else []
-            except Exception as e:
-                logger.error(f"⚠️ 获取资产负债表失败: {e}")
-                financials['balance_sheet'] = []
-            
-            # 获取利润表
-            try:
-                income_statement = self.api.income(
-                    ts_code=ts_code,
-                    period=period,
-                    fields='ts_code,ann_date,f_ann_date,end_date,report_type,comp_type,total_revenue,total_cogs,operate_profit,total_profit,n_income'
-                )
-                financials['income_statement'] = income_statement.to_dict('records') if income_statement is not None and not income_statement.empty else []
-            except Exception as e:
-                logger.error(f"⚠️ 获取利润表失败: {e}")
-                financials['income_statement'] = []
-            
-            # 获取现金流量表
-            try:
-                cash_flow = self.api.cashflow(
-                    ts_code=ts_code,
-                    period=period,
-                    fields='ts_code,ann_date,f_ann_date,end_date,report_type,comp_type,net_profit,finan_exp,c_fr_sale_sg,c_paid_goods_s'
-                )
-                financials['cash_flow'] = cash_flow.to_dict('records') if cash_flow is not None and not cash_flow.empty else []
-            except Exception as e:
-                logger.error(f"⚠️ 获取现金流量表失败: {e}")
-                financials['cash_flow'] = []
+            for key in statements:
+                if key in errors:
+                    logger.error(f"⚠️ 获取{key}失败: {errors[key]}")
+                data = results.get(key)
+                financials[key] = data.to_dict('records') if data is not None and not data.empty else []
+
+            if not errors and any(financials.values()):
+                ann_dates = [str(record.get('ann_date') or '') for records in financials.values() for record in records]
+                store.put('tushare', ts_code, period, financials, ann_date=max(ann_dates, default=''))
             
             return financials
             
@@ -467,6 +478,17 @@ class TushareProvider:
             logger.error(f"❌ 获取{symbol}财务数据失败: {e}")
             return {}
     
+    def _probe_ann_date(self, ts_code: str, period: str) -> Optional[str]:
+        """只请求公告日期字段，探测报告期是否有新的公告（如更正报告）"""
+        try:
+            probe = self.api.income(ts_code=ts_code, period=period, fields='ts_code,ann_date,end_date')
+        except Exception as e:
+            logger.warning(f"⚠️ [财报库] {ts_code}公告日期探测失败: {e}")
+            return None
+        if probe is None or probe.empty:
+            return None
+        return str(probe['ann_date'].astype(str).max())
+
     def _normalize_symbol(self, symbol: str) -> str:
         """
         标准化股票代码为Tushare格式
@@ -513,6 +535,25 @@ class TushareProvider:
             logger.info(f"🔍 [股票代码追踪] 默认深圳证券交易所: '{symbol}' -> '{result}'")
             return result
     
+    def _get_indexed_stock_list(self) -> pd.DataFrame:
+        """按代码索引的股票列表，每天只加载一次，并同步到证券代码表"""
+        today = datetime.now().strftime('%Y%m%d')
+        cached = getattr(self, '_stock_list_index', None)
+        if cached is not None and cached[0] == today:
+            return cached[1]
+        
+        stock_list = self.get_stock_list()
+        if not isinstance(stock_list, pd.DataFrame) or stock_list.empty:
+            return pd.DataFrame()
+        
+        stock_list = stock_list.assign(symbol=stock_list['symbol'].astype(str).str.zfill(6))
+        from .symbol_master import MARKET_CHINA, update_symbol_master
+        update_symbol_master((MARKET_CHINA, code, name) for code, name in zip(stock_list['symbol'], stock_list['name']))
+        
+        indexed = stock_list.set_index('symbol', drop=False)
+        self._stock_list_index = (today, indexed)
+        return indexed
+    
     def search_stocks(self, keyword: str) -> pd.DataFrame:
         """
         搜索股票
@@ -524,19 +565,17 @@ class TushareProvider:
             DataFrame: 搜索结果
         """
         try:
-            stock_list = self.get_stock_list()
+            stock_list = self._get_indexed_stock_list()
             
             if stock_list.empty:
                 return pd.DataFrame()
             
-            # 按名称和代码搜索
-            mask = (
-                stock_list['name'].str.contains(keyword, na=False) |
-                stock_list['symbol'].str.contains(keyword, na=False) |
-                stock_list['ts_code'].str.contains(keyword, na=False)
-            )
+            # 在证券代码表的前缀索引中按代码、名称、拼音首字母检索
+            from .symbol_master import MARKET_CHINA, get_symbol_master
+            matches = get_symbol_master().search(keyword, market=MARKET_CHINA, limit=None)
+            codes = [item['code'] for item in matches if item['code'] in stock_list.index]
             
-            results = stock_list[mask]
+            results = stock_list.loc[codes].reset_index(drop=True)
             logger.debug(f"🔍 搜索'{keyword}'找到{len(results)}只股票")
             
             return results
@@ -568,6 +607,9 @@ def get_china_stock_data_tushare(symbol: str, start_date: str = None, end_date:
         
     Returns:
         DataFrame: 股票数据
+
+    Raises:
+        DataSourceUnavailableError: Tushare未连接，或网络中断、超时
     """
     provider = get_tushare_provider()
     return provider.get_stock_daily(symbol, start_date, end_date)
@@ -8,6 +8,31 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
     ),
+    # A股全市场日线本地库（scripts/ingest_a_share_eod.py 入库，DataSourceManager优先读取）
+    "eod_store_dir": os.getenv(
+        "TRADINGAGENTS_EOD_STORE_DIR",
+        os.path.join(os.path.abspath(os.path.join(os.path.dirname(__file__), ".")), "dataflows/data_cache/eod_store"),
+    ),
+    # 按报告期保存的财务报表库，出现更新的报告期/公告日期时才重新下载
+    "fundamentals_store_dir": os.getenv(
+        "TRADINGAGENTS_FUNDAMENTALS_STORE_DIR",
+        os.path.join(os.path.abspath(os.path.join(os.path.dirname(__file__), ".")), "dataflows/data_cache/fundamentals_store"),
+    ),
+    # 统一证券代码表快照（A股/港股/美股代码、名称、拼音首字母检索），每日后台刷新
+    "symbol_master_path": os.getenv(
+        "TRADINGAGENTS_SYMBOL_MASTER_PATH",
+        os.path.join(os.path.abspath(os.path.join(os.path.dirname(__file__), ".")), "dataflows/data_cache/symbol_master.json"),
+    ),
+    "symbol_master_refresh_hours": float(os.getenv("SYMBOL_MASTER_REFRESH_HOURS", "24")),
+    "eod_store_enabled": os.getenv("TRADINGAGENTS_EOD_STORE_ENABLED", "true").lower() == "true",
+    # 对冲请求：首选数据源超过对冲延迟(默认p95延迟)未返回时并发请求备用数据源，取最先返回的有效结果
+    "hedged_requests": os.getenv("DATA_SOURCE_HEDGING_ENABLED", "false").lower() == "true",
+    "hedge_delay": float(os.getenv("DATA_SOURCE_HEDGE_DELAY", "0")) or None,
+    # 按交易日历判断行情缓存是否新鲜：已收盘交易日的K线不再刷新，交易时段内按盘中间隔刷新
+    "calendar_cache_ttl": os.getenv("CACHE_CALENDAR_TTL_ENABLED", "true").lower() == "true",
+    "intraday_refresh_minutes": float(os.getenv("CACHE_INTRADAY_REFRESH_MINUTES", "15")),
+    "bar_settle_minutes": float(os.getenv("CACHE_BAR_SETTLE_MINUTES", "30")),
+    "immutable_bar_cache_hours": float(os.getenv("CACHE_IMMUTABLE_BAR_HOURS", "168")),
     # LLM settings
     "llm_provider": "openai",
     "deep_think_llm": "o4-mini",
@@ -17,10 +42,17 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # 反思与记忆：各组件的反思LLM调用并发数（批量反思历史交易日时同样受此限制）
+    "reflection_max_workers": int(os.getenv("REFLECTION_MAX_WORKERS", "5")),
+    # 最终决策提取：规则提取把握度达到阈值时不再调用LLM（准确率见 python -m tests.benchmarks.signal_extraction）
+    "signal_fast_path": os.getenv("SIGNAL_FAST_PATH_ENABLED", "true").lower() == "true",
+    "signal_fast_path_min_certainty": float(os.getenv("SIGNAL_FAST_PATH_MIN_CERTAINTY", "0.8")),
     # Tool settings - 从环境变量读取，提供默认值
     "online_tools": os.getenv("ONLINE_TOOLS_ENABLED", "false").lower() == "true",
     "online_news": os.getenv("ONLINE_NEWS_ENABLED", "true").lower() == "true", 
     "realtime_data": os.getenv("REALTIME_DATA_ENABLED", "false").lower() == "true",
+    # Profiling settings - 开启后每次propagate在 results_dir/profiles 下保存耗时剖析
+    "profiling_enabled": os.getenv("TRADINGAGENTS_PROFILE", "false").lower() == "true",
 
     # Note: Database and cache configuration is now managed by .env file and config.database_manager
     # No database/cache settings in default config to avoid configuration conflicts
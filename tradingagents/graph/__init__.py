@@ -1,16 +1,36 @@
 # TradingAgents/graph/__init__.py
+# 按需导入（PEP 562）：访问 TradingAgentsGraph 等属性时才加载对应子模块
 
-from .trading_graph import TradingAgentsGraph
-from .conditional_logic import ConditionalLogic
-from .setup import GraphSetup
-from .propagation import Propagator
-from .reflection import Reflector
-from .signal_processing import SignalProcessor
+import importlib
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
+# 属性名 -> 提供该属性的子模块
+_LAZY_ATTRIBUTES = {
+    "TradingAgentsGraph": ".trading_graph",
+    "ConditionalLogic": ".conditional_logic",
+    "GraphSetup": ".setup",
+    "Propagator": ".propagation",
+    "Reflector": ".reflection",
+    "SignalProcessor": ".signal_processing",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
 __all__ = [
     "TradingAgentsGraph",
     "ConditionalLogic",
@@ -0,0 +1,195 @@
+# TradingAgents/graph/decision_extractor.py
+"""
+最终决策的确定性结构化提取
+从风险经理/交易员的最终决策文本中按规则提取投资建议、目标价、置信度和风险评分，
+覆盖常见的中英文格式（"最终交易建议: **买入**"、"目标价位: ¥45.50"、"置信度: 85%"、
+"FINAL TRANSACTION PROPOSAL: **BUY**"等）；提取把握度不足时由SignalProcessor再调用LLM
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+ACTION_WORDS = {
+    '买入': '买入', '增持': '买入', '加仓': '买入', 'buy': '买入',
+    '持有': '持有', '观望': '持有', 'hold': '持有',
+    '卖出': '卖出', '减持': '卖出', '清仓': '卖出', 'sell': '卖出',
+}
+LEVEL_WORDS = {'极高': 0.9, '很高': 0.85, '较高': 0.75, '高': 0.8, '中高': 0.65, '中等': 0.5, '中': 0.5,
+               '中低': 0.35, '较低': 0.3, '低': 0.2, '极低': 0.1,
+               'very high': 0.9, 'high': 0.8, 'medium': 0.5, 'moderate': 0.5, 'low': 0.2, 'very low': 0.1}
+
+DEFAULT_CONFIDENCE = 0.7
+DEFAULT_RISK_SCORE = 0.5
+DEFAULT_REASONING = '基于综合分析的投资建议'
+MISSING_FIELD_PENALTY = 0.75
+AMBIGUOUS_PRICE_PENALTY = 0.5
+
+
+def _alternation(words) -> str:
+    """英文词要求完整单词，避免匹配shareholder、buyback等"""
+    return '|'.join(word if not word.isascii() else rf'(?<![a-z]){word}(?![a-z])'
+                    for word in sorted(words, key=len, reverse=True))
+
+
+_ACTION_ALTERNATION = _alternation(ACTION_WORDS)
+_LEVEL_ALTERNATION = _alternation(LEVEL_WORDS)
+_NUMBER = r'(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)'
+# 标签后可跟加粗、括号说明（如"目标价位（6个月）"）和冒号
+_LABEL_TAIL = r'\**\s*(?:[（(][^）)\n]{0,20}[）)])?\s*\**\s*[：:]?\s*\**\s*'
+
+_FINAL_LABELS = r'最终交易建议|最终投资建议|最终决策|最终建议|final\s+transaction\s+proposal|final\s+decision|final\s+recommendation'
+# "建议"、"决策"等泛用标签必须带冒号，避免把"保守派建议卖出"之类的转述当成结论
+_ACTION_PATTERN = re.compile(
+    rf'(?<!不)(?:({_FINAL_LABELS}|投资建议|交易建议|操作建议|建议操作|recommendation){_LABEL_TAIL}'
+    rf'|(决策|建议|decision|action)\**\s*[：:]\s*\**\s*)({_ACTION_ALTERNATION})',
+    re.IGNORECASE)
+_BARE_ACTION_PATTERN = re.compile(rf'(不建议|不宜|暂不|避免|不要|不)?\s*({_ACTION_ALTERNATION})', re.IGNORECASE)
+_PRICE_LABEL_PATTERN = re.compile(
+    rf'(?:目标价[位格]?|目标股价|target\s*price|price\s*target){_LABEL_TAIL}', re.IGNORECASE)
+_PRICE_VALUE_PATTERN = re.compile(
+    rf'(?:HK\$|US\$|[¥￥$]|人民币|港币|美元)?\s*{_NUMBER}'
+    rf'(?:\s*(?:-|~|～|—|至|到)\s*(?:HK\$|US\$|[¥￥$])?\s*{_NUMBER})?',
+    re.IGNORECASE)
+# 目标价标签后跟这些单位的数字是期限、涨幅或估值倍数（"2025年底"、"12个月"、"15%"、"20倍PE"），不是价格
+_NON_PRICE_UNIT_PATTERN = re.compile(
+    r'\s*(?:年|个月|月|日|天|周|%|％|倍|x(?![a-z])|years?|months?|days?|weeks?)', re.IGNORECASE)
+_PRICE_SEARCH_WINDOW = 40
+# Q1、H2、FY26、2026E这类字母数字混写说明目标价行里带有期限或口径，规则无法可靠判断
+_ALNUM_TOKEN_PATTERN = re.compile(r'[a-z]\d|\d[a-z]', re.IGNORECASE)
+_CONFIDENCE_LABELS = r'置信度|信心(?:水平|程度|指数)?|confidence(?:\s*level)?'
+_RISK_LABELS = r'风险评分|风险评级|风险等级|风险分数|风险系数|risk\s*(?:score|rating|level)'
+_REASONING_PATTERN = re.compile(
+    rf'(?:决策理由|主要理由|核心理由|理由|详细推理|推理|reasoning|rationale){_LABEL_TAIL}(.+)', re.IGNORECASE)
+
+# 回退选取理由时跳过的纯字段行
+_SUMMARY_LINE_PATTERN = re.compile(
+    rf'({_FINAL_LABELS}|目标价|target\s*price|{_CONFIDENCE_LABELS}|{_RISK_LABELS})', re.IGNORECASE)
+
+
+def _score_pattern(labels: str) -> re.Pattern:
+    return re.compile(
+        rf'(?:{labels}){_LABEL_TAIL}(?:{_NUMBER}\s*(?:(%|％)|/\s*(\d+)\b)?|({_LEVEL_ALTERNATION}))',
+        re.IGNORECASE)
+
+
+_CONFIDENCE_PATTERN = _score_pattern(_CONFIDENCE_LABELS)
+_RISK_PATTERN = _score_pattern(_RISK_LABELS)
+
+
+@dataclass
+class DecisionExtraction:
+    """规则提取结果；certainty为提取把握度(0-1)，低于阈值时应交给LLM"""
+    decision: Dict
+    certainty: float
+    missing: List[str] = field(default_factory=list)
+
+
+def _to_float(text: str) -> float:
+    return float(text.replace(',', ''))
+
+
+def _extract_action(text: str) -> Tuple[Optional[str], float]:
+    """带标签的建议优先（"最终..."标签最优先，同级取最后一处）；无标签时只有一种建议词出现才采用"""
+    labeled = [(match.group(1) or match.group(2), ACTION_WORDS[match.group(3).lower()])
+               for match in _ACTION_PATTERN.finditer(text)]
+    if labeled:
+        final = [action for label, action in labeled if re.match(_FINAL_LABELS, label, re.IGNORECASE)]
+        actions = {action for _, action in labeled}
+        if final:
+            return final[-1], 1.0 if len(set(final)) == 1 else 0.6
+        return labeled[-1][1], 0.9 if len(actions) == 1 else 0.5
+
+    mentioned = {ACTION_WORDS[match.group(2).lower()] for match in _BARE_ACTION_PATTERN.finditer(text)
+                 if not match.group(1)}
+    if len(mentioned) == 1:
+        return mentioned.pop(), 0.6
+    return None, 0.0
+
+
+def _extract_price(text: str) -> Tuple[Optional[float], bool]:
+    """
+    目标价：标签后同一行内不带期限/百分比/倍数单位的数字，给出区间时取中值
+
+    Returns:
+        (目标价, 是否有歧义)；同一行有多个候选价格（如"当前价30元，上看45元"）或字母数字混写（如"2026年Q1"）时
+        视为有歧义，目标价留空交给LLM
+    """
+    for label in _PRICE_LABEL_PATTERN.finditer(text):
+        segment = text[label.end():label.end() + _PRICE_SEARCH_WINDOW].split('\n', 1)[0]
+        if _ALNUM_TOKEN_PATTERN.search(segment):
+            return None, True
+        candidates = []
+        for match in _PRICE_VALUE_PATTERN.finditer(segment):
+            if _NON_PRICE_UNIT_PATTERN.match(segment, match.end()):
+                continue
+            low = _to_float(match.group(1))
+            candidates.append(round((low + _to_float(match.group(2))) / 2, 2) if match.group(2) else low)
+        if len(candidates) > 1:
+            return None, True
+        if candidates:
+            return candidates[0], False
+    return None, False
+
+
+def _extract_score(pattern: re.Pattern, text: str) -> Optional[float]:
+    """0-1评分；支持0.85、85%、3/5、8/10、不带单位的10分制(1-10)/百分制(10-100)和高/中/低等写法"""
+    match = pattern.search(text)
+    if not match:
+        return None
+    if match.group(4):
+        return LEVEL_WORDS[match.group(4).lower()]
+    value = _to_float(match.group(1))
+    if match.group(2):
+        value /= 100
+    elif match.group(3):
+        scale = int(match.group(3))
+        value = value / scale if scale > 0 else None
+    elif value > 1:
+        value = value / 10 if value <= 10 else (value / 100 if value <= 100 else None)
+    return round(value, 4) if value is not None and 0 <= value <= 1 else None
+
+
+def _extract_reasoning(text: str) -> Optional[str]:
+    match = _REASONING_PATTERN.search(text)
+    if match:
+        reasoning = match.group(1).strip(' *')
+        if reasoning:
+            return reasoning[:200]
+    for line in text.splitlines():
+        line = line.strip(' *#-')
+        if len(line) >= 15 and not _SUMMARY_LINE_PATTERN.match(line):
+            return line[:200]
+    return None
+
+
+def extract_decision(text: str) -> DecisionExtraction:
+    """
+    从最终决策文本中提取结构化决策
+
+    把握度 = 建议的把握度，缺少目标价、置信度、风险评分时各再乘0.75，目标价有歧义时再乘0.5；
+    建议无法确定时为0。缺少的评分会按默认值填入，因此任何一项缺失都会低于快速路径阈值，交给LLM
+    """
+    action, certainty = _extract_action(text)
+    target_price, price_ambiguous = _extract_price(text)
+    confidence = _extract_score(_CONFIDENCE_PATTERN, text)
+    risk_score = _extract_score(_RISK_PATTERN, text)
+    reasoning = _extract_reasoning(text)
+
+    missing = [name for name, value in (('action', action), ('target_price', target_price),
+                                        ('confidence', confidence), ('risk_score', risk_score),
+                                        ('reasoning', reasoning)) if value is None]
+    for value in (target_price, confidence, risk_score):
+        if value is None:
+            certainty *= MISSING_FIELD_PENALTY
+    if price_ambiguous:
+        certainty *= AMBIGUOUS_PRICE_PENALTY
+
+    decision = {
+        'action': action or '持有',
+        'target_price': target_price,
+        'confidence': confidence if confidence is not None else DEFAULT_CONFIDENCE,
+        'risk_score': risk_score if risk_score is not None else DEFAULT_RISK_SCORE,
+        'reasoning': reasoning or DEFAULT_REASONING,
+    }
+    return DecisionExtraction(decision=decision, certainty=round(certainty, 4), missing=missing)
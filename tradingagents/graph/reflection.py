@@ -1,20 +1,34 @@
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 from langchain_openai import ChatOpenAI
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
+# 组件名 -> (反思提示中的角色标签, 从状态中取该角色的分析/决策)
+# 交易员决策在运行状态中是trader_investment_plan，在full_states_log.json中是trader_investment_decision
+REFLECTION_COMPONENTS = {
+    "bull": ("BULL", lambda state: state["investment_debate_state"]["bull_history"]),
+    "bear": ("BEAR", lambda state: state["investment_debate_state"]["bear_history"]),
+    "trader": ("TRADER", lambda state: state.get("trader_investment_plan", state.get("trader_investment_decision"))),
+    "invest_judge": ("INVEST JUDGE", lambda state: state["investment_debate_state"]["judge_decision"]),
+    "risk_manager": ("RISK JUDGE", lambda state: state["risk_debate_state"]["judge_decision"]),
+}
+
 
 class Reflector:
     """Handles reflection on decisions and updating memory."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
+    def __init__(self, quick_thinking_llm: ChatOpenAI, max_workers: int = 5):
         """Initialize the reflector with an LLM."""
         self.quick_thinking_llm = quick_thinking_llm
         self.reflection_system_prompt = self._get_reflection_prompt()
+        self.max_workers = max_workers or 5
 
     def _get_reflection_prompt(self) -> str:
         """Get the system prompt for reflection."""
@@ -123,3 +137,79 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             "RISK JUDGE", judge_decision, situation, returns_losses
         )
         risk_manager_memory.add_situations([(situation, result)])
+
+    def reflect_all(self, current_state, returns_losses, memories: Dict[str, Any]) -> Dict[str, str]:
+        """
+        并发反思所有带记忆的组件
+
+        Args:
+            current_state: 本次分析的最终状态
+            returns_losses: 持仓收益
+            memories: 组件名(见REFLECTION_COMPONENTS) -> FinancialSituationMemory，值为None的组件跳过
+
+        Returns:
+            失败组件 -> 错误信息；单个组件失败不影响其他组件写入记忆
+        """
+        return self.reflect_batch([(current_state, returns_losses)], memories)
+
+    def reflect_batch(self, states_and_returns: Sequence[Tuple[Dict[str, Any], Any]],
+                      memories: Dict[str, Any]) -> Dict[str, str]:
+        """
+        一次反思多个历史(状态, 收益)
+
+        所有(交易日, 组件)的LLM调用在有界线程池中并发执行；
+        每个组件的反思结果按交易日顺序汇总后一次性写入该组件的记忆，
+        不同组件的记忆并发写入，同一记忆库只有一个写入者
+
+        Returns:
+            失败项 -> 错误信息，键为组件名（批量时为"组件名[序号]"）
+        """
+        components = [name for name, memory in memories.items()
+                      if memory is not None and name in REFLECTION_COMPONENTS]
+        if not components or not states_and_returns:
+            return {}
+
+        batch = len(states_and_returns) > 1
+        errors: Dict[str, str] = {}
+        results: Dict[str, List[Optional[Tuple[str, str]]]] = {
+            name: [None] * len(states_and_returns) for name in components
+        }
+
+        def key(name: str, index: int) -> str:
+            return f"{name}[{index}]" if batch else name
+
+        def reflect_one(name: str, state: Dict[str, Any], returns_losses) -> Tuple[str, str]:
+            label, get_report = REFLECTION_COMPONENTS[name]
+            situation = self._extract_current_situation(state)
+            return situation, self._reflect_on_component(label, get_report(state), situation, returns_losses)
+
+        workers = max(1, min(self.max_workers, len(components) * len(states_and_returns)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reflection") as executor:
+            futures = {
+                executor.submit(contextvars.copy_context().run, reflect_one, name, state, returns_losses): (name, index)
+                for index, (state, returns_losses) in enumerate(states_and_returns)
+                for name in components
+            }
+            for future, (name, index) in futures.items():
+                try:
+                    results[name][index] = future.result()
+                except Exception as e:
+                    errors[key(name, index)] = f"{type(e).__name__}: {e}"
+
+            def remember(name: str):
+                situations = [item for item in results[name] if item is not None]
+                if situations:
+                    memories[name].add_situations(situations)
+
+            writes = {executor.submit(contextvars.copy_context().run, remember, name): name for name in components}
+            for future, name in writes.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    errors[f"{name}_memory"] = f"{type(e).__name__}: {e}"
+
+        if errors:
+            logger.warning(f"⚠️ [反思] {len(errors)}项反思失败: {errors}")
+        logger.info(f"🪞 [反思] 完成{len(states_and_returns)}个交易日 x {len(components)}个组件的反思，"
+                    f"失败{len(errors)}项")
+        return errors
@@ -5,11 +5,26 @@ from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
 
-from tradingagents.agents import *
+from tradingagents.agents import (
+    create_bear_researcher,
+    create_bull_researcher,
+    create_fundamentals_analyst,
+    create_market_analyst,
+    create_msg_delete,
+    create_neutral_debator,
+    create_news_analyst,
+    create_research_manager,
+    create_risk_manager,
+    create_risky_debator,
+    create_safe_debator,
+    create_social_media_analyst,
+    create_trader,
+)
 from tradingagents.agents.utils.agent_states import AgentState
 from tradingagents.agents.utils.agent_utils import Toolkit
 
 from .conditional_logic import ConditionalLogic
+from tradingagents.utils.progress_events import with_progress_events
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
@@ -159,23 +174,34 @@ class GraphSetup:
         # Create workflow
         workflow = StateGraph(AgentState)
 
+        # 分析师节点对应的进度模块名
+        analyst_module_names = {
+            "market": "market_analyst",
+            "social": "social_media_analyst",
+            "news": "news_analyst",
+            "fundamentals": "fundamentals_analyst",
+        }
+
         # Add analyst nodes to the graph
         for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+            workflow.add_node(
+                f"{analyst_type.capitalize()} Analyst",
+                with_progress_events(analyst_module_names[analyst_type], node),
+            )
             workflow.add_node(
                 f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
             )
             workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
-        workflow.add_node("Bull Researcher", bull_researcher_node)
-        workflow.add_node("Bear Researcher", bear_researcher_node)
-        workflow.add_node("Research Manager", research_manager_node)
-        workflow.add_node("Trader", trader_node)
-        workflow.add_node("Risky Analyst", risky_analyst)
-        workflow.add_node("Neutral Analyst", neutral_analyst)
-        workflow.add_node("Safe Analyst", safe_analyst)
-        workflow.add_node("Risk Judge", risk_manager_node)
+        workflow.add_node("Bull Researcher", with_progress_events("bull_researcher", bull_researcher_node))
+        workflow.add_node("Bear Researcher", with_progress_events("bear_researcher", bear_researcher_node))
+        workflow.add_node("Research Manager", with_progress_events("research_manager", research_manager_node))
+        workflow.add_node("Trader", with_progress_events("trader", trader_node))
+        workflow.add_node("Risky Analyst", with_progress_events("risky_analyst", risky_analyst))
+        workflow.add_node("Neutral Analyst", with_progress_events("neutral_analyst", neutral_analyst))
+        workflow.add_node("Safe Analyst", with_progress_events("safe_analyst", safe_analyst))
+        workflow.add_node("Risk Judge", with_progress_events("risk_manager", risk_manager_node))
 
         # Define edges
         # Start with the first analyst
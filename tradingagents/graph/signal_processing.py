@@ -1,7 +1,14 @@
 # TradingAgents/graph/signal_processing.py
 
+import json
+import os
+from datetime import datetime
+from typing import Optional
+
 from langchain_openai import ChatOpenAI
 
+from tradingagents.graph.decision_extractor import extract_decision
+
 # 导入统一日志系统和图处理模块日志装饰器
 from tradingagents.utils.logging_init import get_logger
 from tradingagents.utils.tool_logging import log_graph_module
@@ -11,9 +18,13 @@ logger = get_logger("graph.signal_processing")
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
-        """Initialize with an LLM for processing."""
+    def __init__(self, quick_thinking_llm: ChatOpenAI, fast_path_min_certainty: Optional[float] = 0.8):
+        """Initialize with an LLM for processing.
+
+        fast_path_min_certainty: 规则提取把握度达到该值时直接返回、不调用LLM；None表示始终调用LLM
+        """
         self.quick_thinking_llm = quick_thinking_llm
+        self.fast_path_min_certainty = fast_path_min_certainty
 
     @log_graph_module("signal_processing")
     def process_signal(self, full_signal: str, stock_symbol: str = None) -> dict:
@@ -63,6 +74,15 @@ class SignalProcessor:
         logger.info(f"🔍 [SignalProcessor] 处理信号: 股票={stock_symbol}, 市场={market_info['market_name']}, 货币={currency}",
                    extra={'stock_symbol': stock_symbol, 'market': market_info['market_name'], 'currency': currency})
 
+        # 规则快速路径：常见的中英文决策格式直接提取，把握度不足时才调用LLM
+        if self.fast_path_min_certainty is not None:
+            extraction = extract_decision(full_signal)
+            if extraction.certainty >= self.fast_path_min_certainty:
+                logger.info(f"⚡ [SignalProcessor] 规则提取决策(把握度{extraction.certainty:.2f})，跳过LLM: {extraction.decision}",
+                           extra={'action': extraction.decision['action'], 'stock_symbol': stock_symbol})
+                return extraction.decision
+            logger.debug(f"🔍 [SignalProcessor] 规则提取把握度{extraction.certainty:.2f}不足，缺少{extraction.missing}，调用LLM")
+
         messages = [
             (
                 "system",
@@ -112,7 +132,6 @@ class SignalProcessor:
             logger.debug(f"🔍 [SignalProcessor] LLM响应: {response[:200]}...")
 
             # 尝试解析JSON响应
-            import json
             import re
 
             # 提取JSON部分
@@ -203,6 +222,7 @@ class SignalProcessor:
                 logger.info(f"🔍 [SignalProcessor] 处理结果: {result}",
                            extra={'action': result['action'], 'target_price': result['target_price'],
                                  'confidence': result['confidence'], 'stock_symbol': stock_symbol})
+                self._record_golden_case(full_signal, stock_symbol, result)
                 return result
             else:
                 # 如果无法解析JSON，使用简单的文本提取
@@ -213,6 +233,24 @@ class SignalProcessor:
             # 回退到简单提取
             return self._extract_simple_decision(full_signal)
 
+    def _record_golden_case(self, full_signal: str, stock_symbol: str, result: dict):
+        """设置 SIGNAL_GOLDEN_RECORD_PATH 时追加保存LLM提取结果，作为规则提取的黄金语料"""
+        path = os.getenv('SIGNAL_GOLDEN_RECORD_PATH')
+        if not path:
+            return
+        case = {
+            'id': f"recorded_{stock_symbol}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}",
+            'symbol': stock_symbol,
+            'source': 'recorded',
+            'signal': full_signal,
+            'llm': {key: result.get(key) for key in ('action', 'target_price', 'confidence', 'risk_score')},
+        }
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(case, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"⚠️ [SignalProcessor] 保存黄金语料失败: {e}")
+
     def _smart_price_estimation(self, text: str, action: str, is_china: bool) -> float:
         """智能价格推算方法"""
         import re
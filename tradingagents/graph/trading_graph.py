@@ -13,9 +13,8 @@ from tradingagents.llm_adapters import ChatDashScope, ChatDashScopeOpenAI, ChatG
 
 from langgraph.prebuilt import ToolNode
 
-from tradingagents.agents import *
+from tradingagents.agents import Toolkit
 from tradingagents.default_config import DEFAULT_CONFIG
-from tradingagents.agents.utils.memory import FinancialSituationMemory
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
@@ -29,6 +28,13 @@ from tradingagents.agents.utils.agent_states import (
     RiskDebateState,
 )
 from tradingagents.dataflows.interface import set_config
+from tradingagents.utils.progress_events import progress_module
+from tradingagents.utils.run_profiler import (
+    CATEGORY_NODE,
+    ProfilerCallbackHandler,
+    profile_run,
+    profile_span,
+)
 
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
@@ -238,7 +244,8 @@ class TradingAgentsGraph:
         # Initialize memories (如果启用)
         memory_enabled = self.config.get("memory_enabled", True)
         if memory_enabled:
-            # 使用单例ChromaDB管理器，避免并发创建冲突
+            # 按需导入（会加载chromadb），使用单例ChromaDB管理器，避免并发创建冲突
+            from tradingagents.agents.utils.memory import FinancialSituationMemory
             self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
             self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
             self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
@@ -273,13 +280,17 @@ class TradingAgentsGraph:
         )
 
         self.propagator = Propagator()
-        self.reflector = Reflector(self.quick_thinking_llm)
-        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+        self.reflector = Reflector(self.quick_thinking_llm, self.config.get("reflection_max_workers"))
+        self.signal_processor = SignalProcessor(
+            self.quick_thinking_llm,
+            self.config.get("signal_fast_path_min_certainty", 0.8) if self.config.get("signal_fast_path", True) else None,
+        )
 
         # State tracking
         self.curr_state = None
         self.ticker = None
         self.log_states_dict = {}  # date to full state dict
+        self.last_profile = None  # 最近一次propagate的运行剖析（开启profiling_enabled时）
 
         # Set up the graph
         self.graph = self.graph_setup.setup_graph(selected_analysts)
@@ -333,7 +344,27 @@ class TradingAgentsGraph:
 
     def propagate(self, company_name, trade_date):
         """Run the trading agents graph for a company on a specific date."""
-
+        if not self.config.get("profiling_enabled", False):
+            return self._propagate(company_name, trade_date)
+
+        with profile_run("propagate", company=str(company_name), trade_date=str(trade_date)) as profiler:
+            try:
+                return self._propagate(company_name, trade_date, callbacks=[ProfilerCallbackHandler(profiler)])
+            finally:
+                self.last_profile = profiler
+                self._save_profile(profiler, company_name, trade_date)
+
+    def _save_profile(self, profiler, company_name, trade_date):
+        """保存剖析结果（JSON + Chrome trace）到 results_dir/profiles"""
+        profiler.finish()
+        try:
+            profile_dir = Path(self.config.get("results_dir", "./results")) / "profiles"
+            json_path, trace_path = profiler.save(str(profile_dir), prefix=f"{company_name}_{trade_date}")
+            logger.info(f"⏱️ [性能剖析] 总耗时 {profiler.root.duration:.2f}s，已保存: {json_path} | {trace_path}")
+        except Exception as e:
+            logger.warning(f"⚠️ [性能剖析] 保存剖析结果失败: {e}")
+
+    def _propagate(self, company_name, trade_date, callbacks=None):
         # 添加详细的接收日志
         logger.debug(f"🔍 [GRAPH DEBUG] ===== TradingAgentsGraph.propagate 接收参数 =====")
         logger.debug(f"🔍 [GRAPH DEBUG] 接收到的company_name: '{company_name}' (类型: {type(company_name)})")
@@ -349,7 +380,7 @@ class TradingAgentsGraph:
         )
         logger.debug(f"🔍 [GRAPH DEBUG] 初始状态中的company_of_interest: '{init_agent_state.get('company_of_interest', 'NOT_FOUND')}'")
         logger.debug(f"🔍 [GRAPH DEBUG] 初始状态中的trade_date: '{init_agent_state.get('trade_date', 'NOT_FOUND')}'")
-        args = self.propagator.get_graph_args()
+        args = self.propagator.get_graph_args(callbacks)
 
         if self.debug:
             # Debug mode with tracing
@@ -373,7 +404,10 @@ class TradingAgentsGraph:
         self._log_state(trade_date, final_state)
 
         # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"], company_name)
+        with progress_module("graph_signal_processing", str(company_name)), \
+                profile_span("graph_signal_processing", CATEGORY_NODE):
+            decision = self.process_signal(final_state["final_trade_decision"], company_name)
+        return final_state, decision
 
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""
@@ -417,23 +451,61 @@ class TradingAgentsGraph:
         ) as f:
             json.dump(self.log_states_dict, f, indent=4)
 
+    def _reflection_memories(self) -> Dict[str, Any]:
+        """组件名 -> 记忆库（记忆功能关闭时为None，反思时跳过）"""
+        return {
+            "bull": self.bull_memory,
+            "bear": self.bear_memory,
+            "trader": self.trader_memory,
+            "invest_judge": self.invest_judge_memory,
+            "risk_manager": self.risk_manager_memory,
+        }
+
     def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
-        )
+        """Reflect on decisions and update memory based on returns.
+
+        五个组件的反思相互独立，并发执行；返回失败组件 -> 错误信息
+        """
+        return self.reflector.reflect_all(self.curr_state, returns_losses, self._reflection_memories())
+
+    def reflect_and_remember_batch(self, returns_by_date) -> Dict[str, str]:
+        """
+        批量反思多个历史交易日（如回测结束后统一学习）
+
+        Args:
+            returns_by_date: {交易日: 收益} 或 [(交易日, 收益), ...]，
+                交易日对应的状态取自本进程的log_states_dict，缺失时读取full_states_log.json
+
+        Returns:
+            失败项 -> 错误信息
+        """
+        items = list(returns_by_date.items()) if isinstance(returns_by_date, dict) else list(returns_by_date)
+        logged_states = dict(self._load_logged_states())
+        logged_states.update(self.log_states_dict)
+
+        states_and_returns = []
+        for trade_date, returns_losses in items:
+            state = logged_states.get(str(trade_date))
+            if state is None:
+                logger.warning(f"⚠️ [反思] 未找到{trade_date}的分析状态，跳过")
+                continue
+            states_and_returns.append((state, returns_losses))
+
+        return self.reflector.reflect_batch(states_and_returns, self._reflection_memories())
+
+    def _load_logged_states(self) -> Dict[str, Any]:
+        """读取已保存的full_states_log.json（不存在或损坏时返回空字典）"""
+        if not self.ticker:
+            return {}
+        path = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log.json")
+        if not path.exists():
+            return {}
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ [反思] 读取{path}失败: {e}")
+            return {}
 
     def process_signal(self, full_signal, stock_symbol=None):
         """Process a signal to extract the core decision."""
@@ -3,10 +3,12 @@
 支持多种过滤策略：规则过滤、语义相似度、本地分类模型
 """
 
+import os
 import pandas as pd
 import re
 import logging
-from typing import List, Dict, Tuple, Optional
+import threading
+from typing import Any, List, Dict, Tuple, Optional
 from datetime import datetime
 import numpy as np
 
@@ -15,6 +17,51 @@ from .news_filter import NewsRelevanceFilter, create_news_filter, get_company_na
 
 logger = logging.getLogger(__name__)
 
+SEMANTIC_MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"  # 支持中文的轻量级模型
+CLASSIFICATION_MODEL_NAME = "uer/roberta-base-finetuned-chinanews-chinese"
+# 批量推理时每批的新闻条数（限制显存/内存峰值）
+MODEL_BATCH_SIZE = int(os.getenv("NEWS_FILTER_BATCH_SIZE", "32"))
+
+# 进程内共享的模型，所有过滤器实例复用；加载失败也会缓存(None)，不再反复尝试
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+
+def _load_shared_model(key: str, loader):
+    if key in _models:
+        return _models[key]
+    with _models_lock:
+        if key not in _models:
+            try:
+                _models[key] = loader()
+            except ImportError as e:
+                logger.warning(f"[增强过滤器] 模型依赖未安装，跳过 {key}: {e}")
+                _models[key] = None
+            except Exception as e:
+                logger.error(f"[增强过滤器] 模型加载失败 {key}: {e}")
+                _models[key] = None
+        return _models[key]
+
+
+def get_sentence_model(model_name: str = SEMANTIC_MODEL_NAME):
+    """获取共享的语义相似度模型，未安装sentence-transformers时返回None"""
+    def load():
+        from sentence_transformers import SentenceTransformer
+        logger.info(f"[增强过滤器] 正在加载语义相似度模型: {model_name}")
+        return SentenceTransformer(model_name)
+    return _load_shared_model(f"sentence:{model_name}", load)
+
+
+def get_classification_model(model_name: str = CLASSIFICATION_MODEL_NAME) -> Optional[Tuple[Any, Any]]:
+    """获取共享的 (tokenizer, 分类模型)，未安装transformers时返回None"""
+    def load():
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        logger.info(f"[增强过滤器] 正在加载本地分类模型: {model_name}")
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.eval()
+        return AutoTokenizer.from_pretrained(model_name), model
+    return _load_shared_model(f"classifier:{model_name}", load)
+
 class EnhancedNewsFilter(NewsRelevanceFilter):
     """增强新闻过滤器，集成本地模型和多种过滤策略"""
     
@@ -47,64 +94,39 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             self._init_classification_model()
     
     def _init_semantic_model(self):
-        """初始化语义相似度模型"""
+        """初始化语义相似度模型（进程内共享）并预计算公司相关文本的embedding"""
+        self.sentence_model = get_sentence_model()
+        if self.sentence_model is None:
+            self.use_semantic = False
+            return
         try:
-            logger.info("[增强过滤器] 正在加载语义相似度模型...")
-            
-            # 尝试使用sentence-transformers
-            try:
-                from sentence_transformers import SentenceTransformer
-                
-                # 使用轻量级中文模型
-                model_name = "paraphrase-multilingual-MiniLM-L12-v2"  # 支持中文的轻量级模型
-                self.sentence_model = SentenceTransformer(model_name)
-                
-                # 预计算公司相关的embedding
-                company_texts = [
-                    self.company_name,
-                    f"{self.company_name}股票",
-                    f"{self.company_name}公司",
-                    f"{self.stock_code}",
-                    f"{self.company_name}业绩",
-                    f"{self.company_name}财报"
-                ]
-                
-                self.company_embedding = self.sentence_model.encode(company_texts)
-                logger.info(f"[增强过滤器] ✅ 语义模型加载成功: {model_name}")
-                
-            except ImportError:
-                logger.warning("[增强过滤器] sentence-transformers未安装，跳过语义过滤")
-                self.use_semantic = False
-                
+            company_texts = [
+                self.company_name,
+                f"{self.company_name}股票",
+                f"{self.company_name}公司",
+                f"{self.stock_code}",
+                f"{self.company_name}业绩",
+                f"{self.company_name}财报"
+            ]
+            self.company_embedding = self._normalize(np.asarray(self.sentence_model.encode(company_texts)))
+            logger.info(f"[增强过滤器] ✅ 语义模型就绪: {SEMANTIC_MODEL_NAME}")
         except Exception as e:
             logger.error(f"[增强过滤器] 语义模型初始化失败: {e}")
             self.use_semantic = False
     
     def _init_classification_model(self):
-        """初始化本地分类模型"""
-        try:
-            logger.info("[增强过滤器] 正在加载本地分类模型...")
-            
-            # 尝试使用transformers库的中文分类模型
-            try:
-                from transformers import AutoTokenizer, AutoModelForSequenceClassification
-                import torch
-                
-                # 使用轻量级中文文本分类模型
-                model_name = "uer/roberta-base-finetuned-chinanews-chinese"
-                
-                self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-                self.classification_model = AutoModelForSequenceClassification.from_pretrained(model_name)
-                
-                logger.info(f"[增强过滤器] ✅ 分类模型加载成功: {model_name}")
-                
-            except ImportError:
-                logger.warning("[增强过滤器] transformers未安装，跳过本地模型分类")
-                self.use_local_model = False
-                
-        except Exception as e:
-            logger.error(f"[增强过滤器] 本地分类模型初始化失败: {e}")
+        """初始化本地分类模型（进程内共享）"""
+        loaded = get_classification_model()
+        if loaded is None:
             self.use_local_model = False
+            return
+        self.tokenizer, self.classification_model = loaded
+        logger.info(f"[增强过滤器] ✅ 分类模型就绪: {CLASSIFICATION_MODEL_NAME}")
+
+    @staticmethod
+    def _normalize(embeddings: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.where(norms == 0, 1, norms)
     
     def calculate_semantic_similarity(self, title: str, content: str) -> float:
         """
@@ -117,36 +139,31 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
         Returns:
             float: 语义相似度评分 (0-100)
         """
+        return float(self.calculate_semantic_similarities(pd.Series([title]), pd.Series([content]))[0])
+
+    def calculate_semantic_similarities(self, titles: pd.Series, contents: pd.Series) -> np.ndarray:
+        """
+        批量计算语义相似度评分：所有新闻一次encode，再与公司embedding做一次矩阵乘法
+
+        Returns:
+            np.ndarray: 每条新闻与公司相关文本的最高余弦相似度 (0-100)
+        """
         if not self.use_semantic or self.sentence_model is None:
-            return 0
+            return np.zeros(len(titles))
         
         try:
             # 组合标题和内容的前200字符
-            text = f"{title} {content[:200]}"
+            texts = (titles.fillna('').astype(str) + " " + contents.fillna('').astype(str).str[:200]).tolist()
+            text_embeddings = self._normalize(np.asarray(
+                self.sentence_model.encode(texts, batch_size=MODEL_BATCH_SIZE)))
             
-            # 计算文本embedding
-            text_embedding = self.sentence_model.encode([text])
-            
-            # 计算与公司相关文本的相似度
-            similarities = []
-            for company_emb in self.company_embedding:
-                similarity = np.dot(text_embedding[0], company_emb) / (
-                    np.linalg.norm(text_embedding[0]) * np.linalg.norm(company_emb)
-                )
-                similarities.append(similarity)
-            
-            # 取最高相似度
-            max_similarity = max(similarities)
-            
-            # 转换为0-100评分
-            semantic_score = max(0, min(100, max_similarity * 100))
-            
-            logger.debug(f"[增强过滤器] 语义相似度评分: {semantic_score:.1f}")
-            return semantic_score
+            # 取与公司相关文本的最高相似度，转换为0-100评分
+            max_similarity = (text_embeddings @ self.company_embedding.T).max(axis=1)
+            return np.clip(max_similarity * 100, 0, 100)
             
         except Exception as e:
             logger.error(f"[增强过滤器] 语义相似度计算失败: {e}")
-            return 0
+            return np.zeros(len(titles))
     
     def classify_news_relevance(self, title: str, content: str) -> float:
         """
@@ -159,48 +176,44 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
         Returns:
             float: 分类相关性评分 (0-100)
         """
+        return float(self.classify_news_relevance_batch(pd.Series([title]), pd.Series([content]))[0])
+
+    def classify_news_relevance_batch(self, titles: pd.Series, contents: pd.Series) -> np.ndarray:
+        """
+        批量分类新闻相关性，每 MODEL_BATCH_SIZE 条新闻做一次前向推理
+
+        Returns:
+            np.ndarray: 分类相关性评分 (0-100)
+        """
         if not self.use_local_model or self.classification_model is None:
-            return 0
+            return np.zeros(len(titles))
         
         try:
             import torch
             
-            # 构建分类文本
-            text = f"{title} {content[:300]}"
-            
-            # 添加公司信息作为上下文
-            context_text = f"关于{self.company_name}({self.stock_code})的新闻: {text}"
-            
-            # 分词和编码
-            inputs = self.tokenizer(
-                context_text,
-                return_tensors="pt",
-                truncation=True,
-                padding=True,
-                max_length=512
-            )
+            # 构建分类文本，添加公司信息作为上下文
+            texts = (titles.fillna('').astype(str) + " " + contents.fillna('').astype(str).str[:300]).tolist()
+            context_texts = [f"关于{self.company_name}({self.stock_code})的新闻: {text}" for text in texts]
             
-            # 模型推理
-            with torch.no_grad():
-                outputs = self.classification_model(**inputs)
-                logits = outputs.logits
-                
-                # 使用softmax获取概率分布
-                probabilities = torch.softmax(logits, dim=-1)
-                
+            scores = []
+            for start in range(0, len(context_texts), MODEL_BATCH_SIZE):
+                inputs = self.tokenizer(
+                    context_texts[start:start + MODEL_BATCH_SIZE],
+                    return_tensors="pt",
+                    truncation=True,
+                    padding=True,
+                    max_length=512
+                )
+                with torch.no_grad():
+                    probabilities = torch.softmax(self.classification_model(**inputs).logits, dim=-1)
                 # 假设第一个类别是"相关"，第二个是"不相关"
                 # 这里需要根据具体模型调整
-                relevance_prob = probabilities[0][0].item()  # 相关性概率
-                
-                # 转换为0-100评分
-                classification_score = relevance_prob * 100
-                
-                logger.debug(f"[增强过滤器] 分类模型评分: {classification_score:.1f}")
-                return classification_score
+                scores.append(probabilities[:, 0].cpu().numpy() * 100)
+            return np.concatenate(scores)
                 
         except Exception as e:
             logger.error(f"[增强过滤器] 本地模型分类失败: {e}")
-            return 0
+            return np.zeros(len(titles))
     
     def calculate_enhanced_relevance_score(self, title: str, content: str) -> Dict[str, float]:
         """
@@ -213,25 +226,24 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
         Returns:
             Dict: 包含各种评分的字典
         """
-        scores = {}
-        
-        # 1. 基础规则评分
-        rule_score = super().calculate_relevance_score(title, content)
-        scores['rule_score'] = rule_score
-        
-        # 2. 语义相似度评分
-        if self.use_semantic:
-            semantic_score = self.calculate_semantic_similarity(title, content)
-            scores['semantic_score'] = semantic_score
-        else:
-            scores['semantic_score'] = 0
+        scores = self.calculate_enhanced_relevance_scores(pd.Series([title]), pd.Series([content]))
+        return {name: float(value) for name, value in scores.iloc[0].items()}
+
+    def calculate_enhanced_relevance_scores(self, titles: pd.Series, contents: pd.Series) -> pd.DataFrame:
+        """
+        批量计算增强相关性评分：规则评分向量化，语义模型和分类模型各做一次批量推理
         
-        # 3. 本地模型分类评分
-        if self.use_local_model:
-            classification_score = self.classify_news_relevance(title, content)
-            scores['classification_score'] = classification_score
-        else:
-            scores['classification_score'] = 0
+        Returns:
+            pd.DataFrame: rule_score / semantic_score / classification_score / final_score 四列，顺序与输入一致
+        """
+        scores = pd.DataFrame({
+            # 1. 基础规则评分
+            'rule_score': super().calculate_relevance_scores(titles, contents),
+            # 2. 语义相似度评分
+            'semantic_score': self.calculate_semantic_similarities(titles, contents),
+            # 3. 本地模型分类评分
+            'classification_score': self.classify_news_relevance_batch(titles, contents),
+        })
         
         # 4. 综合评分（加权平均）
         weights = {
@@ -240,17 +252,12 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             'classification': 0.25  # 分类模型权重25%
         }
         
-        final_score = (
-            weights['rule'] * rule_score +
+        scores['final_score'] = (
+            weights['rule'] * scores['rule_score'] +
             weights['semantic'] * scores['semantic_score'] +
             weights['classification'] * scores['classification_score']
         )
         
-        scores['final_score'] = final_score
-        
-        logger.debug(f"[增强过滤器] 综合评分 - 规则:{rule_score:.1f}, 语义:{scores['semantic_score']:.1f}, "
-                    f"分类:{scores['classification_score']:.1f}, 最终:{final_score:.1f}")
-        
         return scores
     
     def filter_news_enhanced(self, news_df: pd.DataFrame, min_score: float = 40) -> pd.DataFrame:
@@ -270,29 +277,17 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
         
         logger.info(f"[增强过滤器] 开始增强过滤，原始数量: {len(news_df)}条，最低评分阈值: {min_score}")
         
-        filtered_news = []
-        
-        for idx, row in news_df.iterrows():
-            title = row.get('新闻标题', row.get('标题', ''))
-            content = row.get('新闻内容', row.get('内容', ''))
-            
-            # 计算增强评分
-            scores = self.calculate_enhanced_relevance_score(title, content)
-            
-            if scores['final_score'] >= min_score:
-                row_dict = row.to_dict()
-                row_dict.update(scores)  # 添加所有评分信息
-                filtered_news.append(row_dict)
-                
-                logger.debug(f"[增强过滤器] 保留新闻 (综合评分: {scores['final_score']:.1f}): {title[:50]}...")
-            else:
-                logger.debug(f"[增强过滤器] 过滤新闻 (综合评分: {scores['final_score']:.1f}): {title[:50]}...")
+        scores = self.calculate_enhanced_relevance_scores(*self._news_texts(news_df))
+        keep = (scores['final_score'] >= min_score).to_numpy()
+        logger.debug(f"[增强过滤器] 保留 {int(keep.sum())}条，过滤 {int((~keep).sum())}条")
         
-        # 创建过滤后的DataFrame
-        if filtered_news:
-            filtered_df = pd.DataFrame(filtered_news)
+        # 创建过滤后的DataFrame，附带所有评分信息
+        if keep.any():
+            filtered_df = news_df[keep].reset_index(drop=True)
+            for name, values in scores[keep].reset_index(drop=True).items():
+                filtered_df[name] = values
             # 按综合评分排序
-            filtered_df = filtered_df.sort_values('final_score', ascending=False)
+            filtered_df = filtered_df.sort_values('final_score', ascending=False, kind='stable')
             logger.info(f"[增强过滤器] 增强过滤完成，保留 {len(filtered_df)}条 新闻")
         else:
             filtered_df = pd.DataFrame()
@@ -2,15 +2,23 @@
 """
 统一日志管理器
 提供项目级别的日志配置和管理功能
+
+默认使用队列日志：根日志器只挂一个QueueHandler，调用线程只负责把记录放入队列，
+格式化和控制台/文件写入由单个后台线程（QueueListener）完成；
+另外可按日志器名称对调试量大的路径做采样或限流（配置项 logging.sampling）
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 import json
 import toml
 
@@ -19,6 +27,121 @@ import toml
 _bootstrap_logger = logging.getLogger("tradingagents.logging_manager")
 
 
+class LazyMessage:
+    """
+    延迟计算的日志参数：logger.debug("%s", LazyMessage(build, data))
+    只有记录真正被输出时才调用 build(data)，队列模式下在后台写入线程中执行
+    """
+
+    __slots__ = ('_func', '_args', '_value')
+
+    def __init__(self, func, *args):
+        self._func = func
+        self._args = args
+        self._value = None
+
+    def __str__(self):
+        if self._value is None:
+            self._value = str(self._func(*self._args))
+        return self._value
+
+    __repr__ = __str__
+
+
+# 参数全部为这些类型时，放入队列后再由写入线程合并消息也不会因对象被修改而失真
+_DEFERRABLE_ARG_TYPES = (str, int, float, bool, bytes, type(None), type, LazyMessage)
+
+
+def _args_deferrable(args) -> bool:
+    if isinstance(args, dict):
+        args = args.values()
+    return all(isinstance(arg, _DEFERRABLE_ARG_TYPES) for arg in args)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    不在调用线程格式化的QueueHandler
+    标准QueueHandler.prepare会先完整格式化一次（含时间和异常堆栈），这里只在参数可变时提前合并消息，
+    其余格式化全部留给写入线程
+    """
+
+    def prepare(self, record):
+        if record.args and not _args_deferrable(record.args):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class LogSampler(logging.Filter):
+    """
+    按日志器名称采样/限流
+    规则按名称前缀匹配（最长前缀优先），只作用于 max_level 及以下级别，WARNING及以上默认总是保留：
+        sample_rate     保留比例(0-1]，按计数均匀保留
+        max_per_second  每秒最多保留的条数（令牌桶，burst为桶容量，默认等于max_per_second）
+    被丢弃的条数会附加在下一条保留的记录末尾
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Dict[str, Any]]] = None):
+        super().__init__()
+        self._rules = {name: self._compile(rule) for name, rule in (rules or {}).items()}
+        self._rule_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _compile(rule: Dict[str, Any]) -> Dict[str, Any]:
+        max_per_second = float(rule.get('max_per_second', 0) or 0)
+        return {
+            'max_level': logging.getLevelName(str(rule.get('max_level', 'INFO')).upper()),
+            'sample_rate': min(max(float(rule.get('sample_rate', 1.0)), 0.0), 1.0),
+            'max_per_second': max_per_second,
+            'burst': float(rule.get('burst', max_per_second) or max_per_second),
+            'tokens': float(rule.get('burst', max_per_second) or max_per_second),
+            'updated': time.monotonic(),
+            'credit': 0.0,
+            'dropped': 0,
+        }
+
+    def _rule_for(self, name: str) -> Optional[Dict[str, Any]]:
+        if name not in self._rule_cache:
+            rule, prefix = None, name
+            while prefix:
+                if prefix in self._rules:
+                    rule = self._rules[prefix]
+                    break
+                prefix = prefix.rpartition('.')[0]
+            self._rule_cache[name] = rule
+        return self._rule_cache[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rule = self._rule_for(record.name)
+        if rule is None or record.levelno > rule['max_level']:
+            return True
+
+        with self._lock:
+            if rule['sample_rate'] < 1.0:
+                rule['credit'] += rule['sample_rate']
+                if rule['credit'] < 1.0:
+                    rule['dropped'] += 1
+                    return False
+                rule['credit'] -= 1.0
+
+            if rule['max_per_second'] > 0:
+                now = time.monotonic()
+                rule['tokens'] = min(rule['burst'],
+                                     rule['tokens'] + (now - rule['updated']) * rule['max_per_second'])
+                rule['updated'] = now
+                if rule['tokens'] < 1.0:
+                    rule['dropped'] += 1
+                    return False
+                rule['tokens'] -= 1.0
+
+            dropped, rule['dropped'] = rule['dropped'], 0
+
+        if dropped and isinstance(record.msg, str):
+            record.msg = f"{record.msg} [采样省略 {dropped} 条]"
+        return True
+
+
 class ColoredFormatter(logging.Formatter):
     """彩色日志格式化器"""
     
@@ -33,8 +156,9 @@ class ColoredFormatter(logging.Formatter):
     }
     
     def format(self, record):
-        # 添加颜色
+        # 添加颜色（在副本上修改，同一条记录还会交给文件处理器）
         if hasattr(record, 'levelname') and record.levelname in self.COLORS:
+            record = logging.makeLogRecord(record.__dict__)
             record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.COLORS['RESET']}"
         
         return super().format(record)
@@ -75,6 +199,7 @@ class TradingAgentsLogger:
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or self._load_default_config()
         self.loggers: Dict[str, logging.Logger] = {}
+        self.listener: Optional[logging.handlers.QueueListener] = None
         self._setup_logging()
     
     def _load_default_config(self) -> Dict[str, Any]:
@@ -114,6 +239,10 @@ class TradingAgentsLogger:
                     'directory': log_dir
                 }
             },
+            'queue': {
+                'enabled': os.getenv('TRADINGAGENTS_LOG_QUEUE', 'true').lower() != 'false'
+            },
+            'sampling': {},
             'loggers': {
                 'tradingagents': {'level': log_level},
                 'web': {'level': log_level},
@@ -166,6 +295,11 @@ class TradingAgentsLogger:
             'format': logging_config.get('format', {}),
             'handlers': logging_config.get('handlers', {}),
             'loggers': logging_config.get('loggers', {}),
+            'queue': {
+                'enabled': (os.getenv('TRADINGAGENTS_LOG_QUEUE', 'true').lower() != 'false'
+                            and logging_config.get('queue', {}).get('enabled', True))
+            },
+            'sampling': logging_config.get('sampling', {}),
             'docker': {
                 'enabled': is_docker,
                 'stdout_only': logging_config.get('docker', {}).get('stdout_only', True)
@@ -189,18 +323,49 @@ class TradingAgentsLogger:
         # 清除现有处理器
         root_logger.handlers.clear()
         
-        # 添加处理器
-        self._add_console_handler(root_logger)
+        # 创建输出处理器
+        handlers: List[logging.Handler] = []
+        self._add_console_handler(handlers)
         
         if not self.config['docker']['enabled'] or not self.config['docker']['stdout_only']:
-            self._add_file_handler(root_logger)
+            self._add_file_handler(handlers)
             if self.config['handlers']['structured']['enabled']:
-                self._add_structured_handler(root_logger)
+                self._add_structured_handler(handlers)
+        
+        sampling = self.config.get('sampling') or {}
+        sampler = LogSampler(sampling) if sampling else None
+        
+        if self.config.get('queue', {}).get('enabled', True) and handlers:
+            # 调用线程只入队，后台单线程负责格式化和写入
+            queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+            if sampler:
+                queue_handler.addFilter(sampler)
+            root_logger.addHandler(queue_handler)
+            self.listener = logging.handlers.QueueListener(
+                queue_handler.queue, *handlers, respect_handler_level=True)
+            self.listener.start()
+        else:
+            for handler in handlers:
+                if sampler:
+                    handler.addFilter(sampler)
+                root_logger.addHandler(handler)
         
         # 配置特定日志器
         self._configure_specific_loggers()
     
-    def _add_console_handler(self, logger: logging.Logger):
+    def shutdown(self):
+        """停止后台写入线程，写完队列中剩余的日志并关闭处理器"""
+        if self.listener is not None:
+            listener, self.listener = self.listener, None
+            listener.stop()
+            for handler in listener.handlers:
+                try:
+                    handler.flush()
+                    handler.close()
+                except (OSError, ValueError):
+                    pass  # 输出流已被关闭（如测试框架替换的stdout）
+    
+    def _add_console_handler(self, handlers: List[logging.Handler]):
         """添加控制台处理器"""
         if not self.config['handlers']['console']['enabled']:
             return
@@ -216,9 +381,9 @@ class TradingAgentsLogger:
             formatter = logging.Formatter(self.config['format']['console'])
         
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
-    def _add_file_handler(self, logger: logging.Logger):
+    def _add_file_handler(self, handlers: List[logging.Handler]):
         """添加文件处理器"""
         if not self.config['handlers']['file']['enabled']:
             return
@@ -242,9 +407,9 @@ class TradingAgentsLogger:
         
         formatter = logging.Formatter(self.config['format']['file'])
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
     
-    def _add_structured_handler(self, logger: logging.Logger):
+    def _add_structured_handler(self, handlers: List[logging.Handler]):
         """添加结构化日志处理器"""
         log_dir = Path(self.config['handlers']['structured']['directory'])
         log_file = log_dir / 'tradingagents_structured.log'
@@ -261,7 +426,7 @@ class TradingAgentsLogger:
         
         formatter = StructuredFormatter()
         structured_handler.setFormatter(formatter)
-        logger.addHandler(structured_handler)
+        handlers.append(structured_handler)
     
     def _configure_specific_loggers(self):
         """配置特定的日志器"""
@@ -388,23 +553,38 @@ class TradingAgentsLogger:
 
 # 全局日志管理器实例
 _logger_manager: Optional[TradingAgentsLogger] = None
+_logger_manager_lock = threading.Lock()
 
 
 def get_logger_manager() -> TradingAgentsLogger:
     """获取全局日志管理器实例"""
     global _logger_manager
     if _logger_manager is None:
-        _logger_manager = TradingAgentsLogger()
+        with _logger_manager_lock:
+            if _logger_manager is None:
+                _logger_manager = TradingAgentsLogger()
     return _logger_manager
 
 
+def shutdown_logging():
+    """进程退出时写完队列中剩余的日志"""
+    if _logger_manager is not None:
+        _logger_manager.shutdown()
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """获取指定名称的日志器（便捷函数）"""
     return get_logger_manager().get_logger(name)
 
 
 def setup_logging(config: Optional[Dict[str, Any]] = None):
-    """设置项目日志系统（便捷函数）"""
+    """设置项目日志系统（便捷函数）；重复调用时先停止上一次的后台写入线程"""
     global _logger_manager
-    _logger_manager = TradingAgentsLogger(config)
+    with _logger_manager_lock:
+        if _logger_manager is not None:
+            _logger_manager.shutdown()
+        _logger_manager = TradingAgentsLogger(config)
     return _logger_manager
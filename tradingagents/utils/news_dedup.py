@@ -0,0 +1,192 @@
+"""
+新闻近似重复聚类
+同一条通稿经东方财富、新浪、FinnHub、Google新闻等多个来源转载后，标题和正文只有少量差异；
+这里用MinHash签名估计规范化文本的Jaccard相似度，LSH分桶只比较候选对，
+每个聚类保留一条代表新闻并记录全部来源，减少后续评分、向量化和提示词中的重复内容
+"""
+
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16            # 16个分桶 x 每桶4行，Jaccard约0.5以上的文本大概率成为候选对
+SHINGLE_SIZE = 3          # 字符3-gram，中英文通用
+TITLE_THRESHOLD = 0.8     # 标题相似度达到该值，且正文不矛盾时视为同一新闻
+TITLE_BODY_FLOOR = 0.5    # 标题相近时正文至少需要的相似度（"X发布三季报"这类模板标题靠正文区分）
+BODY_THRESHOLD = 0.8      # 正文相似度达到该值即视为同一新闻（标题被改写的转载）
+BODY_MIN_CHARS = 20       # 规范化后短于该长度的正文不参与比较
+BODY_PREFIX_CHARS = 300   # 正文只取前若干字符，不同来源的摘要长度差异很大
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)
+_PERM_A = _rng.randint(1, _MERSENNE_PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+_PERM_B = _rng.randint(0, _MERSENNE_PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+# 转载时常见的来源/编辑标注，不参与相似度计算
+_BOILERPLATE = re.compile(
+    r"(来源[:：]\S+|责任编辑[:：]\S+|编辑[:：]\S+|原标题[:：]|\(?(?:reuters|bloomberg|ap)\)?\s*[-—])",
+    re.IGNORECASE)
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_news_text(text: Optional[str]) -> str:
+    """全角转半角、小写、去掉来源标注、标点和空白"""
+    if not text or not isinstance(text, str):
+        return ""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _BOILERPLATE.sub(" ", text)
+    return _NON_WORD.sub("", text)
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """规范化文本的MinHash签名；文本短于一个shingle时返回None"""
+    if len(text) < SHINGLE_SIZE:
+        return None
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    hashes %= np.uint64(_MERSENNE_PRIME)
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % np.uint64(_MERSENNE_PRIME)
+    return permuted.min(axis=1)
+
+
+def estimate_similarity(left: Optional[np.ndarray], right: Optional[np.ndarray]) -> float:
+    if left is None or right is None:
+        return 0.0
+    return float(np.mean(left == right))
+
+
+@dataclass
+class NewsCluster:
+    """一组近似重复的新闻：代表新闻在输入中的位置，以及全部成员位置和来源"""
+    representative: int
+    members: List[int]
+    sources: List[str] = field(default_factory=list)
+
+    @property
+    def duplicate_count(self) -> int:
+        return len(self.members) - 1
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            # 以较早出现的新闻为根，保持输入顺序
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+def _candidate_pairs(signatures: List[Optional[np.ndarray]]) -> set:
+    """LSH分桶：任一分桶内签名完全相同的新闻成为候选对"""
+    rows = NUM_PERMUTATIONS // LSH_BANDS
+    buckets: Dict[tuple, List[int]] = defaultdict(list)
+    for i, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        for band in range(LSH_BANDS):
+            buckets[(band, signature[band * rows:(band + 1) * rows].tobytes())].append(i)
+    pairs = set()
+    for candidates in buckets.values():
+        for a in range(len(candidates)):
+            for b in range(a + 1, len(candidates)):
+                pairs.add((candidates[a], candidates[b]))
+    return pairs
+
+
+def cluster_near_duplicates(titles: Sequence[str], contents: Sequence[str],
+                            sources: Sequence[str] = None,
+                            title_threshold: float = TITLE_THRESHOLD,
+                            body_threshold: float = BODY_THRESHOLD) -> List[NewsCluster]:
+    """
+    对新闻做近似重复聚类
+
+    标题和正文分别计算MinHash签名并做LSH分桶，只比较候选对；满足以下任一条件即合并（传递闭包）：
+    标题相似度达到 title_threshold 且正文缺失或相似度不低于 TITLE_BODY_FLOOR；正文相似度达到 body_threshold。
+    代表新闻取正文最长的一条，相同时取最早出现的一条
+
+    Returns:
+        List[NewsCluster]: 按每个聚类首次出现的位置排列
+    """
+    count = len(titles)
+    sources = list(sources) if sources is not None else [""] * count
+    normalized_titles = [normalize_news_text(title) for title in titles]
+    normalized_bodies = [normalize_news_text(content[:BODY_PREFIX_CHARS]) if isinstance(content, str) else ""
+                         for content in contents]
+    title_signatures = [minhash_signature(title) for title in normalized_titles]
+    body_signatures = [minhash_signature(body) if len(body) >= BODY_MIN_CHARS else None
+                       for body in normalized_bodies]
+
+    union_find = _UnionFind(count)
+    for i, j in sorted(_candidate_pairs(title_signatures) | _candidate_pairs(body_signatures)):
+        has_bodies = body_signatures[i] is not None and body_signatures[j] is not None
+        body_similarity = estimate_similarity(body_signatures[i], body_signatures[j])
+        if has_bodies and body_similarity >= body_threshold:
+            union_find.union(i, j)
+        elif (estimate_similarity(title_signatures[i], title_signatures[j]) >= title_threshold
+              and (not has_bodies or body_similarity >= TITLE_BODY_FLOOR)):
+            union_find.union(i, j)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(count):
+        groups[union_find.find(i)].append(i)
+
+    clusters = []
+    for members in groups.values():
+        representative = max(members, key=lambda i: (len(normalized_bodies[i]), -i))
+        member_sources = []
+        for i in members:
+            if isinstance(sources[i], str) and sources[i] and sources[i] not in member_sources:
+                member_sources.append(sources[i])
+        clusters.append(NewsCluster(representative, members, member_sources))
+    clusters.sort(key=lambda cluster: cluster.members[0])
+    return clusters
+
+
+def deduplicate_news_items(items: Sequence[Any], get_title: Callable[[Any], str],
+                           get_content: Callable[[Any], str],
+                           get_source: Callable[[Any], str] = lambda item: "") -> List[NewsCluster]:
+    """对任意新闻对象列表聚类，返回的聚类用下标引用 items"""
+    return cluster_near_duplicates([get_title(item) for item in items], [get_content(item) for item in items],
+                                   [get_source(item) for item in items])
+
+
+def deduplicate_news_df(news_df: pd.DataFrame, title_column: str = '新闻标题', content_column: str = '新闻内容',
+                        source_column: str = '文章来源') -> pd.DataFrame:
+    """
+    新闻DataFrame去除近似重复，每个聚类保留一行
+
+    保留行增加 来源列表（逗号分隔的全部来源）和 重复数量 两列
+    """
+    if news_df is None or news_df.empty or title_column not in news_df.columns:
+        return news_df
+
+    def column(name):
+        return news_df[name].tolist() if name in news_df.columns else [""] * len(news_df)
+
+    clusters = cluster_near_duplicates(column(title_column), column(content_column), column(source_column))
+    deduplicated = news_df.iloc[[cluster.representative for cluster in clusters]].copy()
+    deduplicated['来源列表'] = [", ".join(cluster.sources) for cluster in clusters]
+    deduplicated['重复数量'] = [cluster.duplicate_count for cluster in clusters]
+
+    removed = len(news_df) - len(deduplicated)
+    if removed:
+        logger.info(f"[新闻去重] 近似重复聚类: {len(news_df)}条 -> {len(deduplicated)}条，合并 {removed}条转载")
+    return deduplicated
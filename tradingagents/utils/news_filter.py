@@ -3,6 +3,7 @@
 用于过滤与特定股票/公司不相关的新闻，提高新闻分析质量
 """
 
+import numpy as np
 import pandas as pd
 import re
 from typing import List, Dict, Tuple
@@ -59,77 +60,71 @@ class NewsRelevanceFilter:
         Returns:
             float: 相关性评分 (0-100)
         """
-        score = 0
-        title_lower = title.lower()
-        content_lower = content.lower()
-        
-        # 1. 直接提及公司名称
-        if self.company_name in title:
-            score += 50  # 标题中出现公司名称，高分
-            logger.debug(f"[过滤器] 标题包含公司名称 '{self.company_name}': +50分")
-        elif self.company_name in content:
-            score += 25  # 内容中出现公司名称，中等分
-            logger.debug(f"[过滤器] 内容包含公司名称 '{self.company_name}': +25分")
-            
-        # 2. 直接提及股票代码
-        if self.stock_code in title:
-            score += 40  # 标题中出现股票代码，高分
-            logger.debug(f"[过滤器] 标题包含股票代码 '{self.stock_code}': +40分")
-        elif self.stock_code in content:
-            score += 20  # 内容中出现股票代码，中等分
-            logger.debug(f"[过滤器] 内容包含股票代码 '{self.stock_code}': +20分")
-            
-        # 3. 强相关关键词检查
-        strong_matches = []
-        for keyword in self.strong_keywords:
-            if keyword in title_lower:
-                score += 30
-                strong_matches.append(keyword)
-            elif keyword in content_lower:
-                score += 15
-                strong_matches.append(keyword)
-        
-        if strong_matches:
-            logger.debug(f"[过滤器] 强相关关键词匹配: {strong_matches}")
-            
-        # 4. 包含关键词检查
-        include_matches = []
-        for keyword in self.include_keywords:
-            if keyword in title_lower:
-                score += 15
-                include_matches.append(keyword)
-            elif keyword in content_lower:
-                score += 8
-                include_matches.append(keyword)
-        
-        if include_matches:
-            logger.debug(f"[过滤器] 相关关键词匹配: {include_matches[:3]}...")  # 只显示前3个
-            
-        # 5. 排除关键词检查（减分）
-        exclude_matches = []
-        for keyword in self.exclude_keywords:
-            if keyword in title_lower:
-                score -= 40  # 标题中出现排除词，大幅减分
-                exclude_matches.append(keyword)
-            elif keyword in content_lower:
-                score -= 20  # 内容中出现排除词，中等减分
-                exclude_matches.append(keyword)
-        
-        if exclude_matches:
-            logger.debug(f"[过滤器] 排除关键词匹配: {exclude_matches[:3]}...")
+        final_score = int(self.calculate_relevance_scores(pd.Series([title]), pd.Series([content]))[0])
+        logger.debug(f"[过滤器] 最终评分: {final_score}分 - 标题: {title[:30]}...")
+        return final_score
+
+    @staticmethod
+    def _keyword_hits(texts: pd.Series, keywords: List[str]) -> np.ndarray:
+        """每个关键词对整列文本做一次子串匹配，返回 (新闻数, 关键词数) 的布尔矩阵"""
+        if not keywords:
+            return np.zeros((len(texts), 0), dtype=bool)
+        return np.column_stack([texts.str.contains(keyword, regex=False).to_numpy(dtype=bool)
+                                for keyword in keywords])
+
+    def calculate_relevance_scores(self, titles: pd.Series, contents: pd.Series) -> np.ndarray:
+        """
+        批量计算相关性评分，规则与 calculate_relevance_score 相同
+
+        每个关键词对整列标题/内容各匹配一次，评分由命中矩阵加权求和得到，不再逐条循环
+
+        Args:
+            titles: 新闻标题列
+            contents: 新闻内容列
             
+        Returns:
+            np.ndarray: 与输入顺序一致的相关性评分 (0-100)
+        """
+        titles = titles.fillna('').astype(str).reset_index(drop=True)
+        contents = contents.fillna('').astype(str).reset_index(drop=True)
+        titles_lower = titles.str.lower()
+        contents_lower = contents.str.lower()
+        score = np.zeros(len(titles), dtype=np.int64)
+
+        # 1-2. 直接提及公司名称/股票代码：标题命中高分，否则内容命中中等分
+        name_in_title = titles.str.contains(self.company_name, regex=False).to_numpy(dtype=bool)
+        name_in_content = contents.str.contains(self.company_name, regex=False).to_numpy(dtype=bool)
+        code_in_title = titles.str.contains(self.stock_code, regex=False).to_numpy(dtype=bool)
+        code_in_content = contents.str.contains(self.stock_code, regex=False).to_numpy(dtype=bool)
+        score += np.where(name_in_title, 50, np.where(name_in_content, 25, 0))
+        score += np.where(code_in_title, 40, np.where(code_in_content, 20, 0))
+
+        # 3-5. 关键词：每个关键词标题命中按标题分计，否则内容命中按内容分计
+        def keyword_points(keywords, title_points, content_points):
+            in_title = self._keyword_hits(titles_lower, keywords)
+            in_content = self._keyword_hits(contents_lower, keywords) & ~in_title
+            return title_points * in_title.sum(axis=1) + content_points * in_content.sum(axis=1), in_title
+
+        score += keyword_points(self.strong_keywords, 30, 15)[0]
+        score += keyword_points(self.include_keywords, 15, 8)[0]
+        exclude_points, exclude_in_title = keyword_points(self.exclude_keywords, -40, -20)
+        score += exclude_points
+
         # 6. 特殊规则：如果标题完全不包含公司信息但包含排除词，严重减分
-        if (self.company_name not in title and self.stock_code not in title and 
-            any(keyword in title_lower for keyword in self.exclude_keywords)):
-            score -= 30
-            logger.debug(f"[过滤器] 标题无公司信息但含排除词: -30分")
-        
+        score -= np.where(~name_in_title & ~code_in_title & exclude_in_title.any(axis=1), 30, 0)
+
         # 确保评分在0-100范围内
-        final_score = max(0, min(100, score))
-        
-        logger.debug(f"[过滤器] 最终评分: {final_score}分 - 标题: {title[:30]}...")
-        
-        return final_score
+        return np.clip(score, 0, 100)
+
+    @staticmethod
+    def _news_texts(news_df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+        """取标题列和内容列（兼容 新闻标题/标题、新闻内容/内容 两种列名）"""
+        def column(*names):
+            for name in names:
+                if name in news_df.columns:
+                    return news_df[name]
+            return pd.Series([''] * len(news_df), index=news_df.index)
+        return column('新闻标题', '标题'), column('新闻内容', '内容')
     
     def filter_news(self, news_df: pd.DataFrame, min_score: float = 30) -> pd.DataFrame:
         """
@@ -148,29 +143,16 @@ class NewsRelevanceFilter:
         
         logger.info(f"[过滤器] 开始过滤新闻，原始数量: {len(news_df)}条，最低评分阈值: {min_score}")
         
-        filtered_news = []
-        
-        for idx, row in news_df.iterrows():
-            title = row.get('新闻标题', row.get('标题', ''))
-            content = row.get('新闻内容', row.get('内容', ''))
-            
-            # 计算相关性评分
-            score = self.calculate_relevance_score(title, content)
-            
-            if score >= min_score:
-                row_dict = row.to_dict()
-                row_dict['relevance_score'] = score
-                filtered_news.append(row_dict)
-                
-                logger.debug(f"[过滤器] 保留新闻 (评分: {score:.1f}): {title[:50]}...")
-            else:
-                logger.debug(f"[过滤器] 过滤新闻 (评分: {score:.1f}): {title[:50]}...")
+        scores = self.calculate_relevance_scores(*self._news_texts(news_df))
+        keep = scores >= min_score
+        logger.debug(f"[过滤器] 保留 {int(keep.sum())}条，过滤 {int((~keep).sum())}条")
         
         # 创建过滤后的DataFrame
-        if filtered_news:
-            filtered_df = pd.DataFrame(filtered_news)
+        if keep.any():
+            filtered_df = news_df[keep].reset_index(drop=True)
+            filtered_df['relevance_score'] = scores[keep]
             # 按相关性评分排序
-            filtered_df = filtered_df.sort_values('relevance_score', ascending=False)
+            filtered_df = filtered_df.sort_values('relevance_score', ascending=False, kind='stable')
             logger.info(f"[过滤器] 过滤完成，保留 {len(filtered_df)}条 新闻")
         else:
             filtered_df = pd.DataFrame()
@@ -251,7 +233,10 @@ def get_company_name(ticker: str) -> str:
     clean_ticker = ticker.split('.')[0]
     
     company_name = STOCK_COMPANY_MAPPING.get(clean_ticker)
-    
+    if not company_name:
+        from tradingagents.dataflows.symbol_master import get_stock_name
+        company_name = get_stock_name(ticker)
+
     if company_name:
         logger.debug(f"[公司映射] {ticker} -> {company_name}")
         return company_name
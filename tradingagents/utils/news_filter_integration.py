@@ -60,6 +60,10 @@ def integrate_news_filtering(original_get_stock_news_em):
             try:
                 # 导入过滤器
                 from tradingagents.utils.enhanced_news_filter import create_enhanced_news_filter
+                from tradingagents.utils.news_dedup import deduplicate_news_df
+                
+                # 先合并近似重复的转载，避免同一新闻被重复评分和向量化
+                news_df = deduplicate_news_df(news_df)
                 
                 # 创建过滤器
                 news_filter = create_enhanced_news_filter(
@@ -179,8 +183,10 @@ def create_filtered_realtime_news_function():
                     if enable_filter and not original_news_df.empty:
                          # 应用新闻过滤
                          from tradingagents.utils.news_filter import create_news_filter
+                         from tradingagents.utils.news_dedup import deduplicate_news_df
                          news_filter = create_news_filter(clean_ticker)
-                         filtered_news_df = news_filter.filter_news(original_news_df, min_score=min_score)
+                         filtered_news_df = news_filter.filter_news(deduplicate_news_df(original_news_df),
+                                                                    min_score=min_score)
                          
                          # 记录过滤统计
                          filter_stats = news_filter.get_filter_statistics(original_news_df, filtered_news_df)
@@ -212,6 +218,9 @@ def create_filtered_realtime_news_function():
                             report += f"### {row.get('新闻标题', '无标题')}\n"
                             report += f"📅 {row.get('发布时间', '无时间')}\n"
                             
+                            if row.get('重复数量', 0):
+                                report += f"📰 {row['重复数量'] + 1}个来源转载: {row.get('来源列表', '')}\n"
+                            
                             if 'final_score' in row:
                                 report += f"⭐ 相关性评分: {row['final_score']:.1f}分\n"
                             
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+进度更新广播器
+进度跟踪器每次写入存储后发出通知（进程内版本号 + Redis发布订阅），
+前端进度组件据此判断是否需要重新读取进度，而不是整页定时重跑
+"""
+
+import threading
+from typing import Dict, Optional
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('progress_events')
+
+# Redis发布订阅频道前缀
+PROGRESS_CHANNEL_PREFIX = "progress_updates:"
+
+
+class ProgressBroadcaster:
+    """按analysis_id维护进度版本号的广播器"""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._status: Dict[str, str] = {}
+        self._condition = threading.Condition()
+        self._redis_listener: Optional[threading.Thread] = None
+
+    def notify(self, analysis_id: str, status: Optional[str] = None):
+        """记录一次进度更新并唤醒等待者"""
+        with self._condition:
+            self._versions[analysis_id] = self._versions.get(analysis_id, 0) + 1
+            if status:
+                self._status[analysis_id] = status
+            self._condition.notify_all()
+
+    def get_version(self, analysis_id: str) -> Optional[int]:
+        """获取当前版本号；本进程从未收到该分析的通知时返回None"""
+        with self._condition:
+            return self._versions.get(analysis_id)
+
+    def get_status(self, analysis_id: str) -> Optional[str]:
+        with self._condition:
+            return self._status.get(analysis_id)
+
+    def wait_for_update(self, analysis_id: str, since_version: Optional[int], timeout: float) -> Optional[int]:
+        """等待版本号超过since_version或超时，返回最新版本号"""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._versions.get(analysis_id) != since_version,
+                timeout=timeout
+            )
+            return self._versions.get(analysis_id)
+
+    def forget(self, analysis_id: str):
+        """清理已结束分析的版本信息"""
+        with self._condition:
+            self._versions.pop(analysis_id, None)
+            self._status.pop(analysis_id, None)
+
+    def start_redis_listener(self, redis_client) -> bool:
+        """订阅Redis进度频道，把其他进程发布的更新转为本进程通知（只启动一次）"""
+        with self._condition:
+            if self._redis_listener is not None and self._redis_listener.is_alive():
+                return True
+
+            try:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{PROGRESS_CHANNEL_PREFIX}*")
+            except Exception as e:
+                logger.warning(f"⚠️ [进度广播] Redis订阅失败: {e}")
+                return False
+
+            def listen():
+                try:
+                    for message in pubsub.listen():
+                        channel = message.get('channel')
+                        if isinstance(channel, bytes):
+                            channel = channel.decode('utf-8')
+                        data = message.get('data')
+                        if isinstance(data, bytes):
+                            data = data.decode('utf-8')
+                        if channel and channel.startswith(PROGRESS_CHANNEL_PREFIX):
+                            self.notify(channel[len(PROGRESS_CHANNEL_PREFIX):], data or None)
+                except Exception as e:
+                    logger.warning(f"⚠️ [进度广播] Redis订阅中断: {e}")
+
+            self._redis_listener = threading.Thread(target=listen, name="progress-redis-listener", daemon=True)
+            self._redis_listener.start()
+            logger.info("📡 [进度广播] 已订阅Redis进度频道")
+            return True
+
+
+_broadcaster: Optional[ProgressBroadcaster] = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_progress_broadcaster() -> ProgressBroadcaster:
+    """获取全局进度广播器"""
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                _broadcaster = ProgressBroadcaster()
+    return _broadcaster
+
+
+def publish_progress_update(analysis_id: str, status: Optional[str] = None, redis_client=None):
+    """通知进度已更新：进程内广播，并在提供Redis客户端时发布到频道"""
+    get_progress_broadcaster().notify(analysis_id, status)
+
+    if redis_client is not None:
+        try:
+            redis_client.publish(f"{PROGRESS_CHANNEL_PREFIX}{analysis_id}", status or "")
+        except Exception as e:
+            logger.debug(f"📡 [进度广播] Redis发布失败: {e}")
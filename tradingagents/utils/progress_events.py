@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+分析进度事件总线
+由图节点直接发布类型化的进度事件，按analysis_id分发给订阅者（如Web端的异步进度跟踪器），
+取代从日志文本中匹配"[模块开始]/[模块完成]"的方式
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.run_profiler import CATEGORY_NODE, profile_span
+logger = get_logger('progress_events')
+
+
+# 事件类型
+MODULE_START = "module_start"
+MODULE_COMPLETE = "module_complete"
+MODULE_ERROR = "module_error"
+MESSAGE = "message"
+
+# 当前线程/协程所属的分析ID（后台分析线程中设置，LangGraph执行节点时会复制上下文）
+_current_analysis_id: ContextVar[Optional[str]] = ContextVar("tradingagents_analysis_id", default=None)
+
+
+@dataclass
+class ProgressEvent:
+    """进度事件"""
+    analysis_id: str
+    event_type: str
+    module_name: str = ""
+    stock_symbol: str = ""
+    message: str = ""
+    duration: float = 0.0
+    success: bool = True
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'analysis_id': self.analysis_id,
+            'event_type': self.event_type,
+            'module_name': self.module_name,
+            'stock_symbol': self.stock_symbol,
+            'message': self.message,
+            'duration': self.duration,
+            'success': self.success,
+            'timestamp': self.timestamp,
+        }
+
+
+ProgressSubscriber = Callable[[ProgressEvent], None]
+
+
+class ProgressEventBus:
+    """按analysis_id分发进度事件的进程内总线"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[ProgressSubscriber]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, analysis_id: str, callback: ProgressSubscriber):
+        """订阅指定分析的进度事件"""
+        with self._lock:
+            callbacks = self._subscribers.setdefault(analysis_id, [])
+            if callback not in callbacks:
+                callbacks.append(callback)
+        logger.debug(f"📡 [进度事件] 订阅: {analysis_id}")
+
+    def unsubscribe(self, analysis_id: str, callback: Optional[ProgressSubscriber] = None):
+        """取消订阅；不指定callback时移除该分析的所有订阅者"""
+        with self._lock:
+            if callback is None:
+                self._subscribers.pop(analysis_id, None)
+            else:
+                callbacks = self._subscribers.get(analysis_id, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks:
+                    self._subscribers.pop(analysis_id, None)
+        logger.debug(f"📡 [进度事件] 取消订阅: {analysis_id}")
+
+    def has_subscribers(self, analysis_id: str) -> bool:
+        with self._lock:
+            return bool(self._subscribers.get(analysis_id))
+
+    def publish(self, event: ProgressEvent):
+        """发布事件，仅投递给同一analysis_id的订阅者"""
+        with self._lock:
+            callbacks = list(self._subscribers.get(event.analysis_id, ()))
+
+        # 在锁外回调，订阅者出错不影响分析流程
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(f"⚠️ [进度事件] 订阅者处理失败 {event.analysis_id}: {e}")
+
+
+_event_bus: Optional[ProgressEventBus] = None
+_event_bus_lock = threading.Lock()
+
+
+def get_progress_event_bus() -> ProgressEventBus:
+    """获取全局进度事件总线"""
+    global _event_bus
+    if _event_bus is None:
+        with _event_bus_lock:
+            if _event_bus is None:
+                _event_bus = ProgressEventBus()
+    return _event_bus
+
+
+def get_current_analysis_id() -> Optional[str]:
+    """获取当前上下文绑定的分析ID"""
+    return _current_analysis_id.get()
+
+
+@contextmanager
+def progress_context(analysis_id: Optional[str]):
+    """在当前上下文中绑定分析ID，其中发布的进度事件都归属该分析"""
+    token = _current_analysis_id.set(analysis_id)
+    try:
+        yield
+    finally:
+        _current_analysis_id.reset(token)
+
+
+def emit_progress_event(event_type: str, module_name: str = "", stock_symbol: str = "",
+                        message: str = "", duration: float = 0.0, success: bool = True,
+                        analysis_id: Optional[str] = None):
+    """发布进度事件；当前上下文没有分析ID或没有订阅者时直接返回"""
+    analysis_id = analysis_id or _current_analysis_id.get()
+    if not analysis_id:
+        return
+
+    bus = get_progress_event_bus()
+    if not bus.has_subscribers(analysis_id):
+        return
+
+    bus.publish(ProgressEvent(
+        analysis_id=analysis_id,
+        event_type=event_type,
+        module_name=module_name,
+        stock_symbol=stock_symbol,
+        message=message,
+        duration=duration,
+        success=success,
+    ))
+
+
+@contextmanager
+def progress_module(module_name: str, stock_symbol: str = ""):
+    """发布模块开始/完成/错误事件"""
+    emit_progress_event(MODULE_START, module_name, stock_symbol)
+    start_time = time.time()
+    try:
+        yield
+    except Exception as e:
+        emit_progress_event(MODULE_ERROR, module_name, stock_symbol, message=str(e),
+                            duration=time.time() - start_time, success=False)
+        raise
+    emit_progress_event(MODULE_COMPLETE, module_name, stock_symbol,
+                        duration=time.time() - start_time)
+
+
+def with_progress_events(module_name: str, node: Callable) -> Callable:
+    """包装图节点，使其在执行前后发布进度事件，并在开启运行剖析时记录节点span"""
+
+    @functools.wraps(node)
+    def wrapper(state, *args, **kwargs):
+        stock_symbol = ""
+        if isinstance(state, dict):
+            stock_symbol = str(state.get('company_of_interest', '') or '')
+        with progress_module(module_name, stock_symbol), profile_span(module_name, CATEGORY_NODE):
+            return node(state, *args, **kwargs)
+
+    return wrapper
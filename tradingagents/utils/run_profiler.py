@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+分析运行性能剖析器
+为每次 TradingAgentsGraph.propagate 记录一棵 节点 → LLM调用 → 工具 → 数据源 的耗时树，
+同时汇总token、缓存命中和数据量，可导出为JSON与Chrome trace（chrome://tracing / Perfetto）格式
+"""
+
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+try:
+    from langchain_core.callbacks import BaseCallbackHandler
+    LANGCHAIN_CALLBACKS_AVAILABLE = True
+except ImportError:
+    BaseCallbackHandler = object
+    LANGCHAIN_CALLBACKS_AVAILABLE = False
+
+
+# span类别
+CATEGORY_RUN = "run"
+CATEGORY_NODE = "node"
+CATEGORY_LLM = "llm"
+CATEGORY_TOOL = "tool"
+CATEGORY_DATA_SOURCE = "data_source"
+
+# 可累加的计数指标
+METRIC_KEYS = ("tokens_in", "tokens_out", "cache_hits", "cache_misses", "bytes")
+
+_current_profiler: ContextVar[Optional["RunProfiler"]] = ContextVar("tradingagents_run_profiler", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("tradingagents_profile_span", default=None)
+
+
+@dataclass
+class Span:
+    """一次计时区间，时间为相对剖析开始的秒数"""
+    name: str
+    category: str
+    start: float
+    end: Optional[float] = None
+    thread_id: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    metrics: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+    children: List["Span"] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        if self.end is None:
+            return 0.0
+        return max(self.end - self.start, 0.0)
+
+    @property
+    def self_time(self) -> float:
+        """扣除子span后的自身耗时（并行子span可能重叠，结果不小于0）"""
+        return max(self.duration - sum(child.duration for child in self.children), 0.0)
+
+    def add_metrics(self, **counters):
+        for key, value in counters.items():
+            if value:
+                self.metrics[key] = self.metrics.get(key, 0) + int(value)
+
+    def iter_spans(self):
+        yield self
+        for child in self.children:
+            yield from child.iter_spans()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'category': self.category,
+            'start': round(self.start, 6),
+            'end': round(self.end, 6) if self.end is not None else None,
+            'duration': round(self.duration, 6),
+            'thread_id': self.thread_id,
+            'attributes': self.attributes,
+            'metrics': self.metrics,
+            'error': self.error,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Span":
+        return cls(
+            name=data['name'],
+            category=data.get('category', ''),
+            start=data.get('start', 0.0),
+            end=data.get('end'),
+            thread_id=data.get('thread_id', 0),
+            attributes=data.get('attributes', {}),
+            metrics=data.get('metrics', {}),
+            error=data.get('error'),
+            children=[cls.from_dict(child) for child in data.get('children', [])],
+        )
+
+
+class RunProfiler:
+    """单次分析运行的span树"""
+
+    def __init__(self, name: str = "propagate", metadata: Optional[Dict[str, Any]] = None):
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.started_at = datetime.now().isoformat()
+        self.metadata = metadata or {}
+        self.root = Span(name=name, category=CATEGORY_RUN, start=0.0, thread_id=threading.get_ident())
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def start_span(self, name: str, category: str, parent: Optional[Span] = None, **attributes) -> Span:
+        span = Span(name=name, category=category, start=self._now(),
+                    thread_id=threading.get_ident(), attributes=attributes)
+        with self._lock:
+            (parent or self.root).children.append(span)
+        return span
+
+    def finish_span(self, span: Span, error: Optional[str] = None):
+        span.end = self._now()
+        if error:
+            span.error = error
+
+    def finish(self):
+        if self.root.end is None:
+            self.finish_span(self.root)
+
+    # ------------------------------------------------------------ 分析
+
+    def iter_spans(self):
+        with self._lock:
+            return list(self.root.iter_spans())
+
+    def critical_path(self) -> List[Span]:
+        """从根开始逐层选择最晚结束的子span，得到决定总耗时的调用链"""
+        path = [self.root]
+        span = self.root
+        while span.children:
+            finished = [child for child in span.children if child.end is not None]
+            if not finished:
+                break
+            span = max(finished, key=lambda child: child.end)
+            path.append(span)
+        return path
+
+    def top_spans(self, n: int = 10, category: Optional[str] = None) -> List[Span]:
+        """按耗时排序的最慢span（不含根）"""
+        spans = [span for span in self.iter_spans()[1:]
+                 if category is None or span.category == category]
+        return sorted(spans, key=lambda span: span.duration, reverse=True)[:n]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """按类别汇总次数、耗时和计数指标"""
+        result: Dict[str, Dict[str, Any]] = {}
+        for span in self.iter_spans()[1:]:
+            entry = result.setdefault(span.category, {'count': 0, 'total_time': 0.0, 'errors': 0})
+            entry['count'] += 1
+            entry['total_time'] += span.duration
+            if span.error:
+                entry['errors'] += 1
+            for key, value in span.metrics.items():
+                entry[key] = entry.get(key, 0) + value
+        for entry in result.values():
+            entry['total_time'] = round(entry['total_time'], 6)
+        return result
+
+    # ------------------------------------------------------------ 导出
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.root.name,
+            'started_at': self.started_at,
+            'duration': round(self.root.duration, 6),
+            'metadata': self.metadata,
+            'summary': self.summary(),
+            'root': self.root.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunProfiler":
+        profiler = cls(name=data.get('name', 'propagate'), metadata=data.get('metadata', {}))
+        profiler.started_at = data.get('started_at', profiler.started_at)
+        profiler.root = Span.from_dict(data['root'])
+        return profiler
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """导出Chrome trace事件格式（完整事件ph=X，时间单位微秒）"""
+        events = []
+        for span in self.iter_spans():
+            if span.end is None:
+                continue
+            args = dict(span.attributes)
+            args.update(span.metrics)
+            if span.error:
+                args['error'] = span.error
+            events.append({
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': round(span.start * 1_000_000),
+                'dur': round(span.duration * 1_000_000),
+                'pid': 1,
+                'tid': span.thread_id,
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': self.metadata}
+
+    def save(self, directory: str, prefix: str = "profile") -> Tuple[str, str]:
+        """保存JSON和Chrome trace文件，返回两个文件路径"""
+        output_dir = Path(directory)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        json_path = output_dir / f"{prefix}_{stamp}.json"
+        trace_path = output_dir / f"{prefix}_{stamp}.trace.json"
+
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False, default=str)
+        return str(json_path), str(trace_path)
+
+
+def load_profile(path: str) -> RunProfiler:
+    """从导出的JSON文件恢复剖析结果"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return RunProfiler.from_dict(json.load(f))
+
+
+def get_current_profiler() -> Optional[RunProfiler]:
+    return _current_profiler.get()
+
+
+@contextmanager
+def profile_run(name: str = "propagate", **metadata):
+    """开启一次运行剖析，期间的profile_span都会挂到这棵树上"""
+    profiler = RunProfiler(name, metadata)
+    profiler_token = _current_profiler.set(profiler)
+    span_token = _current_span.set(profiler.root)
+    try:
+        yield profiler
+    except Exception as e:
+        profiler.root.error = str(e)
+        raise
+    finally:
+        profiler.finish()
+        _current_span.reset(span_token)
+        _current_profiler.reset(profiler_token)
+
+
+@contextmanager
+def profile_span(name: str, category: str, **attributes):
+    """在当前剖析中记录一个子span；没有进行中的剖析时不做任何事"""
+    profiler = _current_profiler.get()
+    if profiler is None:
+        yield None
+        return
+
+    span = profiler.start_span(name, category, _current_span.get(), **attributes)
+    token = _current_span.set(span)
+    error = None
+    try:
+        yield span
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        profiler.finish_span(span, error)
+
+
+def profiled(name: Optional[str] = None, category: str = CATEGORY_DATA_SOURCE):
+    """把函数调用记录为span的装饰器，字符串结果会计入bytes"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or getattr(func, '__name__', 'unknown')
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_profiler.get() is None:
+                return func(*args, **kwargs)
+            with profile_span(span_name, category) as span:
+                result = func(*args, **kwargs)
+                if isinstance(result, (str, bytes)):
+                    span.add_metrics(bytes=len(result))
+                return result
+
+        return wrapper
+    return decorator
+
+
+def record_span_metrics(**counters):
+    """给当前span累加计数（如cache_hits=1），没有进行中的剖析时忽略"""
+    if _current_profiler.get() is None:
+        return
+    span = _current_span.get()
+    if span is not None:
+        span.add_metrics(**counters)
+
+
+class ProfilerCallbackHandler(BaseCallbackHandler):
+    """LangChain回调：把LLM调用记录为当前节点下的span并提取token用量"""
+
+    def __init__(self, profiler: RunProfiler):
+        super().__init__()
+        self.profiler = profiler
+        self._spans: Dict[Any, Span] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id, serialized: Optional[Dict[str, Any]], kwargs: Dict[str, Any]):
+        invocation = kwargs.get('invocation_params') or {}
+        model = (invocation.get('model') or invocation.get('model_name')
+                 or (serialized or {}).get('name') or 'llm')
+        parent = _current_span.get() if _current_profiler.get() is self.profiler else None
+        span = self.profiler.start_span(f"llm:{model}", CATEGORY_LLM, parent, model=model)
+        with self._lock:
+            self._spans[run_id] = span
+
+    def _pop(self, run_id) -> Optional[Span]:
+        with self._lock:
+            return self._spans.pop(run_id, None)
+
+    def on_llm_start(self, serialized, prompts, *, run_id=None, **kwargs):
+        self._start(run_id, serialized, kwargs)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id=None, **kwargs):
+        self._start(run_id, serialized, kwargs)
+
+    def on_llm_end(self, response, *, run_id=None, **kwargs):
+        span = self._pop(run_id)
+        if span is None:
+            return
+        tokens_in, tokens_out = self._extract_token_usage(response)
+        span.add_metrics(tokens_in=tokens_in, tokens_out=tokens_out)
+        self.profiler.finish_span(span)
+
+    def on_llm_error(self, error, *, run_id=None, **kwargs):
+        span = self._pop(run_id)
+        if span is not None:
+            self.profiler.finish_span(span, str(error))
+
+    @staticmethod
+    def _extract_token_usage(response) -> Tuple[int, int]:
+        """兼容llm_output.token_usage与消息usage_metadata两种用量格式"""
+        llm_output = getattr(response, 'llm_output', None) or {}
+        usage = llm_output.get('token_usage') or llm_output.get('usage') or {}
+        if usage:
+            return (usage.get('prompt_tokens', usage.get('input_tokens', 0)) or 0,
+                    usage.get('completion_tokens', usage.get('output_tokens', 0)) or 0)
+
+        tokens_in = tokens_out = 0
+        for generations in getattr(response, 'generations', None) or []:
+            for generation in generations:
+                metadata = getattr(getattr(generation, 'message', None), 'usage_metadata', None) or {}
+                tokens_in += metadata.get('input_tokens', 0) or 0
+                tokens_out += metadata.get('output_tokens', 0) or 0
+        return tokens_in, tokens_out
@@ -12,13 +12,33 @@ from datetime import datetime
 from tradingagents.utils.logging_init import get_logger
 
 # 导入日志模块
-from tradingagents.utils.logging_manager import get_logger, get_logger_manager
+from tradingagents.utils.logging_manager import LazyMessage, get_logger, get_logger_manager
+from tradingagents.utils.run_profiler import CATEGORY_DATA_SOURCE, CATEGORY_TOOL, profile_span
 logger = get_logger('agents')
 
 # 工具调用日志器
 tool_logger = get_logger("tools")
 
 
+def _truncate(value: Any, limit: int = 100) -> str:
+    text = str(value)
+    return text[:limit] + '...' if len(text) > limit else text
+
+
+def _text_length(value: Any) -> int:
+    return len(str(value)) if value else 0
+
+
+def _summarize_args(args: tuple, kwargs: dict) -> Dict[str, Any]:
+    """参数摘要；参数可能是大的DataFrame或状态字典，只在日志真正输出该字段时才转换为字符串"""
+    args_info = {}
+    if args:
+        args_info['args'] = [_truncate(arg) for arg in args]
+    if kwargs:
+        args_info['kwargs'] = {k: _truncate(v) for k, v in kwargs.items()}
+    return args_info
+
+
 def log_tool_call(tool_name: Optional[str] = None, log_args: bool = True, log_result: bool = False):
     """
     工具调用日志装饰器
@@ -37,19 +57,8 @@ def log_tool_call(tool_name: Optional[str] = None, log_args: bool = True, log_re
             # 记录开始时间
             start_time = time.time()
             
-            # 准备参数信息
-            args_info = {}
-            if log_args:
-                # 记录位置参数
-                if args:
-                    args_info['args'] = [str(arg)[:100] + '...' if len(str(arg)) > 100 else str(arg) for arg in args]
-                
-                # 记录关键字参数
-                if kwargs:
-                    args_info['kwargs'] = {
-                        k: str(v)[:100] + '...' if len(str(v)) > 100 else str(v) 
-                        for k, v in kwargs.items()
-                    }
+            # 准备参数信息（延迟计算）
+            args_info = LazyMessage(_summarize_args, args, kwargs) if log_args else None
             
             # 记录工具调用开始
             tool_logger.info(
@@ -58,13 +67,14 @@ def log_tool_call(tool_name: Optional[str] = None, log_args: bool = True, log_re
                     'tool_name': name,
                     'event_type': 'tool_call_start',
                     'timestamp': datetime.now().isoformat(),
-                    'args_info': args_info if log_args else None
+                    'args_info': args_info
                 }
             )
             
             try:
                 # 执行工具函数
-                result = func(*args, **kwargs)
+                with profile_span(name, CATEGORY_TOOL):
+                    result = func(*args, **kwargs)
                 
                 # 计算执行时间
                 duration = time.time() - start_time
@@ -72,8 +82,7 @@ def log_tool_call(tool_name: Optional[str] = None, log_args: bool = True, log_re
                 # 准备结果信息
                 result_info = None
                 if log_result and result is not None:
-                    result_str = str(result)
-                    result_info = result_str[:200] + '...' if len(result_str) > 200 else result_str
+                    result_info = LazyMessage(_truncate, result, 200)
                 
                 # 记录工具调用成功
                 tool_logger.info(
@@ -140,11 +149,15 @@ def log_data_source_call(source_name: str):
             )
             
             try:
-                result = func(*args, **kwargs)
+                with profile_span(source_name, CATEGORY_DATA_SOURCE, symbol=str(symbol)) as span:
+                    result = func(*args, **kwargs)
+                    if span is not None and isinstance(result, str):
+                        span.add_metrics(bytes=len(result))
                 duration = time.time() - start_time
                 
                 # 检查结果是否成功
-                success = result and "❌" not in str(result) and "错误" not in str(result)
+                result_text = str(result) if result else ""
+                success = result and "❌" not in result_text and "错误" not in result_text
                 
                 if success:
                     tool_logger.info(
@@ -154,7 +167,7 @@ def log_data_source_call(source_name: str):
                             'symbol': symbol,
                             'event_type': 'data_source_success',
                             'duration': duration,
-                            'data_size': len(str(result)) if result else 0,
+                            'data_size': len(result_text),
                             'timestamp': datetime.now().isoformat()
                         }
                     )
@@ -366,7 +379,7 @@ def log_analysis_module(module_name: str, session_id: str = None):
                 duration = time.time() - start_time
 
                 # 记录模块完成
-                result_length = len(str(result)) if result else 0
+                result_length = LazyMessage(_text_length, result)
                 logger_manager.log_module_complete(
                     tool_logger, module_name, symbol, actual_session_id,
                     duration, success=True, result_length=result_length,
@@ -1216,17 +1216,21 @@ def main():
                 import threading
 
                 def run_analysis_in_background():
+                    from tradingagents.utils.progress_events import progress_context
+
                     try:
-                        results = run_stock_analysis(
-                            stock_symbol=form_data['stock_symbol'],
-                            analysis_date=form_data['analysis_date'],
-                            analysts=form_data['analysts'],
-                            research_depth=form_data['research_depth'],
-                            llm_provider=config['llm_provider'],
-                            market_type=form_data.get('market_type', '美股'),
-                            llm_model=config['llm_model'],
-                            progress_callback=progress_callback
-                        )
+                        # 绑定分析ID，图节点发布的进度事件只投递给本次分析的跟踪器
+                        with progress_context(analysis_id):
+                            results = run_stock_analysis(
+                                stock_symbol=form_data['stock_symbol'],
+                                analysis_date=form_data['analysis_date'],
+                                analysts=form_data['analysts'],
+                                research_depth=form_data['research_depth'],
+                                llm_provider=config['llm_provider'],
+                                market_type=form_data.get('market_type', '美股'),
+                                llm_model=config['llm_model'],
+                                progress_callback=progress_callback
+                            )
 
                         # 标记分析完成并保存结果（不访问session state）
                         async_tracker.mark_completed("✅ 分析成功完成！", results=results)
@@ -1300,8 +1304,7 @@ def main():
                 # 显示启动信息
                 st.info("⏱️ 页面将自动刷新显示分析进度...")
 
-                # 等待2秒让用户看到启动信息，然后刷新页面
-                time.sleep(2)
+                # 刷新一次页面以显示进度区域，之后由进度组件局部刷新
                 st.rerun()
 
         # 2. 股票分析区域（只有在有分析ID时才显示）
@@ -1344,9 +1347,9 @@ def main():
 
             is_completed = display_unified_progress(current_analysis_id, show_refresh_controls=is_running)
 
-            # 如果分析正在进行，显示提示信息（不添加额外的自动刷新）
+            # 如果分析正在进行，显示提示信息（进度区域自动局部刷新，不重跑整页）
             if is_running:
-                st.info("⏱️ 分析正在进行中，可以使用下方的自动刷新功能查看进度更新...")
+                st.info("⏱️ 分析正在进行中，进度会自动更新，完成后将显示分析报告...")
 
             # 如果分析刚完成，尝试恢复结果
             if is_completed and not st.session_state.get('analysis_results') and progress_data:
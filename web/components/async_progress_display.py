@@ -4,6 +4,7 @@
 支持定时刷新，从Redis或文件获取进度状态
 """
 
+import os
 import streamlit as st
 import time
 from typing import Optional, Dict, Any
@@ -455,6 +456,10 @@ def display_unified_progress(analysis_id: str, show_refresh_controls: bool = Tru
     """
     import streamlit as st
 
+    # 运行中的分析使用局部刷新组件，只重跑进度区域；不支持fragment的旧版Streamlit退回整页刷新
+    if show_refresh_controls and LIVE_PROGRESS_AVAILABLE:
+        return display_live_progress(analysis_id)
+
     # 简化逻辑：直接调用显示函数，通过参数控制是否显示刷新按钮
     # 调用方负责确保只在需要的地方传入show_refresh_controls=True
     return display_static_progress_with_controls(analysis_id, show_refresh_controls)
@@ -608,3 +613,121 @@ def display_static_progress_with_controls(analysis_id: str, show_refresh_control
     # 不需要清理session state，因为我们通过参数控制显示
 
     return status in ['completed', 'failed']
+
+
+# ---------------------------------------------------------------------------
+# 局部刷新的实时进度组件
+# ---------------------------------------------------------------------------
+
+# st.fragment(run_every=...) 需要 Streamlit >= 1.37
+LIVE_PROGRESS_AVAILABLE = hasattr(st, 'fragment')
+LIVE_PROGRESS_INTERVAL = float(os.getenv('PROGRESS_REFRESH_INTERVAL', '1.0'))
+
+
+def _load_live_progress(analysis_id: str) -> Optional[Dict[str, Any]]:
+    """
+    读取进度数据，仅在广播器报告有新版本时才访问存储
+
+    本进程没有收到过该分析的广播时（例如进度由其他进程写入且未启用Redis），
+    每次都从存储读取。
+    """
+    from tradingagents.utils.progress_broadcaster import get_progress_broadcaster
+
+    broadcaster = get_progress_broadcaster()
+    version = broadcaster.get_version(analysis_id)
+    cache_key = f"live_progress_{analysis_id}"
+    cached = st.session_state.get(cache_key)
+
+    if cached is not None and version is not None and cached['version'] == version:
+        return cached['data']
+
+    progress_data = get_progress_by_id(analysis_id)
+    st.session_state[cache_key] = {'version': version, 'data': progress_data}
+    return progress_data
+
+
+def _ensure_progress_subscription():
+    """启用Redis时订阅进度频道，使其他进程写入的进度也能推送到本进程"""
+    if os.getenv('REDIS_ENABLED', 'false').lower() != 'true':
+        return
+    try:
+        from tradingagents.config.connection_pool import get_connection_registry
+        from tradingagents.utils.progress_broadcaster import get_progress_broadcaster
+
+        redis_client = get_connection_registry().get_default_redis_client(decode_responses=True)
+        get_progress_broadcaster().start_redis_listener(redis_client)
+    except Exception as e:
+        logger.debug(f"📡 [实时进度] Redis订阅不可用: {e}")
+
+
+def _render_live_progress(analysis_id: str, progress_data: Optional[Dict[str, Any]]):
+    """渲染进度区域"""
+    if not progress_data:
+        st.info("🔄 **当前状态**: 准备开始分析...")
+        return
+
+    status = progress_data.get('status', 'running')
+    progress_percentage = progress_data.get('progress_percentage', 0.0)
+    start_time = progress_data.get('start_time', 0)
+    estimated_total_time = progress_data.get('estimated_total_time', 0)
+
+    if status == 'running' and start_time > 0:
+        elapsed_time = time.time() - start_time
+    else:
+        elapsed_time = progress_data.get('elapsed_time', 0)
+    remaining_time = max(estimated_total_time - elapsed_time, 0)
+
+    st.write(f"**当前步骤**: {progress_data.get('current_step_name', '准备阶段')}")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("进度", f"{progress_percentage:.1f}%")
+    with col2:
+        st.metric("已用时间", format_time(elapsed_time))
+    with col3:
+        if status == 'completed':
+            st.metric("预计剩余", "已完成")
+        elif status == 'failed':
+            st.metric("预计剩余", "已中断")
+        else:
+            st.metric("预计剩余", format_time(remaining_time))
+
+    st.progress(min(progress_percentage / 100.0, 1.0))
+    st.write(f"**当前任务**: {progress_data.get('current_step_description', '初始化分析引擎')}")
+
+    last_message = progress_data.get('last_message', '准备开始分析')
+    if status == 'completed':
+        st.success(f"✅ **当前状态**: {last_message}")
+    elif status == 'failed':
+        st.error(f"❌ **当前状态**: {last_message}")
+    else:
+        st.info(f"🔄 **当前状态**: {last_message}")
+
+
+if LIVE_PROGRESS_AVAILABLE:
+    @st.fragment(run_every=LIVE_PROGRESS_INTERVAL)
+    def _live_progress_fragment(analysis_id: str):
+        """定时只重跑本组件；分析结束时触发一次整页重跑以显示报告"""
+        progress_data = _load_live_progress(analysis_id)
+        _render_live_progress(analysis_id, progress_data)
+
+        status = progress_data.get('status') if progress_data else None
+        finished_key = f"live_progress_finished_{analysis_id}"
+        if status in ('completed', 'failed') and not st.session_state.get(finished_key, False):
+            st.session_state[finished_key] = True
+            logger.info(f"📡 [实时进度] 分析结束({status})，刷新整页: {analysis_id}")
+            st.rerun()
+
+
+def display_live_progress(analysis_id: str) -> bool:
+    """
+    显示实时进度（局部刷新）
+
+    进度区域按PROGRESS_REFRESH_INTERVAL秒重跑，只有进度版本变化时才读取存储；
+    整个脚本仅在分析结束时重跑一次。返回本次整页运行时分析是否已结束。
+    """
+    _ensure_progress_subscription()
+    _live_progress_fragment(analysis_id)
+
+    progress_data = st.session_state.get(f"live_progress_{analysis_id}", {}).get('data')
+    return bool(progress_data) and progress_data.get('status') in ('completed', 'failed')
@@ -0,0 +1,121 @@
+"""
+数据源健康度组件
+展示A股数据源的熔断状态、成功率和延迟，以及线程池和HTTP主机的运行统计
+"""
+
+import streamlit as st
+import pandas as pd
+
+STATE_LABELS = {
+    "closed": "🟢 正常",
+    "half_open": "🟡 半开探测",
+    "open": "🔴 熔断",
+}
+
+
+def render_data_source_health():
+    """显示数据源熔断器状态和健康度评分"""
+    st.subheader("🩺 数据源健康度")
+
+    try:
+        from tradingagents.dataflows.source_health import get_source_health_registry
+    except ImportError as e:
+        st.warning(f"数据源健康度模块不可用: {e}")
+        return
+
+    registry = get_source_health_registry()
+    snapshot = registry.snapshot()
+    if not snapshot:
+        st.info("📭 当前进程尚未调用A股数据源")
+        render_fetch_pool_metrics()
+        render_http_host_metrics()
+        return
+
+    df = pd.DataFrame(snapshot).sort_values('score', ascending=False)
+    df['state'] = df['state'].map(lambda state: STATE_LABELS.get(state, state))
+
+    st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "source": st.column_config.TextColumn("数据源", width="small"),
+            "state": st.column_config.TextColumn("熔断状态", width="small"),
+            "calls": st.column_config.NumberColumn("近期调用"),
+            "success_rate": st.column_config.ProgressColumn("成功率", min_value=0.0, max_value=1.0, format="%.2f"),
+            "p50_ms": st.column_config.NumberColumn("P50延迟(ms)"),
+            "p95_ms": st.column_config.NumberColumn("P95延迟(ms)"),
+            "score": st.column_config.NumberColumn("健康评分", format="%.3f"),
+            "consecutive_failures": st.column_config.NumberColumn("连续失败"),
+            "trips": st.column_config.NumberColumn("熔断次数"),
+            "retry_in_s": st.column_config.NumberColumn("探测倒计时(s)"),
+            "last_error": st.column_config.TextColumn("最近错误", width="large"),
+        }
+    )
+    st.caption("路由时优先选择健康评分最高的数据源；熔断的数据源在冷却期结束后放行一次探测请求")
+
+    if st.button("♻️ 重置熔断器", key="reset_source_breakers"):
+        registry.reset()
+        st.success("✅ 数据源熔断器已重置")
+
+    render_fetch_pool_metrics()
+    render_http_host_metrics()
+
+
+def render_fetch_pool_metrics():
+    """显示数据源线程池的在途请求、排队深度和遗留线程"""
+    try:
+        from tradingagents.dataflows.fetch_executor import get_fetch_metrics
+    except ImportError:
+        return
+
+    metrics = get_fetch_metrics()
+    if not metrics:
+        return
+
+    st.markdown("**🧵 数据源线程池**")
+    st.dataframe(
+        pd.DataFrame(metrics),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "provider": st.column_config.TextColumn("数据源", width="small"),
+            "max_in_flight": st.column_config.NumberColumn("并发上限"),
+            "in_flight": st.column_config.NumberColumn("在途请求"),
+            "waiting": st.column_config.NumberColumn("等待名额"),
+            "max_queue_depth": st.column_config.NumberColumn("最大排队深度"),
+            "completed": st.column_config.NumberColumn("成功"),
+            "failed": st.column_config.NumberColumn("失败"),
+            "timeouts": st.column_config.NumberColumn("超时"),
+            "rejected": st.column_config.NumberColumn("名额等待超时"),
+            "leaked": st.column_config.NumberColumn("超时后仍在运行"),
+        }
+    )
+
+
+def render_http_host_metrics():
+    """显示共享HTTP会话按主机统计的请求数、错误数和延迟"""
+    try:
+        from tradingagents.dataflows.http_session import get_http_metrics
+    except ImportError:
+        return
+
+    metrics = get_http_metrics()
+    if not metrics:
+        return
+
+    st.markdown("**🌐 HTTP主机延迟**")
+    st.dataframe(
+        pd.DataFrame(metrics).sort_values('requests', ascending=False),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "host": st.column_config.TextColumn("主机", width="medium"),
+            "requests": st.column_config.NumberColumn("请求数"),
+            "errors": st.column_config.NumberColumn("错误"),
+            "kb": st.column_config.NumberColumn("流量(KB)"),
+            "p50_ms": st.column_config.NumberColumn("P50延迟(ms)"),
+            "p95_ms": st.column_config.NumberColumn("P95延迟(ms)"),
+            "last_error": st.column_config.TextColumn("最近错误", width="large"),
+        }
+    )
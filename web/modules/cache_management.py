@@ -16,6 +16,7 @@ sys.path.append(str(project_root))
 # 导入UI工具函数
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.ui_utils import apply_hide_deploy_button_css
+from components.data_source_health import render_data_source_health
 
 try:
     from tradingagents.dataflows.cache_manager import get_cache
@@ -105,7 +106,7 @@ def main():
                 st.metric(
                     label="总大小",
                     value=f"{stats['total_size_mb']} MB",
-                    help="缓存文件占用的磁盘空间"
+                    help=f"缓存文件占用的磁盘空间（上限 {stats.get('max_size_mb', 0)} MB，超出后按最近访问时间自动淘汰）"
                 )
                 
                 st.metric(
@@ -153,6 +154,14 @@ def main():
         else:
             st.warning("缓存配置信息不可用")
 
+    # 数据库连接池状态
+    st.markdown("---")
+    render_connection_pool_stats()
+
+    # 数据源熔断器状态
+    st.markdown("---")
+    render_data_source_health()
+
     # 缓存测试功能
     st.markdown("---")
     st.subheader("🧪 缓存测试")
@@ -321,5 +330,70 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
+def render_connection_pool_stats():
+    """显示Redis/MongoDB连接池使用情况"""
+    st.subheader("🔌 数据库连接池")
+
+    try:
+        from tradingagents.config.connection_pool import get_connection_registry
+    except ImportError as e:
+        st.warning(f"连接池注册表不可用: {e}")
+        return
+
+    registry = get_connection_registry()
+
+    if st.button("🩺 健康检查", key="connection_pool_health_check"):
+        with st.spinner("正在检查连接池..."):
+            results = registry.health_check()
+        if not results:
+            st.info("暂无已创建的连接池")
+        for target, healthy in results.items():
+            if healthy:
+                st.success(f"✅ {target} 连接正常")
+            else:
+                st.error(f"❌ {target} 连接失败")
+
+    stats = registry.get_stats()
+    if not stats['redis'] and not stats['mongodb']:
+        st.info("📭 当前进程尚未创建数据库连接池")
+        return
+
+    import pandas as pd
+
+    if stats['redis']:
+        st.markdown("**Redis连接池**")
+        st.dataframe(
+            pd.DataFrame(stats['redis']),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "target": st.column_config.TextColumn("连接目标", width="medium"),
+                "max_connections": st.column_config.NumberColumn("最大连接数"),
+                "created_connections": st.column_config.NumberColumn("已创建连接"),
+                "available_connections": st.column_config.NumberColumn("空闲连接"),
+                "in_use_connections": st.column_config.NumberColumn("使用中"),
+                "clients_requested": st.column_config.NumberColumn("客户端获取次数"),
+                "healthy": st.column_config.CheckboxColumn("健康"),
+            }
+        )
+
+    if stats['mongodb']:
+        st.markdown("**MongoDB连接池**")
+        st.dataframe(
+            pd.DataFrame(stats['mongodb']),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "target": st.column_config.TextColumn("连接目标", width="medium"),
+                "max_pool_size": st.column_config.NumberColumn("最大连接数"),
+                "open_connections": st.column_config.NumberColumn("打开连接"),
+                "in_use_connections": st.column_config.NumberColumn("使用中"),
+                "checkouts": st.column_config.NumberColumn("借出次数"),
+                "clients_requested": st.column_config.NumberColumn("客户端获取次数"),
+                "healthy": st.column_config.CheckboxColumn("健康"),
+            }
+        )
+
+
 if __name__ == "__main__":
     main()
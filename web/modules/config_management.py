@@ -19,6 +19,7 @@ sys.path.insert(0, str(project_root))
 # 导入UI工具函数
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.ui_utils import apply_hide_deploy_button_css
+from components.data_source_health import render_data_source_health
 
 from tradingagents.config.config_manager import (
     config_manager, ModelConfig, PricingConfig
@@ -39,7 +40,7 @@ def render_config_management():
     st.sidebar.title("配置选项")
     page = st.sidebar.selectbox(
         "选择功能",
-        ["模型配置", "定价设置", "使用统计", "系统设置"]
+        ["模型配置", "定价设置", "使用统计", "系统设置", "数据源状态"]
     )
     
     if page == "模型配置":
@@ -50,6 +51,8 @@ def render_config_management():
         render_usage_statistics()
     elif page == "系统设置":
         render_system_settings()
+    elif page == "数据源状态":
+        render_data_source_health()
 
 
 def render_model_config():
@@ -71,6 +71,23 @@ def safe_serialize(obj):
 
 class AsyncProgressTracker:
     """异步进度跟踪器"""
+
+    # 进度事件模块名 -> 分析步骤名称关键词
+    MODULE_STEP_KEYWORDS = {
+        'market_analyst': ["市场分析"],
+        'fundamentals_analyst': ["基本面分析"],
+        'news_analyst': ["新闻分析"],
+        'social_media_analyst': ["社交媒体", "social"],
+        'bull_researcher': ["多头观点"],
+        'bear_researcher': ["空头观点"],
+        'research_manager': ["观点整合"],
+        'trader': ["投资建议"],
+        'risky_analyst': ["激进策略"],
+        'safe_analyst': ["保守策略"],
+        'neutral_analyst': ["平衡策略"],
+        'risk_manager': ["风险控制", "风险提示"],
+        'graph_signal_processing': ["生成报告"],
+    }
     
     def __init__(self, analysis_id: str, analysts: List[str], research_depth: int, llm_provider: str):
         self.analysis_id = analysis_id
@@ -102,6 +119,15 @@ class AsyncProgressTracker:
             'steps': self.analysis_steps
         }
         
+        # 进度写入合并：两次写入之间至少间隔min_save_interval秒，期间的更新由定时器合并写入
+        self.min_save_interval = float(os.getenv('PROGRESS_SAVE_INTERVAL', '1.0'))
+        self._save_lock = threading.RLock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._last_save_time = 0.0
+        self._dirty = False
+        # 已写入存储的字段快照（JSON编码），Redis只写入发生变化的字段
+        self._persisted_fields: Dict[str, str] = {}
+
         # 尝试初始化Redis，失败则使用文件
         self.redis_client = None
         self.use_redis = self._init_redis()
@@ -112,35 +138,16 @@ class AsyncProgressTracker:
             os.makedirs(os.path.dirname(self.progress_file), exist_ok=True)
         
         # 保存初始状态
-        self._save_progress()
+        self._save_progress(force=True)
         
         logger.info(f"📊 [异步进度] 初始化完成: {analysis_id}, 存储方式: {'Redis' if self.use_redis else '文件'}")
 
-        # 注册到日志系统进行自动进度更新
+        # 订阅图节点发布的进度事件（按analysis_id分发，不再解析日志文本）
         try:
-            from .progress_log_handler import register_analysis_tracker
-            import threading
-
-            # 使用超时机制避免死锁
-            def register_with_timeout():
-                try:
-                    register_analysis_tracker(self.analysis_id, self)
-                    print(f"✅ [进度集成] 跟踪器注册成功: {self.analysis_id}")
-                except Exception as e:
-                    print(f"❌ [进度集成] 跟踪器注册失败: {e}")
-
-            # 在单独线程中注册，避免阻塞主线程
-            register_thread = threading.Thread(target=register_with_timeout, daemon=True)
-            register_thread.start()
-            register_thread.join(timeout=2.0)  # 2秒超时
-
-            if register_thread.is_alive():
-                print(f"⚠️ [进度集成] 跟踪器注册超时，继续执行: {self.analysis_id}")
-
+            from tradingagents.utils.progress_events import get_progress_event_bus
+            get_progress_event_bus().subscribe(self.analysis_id, self.handle_progress_event)
         except ImportError:
-            logger.debug("📊 [异步进度] 日志集成不可用")
-        except Exception as e:
-            print(f"❌ [进度集成] 跟踪器注册异常: {e}")
+            logger.debug("📊 [异步进度] 进度事件总线不可用")
     
     def _init_redis(self) -> bool:
         """初始化Redis连接"""
@@ -154,30 +161,12 @@ class AsyncProgressTracker:
                 logger.info(f"📊 [异步进度] Redis已禁用，使用文件存储")
                 return False
 
-            import redis
+            from tradingagents.config.connection_pool import get_connection_registry
 
-            # 从环境变量获取Redis配置
+            # 使用共享连接池的Redis客户端
+            self.redis_client = get_connection_registry().get_default_redis_client(decode_responses=True)
             redis_host = os.getenv('REDIS_HOST', 'localhost')
             redis_port = int(os.getenv('REDIS_PORT', 6379))
-            redis_password = os.getenv('REDIS_PASSWORD', None)
-            redis_db = int(os.getenv('REDIS_DB', 0))
-
-            # 创建Redis连接
-            if redis_password:
-                self.redis_client = redis.Redis(
-                    host=redis_host,
-                    port=redis_port,
-                    password=redis_password,
-                    db=redis_db,
-                    decode_responses=True
-                )
-            else:
-                self.redis_client = redis.Redis(
-                    host=redis_host,
-                    port=redis_port,
-                    db=redis_db,
-                    decode_responses=True
-                )
 
             # 测试连接
             self.redis_client.ping()
@@ -323,48 +312,68 @@ class AsyncProgressTracker:
     
     def update_progress(self, message: str, step: Optional[int] = None):
         """更新进度状态"""
-        current_time = time.time()
-        elapsed_time = current_time - self.start_time
-
         # 自动检测步骤
         if step is None:
             step = self._detect_step_from_message(message)
 
+        self._apply_update(message, step)
+
+    def handle_progress_event(self, event):
+        """处理图节点发布的进度事件（ProgressEvent）"""
+        from tradingagents.utils.progress_events import MODULE_START, MODULE_COMPLETE, MODULE_ERROR
+
+        module_step = self._find_step_by_keyword(self.MODULE_STEP_KEYWORDS.get(event.module_name, []))
+        module_label = self.analysis_steps[module_step]['name'] if module_step is not None else event.module_name
+
+        if event.event_type == MODULE_START:
+            step = module_step
+            message = f"📊 [模块开始] {event.module_name} - 股票: {event.stock_symbol}"
+            step_description = f"开始{module_label}..."
+        elif event.event_type == MODULE_COMPLETE:
+            # 完成映射到模块自身步骤的下一步，重复完成（辩论多轮、节点重入）不会越过该模块的位置；
+            # 未知模块不推进步骤，_apply_update 保证进度不倒退
+            step = min(module_step + 1, len(self.analysis_steps) - 1) if module_step is not None else None
+            message = f"📊 [模块完成] {event.module_name} - 股票: {event.stock_symbol}, 耗时: {event.duration:.2f}s"
+            step_description = f"{module_label}已完成"
+        elif event.event_type == MODULE_ERROR:
+            step = None
+            message = f"❌ [模块错误] {event.module_name} - 股票: {event.stock_symbol}: {event.message}"
+            step_description = f"{module_label}出现错误"
+        else:
+            step = None
+            message = event.message
+            step_description = None
+
+        # 事件只推进步骤，分析完成状态由mark_completed负责
+        self._apply_update(message, step, step_description=step_description, allow_complete=False)
+
+    def _apply_update(self, message: str, step: Optional[int], step_description: Optional[str] = None,
+                      allow_complete: bool = True):
+        """应用一次进度更新并（合并）写入存储"""
+        current_time = time.time()
+        elapsed_time = current_time - self.start_time
+
         # 更新步骤（防止倒退）
         if step is not None and step >= self.current_step:
             self.current_step = step
             logger.debug(f"📊 [异步进度] 步骤推进到 {self.current_step + 1}/{len(self.analysis_steps)}")
 
         # 如果是完成消息，确保进度为100%
-        if "分析完成" in message or "分析成功" in message or "✅ 分析完成" in message:
+        if allow_complete and ("分析完成" in message or "分析成功" in message or "✅ 分析完成" in message):
             self.current_step = len(self.analysis_steps) - 1
             logger.info(f"📊 [异步进度] 分析完成，设置为最终步骤")
 
         # 计算进度
         progress_percentage = self._calculate_weighted_progress() * 100
+        if not allow_complete:
+            progress_percentage = min(progress_percentage, 99.0)
         remaining_time = self._estimate_remaining_time(progress_percentage / 100, elapsed_time)
 
         # 更新进度数据
         current_step_info = self.analysis_steps[self.current_step] if self.current_step < len(self.analysis_steps) else self.analysis_steps[-1]
 
-        # 特殊处理工具调用消息，更新步骤描述但不改变步骤
-        step_description = current_step_info['description']
-        if "工具调用" in message:
-            # 提取工具名称并更新描述
-            if "get_stock_market_data_unified" in message:
-                step_description = "正在获取市场数据和技术指标..."
-            elif "get_stock_fundamentals_unified" in message:
-                step_description = "正在获取基本面数据和财务指标..."
-            elif "get_china_stock_data" in message:
-                step_description = "正在获取A股市场数据..."
-            elif "get_china_fundamentals" in message:
-                step_description = "正在获取A股基本面数据..."
-            else:
-                step_description = "正在调用分析工具..."
-        elif "模块开始" in message:
-            step_description = f"开始{current_step_info['name']}..."
-        elif "模块完成" in message:
-            step_description = f"{current_step_info['name']}已完成"
+        if step_description is None:
+            step_description = self._describe_step(message, current_step_info)
 
         self.progress_data.update({
             'current_step': self.current_step,
@@ -378,13 +387,35 @@ class AsyncProgressTracker:
             'status': 'completed' if progress_percentage >= 100 else 'running'
         })
 
-        # 保存到存储
+        # 保存到存储（合并写入）
         self._save_progress()
 
         # 详细的更新日志
         step_name = current_step_info.get('name', '未知')
         logger.info(f"📊 [进度更新] {self.analysis_id}: {message[:50]}...")
         logger.debug(f"📊 [进度详情] 步骤{self.current_step + 1}/{len(self.analysis_steps)} ({step_name}), 进度{progress_percentage:.1f}%, 耗时{elapsed_time:.1f}s")
+
+    def _describe_step(self, message: str, current_step_info: Dict) -> str:
+        """根据消息生成步骤描述"""
+        # 特殊处理工具调用消息，更新步骤描述但不改变步骤
+        step_description = current_step_info['description']
+        if "工具调用" in message:
+            # 提取工具名称并更新描述
+            if "get_stock_market_data_unified" in message:
+                step_description = "正在获取市场数据和技术指标..."
+            elif "get_stock_fundamentals_unified" in message:
+                step_description = "正在获取基本面数据和财务指标..."
+            elif "get_china_stock_data" in message:
+                step_description = "正在获取A股市场数据..."
+            elif "get_china_fundamentals" in message:
+                step_description = "正在获取A股基本面数据..."
+            else:
+                step_description = "正在调用分析工具..."
+        elif "模块开始" in message:
+            step_description = f"开始{current_step_info['name']}..."
+        elif "模块完成" in message:
+            step_description = f"{current_step_info['name']}已完成"
+        return step_description
     
     def _detect_step_from_message(self, message: str) -> Optional[int]:
         """根据消息内容智能检测当前步骤"""
@@ -500,22 +531,70 @@ class AsyncProgressTracker:
 
         return remaining
     
-    def _save_progress(self):
-        """保存进度到存储"""
+    def _save_progress(self, force: bool = False):
+        """保存进度到存储
+
+        非强制写入会被合并：距上次写入不足min_save_interval秒时只标记为脏数据，
+        由定时器在间隔到期后统一写入最新状态。
+        """
+        with self._save_lock:
+            self._dirty = True
+            wait = self.min_save_interval - (time.time() - self._last_save_time)
+            if not force and wait > 0:
+                if self._save_timer is None:
+                    self._save_timer = threading.Timer(wait, self._flush_progress)
+                    self._save_timer.daemon = True
+                    self._save_timer.start()
+                return
+            self._flush_progress()
+
+    def _flush_progress(self):
+        """将最新进度写入存储"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._last_save_time = time.time()
+            self._write_progress()
+
+        # 通知前端进度组件（进程内广播 + Redis发布订阅）
+        try:
+            from tradingagents.utils.progress_broadcaster import publish_progress_update
+            publish_progress_update(
+                self.analysis_id,
+                self.progress_data.get('status'),
+                self.redis_client if self.use_redis else None
+            )
+        except ImportError:
+            pass
+
+    def _write_progress(self):
+        """写入存储：Redis按字段增量写入，文件整体写入"""
         try:
             current_step_name = self.progress_data.get('current_step_name', '未知')
             progress_pct = self.progress_data.get('progress_percentage', 0)
             status = self.progress_data.get('status', 'running')
 
             if self.use_redis:
-                # 保存到Redis（安全序列化）
+                # 保存到Redis哈希，只写入变化的字段（安全序列化）
                 key = f"progress:{self.analysis_id}"
                 safe_data = safe_serialize(self.progress_data)
-                data_json = json.dumps(safe_data, ensure_ascii=False)
-                self.redis_client.setex(key, 3600, data_json)  # 1小时过期
+                encoded = {k: json.dumps(v, ensure_ascii=False) for k, v in safe_data.items()}
+                changed = {k: v for k, v in encoded.items() if self._persisted_fields.get(k) != v}
+
+                if changed:
+                    pipe = self.redis_client.pipeline()
+                    pipe.hset(key, mapping=changed)
+                    pipe.expire(key, 3600)  # 1小时过期
+                    pipe.execute()
+                    self._persisted_fields.update(changed)
 
                 logger.info(f"📊 [Redis写入] {self.analysis_id} -> {status} | {current_step_name} | {progress_pct:.1f}%")
-                logger.debug(f"📊 [Redis详情] 键: {key}, 数据大小: {len(data_json)} 字节")
+                logger.debug(f"📊 [Redis详情] 键: {key}, 变更字段: {list(changed.keys())}, "
+                             f"数据大小: {sum(len(v) for v in changed.values())} 字节")
             else:
                 # 保存到文件（安全序列化）
                 safe_data = safe_serialize(self.progress_data)
@@ -575,31 +654,52 @@ class AsyncProgressTracker:
                 logger.warning(f"📊 [异步进度] 结果序列化失败: {e}")
                 self.progress_data['raw_results'] = str(results)  # 最后的fallback
 
-        self._save_progress()
+        self._save_progress(force=True)
         logger.info(f"📊 [异步进度] 分析完成: {self.analysis_id}")
 
-        # 从日志系统注销
-        try:
-            from .progress_log_handler import unregister_analysis_tracker
-            unregister_analysis_tracker(self.analysis_id)
-        except ImportError:
-            pass
+        self._unsubscribe_events()
     
     def mark_failed(self, error_message: str):
         """标记分析失败"""
         self.progress_data['status'] = 'failed'
         self.progress_data['last_message'] = f"分析失败: {error_message}"
         self.progress_data['last_update'] = time.time()
-        self._save_progress()
+        self._save_progress(force=True)
         logger.error(f"📊 [异步进度] 分析失败: {self.analysis_id}, 错误: {error_message}")
 
-        # 从日志系统注销
+        self._unsubscribe_events()
+
+    def _unsubscribe_events(self):
+        """取消进度事件订阅"""
         try:
-            from .progress_log_handler import unregister_analysis_tracker
-            unregister_analysis_tracker(self.analysis_id)
+            from tradingagents.utils.progress_events import get_progress_event_bus
+            get_progress_event_bus().unsubscribe(self.analysis_id, self.handle_progress_event)
         except ImportError:
             pass
 
+def _load_progress_from_redis(redis_client, key: str) -> Optional[Dict[str, Any]]:
+    """从Redis读取进度（哈希按字段存储JSON，兼容旧版整体JSON字符串）"""
+    try:
+        fields = redis_client.hgetall(key)
+    except Exception:
+        data = redis_client.get(key)
+        return json.loads(data) if data else None
+
+    if not fields:
+        return None
+    return {field: json.loads(value) for field, value in fields.items()}
+
+
+def _load_last_update_from_redis(redis_client, key: str) -> Optional[float]:
+    """只读取进度的last_update字段"""
+    try:
+        value = redis_client.hget(key, 'last_update')
+        return json.loads(value) if value else None
+    except Exception:
+        data = redis_client.get(key)
+        return json.loads(data).get('last_update', 0) if data else None
+
+
 def get_progress_by_id(analysis_id: str) -> Optional[Dict[str, Any]]:
     """根据分析ID获取进度"""
     try:
@@ -609,35 +709,15 @@ def get_progress_by_id(analysis_id: str) -> Optional[Dict[str, Any]]:
         # 如果Redis启用，先尝试Redis
         if redis_enabled:
             try:
-                import redis
-
-                # 从环境变量获取Redis配置
-                redis_host = os.getenv('REDIS_HOST', 'localhost')
-                redis_port = int(os.getenv('REDIS_PORT', 6379))
-                redis_password = os.getenv('REDIS_PASSWORD', None)
-                redis_db = int(os.getenv('REDIS_DB', 0))
-
-                # 创建Redis连接
-                if redis_password:
-                    redis_client = redis.Redis(
-                        host=redis_host,
-                        port=redis_port,
-                        password=redis_password,
-                        db=redis_db,
-                        decode_responses=True
-                    )
-                else:
-                    redis_client = redis.Redis(
-                        host=redis_host,
-                        port=redis_port,
-                        db=redis_db,
-                        decode_responses=True
-                    )
+                from tradingagents.config.connection_pool import get_connection_registry
+
+                # 复用共享连接池，避免每次轮询都新建连接
+                redis_client = get_connection_registry().get_default_redis_client(decode_responses=True)
 
                 key = f"progress:{analysis_id}"
-                data = redis_client.get(key)
+                data = _load_progress_from_redis(redis_client, key)
                 if data:
-                    return json.loads(data)
+                    return data
             except Exception as e:
                 logger.debug(f"📊 [异步进度] Redis读取失败: {e}")
 
@@ -673,30 +753,10 @@ def get_latest_analysis_id() -> Optional[str]:
         # 如果Redis启用，先尝试从Redis获取
         if redis_enabled:
             try:
-                import redis
-
-                # 从环境变量获取Redis配置
-                redis_host = os.getenv('REDIS_HOST', 'localhost')
-                redis_port = int(os.getenv('REDIS_PORT', 6379))
-                redis_password = os.getenv('REDIS_PASSWORD', None)
-                redis_db = int(os.getenv('REDIS_DB', 0))
-
-                # 创建Redis连接
-                if redis_password:
-                    redis_client = redis.Redis(
-                        host=redis_host,
-                        port=redis_port,
-                        password=redis_password,
-                        db=redis_db,
-                        decode_responses=True
-                    )
-                else:
-                    redis_client = redis.Redis(
-                        host=redis_host,
-                        port=redis_port,
-                        db=redis_db,
-                        decode_responses=True
-                    )
+                from tradingagents.config.connection_pool import get_connection_registry
+
+                # 复用共享连接池，避免每次轮询都新建连接
+                redis_client = get_connection_registry().get_default_redis_client(decode_responses=True)
 
                 # 获取所有progress键
                 keys = redis_client.keys("progress:*")
@@ -709,10 +769,8 @@ def get_latest_analysis_id() -> Optional[str]:
 
                 for key in keys:
                     try:
-                        data = redis_client.get(key)
-                        if data:
-                            progress_data = json.loads(data)
-                            last_update = progress_data.get('last_update', 0)
+                        last_update = _load_last_update_from_redis(redis_client, key)
+                        if last_update is not None:
                             if last_update > latest_time:
                                 latest_time = last_update
                                 # 从键名中提取analysis_id (去掉"progress:"前缀)
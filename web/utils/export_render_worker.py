@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+报告导出后台渲染
+Word/PDF 导出需要调用pandoc（PDF还可能依次尝试多个引擎），耗时从数秒到数十秒不等。
+这里把渲染放到后台线程执行，Streamlit页面只提交任务并轮询进度：
+    缓存键    分析结果的内容哈希 + 导出格式，相同报告重复下载直接命中缓存
+    内存缓存  最近渲染的文档按LRU保存在进程内
+    磁盘缓存  渲染结果同时写入缓存目录，服务重启后仍可命中，容量按LRU预算淘汰
+    任务去重  同一缓存键正在渲染时重复提交返回同一个任务
+
+环境变量:
+    EXPORT_RENDER_WORKERS   后台渲染线程数，默认1（pandoc/LaTeX本身较占资源）
+    EXPORT_CACHE_DIR        磁盘缓存目录，默认 <results目录>/.export_cache，设为空字符串表示只用内存缓存
+    EXPORT_CACHE_MAX_MB     磁盘缓存容量上限，默认256
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from tradingagents.dataflows.cache_maintenance import FileCacheBudget, FileCacheEntry, touch_cache_file
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('web')
+
+# 报告模板变化时递增，使旧缓存失效
+EXPORT_RENDER_VERSION = 1
+MEMORY_CACHE_ENTRIES = 32
+FORMAT_EXTENSIONS = {'markdown': 'md', 'docx': 'docx', 'pdf': 'pdf'}
+
+# 渲染函数签名: render(results, progress) -> bytes，progress(比例0~1, 说明)
+ProgressCallback = Callable[[float, str], None]
+RenderFunction = Callable[[Dict[str, Any], ProgressCallback], bytes]
+
+
+def compute_export_key(results: Dict[str, Any], format_type: str) -> str:
+    """分析结果内容 + 导出格式的哈希，字典按键排序，不可序列化的值按字符串参与计算"""
+    payload = json.dumps(results, sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha256()
+    digest.update(f"v{EXPORT_RENDER_VERSION}:{format_type}:".encode('utf-8'))
+    digest.update(payload.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _default_cache_dir() -> Optional[Path]:
+    cache_dir = os.getenv("EXPORT_CACHE_DIR")
+    if cache_dir is not None:
+        return Path(cache_dir) if cache_dir.strip() else None
+    project_root = Path(__file__).resolve().parent.parent.parent
+    results_dir = Path(os.getenv("TRADINGAGENTS_RESULTS_DIR") or "results")
+    if not results_dir.is_absolute():
+        results_dir = project_root / results_dir
+    return results_dir / ".export_cache"
+
+
+@dataclass
+class ExportJob:
+    """一次导出渲染任务"""
+    key: str
+    format_type: str
+    status: str = 'pending'  # pending / running / done / failed
+    progress: float = 0.0
+    message: str = "等待渲染..."
+    content: Optional[bytes] = None
+    error: Optional[str] = None
+    cached: bool = False
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.time()) - self.submitted_at
+
+
+class ExportRenderCache:
+    """渲染结果缓存：内存LRU + 可选磁盘缓存"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_memory_entries: int = MEMORY_CACHE_ENTRIES,
+                 max_disk_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.budget: Optional[FileCacheBudget] = None
+        if self.cache_dir is not None:
+            if max_disk_bytes is None:
+                try:
+                    max_disk_bytes = int(float(os.getenv("EXPORT_CACHE_MAX_MB", 256)) * 1024 * 1024)
+                except ValueError:
+                    max_disk_bytes = 256 * 1024 * 1024
+            self.budget = FileCacheBudget("导出报告缓存", self._scan_entries, max_bytes=max_disk_bytes, max_entries=0)
+
+    def _path(self, key: str, format_type: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{key}.{FORMAT_EXTENSIONS.get(format_type, format_type)}"
+
+    def _scan_entries(self) -> List[FileCacheEntry]:
+        entries = []
+        if self.cache_dir is None or not self.cache_dir.exists():
+            return entries
+        for path in self.cache_dir.iterdir():
+            if path.name.startswith('.'):  # 写入中的临时文件
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append(FileCacheEntry(path.stem, [path], stat.st_size, stat.st_mtime))
+        return entries
+
+    def _remember(self, key: str, content: bytes):
+        self._memory[key] = content
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str, format_type: str) -> Optional[bytes]:
+        with self._lock:
+            content = self._memory.get(key)
+            if content is not None:
+                self._memory.move_to_end(key)
+                return content
+
+        path = self._path(key, format_type)
+        if path is None or not path.exists():
+            return None
+        try:
+            content = path.read_bytes()
+        except OSError as e:
+            logger.warning(f"⚠️ [导出缓存] 读取缓存文件失败 {path}: {e}")
+            return None
+        touch_cache_file(path)
+        with self._lock:
+            self._remember(key, content)
+        return content
+
+    def put(self, key: str, format_type: str, content: bytes):
+        with self._lock:
+            self._remember(key, content)
+
+        path = self._path(key, format_type)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, path)
+            self.budget.record_write(len(content))
+        except OSError as e:
+            logger.warning(f"⚠️ [导出缓存] 写入缓存文件失败 {path}: {e}")
+
+
+class ExportRenderWorker:
+    """后台渲染线程池：提交任务立即返回，页面按缓存键轮询任务状态"""
+
+    def __init__(self, cache: Optional[ExportRenderCache] = None, max_workers: Optional[int] = None):
+        if max_workers is None:
+            try:
+                max_workers = max(1, int(os.getenv("EXPORT_RENDER_WORKERS", 1)))
+            except ValueError:
+                max_workers = 1
+        self.cache = cache if cache is not None else ExportRenderCache(_default_cache_dir())
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export-render")
+        self._jobs: Dict[str, ExportJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, results: Dict[str, Any], format_type: str, render: RenderFunction) -> ExportJob:
+        """
+        提交渲染任务
+
+        缓存命中时返回已完成的任务；同一缓存键正在渲染或已渲染完成时返回已有任务；
+        之前失败的任务重新提交
+        """
+        key = compute_export_key(results, format_type)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status != 'failed':
+                return job
+
+        content = self.cache.get(key, format_type)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status != 'failed':
+                return job
+            if content is not None:
+                now = time.time()
+                job = ExportJob(key, format_type, status='done', progress=1.0, message="已从缓存读取",
+                                content=content, cached=True, submitted_at=now, finished_at=now)
+                self._jobs[key] = job
+                self._forget_finished_jobs()
+                logger.info(f"⚡ [导出缓存] 命中: format={format_type}, 大小: {len(content)} 字节")
+                return job
+            job = ExportJob(key, format_type)
+            self._jobs[key] = job
+
+        logger.info(f"📤 [导出渲染] 提交后台任务: format={format_type}, key={key[:12]}")
+        self._executor.submit(self._run, job, results, render)
+        return job
+
+    def get_job(self, key: str) -> Optional[ExportJob]:
+        with self._lock:
+            return self._jobs.get(key)
+
+    def _run(self, job: ExportJob, results: Dict[str, Any], render: RenderFunction):
+        def progress(fraction: float, message: str):
+            job.progress = min(max(fraction, 0.0), 0.99)
+            job.message = message
+
+        job.status = 'running'
+        progress(0.05, "开始渲染...")
+        try:
+            content = render(results, progress)
+            if not content:
+                raise Exception("渲染结果为空")
+            self.cache.put(job.key, job.format_type, content)
+            # 页面线程按status判断完成，其余字段先写好
+            job.content, job.finished_at = content, time.time()
+            job.progress, job.message, job.status = 1.0, "渲染完成", 'done'
+            logger.info(f"✅ [导出渲染] 完成: format={job.format_type}, 大小: {len(content)} 字节, "
+                        f"耗时: {job.elapsed:.1f}s")
+        except Exception as e:
+            job.error, job.finished_at = str(e), time.time()
+            job.message, job.status = "渲染失败", 'failed'
+            logger.error(f"❌ [导出渲染] 失败: format={job.format_type}, 错误: {e}")
+        with self._lock:
+            self._forget_finished_jobs()
+
+    def _forget_finished_jobs(self):
+        """只保留最近完成的任务，更早的任务再次提交时从缓存读取"""
+        finished = [key for key, job in self._jobs.items() if job.finished]
+        for key in finished[:-MEMORY_CACHE_ENTRIES]:
+            del self._jobs[key]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+_worker: Optional[ExportRenderWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_export_worker() -> ExportRenderWorker:
+    """获取全局导出渲染器（Streamlit每次重跑脚本都复用同一个线程池和缓存）"""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = ExportRenderWorker()
+    return _worker
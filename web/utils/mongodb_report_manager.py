@@ -67,8 +67,9 @@ class MongoDBReportManager:
                     "authSource": mongodb_auth_source
                 })
 
-            # 连接MongoDB
-            self.client = MongoClient(**connect_kwargs)
+            # 连接MongoDB（共享连接池）
+            from tradingagents.config.connection_pool import get_pooled_mongodb_client
+            self.client = get_pooled_mongodb_client(**connect_kwargs)
             
             # 测试连接
             self.client.admin.command('ping')
@@ -10,9 +10,10 @@ import os
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 import tempfile
 import base64
+import time
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -36,6 +37,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 导入后台渲染器（Word/PDF在后台线程渲染，结果按内容哈希缓存）
+from .export_render_worker import compute_export_key, get_export_worker
+
 # 导入Docker适配器
 try:
     from .docker_pdf_adapter import (
@@ -90,6 +94,8 @@ class ReportExporter:
         self.export_available = EXPORT_AVAILABLE
         self.pandoc_available = PANDOC_AVAILABLE
         self.is_docker = DOCKER_ADAPTER_AVAILABLE and is_docker_environment()
+        # 上次成功的PDF引擎（''表示pandoc默认引擎），下次优先尝试，避免每次都先等待不可用的引擎失败
+        self.preferred_pdf_engine: Optional[str] = None
 
         # 记录初始化状态
         logger.info(f"📋 ReportExporter初始化:")
@@ -368,10 +374,18 @@ class ReportExporter:
 
         return formatted_content
 
-    def generate_docx_report(self, results: Dict[str, Any]) -> bytes:
-        """生成Word文档格式的报告"""
+    def generate_docx_report(self, results: Dict[str, Any],
+                             progress_callback: Optional[Callable[[float, str], None]] = None) -> bytes:
+        """
+        生成Word文档格式的报告
+
+        Args:
+            results: 分析结果
+            progress_callback: 进度回调 (比例0~1, 说明)，后台渲染时用于页面显示进度
+        """
 
         logger.info("📄 开始生成Word文档...")
+        progress = progress_callback or (lambda fraction, message: None)
 
         if not self.pandoc_available:
             logger.error("❌ Pandoc不可用")
@@ -379,6 +393,7 @@ class ReportExporter:
 
         # 首先生成markdown内容
         logger.info("📝 生成Markdown内容...")
+        progress(0.1, "生成Markdown内容...")
         md_content = self.generate_markdown_report(results)
         logger.info(f"✅ Markdown内容生成完成，长度: {len(md_content)} 字符")
 
@@ -394,6 +409,7 @@ class ReportExporter:
             logger.info(f"🔧 pypandoc参数: {extra_args} (禁用YAML解析)")
 
             logger.info("🔄 使用pypandoc将markdown转换为docx...")
+            progress(0.3, "使用pandoc转换为Word文档...")
 
             # 调试：保存实际的Markdown内容
             debug_file = '/app/debug_markdown.md'
@@ -442,10 +458,18 @@ class ReportExporter:
             raise Exception(f"生成Word文档失败: {e}")
     
     
-    def generate_pdf_report(self, results: Dict[str, Any]) -> bytes:
-        """生成PDF格式的报告"""
+    def generate_pdf_report(self, results: Dict[str, Any],
+                            progress_callback: Optional[Callable[[float, str], None]] = None) -> bytes:
+        """
+        生成PDF格式的报告
+
+        Args:
+            results: 分析结果
+            progress_callback: 进度回调 (比例0~1, 说明)，后台渲染时用于页面显示进度
+        """
 
         logger.info("📊 开始生成PDF文档...")
+        progress = progress_callback or (lambda fraction, message: None)
 
         if not self.pandoc_available:
             logger.error("❌ Pandoc不可用")
@@ -453,6 +477,7 @@ class ReportExporter:
 
         # 首先生成markdown内容
         logger.info("📝 生成Markdown内容...")
+        progress(0.1, "生成Markdown内容...")
         md_content = self.generate_markdown_report(results)
         logger.info(f"✅ Markdown内容生成完成，长度: {len(md_content)} 字符")
 
@@ -462,11 +487,15 @@ class ReportExporter:
             ('weasyprint', '现代HTML转PDF引擎'),
             (None, '使用pandoc默认引擎')  # 不指定引擎，让pandoc自己选择
         ]
+        # 上次成功的引擎排在最前
+        if self.preferred_pdf_engine is not None:
+            pdf_engines.sort(key=lambda engine_info: (engine_info[0] or '') != self.preferred_pdf_engine)
 
         last_error = None
 
-        for engine_info in pdf_engines:
+        for index, engine_info in enumerate(pdf_engines):
             engine, description = engine_info
+            progress(0.2 + 0.7 * index / len(pdf_engines), f"使用PDF引擎 {engine or '默认'} 渲染...")
             try:
                 # 创建临时文件用于PDF输出
                 with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
@@ -506,6 +535,7 @@ class ReportExporter:
                     os.unlink(output_file)
 
                     logger.info(f"✅ PDF生成成功，使用引擎: {engine or '默认'}")
+                    self.preferred_pdf_engine = engine or ''
                     return pdf_content
                 else:
                     raise Exception("PDF文件生成失败或为空")
@@ -955,6 +985,7 @@ def render_export_buttons(results: Dict[str, Any]):
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
     col1, col2, col3 = st.columns(3)
+    pending = False
     
     with col1:
         if st.button("📄 导出 Markdown", help="导出为Markdown格式"):
@@ -999,167 +1030,202 @@ def render_export_buttons(results: Dict[str, Any]):
     with col2:
         if st.button("📝 导出 Word", help="导出为Word文档格式"):
             logger.info(f"🖱️ [EXPORT] 用户点击Word导出按钮 - 股票: {stock_symbol}")
-            logger.info(f"🖱️ 用户点击Word导出按钮 - 股票: {stock_symbol}")
-            with st.spinner("正在生成Word文档，请稍候..."):
-                try:
-                    logger.info(f"🔄 [EXPORT] 开始Word导出流程...")
-                    logger.info("🔄 开始Word导出流程...")
-
-                    # 1. 保存分模块报告（CLI格式）
-                    logger.info("📁 开始保存分模块报告（CLI格式）...")
-                    modular_files = save_modular_reports_to_results_dir(results, stock_symbol)
-
-                    # 2. 生成Word汇总报告
-                    content = report_exporter.export_report(results, 'docx')
-                    if content:
-                        filename = f"{stock_symbol}_analysis_{timestamp}.docx"
-                        logger.info(f"✅ [EXPORT] Word导出成功，文件名: {filename}, 大小: {len(content)} 字节")
-                        logger.info(f"✅ Word导出成功，文件名: {filename}, 大小: {len(content)} 字节")
-
-                        # 3. 保存Word汇总报告到results目录
-                        saved_path = save_report_to_results_dir(content, filename, stock_symbol)
-
-                        # 4. 显示保存结果
-                        if modular_files and saved_path:
-                            st.success(f"✅ 已保存 {len(modular_files)} 个分模块报告 + 1个Word汇总报告")
-                            with st.expander("📁 查看保存的文件"):
-                                st.write("**分模块报告:**")
-                                for module, path in modular_files.items():
-                                    st.write(f"- {module}: `{path}`")
-                                st.write("**Word汇总报告:**")
-                                st.write(f"- Word报告: `{saved_path}`")
-                        elif saved_path:
-                            st.success(f"✅ Word文档已保存到: {saved_path}")
-                        else:
-                            st.success("✅ Word文档生成成功！")
-
-                        st.download_button(
-                            label="📥 下载 Word",
-                            data=content,
-                            file_name=filename,
-                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                        )
-                    else:
-                        logger.error(f"❌ [EXPORT] Word导出失败，content为空")
-                        logger.error("❌ Word导出失败，content为空")
-                        st.error("❌ Word文档生成失败")
-                except Exception as e:
-                    logger.error(f"❌ [EXPORT] Word导出异常: {str(e)}")
-                    logger.error(f"❌ Word导出异常: {str(e)}", exc_info=True)
-                    st.error(f"❌ Word文档生成失败: {str(e)}")
-
-                    # 显示详细错误信息
-                    with st.expander("🔍 查看详细错误信息"):
-                        st.text(str(e))
-
-                    # 提供解决方案
-                    with st.expander("💡 解决方案"):
-                        st.markdown("""
-                        **Word导出需要pandoc工具，请检查:**
-
-                        1. **Docker环境**: 重新构建镜像确保包含pandoc
-                        2. **本地环境**: 安装pandoc
-                        ```bash
-                        # Windows
-                        choco install pandoc
-
-                        # macOS
-                        brew install pandoc
-
-                        # Linux
-                        sudo apt-get install pandoc
-                        ```
-
-                        3. **替代方案**: 使用Markdown格式导出
-                        """)
-    
+            _submit_background_export(results, 'docx', stock_symbol, report_exporter.generate_docx_report)
+        pending = _render_export_status(results, 'docx', stock_symbol) or pending
+
     with col3:
         if st.button("📊 导出 PDF", help="导出为PDF格式 (需要额外工具)"):
             logger.info(f"🖱️ 用户点击PDF导出按钮 - 股票: {stock_symbol}")
-            with st.spinner("正在生成PDF，请稍候..."):
-                try:
-                    logger.info("🔄 开始PDF导出流程...")
-
-                    # 1. 保存分模块报告（CLI格式）
-                    logger.info("📁 开始保存分模块报告（CLI格式）...")
-                    modular_files = save_modular_reports_to_results_dir(results, stock_symbol)
-
-                    # 2. 生成PDF汇总报告
-                    content = report_exporter.export_report(results, 'pdf')
-                    if content:
-                        filename = f"{stock_symbol}_analysis_{timestamp}.pdf"
-                        logger.info(f"✅ PDF导出成功，文件名: {filename}, 大小: {len(content)} 字节")
-
-                        # 3. 保存PDF汇总报告到results目录
-                        saved_path = save_report_to_results_dir(content, filename, stock_symbol)
-
-                        # 4. 显示保存结果
-                        if modular_files and saved_path:
-                            st.success(f"✅ 已保存 {len(modular_files)} 个分模块报告 + 1个PDF汇总报告")
-                            with st.expander("📁 查看保存的文件"):
-                                st.write("**分模块报告:**")
-                                for module, path in modular_files.items():
-                                    st.write(f"- {module}: `{path}`")
-                                st.write("**PDF汇总报告:**")
-                                st.write(f"- PDF报告: `{saved_path}`")
-                        elif saved_path:
-                            st.success(f"✅ PDF已保存到: {saved_path}")
-                        else:
-                            st.success("✅ PDF生成成功！")
-
-                        st.download_button(
-                            label="📥 下载 PDF",
-                            data=content,
-                            file_name=filename,
-                            mime="application/pdf"
-                        )
-                    else:
-                        logger.error("❌ PDF导出失败，content为空")
-                        st.error("❌ PDF生成失败")
-                except Exception as e:
-                    logger.error(f"❌ PDF导出异常: {str(e)}", exc_info=True)
-                    st.error(f"❌ PDF生成失败")
-
-                    # 显示详细错误信息
-                    with st.expander("🔍 查看详细错误信息"):
-                        st.text(str(e))
-
-                    # 提供解决方案
-                    with st.expander("💡 解决方案"):
-                        st.markdown("""
-                        **PDF导出需要额外的工具，请选择以下方案之一:**
-
-                        **方案1: 安装wkhtmltopdf (推荐)**
-                        ```bash
-                        # Windows
-                        choco install wkhtmltopdf
-
-                        # macOS
-                        brew install wkhtmltopdf
-
-                        # Linux
-                        sudo apt-get install wkhtmltopdf
-                        ```
-
-                        **方案2: 安装LaTeX**
-                        ```bash
-                        # Windows
-                        choco install miktex
-
-                        # macOS
-                        brew install mactex
-
-                        # Linux
-                        sudo apt-get install texlive-full
-                        ```
-
-                        **方案3: 使用替代格式**
-                        - 📄 Markdown格式 - 轻量级，兼容性好
-                        - 📝 Word格式 - 适合进一步编辑
-                        """)
-
-                    # 建议使用其他格式
-                    st.info("💡 建议：您可以先使用Markdown或Word格式导出，然后使用其他工具转换为PDF")
+            _submit_background_export(results, 'pdf', stock_symbol, report_exporter.generate_pdf_report)
+        pending = _render_export_status(results, 'pdf', stock_symbol) or pending
+
+    # 不支持fragment的旧版Streamlit在后台渲染未完成时退回整页定时刷新
+    if pending:
+        time.sleep(EXPORT_PROGRESS_REFRESH_SECONDS)
+        st.rerun()
+
+
+# 后台渲染的导出格式：显示名称、MIME类型
+BACKGROUND_EXPORT_FORMATS = {
+    'docx': ("Word", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    'pdf': ("PDF", "application/pdf"),
+}
+EXPORT_PROGRESS_REFRESH_SECONDS = 1
+# st.fragment(run_every=...) 需要 Streamlit >= 1.37
+EXPORT_FRAGMENT_AVAILABLE = hasattr(st, 'fragment')
+
+
+def _export_state_key(format_type: str) -> str:
+    return f"report_export_job_{format_type}"
+
+
+def _submit_background_export(results: Dict[str, Any], format_type: str, stock_symbol: str, render):
+    """保存分模块报告并提交后台渲染任务，任务信息记录在会话状态中供后续重跑轮询"""
+    # 1. 保存分模块报告（CLI格式）
+    logger.info("📁 开始保存分模块报告（CLI格式）...")
+    modular_files = save_modular_reports_to_results_dir(results, stock_symbol)
+
+    # 2. 提交汇总报告渲染任务（相同报告直接命中缓存）
+    job = get_export_worker().submit(results, format_type, render)
+    st.session_state[_export_state_key(format_type)] = {
+        'key': job.key,
+        'modular_files': modular_files,
+        'saved_path': None,
+    }
+
+
+def _background_export_pending(format_type: str) -> bool:
+    """会话中记录的后台渲染任务是否仍未完成"""
+    state = st.session_state.get(_export_state_key(format_type))
+    if not state:
+        return False
+    job = get_export_worker().get_job(state['key'])
+    return job is not None and not job.finished
+
+
+def _render_export_status(results: Dict[str, Any], format_type: str, stock_symbol: str) -> bool:
+    """
+    显示导出任务状态，返回是否需要整页定时刷新
+
+    渲染中的任务交给局部刷新组件轮询进度，只重跑进度区域；仅旧版Streamlit需要整页刷新。
+    """
+    if EXPORT_FRAGMENT_AVAILABLE and _background_export_pending(format_type):
+        _background_export_fragment(results, format_type, stock_symbol)
+        return False
+    return _render_background_export(results, format_type, stock_symbol)
+
+
+if EXPORT_FRAGMENT_AVAILABLE:
+    @st.fragment(run_every=EXPORT_PROGRESS_REFRESH_SECONDS)
+    def _background_export_fragment(results: Dict[str, Any], format_type: str, stock_symbol: str):
+        """定时只重跑进度区域；渲染结束时整页重跑一次以显示结果，之后不再定时刷新"""
+        if _background_export_pending(format_type):
+            _render_background_export(results, format_type, stock_symbol)
+            return
+        logger.info(f"📤 [EXPORT] {format_type}后台渲染结束，刷新页面显示结果")
+        st.rerun()
+
+
+def _render_background_export(results: Dict[str, Any], format_type: str, stock_symbol: str) -> bool:
+    """显示后台渲染任务的进度或结果，返回任务是否仍在渲染"""
+    state = st.session_state.get(_export_state_key(format_type))
+    if not state:
+        return False
+
+    job = get_export_worker().get_job(state['key'])
+    if job is None or job.key != compute_export_key(results, format_type):
+        # 任务已被清理，或页面已切换到另一份分析结果
+        del st.session_state[_export_state_key(format_type)]
+        return False
+
+    display_name, mime = BACKGROUND_EXPORT_FORMATS[format_type]
+    if not job.finished:
+        st.progress(job.progress, text=f"正在生成{display_name}：{job.message}（已用时 {job.elapsed:.0f}s）")
+        return True
+
+    if job.status == 'failed':
+        logger.error(f"❌ [EXPORT] {display_name}导出失败: {job.error}")
+        st.error(f"❌ {display_name}生成失败")
+        with st.expander("🔍 查看详细错误信息"):
+            st.text(job.error)
+        if format_type == 'pdf':
+            _render_pdf_export_help()
+        else:
+            _render_docx_export_help()
+        return False
+
+    filename = f"{stock_symbol}_analysis_{datetime.fromtimestamp(job.finished_at).strftime('%Y%m%d_%H%M%S')}.{format_type}"
+
+    # 3. 保存汇总报告到results目录（每个任务只保存一次）
+    if state['saved_path'] is None:
+        state['saved_path'] = save_report_to_results_dir(job.content, filename, stock_symbol)
+
+    # 4. 显示保存结果
+    modular_files, saved_path = state['modular_files'], state['saved_path']
+    source = "（已从缓存读取）" if job.cached else f"（耗时 {job.elapsed:.1f}s）"
+    if modular_files and saved_path:
+        st.success(f"✅ 已保存 {len(modular_files)} 个分模块报告 + 1个{display_name}汇总报告{source}")
+        with st.expander("📁 查看保存的文件"):
+            st.write("**分模块报告:**")
+            for module, path in modular_files.items():
+                st.write(f"- {module}: `{path}`")
+            st.write(f"**{display_name}汇总报告:**")
+            st.write(f"- {display_name}报告: `{saved_path}`")
+    elif saved_path:
+        st.success(f"✅ {display_name}已保存到: {saved_path}{source}")
+    else:
+        st.success(f"✅ {display_name}生成成功！{source}")
+
+    st.download_button(
+        label=f"📥 下载 {display_name}",
+        data=job.content,
+        file_name=filename,
+        mime=mime,
+        key=f"download_{format_type}_{job.key[:12]}"
+    )
+    return False
+
+
+def _render_docx_export_help():
+    """Word导出失败时的解决方案"""
+    with st.expander("💡 解决方案"):
+        st.markdown("""
+        **Word导出需要pandoc工具，请检查:**
+
+        1. **Docker环境**: 重新构建镜像确保包含pandoc
+        2. **本地环境**: 安装pandoc
+        ```bash
+        # Windows
+        choco install pandoc
+
+        # macOS
+        brew install pandoc
+
+        # Linux
+        sudo apt-get install pandoc
+        ```
+
+        3. **替代方案**: 使用Markdown格式导出
+        """)
+
+
+def _render_pdf_export_help():
+    """PDF导出失败时的解决方案"""
+    with st.expander("💡 解决方案"):
+        st.markdown("""
+        **PDF导出需要额外的工具，请选择以下方案之一:**
+
+        **方案1: 安装wkhtmltopdf (推荐)**
+        ```bash
+        # Windows
+        choco install wkhtmltopdf
+
+        # macOS
+        brew install wkhtmltopdf
+
+        # Linux
+        sudo apt-get install wkhtmltopdf
+        ```
+
+        **方案2: 安装LaTeX**
+        ```bash
+        # Windows
+        choco install miktex
+
+        # macOS
+        brew install mactex
+
+        # Linux
+        sudo apt-get install texlive-full
+        ```
+
+        **方案3: 使用替代格式**
+        - 📄 Markdown格式 - 轻量级，兼容性好
+        - 📝 Word格式 - 适合进一步编辑
+        """)
+
+    # 建议使用其他格式
+    st.info("💡 建议：您可以先使用Markdown或Word格式导出，然后使用其他工具转换为PDF")
 
 
 def save_analysis_report(stock_symbol: str, analysis_results: Dict[str, Any], 